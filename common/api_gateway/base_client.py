@@ -18,7 +18,9 @@ Reference: Blueprint Section "The API Integration Gateway"
 import requests
 import logging
 import time
-from typing import Dict, Optional, Any, Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Any, Callable
 from abc import ABC, abstractmethod
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -30,6 +32,37 @@ from .circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitSta
 
 logger = logging.getLogger(__name__)
 
+# Cache warming hooks. Context variables follow calls into asyncio.to_thread,
+# so async adapters wrapping these sync clients can use them directly.
+_force_refresh: ContextVar[bool] = ContextVar('api_gateway_force_refresh', default=False)
+_observed_cache_keys: ContextVar[Optional[List[str]]] = ContextVar('api_gateway_observed_cache_keys', default=None)
+
+
+@contextmanager
+def cache_refresh():
+    """
+    Skip cache reads (but still store responses) for requests in this context.
+
+    Used for refresh-ahead warming: the entry is replaced with a fresh
+    response and a new TTL before it expires.
+    """
+    token = _force_refresh.set(True)
+    try:
+        yield
+    finally:
+        _force_refresh.reset(token)
+
+
+@contextmanager
+def observe_cache_keys():
+    """Collect the cache keys used by requests made in this context."""
+    keys: List[str] = []
+    token = _observed_cache_keys.set(keys)
+    try:
+        yield keys
+    finally:
+        _observed_cache_keys.reset(token)
+
 # Prometheus Metrics - Module-level definitions
 api_gateway_requests_total = Counter(
     'api_gateway_requests_total',
@@ -222,6 +255,10 @@ class BaseAPIClient(ABC):
         try:
             # Step 1: Check cache
             if use_cache and cache_key:
+                observed = _observed_cache_keys.get()
+                if observed is not None:
+                    observed.append(cache_key)
+            if use_cache and cache_key and not _force_refresh.get():
                 cached = self._check_cache(cache_key)
                 if cached is not None:
                     self.stats['cache_hits'] += 1
@@ -7,6 +7,8 @@ Middleware Stack (Priority Order):
 - CaptchaSolvingMiddleware (600): Automated CAPTCHA detection and solving
 - IntelligentProxyMiddleware (650): Proxy rotation with health monitoring
 - DynamicHeaderMiddleware (700): Realistic browser header generation
+- ConditionalHttpCacheMiddleware (900): ETag/Last-Modified revalidation, skips unchanged pages
+- PlaywrightPageCapMiddleware (950): Worker-wide cap on open Playwright pages
 
 All middlewares integrate with crawler.stats for shared state management
 and implement comprehensive logging for diagnostics.
@@ -16,12 +18,17 @@ from .headers_middleware import DynamicHeaderMiddleware
 from .captcha_middleware import CaptchaSolvingMiddleware
 from .retry_middleware import EnhancedRetryMiddleware
 from .proxy_integration import ProxyMiddlewareIntegration
+from .http_cache import ConditionalHttpCacheMiddleware, UnchangedResponse
+from .playwright_page_cap import PlaywrightPageCapMiddleware
 
 __all__ = [
     'DynamicHeaderMiddleware',
     'CaptchaSolvingMiddleware',
     'EnhancedRetryMiddleware',
     'ProxyMiddlewareIntegration',
+    'ConditionalHttpCacheMiddleware',
+    'UnchangedResponse',
+    'PlaywrightPageCapMiddleware',
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,277 @@
+"""
+Conditional-Request HTTP Cache
+Priority: 900 (replaces Scrapy's HttpCacheMiddleware, closest to the downloader)
+
+Recrawls of tracklist pages revalidate instead of downloading in full:
+- Responses carrying an ETag or Last-Modified validator are stored
+- The next request for the same page sends If-None-Match / If-Modified-Since
+- A 304 (or a cache hit within HTTPCACHE_FRESH_SECS) means the page is
+  unchanged since it was last downloaded. Leaf pages that opt in with
+  meta['httpcache_skip_unchanged'] are dropped with UnchangedResponse before
+  the callback and item pipelines run, provided their previous copy was
+  processed; every other page (hubs, search, pagination) is parsed from the
+  cached copy so newly linked pages are still discovered
+- Server errors are never answered from the cache, so RetryMiddleware sees them
+
+A stored page counts as processed once one of its items has passed the item
+pipelines (item_scraped). A callback error (spider_error) or a pipeline
+error (item_error) clears the mark, so the page is parsed again next time.
+
+Storage is a per-spider SQLite file of zlib-compressed responses, evicted
+least-recently-used once HTTPCACHE_MAX_BYTES is exceeded.
+
+Playwright-rendered requests are never cached: the browser issues its own
+requests and a 304 navigation would render an empty page.
+
+Stats (Scrapy's own plus the ones added here):
+    httpcache/hit, httpcache/miss, httpcache/revalidate, httpcache/invalidate,
+    httpcache/store, httpcache/unchanged_skipped, httpcache/evicted,
+    httpcache/stored_bytes
+
+Configuration (settings.py):
+    HTTPCACHE_ENABLED = True
+    HTTPCACHE_POLICY = 'middlewares.http_cache.ConditionalCachePolicy'
+    HTTPCACHE_STORAGE = 'middlewares.http_cache.CompressedLRUCacheStorage'
+    HTTPCACHE_MAX_BYTES = 512 * 1024 * 1024
+    HTTPCACHE_FRESH_SECS = 0           # serve without revalidating if younger
+    HTTPCACHE_SKIP_UNCHANGED = False   # per request: meta['httpcache_skip_unchanged']
+"""
+
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from typing import Optional, Set
+
+from scrapy import signals
+from scrapy.downloadermiddlewares.httpcache import HttpCacheMiddleware
+from scrapy.exceptions import IgnoreRequest
+from scrapy.extensions.httpcache import RFC2616Policy, rfc1123_to_epoch
+from scrapy.http import Headers, Request, Response
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.project import data_path
+from w3lib.http import headers_dict_to_raw, headers_raw_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+class UnchangedResponse(IgnoreRequest):
+    """Raised for pages whose cached copy is still current (already parsed)"""
+
+
+class ConditionalCachePolicy(RFC2616Policy):
+    """
+    Always revalidate cached pages with conditional requests.
+
+    RFC2616Policy would treat a page with an old Last-Modified as fresh for
+    10% of its age and serve it without asking the server; recrawls here
+    want to know whether the page changed, so freshness is limited to the
+    explicit HTTPCACHE_FRESH_SECS window.
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.fresh_secs = settings.getint('HTTPCACHE_FRESH_SECS', 0)
+
+    def should_cache_request(self, request: Request) -> bool:
+        if request.method != 'GET' or request.meta.get('playwright'):
+            return False
+        return super().should_cache_request(request)
+
+    def should_cache_response(self, response: Response, request: Request) -> bool:
+        # Without a validator the page could only ever be re-downloaded
+        if response.status != 200:
+            return False
+        if b'ETag' not in response.headers and b'Last-Modified' not in response.headers:
+            return False
+        return super().should_cache_response(response, request)
+
+    def is_cached_response_fresh(self, cachedresponse: Response, request: Request) -> bool:
+        if self.fresh_secs:
+            stored_at = rfc1123_to_epoch(cachedresponse.headers.get(b'Date'))
+            if stored_at and time.time() - stored_at < self.fresh_secs:
+                return True
+        self._set_conditional_validators(request, cachedresponse)
+        return False
+
+    def is_cached_response_valid(self, cachedresponse: Response, response: Response, request: Request) -> bool:
+        # RFC2616Policy also serves the cached copy on 5xx; here that would read
+        # as "unchanged" and hide the error from RetryMiddleware
+        return response.status == 304
+
+
+class CompressedLRUCacheStorage:
+    """
+    Size-bounded cache storage: one SQLite file per spider, zlib-compressed
+    bodies and headers, least-recently-used entries evicted past the limit.
+
+    Each entry also records whether the page it holds was processed; cached
+    responses for processed pages carry the 'processed' flag.
+    """
+
+    EVICT_TO_RATIO = 0.9  # evict down to 90% of the limit to avoid thrashing
+
+    def __init__(self, settings):
+        self.cachedir = data_path(settings['HTTPCACHE_DIR'], createdir=True)
+        self.expiration_secs = settings.getint('HTTPCACHE_EXPIRATION_SECS')
+        self.max_bytes = settings.getint('HTTPCACHE_MAX_BYTES', 512 * 1024 * 1024)
+        self.compression_level = settings.getint('HTTPCACHE_COMPRESSION_LEVEL', 6)
+        self.db: Optional[sqlite3.Connection] = None
+        self.total_bytes = 0
+        self.stats = None
+
+    def open_spider(self, spider):
+        path = os.path.join(self.cachedir, f"{spider.name}.sqlite3")
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   fingerprint TEXT PRIMARY KEY,
+                   url TEXT NOT NULL,
+                   status INTEGER NOT NULL,
+                   headers BLOB NOT NULL,
+                   body BLOB NOT NULL,
+                   size INTEGER NOT NULL,
+                   stored_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL,
+                   processed INTEGER NOT NULL DEFAULT 0
+               )"""
+        )
+        columns = {row[1] for row in self.db.execute('PRAGMA table_info(responses)')}
+        if 'processed' not in columns:
+            self.db.execute('ALTER TABLE responses ADD COLUMN processed INTEGER NOT NULL DEFAULT 0')
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self.total_bytes = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+        self._fingerprinter = spider.crawler.request_fingerprinter
+        self.stats = spider.crawler.stats
+        self.stats.set_value('httpcache/stored_bytes', self.total_bytes)
+        logger.debug(f"Using HTTP cache {path} ({self.total_bytes / 1024 / 1024:.1f} MB)")
+
+    def close_spider(self, spider):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def retrieve_response(self, spider, request: Request) -> Optional[Response]:
+        key = self._fingerprinter.fingerprint(request).hex()
+        row = self.db.execute(
+            'SELECT url, status, headers, body, stored_at, processed FROM responses WHERE fingerprint = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        url, status, headers, body, stored_at, processed = row
+        if 0 < self.expiration_secs < time.time() - stored_at:
+            return None
+        self.db.execute('UPDATE responses SET accessed_at = ? WHERE fingerprint = ?', (time.time(), key))
+
+        headers = Headers(headers_raw_to_dict(zlib.decompress(headers)))
+        body = zlib.decompress(body)
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(url=url, headers=headers, status=status, body=body,
+                       flags=['processed'] if processed else None)
+
+    def store_response(self, spider, request: Request, response: Response):
+        key = self._fingerprinter.fingerprint(request).hex()
+        headers = zlib.compress(headers_dict_to_raw(response.headers), self.compression_level)
+        body = zlib.compress(response.body, self.compression_level)
+        size = len(headers) + len(body)
+        now = time.time()
+
+        previous = self.db.execute(
+            'SELECT size, body, processed FROM responses WHERE fingerprint = ?', (key,)
+        ).fetchone()
+        # Re-storing the same body (e.g. headers freshened by a 304) keeps the mark
+        processed = previous[2] if previous and previous[1] == body else 0
+        self.db.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (key, response.url, response.status, headers, body, size, now, now, processed)
+        )
+        self.total_bytes += size - (previous[0] if previous else 0)
+
+        if self.total_bytes > self.max_bytes:
+            self._evict(spider)
+        self.stats.set_value('httpcache/stored_bytes', self.total_bytes)
+
+    def mark_processed(self, spider, request: Request, processed: bool = True):
+        """Record whether the stored copy of `request`'s page has been fully processed"""
+        key = self._fingerprinter.fingerprint(request).hex()
+        self.db.execute('UPDATE responses SET processed = ? WHERE fingerprint = ?', (int(processed), key))
+
+    def _evict(self, spider):
+        target = self.max_bytes * self.EVICT_TO_RATIO
+        evicted = 0
+        rows = self.db.execute('SELECT fingerprint, size FROM responses ORDER BY accessed_at').fetchall()
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            self.db.execute('DELETE FROM responses WHERE fingerprint = ?', (key,))
+            self.total_bytes -= size
+            evicted += 1
+        self.stats.inc_value('httpcache/evicted', evicted)
+
+
+class ConditionalHttpCacheMiddleware(HttpCacheMiddleware):
+    """
+    HttpCacheMiddleware that drops unchanged, already processed leaf pages
+    instead of re-parsing them.
+
+    Cached responses come back flagged 'cached' both on a fresh hit and after
+    a 304 revalidation; either way the page is identical to the stored copy.
+    Only requests that opt in are skipped, and only when that copy was
+    processed: marks are set from item_scraped and cleared on spider_error
+    or item_error.
+    """
+
+    def __init__(self, settings, stats):
+        super().__init__(settings, stats)
+        self.skip_unchanged = settings.getbool('HTTPCACHE_SKIP_UNCHANGED', False)
+        self._marked: Set[bytes] = set()
+        self._failed: Set[bytes] = set()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        o = super().from_crawler(crawler)
+        crawler.signals.connect(o.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(o.item_error, signal=signals.item_error)
+        crawler.signals.connect(o.spider_error, signal=signals.spider_error)
+        return o
+
+    def process_response(self, request: Request, response: Response, spider):
+        result = super().process_response(request, response, spider)
+
+        if isinstance(result, Response) and 'cached' in result.flags and not request.meta.get('dont_cache'):
+            result.flags.append('unchanged')
+            skip = request.meta.get('httpcache_skip_unchanged', self.skip_unchanged)
+            if skip and 'processed' in result.flags:
+                self.stats.inc_value('httpcache/unchanged_skipped')
+                raise UnchangedResponse(f"Unchanged since last crawl: {request.url}")
+
+        return result
+
+    def item_scraped(self, item, response, spider):
+        request = getattr(response, 'request', None)
+        if request is None or request.meta.get('dont_cache') or not hasattr(self.storage, 'mark_processed'):
+            return
+        key = self.crawler.request_fingerprinter.fingerprint(request)
+        if key in self._marked or key in self._failed:
+            return
+        self._marked.add(key)
+        self.storage.mark_processed(spider, request)
+
+    def item_error(self, item, response, spider, failure):
+        self._unmark(response, spider)
+
+    def spider_error(self, failure, response, spider):
+        self._unmark(response, spider)
+
+    def _unmark(self, response, spider):
+        request = getattr(response, 'request', None)
+        if request is None or not hasattr(self.storage, 'mark_processed'):
+            return
+        key = self.crawler.request_fingerprinter.fingerprint(request)
+        self._failed.add(key)
+        self._marked.discard(key)
+        self.storage.mark_processed(spider, request, processed=False)
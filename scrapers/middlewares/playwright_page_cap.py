@@ -0,0 +1,33 @@
+"""
+Playwright Page Cap Middleware
+Priority: 950 (after retries and the HTTP cache, right before the download handler)
+
+Holds back context-pooled Playwright requests until the spider's
+PlaywrightContextPool has a free page slot, so the number of open pages
+stays under PLAYWRIGHT_MAX_PAGES_PER_WORKER across all domains instead of
+being split evenly between contexts.
+
+The slot comes with a lease on the domain's browser context, taken here
+rather than when the request is built so that requests dropped before
+download (dupefilter, offsite) never hold one. Both are returned by
+PlaywrightContextPool.release() from the spider's callback or errback. Requests that are not Playwright requests, or whose
+spider has no context pool, pass straight through.
+"""
+
+import logging
+
+from scrapy.http import Request
+
+logger = logging.getLogger(__name__)
+
+
+class PlaywrightPageCapMiddleware:
+    """Waits for a page slot from the spider's context pool before downloading"""
+
+    async def process_request(self, request: Request, spider):
+        pool = getattr(spider, 'context_pool', None)
+        if pool is None or not request.meta.get('playwright'):
+            return None
+
+        await pool.acquire_page_slot(request.meta)
+        return None
@@ -6,8 +6,16 @@ Delegates ALL enrichment to the metadata-enrichment microservice.
 
 This pipeline is now a thin HTTP client that:
 1. Extracts track info from scraped items
-2. Calls metadata-enrichment service via HTTP
-3. Applies returned enrichment data to item
+2. Buffers them into micro-batches (by size and max wait)
+3. Calls metadata-enrichment service via HTTP (POST /enrich/batch/sync)
+4. Applies returned enrichment data to item
+
+Batching: items wait in a bounded buffer until ENRICHMENT_BATCH_SIZE tracks
+are queued or ENRICHMENT_BATCH_MAX_WAIT seconds pass, whichever comes first.
+Each item's process_item call resolves with its own result, so one failed
+track never fails its neighbours. At most ENRICHMENT_MAX_PENDING tracks are
+buffered or in flight; further items wait, which backpressures the crawl.
+Services without the batch endpoint get one POST /enrich per track.
 
 Priority: 250 (after EnrichmentPipeline, before Persistence)
 
@@ -25,11 +33,13 @@ Benefits:
 - Centralized API key management
 """
 
+import asyncio
 import logging
 import httpx
 import os
 import json
-from typing import Dict, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from itemadapter import ItemAdapter
 from datetime import datetime
 
@@ -55,7 +65,10 @@ class APIEnrichmentPipeline:
     def __init__(self,
                  enrichment_service_url: str = None,
                  enable_fallback: bool = False,
-                 timeout: float = 60.0):
+                 timeout: float = 60.0,
+                 batch_size: int = None,
+                 batch_max_wait: float = None,
+                 max_pending: int = None):
         """
         Initialize the enrichment client.
 
@@ -63,6 +76,9 @@ class APIEnrichmentPipeline:
             enrichment_service_url: URL of metadata-enrichment service
             enable_fallback: If True, fall back to legacy inline enrichment if service unavailable
             timeout: HTTP request timeout in seconds
+            batch_size: Tracks per batch request (1 disables batching)
+            batch_max_wait: Seconds a partial batch waits before being sent
+            max_pending: Tracks buffered or in flight before process_item blocks
         """
         self.enrichment_service_url = enrichment_service_url or os.getenv(
             "METADATA_ENRICHMENT_URL",
@@ -72,6 +88,16 @@ class APIEnrichmentPipeline:
         self.enable_fallback = enable_fallback
         self.timeout = timeout
 
+        # Micro-batching
+        self.batch_size = max(1, int(batch_size or os.getenv('ENRICHMENT_BATCH_SIZE', 20)))
+        self.batch_max_wait = float(batch_max_wait or os.getenv('ENRICHMENT_BATCH_MAX_WAIT', 0.5))
+        self.max_pending = max(self.batch_size, int(max_pending or os.getenv('ENRICHMENT_MAX_PENDING', 200)))
+        self.batch_endpoint_available = True
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._pending_slots = asyncio.Semaphore(self.max_pending)
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._inflight_batches = set()
+
         # Create persistent HTTP client with connection pooling
         self.http_client = httpx.AsyncClient(
             timeout=httpx.Timeout(self.timeout, connect=10.0),
@@ -89,11 +115,13 @@ class APIEnrichmentPipeline:
             'service_errors': 0,
             'service_unavailable': 0,
             'skipped': 0,
-            'fallback_used': 0
+            'fallback_used': 0,
+            'batches_sent': 0
         }
 
         logger.info(
-            f"APIEnrichmentPipeline initialized in DELEGATION mode: {self.enrichment_service_url}"
+            f"APIEnrichmentPipeline initialized in DELEGATION mode: {self.enrichment_service_url} "
+            f"(batch_size={self.batch_size}, max_wait={self.batch_max_wait}s, max_pending={self.max_pending})"
         )
 
     def _init_metrics(self):
@@ -113,6 +141,11 @@ class APIEnrichmentPipeline:
                     'scraper_enrichment_duration_seconds',
                     'Enrichment request duration',
                     buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+                ),
+                'enrichment_batch_size': Histogram(
+                    'scraper_enrichment_batch_size',
+                    'Tracks per enrichment batch request',
+                    buckets=[1, 2, 5, 10, 20, 50, 100]
                 )
             }
             logger.info("Prometheus metrics initialized")
@@ -126,7 +159,10 @@ class APIEnrichmentPipeline:
         return cls(
             enrichment_service_url=crawler.settings.get('METADATA_ENRICHMENT_URL') or os.getenv('METADATA_ENRICHMENT_URL'),
             enable_fallback=crawler.settings.get('ENRICHMENT_FALLBACK_ENABLED', False),
-            timeout=crawler.settings.get('ENRICHMENT_TIMEOUT', 60.0)
+            timeout=crawler.settings.get('ENRICHMENT_TIMEOUT', 60.0),
+            batch_size=crawler.settings.getint('ENRICHMENT_BATCH_SIZE') or None,
+            batch_max_wait=crawler.settings.getfloat('ENRICHMENT_BATCH_MAX_WAIT') or None,
+            max_pending=crawler.settings.getint('ENRICHMENT_MAX_PENDING') or None
         )
 
     async def process_item(self, item, spider):
@@ -186,7 +222,7 @@ class APIEnrichmentPipeline:
 
         # Call enrichment service
         try:
-            enrichment_data = await self._enrich_via_service(
+            enrichment_data = await self._enrich_batched(
                 track_id=adapter.get('track_id') or adapter.get('id'),
                 artist_name=artist,
                 track_title=title,
@@ -258,6 +294,127 @@ class APIEnrichmentPipeline:
 
         return item
 
+    async def _enrich_batched(self, **kwargs) -> Optional[Dict]:
+        """
+        Queue one track for the next batch and wait for its own result.
+
+        Returns the same per-track payload as _enrich_via_service; a batch-wide
+        connection failure is raised here so process_item handles it as before.
+        """
+        payload = {k: v for k, v in kwargs.items() if v is not None}
+
+        # The service requires track_id on every batch entry; one missing
+        # would get the whole batch rejected
+        if self.batch_size <= 1 or not self.batch_endpoint_available or 'track_id' not in payload:
+            return await self._enrich_via_service(**payload)
+
+        await self._pending_slots.acquire()
+        try:
+            future = asyncio.get_running_loop().create_future()
+            self._pending.append((payload, future))
+            if len(self._pending) >= self.batch_size:
+                self._flush_batch()
+            elif self._flush_timer is None:
+                self._flush_timer = asyncio.ensure_future(self._flush_after_wait())
+            return await future
+        finally:
+            self._pending_slots.release()
+
+    def _flush_batch(self):
+        """Send up to batch_size buffered tracks without blocking the caller"""
+        batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+
+        if not self._pending and self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        elif self._pending and self._flush_timer is None:
+            self._flush_timer = asyncio.ensure_future(self._flush_after_wait())
+
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._inflight_batches.add(task)
+        task.add_done_callback(self._inflight_batches.discard)
+
+    async def _flush_after_wait(self):
+        await asyncio.sleep(self.batch_max_wait)
+        self._flush_timer = None
+        while self._pending:
+            self._flush_batch()
+
+    async def _send_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        """Resolve every future in the batch with its own result or error"""
+        try:
+            results = await self._enrich_batch_via_service([payload for payload, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue  # caller went away (e.g. spider shutdown)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _enrich_batch_via_service(self, payloads: List[Dict]) -> List:
+        """
+        Call metadata-enrichment service for a micro-batch.
+
+        POST /enrich/batch/sync
+        [{"track_id": "uuid", "artist_name": "...", "track_title": "..."}, ...]
+
+        Returns:
+        {"batch_size": 2, "correlation_id": "...", "results": [<EnrichmentResult>, ...]}
+
+        Results come back in request order, one per track. Failed tracks are
+        returned with status=failed rather than failing the request.
+        """
+        if self.metrics:
+            self.metrics['enrichment_batch_size'].observe(len(payloads))
+
+        start_time = time.time()
+        try:
+            response = await self.http_client.post(
+                f"{self.enrichment_service_url}/enrich/batch/sync",
+                json=payloads,
+                timeout=self.timeout
+            )
+        except httpx.TimeoutException:
+            duration = time.time() - start_time
+            logger.warning(f"Enrichment batch of {len(payloads)} timed out after {duration:.1f}s")
+            if self.metrics:
+                self.metrics['enrichment_duration_seconds'].observe(duration)
+            return [None] * len(payloads)
+
+        duration = time.time() - start_time
+        self.stats['batches_sent'] += 1
+        if self.metrics:
+            self.metrics['enrichment_duration_seconds'].observe(duration)
+
+        if response.status_code == 200:
+            results = response.json().get('results', [])
+            if len(results) != len(payloads):
+                logger.warning(
+                    f"Enrichment batch returned {len(results)} results for {len(payloads)} tracks"
+                )
+            return (results + [None] * len(payloads))[:len(payloads)]
+        elif response.status_code in (404, 405):
+            logger.warning(
+                "Enrichment service has no batch endpoint; falling back to one request per track"
+            )
+            self.batch_endpoint_available = False
+            return await asyncio.gather(
+                *(self._enrich_via_service(**payload) for payload in payloads),
+                return_exceptions=True
+            )
+        elif response.status_code == 503:
+            logger.warning(f"Enrichment service temporarily unavailable (503)")
+            return [None] * len(payloads)
+        else:
+            logger.warning(
+                f"Enrichment batch returned {response.status_code}: {response.text[:200]}"
+            )
+            return [None] * len(payloads)
+
     async def _enrich_via_service(self, **kwargs) -> Optional[Dict]:
         """
         Call metadata-enrichment service.
@@ -289,8 +446,6 @@ class APIEnrichmentPipeline:
             "timestamp": "2025-10-10T..."
         }
         """
-        import time
-
         # Clean kwargs - remove None values
         payload = {k: v for k, v in kwargs.items() if v is not None}
 
@@ -390,7 +545,15 @@ class APIEnrichmentPipeline:
         return None
 
     async def close_spider(self, spider):
-        """Close HTTP client and log stats"""
+        """Flush buffered tracks, close HTTP client and log stats"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        while self._pending:
+            self._flush_batch()
+        if self._inflight_batches:
+            await asyncio.gather(*self._inflight_batches, return_exceptions=True)
+
         await self.http_client.aclose()
 
         # Calculate success rate
@@ -408,6 +571,7 @@ class APIEnrichmentPipeline:
             f"Service unavailable:        {self.stats['service_unavailable']}\n"
             f"Skipped (no artist/title):  {self.stats['skipped']}\n"
             f"Fallback used:              {self.stats['fallback_used']}\n"
+            f"Batch requests sent:        {self.stats['batches_sent']}\n"
             f"Success rate:               {success_rate:.1f}%\n"
             f"{'='*60}\n"
             f"Enrichment Service: {self.enrichment_service_url}\n"
@@ -71,6 +71,11 @@ DEFAULT_REQUEST_HEADERS = {
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
     # Playwright download handler (newer scrapy-playwright versions use DOWNLOAD_HANDLERS instead)
+    # Conditional-request cache: drops pages unchanged since the last crawl
+    'scrapy.downloadermiddlewares.httpcache.HttpCacheMiddleware': None,
+    'middlewares.http_cache.ConditionalHttpCacheMiddleware': 900,
+    # Worker-wide cap on open Playwright pages for context-pooled requests
+    'middlewares.playwright_page_cap.PlaywrightPageCapMiddleware': 950,
 }
 
 # Download handlers for scrapy-playwright
@@ -108,17 +113,22 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0  # Target 1 concurrent request per domain
 # Enable debugging to monitor throttling
 AUTOTHROTTLE_DEBUG = True
 
-# Enable and configure HTTP caching (disabled by default)
-# See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-# HTTPCACHE_ENABLED = True
-# HTTPCACHE_EXPIRATION_SECS = 0
-# HTTPCACHE_DIR = 'httpcache'
-# HTTPCACHE_IGNORE_HTTP_CODES =
-# HTTPCACHE_STORAGE = 'scrapy.extensions.httpcache.FilesystemCacheStorage'
+import os
+
+# HTTP caching with conditional requests (ETag / Last-Modified revalidation)
+# See middlewares/http_cache.py and
+# https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
+HTTPCACHE_ENABLED = os.getenv('SCRAPER_HTTPCACHE_ENABLED', 'True').lower() == 'true'
+HTTPCACHE_DIR = os.getenv('SCRAPER_HTTPCACHE_DIR', 'httpcache')
+HTTPCACHE_EXPIRATION_SECS = 0  # Entries never expire; LRU eviction bounds the size
+HTTPCACHE_POLICY = 'middlewares.http_cache.ConditionalCachePolicy'
+HTTPCACHE_STORAGE = 'middlewares.http_cache.CompressedLRUCacheStorage'
+HTTPCACHE_MAX_BYTES = int(os.getenv('SCRAPER_HTTPCACHE_MAX_MB', '512')) * 1024 * 1024
+HTTPCACHE_FRESH_SECS = 0  # Always revalidate on recrawl
+HTTPCACHE_SKIP_UNCHANGED = False  # Leaf pages opt in with meta['httpcache_skip_unchanged']
 
 # Playwright settings for JavaScript rendering
 # Set TRACKLISTS_1001_HEADLESS=False in docker-compose.yml for manual CAPTCHA solving
-import os
 PLAYWRIGHT_BROWSER_TYPE = 'chromium'
 PLAYWRIGHT_LAUNCH_OPTIONS = {
     'headless': os.getenv('TRACKLISTS_1001_HEADLESS', 'True').lower() == 'true',
@@ -132,6 +142,15 @@ PLAYWRIGHT_LAUNCH_OPTIONS = {
     ]
 }
 
+# Abort images, stylesheets, fonts, media and trackers for every Playwright page
+# (override types with PLAYWRIGHT_BLOCKED_RESOURCE_TYPES)
+PLAYWRIGHT_ABORT_REQUEST = 'utils.playwright_helpers.abort_blocked_resource'
+# Cap on concurrent browser contexts and on rendered pages per scraper worker.
+# The worker-wide page cap is enforced by the context pool
+# (PlaywrightPageCapMiddleware), so one busy domain may use all of it.
+PLAYWRIGHT_MAX_CONTEXTS = int(os.getenv('PLAYWRIGHT_MAX_CONTEXTS', '4'))
+PLAYWRIGHT_MAX_PAGES_PER_CONTEXT = max(1, int(os.getenv('PLAYWRIGHT_MAX_PAGES_PER_WORKER', '8')))
+
 # Logging settings [1, 2]
 LOG_LEVEL = 'INFO' # DEBUG for more verbose output
 
@@ -8,7 +8,6 @@ import logging
 import json
 import re
 import os
-import hashlib
 import random
 import psutil
 from typing import Dict
@@ -40,6 +39,9 @@ try:
     from .utils import parse_track_string
     from ..track_id_generator import generate_track_id, generate_track_id_from_parsed
     from ..utils.memory_monitor import MemoryMonitor
+    from ..utils.playwright_context_pool import PlaywrightContextPool
+    from ..middlewares.http_cache import UnchangedResponse
+    from ..utils.source_dedupe import ProcessedSourceStore
 except ImportError:
     # Fallback for standalone execution
     import sys
@@ -64,6 +66,9 @@ except ImportError:
     from spiders.utils import parse_track_string
     from track_id_generator import generate_track_id, generate_track_id_from_parsed
     from utils.memory_monitor import MemoryMonitor
+    from utils.playwright_context_pool import PlaywrightContextPool
+    from middlewares.http_cache import UnchangedResponse
+    from utils.source_dedupe import ProcessedSourceStore
 
 
 class OneThousandOneTracklistsSpider(scrapy.Spider):
@@ -163,12 +168,16 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
 
         # Initialize memory monitor for Playwright page leak detection
         self.memory_monitor = MemoryMonitor(spider_name=self.name, logger=self.logger)
+        self.context_pool = PlaywrightContextPool(self.name, memory_monitor=self.memory_monitor, logger=self.logger)
 
         # Load target tracks
         self.load_target_tracks()
 
         # Initialize Redis-backed state for cross-run dedupe
         self.initialize_state_store()
+        self.source_store = ProcessedSourceStore(
+            self.redis_client, self.redis_prefix, self.source_ttl_seconds, logger=self.logger
+        )
         self.apply_robots_policy()
 
         # Support for custom start URLs (from orchestrator)
@@ -461,14 +470,16 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
         page = failure.request.meta.get("playwright_page")
         if page:
             try:
-                # Close page asynchronously - Scrapy will handle the coroutine
-                import asyncio
-                asyncio.create_task(page.close())
+                # Close page (or its recycled context) asynchronously
+                self.context_pool.release(page, failure.request.meta)
                 self.memory_monitor.page_closed()
                 self.logger.debug(f"Closed page on error: {failure.request.url}")
             except Exception as e:
                 self.logger.error(f"Error closing page in errback: {e}")
                 self.memory_monitor.page_errored()
+        else:
+            # Return the context pool lease taken when the request was built
+            self.context_pool.release(None, failure.request.meta)
 
         # Call original error handler
         return self.handle_error(failure)
@@ -683,15 +694,14 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
                         headers=headers,
                         callback=callback,
                         errback=self.errback_close_page,
-                        meta={
-                            'download_timeout': 30,
-                            'download_delay': delay,
-                            'playwright': True,
-                            'playwright_page_methods': [
-                                PageMethod('route', '**/*', self.abort_non_essential_requests),
+                        meta=self.context_pool.request_meta(
+                            url,
+                            page_methods=[
                                 PageMethod('wait_for_selector', 'div.tlLink, a[href*="/tracklist/"], div.search-results, body', timeout=10000)
-                            ]
-                        }
+                            ],
+                            download_timeout=30,
+                            download_delay=delay,
+                        )
                     )
                 else:
                     # Search URLs require form submission (1001tracklists changed to POST-only)
@@ -699,26 +709,24 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
                     search_query = self._extract_search_query_from_url(url)
                     callback = self.parse_search_results
 
-                    from scrapy_playwright.page import PageMethod
+                    homepage = 'https://www.1001tracklists.com/'
+                    meta = self.context_pool.request_meta(
+                        homepage,
+                        download_timeout=30,
+                        download_delay=delay,
+                        playwright_page_coroutines=[
+                            self._submit_search_form(search_query)
+                        ],
+                        search_query=search_query,  # Pass search query to callback
+                        original_url=url  # For logging purposes
+                    )
 
                     yield Request(
-                        url='https://www.1001tracklists.com/',  # Navigate to homepage
+                        url=homepage,  # Navigate to homepage
                         headers=headers,
                         callback=callback,
                         errback=self.errback_close_page,
-                        meta={
-                            'download_timeout': 30,
-                            'download_delay': delay,
-                            'playwright': True,
-                            'playwright_page_methods': [
-                                PageMethod('route', '**/*', self.abort_non_essential_requests),
-                            ],
-                            'playwright_page_coroutines': [
-                                self._submit_search_form(search_query)
-                            ],
-                            'search_query': search_query,  # Pass search query to callback
-                            'original_url': url  # For logging purposes
-                        }
+                        meta=meta
                     )
 
     def after_login(self, response):
@@ -780,8 +788,7 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
             # Ensure Playwright page is always closed
             if page:
                 try:
-                    import asyncio
-                    asyncio.create_task(page.close())
+                    self.context_pool.release(page, response.meta)
                     self.memory_monitor.page_closed()
                     self.logger.debug(f"Closed Playwright page: {response.url}")
                 except Exception as e:
@@ -847,23 +854,22 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
             return
 
         # Process up to 20 tracklists per search to manage load
-        seen_links = set()
+        candidates = []
         for link in tracklist_links[:20]:
             full_url = response.urljoin(link)
-            if full_url in seen_links or full_url in self.processed_setlists:
-                continue
+            if full_url not in candidates and full_url not in self.processed_setlists:
+                candidates.append(full_url)
 
-            if self.is_source_processed(full_url):
-                continue
-
-            seen_links.add(full_url)
+        # One batched dedupe check for the whole page
+        for full_url in self.filter_unprocessed_sources(candidates):
             self.processed_setlists.add(full_url)
 
             yield Request(
                 url=full_url,
                 callback=self.parse_tracklist,
                 errback=self.handle_error,
-                meta={'search_query': response.meta.get('search_query')}
+                # Tracklist pages are leaves: skip them when unchanged since last processed
+                meta={'search_query': response.meta.get('search_query'), 'httpcache_skip_unchanged': True}
             )
 
     def parse_tracklist(self, response):
@@ -881,8 +887,7 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
             # Ensure Playwright page is always closed
             if page:
                 try:
-                    import asyncio
-                    asyncio.create_task(page.close())
+                    self.context_pool.release(page, response.meta)
                     self.memory_monitor.page_closed()
                     self.logger.debug(f"Closed Playwright page: {response.url}")
                 except Exception as e:
@@ -1009,32 +1014,23 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
             self.mark_source_processed(response.url)
 
     def is_source_processed(self, url: str) -> bool:
-        """Check Redis (if available) to see if a tracklist was already scraped."""
+        """Check the dedupe store to see if a tracklist was already scraped."""
         if url in self.processed_setlists:
             return True
-        if not self.redis_client:
-            return False
-        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
-        key = f"{self.redis_prefix}:{digest}"
-        try:
-            return bool(self.redis_client.exists(key))
-        except Exception as exc:
-            self.logger.debug("Redis exists check failed: %s", exc)
-            return False
+        return self.source_store.is_processed(url)
+
+    def filter_unprocessed_sources(self, urls):
+        """Batch variant of is_source_processed for a page of discovered links."""
+        return self.source_store.filter_unprocessed(
+            [url for url in urls if url not in self.processed_setlists]
+        )
 
     def mark_source_processed(self, url: str) -> None:
         """Persistently mark a tracklist as processed."""
         if not url:
             return
         self.processed_setlists.add(url)
-        if not self.redis_client:
-            return
-        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
-        key = f"{self.redis_prefix}:{digest}"
-        try:
-            self.redis_client.setex(key, self.source_ttl_seconds, datetime.utcnow().isoformat())
-        except Exception as exc:
-            self.logger.debug("Redis setex failed: %s", exc)
+        self.source_store.mark_processed(url)
 
     def closed(self, reason):
         self.record_run_timestamp()
@@ -1647,6 +1643,11 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
         """Enhanced error handling with retry logic"""
         from twisted.python.failure import Failure
 
+        # Page unchanged since the last crawl (HTTP cache revalidation) - nothing to retry
+        if failure.check(UnchangedResponse):
+            self.logger.debug(f"Skipping unchanged page: {failure.request.url}")
+            return
+
         # Check if it's a response error (e.g., 404)
         if hasattr(failure, 'value') and hasattr(failure.value, 'response'):
             response = failure.value.response
@@ -1693,6 +1694,8 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
         self.logger.info(f"Target tracks loaded: {len(self.target_tracks)}")
         self.logger.info(f"Target tracks found: {len(self.found_target_tracks)}")
         self.logger.info(f"Setlists processed: {len(self.processed_setlists)}")
+        self.logger.info(f"Source dedupe: {self.source_store.get_stats()}")
+        self.source_store.close()
 
         if self.found_target_tracks:
             self.logger.info(f"\n✓ FOUND TARGET TRACKS:")
@@ -1706,6 +1709,7 @@ class OneThousandOneTracklistsSpider(scrapy.Spider):
 
         # Log final memory statistics
         self.memory_monitor.log_final_stats()
+        self.logger.info(f"Playwright context pool: {self.context_pool.get_stats()}")
 
         # Record run timestamp
         self.record_run_timestamp()
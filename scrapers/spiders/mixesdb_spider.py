@@ -7,7 +7,6 @@ import re
 import json
 import logging
 import os
-import hashlib
 from typing import Dict
 from datetime import datetime
 from urllib.parse import quote
@@ -28,6 +27,8 @@ try:
     )
     from .utils import parse_track_string
     from ..track_id_generator import generate_track_id, generate_track_id_from_parsed
+    from ..utils.source_dedupe import ProcessedSourceStore
+    from ..middlewares.http_cache import UnchangedResponse
 except ImportError:
     # Fallback for standalone execution
     import sys
@@ -44,6 +45,8 @@ except ImportError:
     )
     from spiders.utils import parse_track_string
     from track_id_generator import generate_track_id, generate_track_id_from_parsed
+    from utils.source_dedupe import ProcessedSourceStore
+    from middlewares.http_cache import UnchangedResponse
 
 
 class MixesdbSpider(scrapy.Spider):
@@ -95,6 +98,9 @@ class MixesdbSpider(scrapy.Spider):
         )
 
         self.initialize_state_store()
+        self.source_store = ProcessedSourceStore(
+            self.redis_client, self.redis_prefix, self.source_ttl_seconds, logger=self.logger
+        )
         self.apply_robots_policy()
 
         # Support for custom start URLs (from orchestrator)
@@ -362,27 +368,33 @@ class MixesdbSpider(scrapy.Spider):
         # With 15s delay, 5 results = ~75s + processing time
         max_results = int(os.getenv('MIXESDB_MAX_RESULTS_PER_SEARCH', '5'))
 
-        requests_yielded = 0
+        mix_urls = []
         for link in mix_links[:max_results]:
             full_url = response.urljoin(link)
             self.logger.info(f"🔍 Processing link: {full_url}")
             if self.is_mix_url(full_url):
                 self.logger.info(f"✅ is_mix_url passed: {full_url}")
-                if self.is_source_processed(full_url):
-                    self.logger.info(f"⏭️  Skipping already processed URL: {full_url}")
-                    continue
-                self.logger.info(f"🚀 Yielding Request for: {full_url}")
-                requests_yielded += 1
-                yield scrapy.Request(
-                    url=full_url,
-                    callback=self.parse_mix_page,
-                    errback=self.handle_error,
-                    dont_filter=True,  # CRITICAL FIX: Allow URL following even if previously seen
-                    meta={'download_timeout': 30}
-                )
+                mix_urls.append(full_url)
             else:
                 self.logger.info(f"❌ is_mix_url failed: {full_url}")
 
+        unprocessed = set(self.filter_unprocessed_sources(mix_urls))
+        requests_yielded = 0
+        for full_url in mix_urls:
+            if full_url not in unprocessed:
+                self.logger.info(f"⏭️  Skipping already processed URL: {full_url}")
+                continue
+            self.logger.info(f"🚀 Yielding Request for: {full_url}")
+            requests_yielded += 1
+            yield scrapy.Request(
+                url=full_url,
+                callback=self.parse_mix_page,
+                errback=self.handle_error,
+                dont_filter=True,  # CRITICAL FIX: Allow URL following even if previously seen
+                # Mix pages are leaves: skip them when unchanged since last processed
+                meta={'download_timeout': 30, 'httpcache_skip_unchanged': True}
+            )
+
         self.logger.info(f"🔍 parse_search_results COMPLETE: Yielded {requests_yielded} requests")
 
     def parse_category_page(self, response):
@@ -413,18 +425,15 @@ class MixesdbSpider(scrapy.Spider):
         # Limit to 5 results per category page to prevent timeouts
         max_results = int(os.getenv('MIXESDB_MAX_RESULTS_PER_CATEGORY', '5'))
 
-        for link in mix_links[:max_results]:
-            full_url = response.urljoin(link)
-            if self.is_mix_url(full_url):
-                if self.is_source_processed(full_url):
-                    self.logger.debug(f"Skipping already processed URL: {full_url}")
-                    continue
-                yield scrapy.Request(
-                    url=full_url,
-                    callback=self.parse_mix_page,
-                    errback=self.handle_error,
-                    meta={'download_timeout': 30}
-                )
+        mix_urls = [response.urljoin(link) for link in mix_links[:max_results]]
+        mix_urls = [url for url in mix_urls if self.is_mix_url(url)]
+        for full_url in self.filter_unprocessed_sources(mix_urls):
+            yield scrapy.Request(
+                url=full_url,
+                callback=self.parse_mix_page,
+                errback=self.handle_error,
+                meta={'download_timeout': 30, 'httpcache_skip_unchanged': True}
+            )
 
     def parse_recent_changes(self, response):
         """Parse recent changes for new mix links"""
@@ -433,18 +442,15 @@ class MixesdbSpider(scrapy.Spider):
         # Limit to 5 results from recent changes
         max_results = int(os.getenv('MIXESDB_MAX_RESULTS_PER_RECENT', '5'))
 
-        for link in recent_links[:max_results]:
-            full_url = response.urljoin(link)
-            if self.is_mix_url(full_url):
-                if self.is_source_processed(full_url):
-                    self.logger.debug(f"Skipping already processed URL: {full_url}")
-                    continue
-                yield scrapy.Request(
-                    url=full_url,
-                    callback=self.parse_mix_page,
-                    errback=self.handle_error,
-                    meta={'download_timeout': 30}
-                )
+        mix_urls = [response.urljoin(link) for link in recent_links[:max_results]]
+        mix_urls = [url for url in mix_urls if self.is_mix_url(url)]
+        for full_url in self.filter_unprocessed_sources(mix_urls):
+            yield scrapy.Request(
+                url=full_url,
+                callback=self.parse_mix_page,
+                errback=self.handle_error,
+                meta={'download_timeout': 30, 'httpcache_skip_unchanged': True}
+            )
 
     def is_mix_page(self, response):
         """Check if current page is a mix page"""
@@ -560,28 +566,19 @@ class MixesdbSpider(scrapy.Spider):
             return False
         if url in self.processed_mix_urls:
             return True
-        if not self.redis_client:
-            return False
-        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
-        key = f"{self.redis_prefix}:{digest}"
-        try:
-            return bool(self.redis_client.exists(key))
-        except Exception as exc:
-            self.logger.debug("Redis exists check failed for MixesDB: %s", exc)
-            return False
+        return self.source_store.is_processed(url)
+
+    def filter_unprocessed_sources(self, urls):
+        """Batch dedupe check for a page of discovered mix links"""
+        return self.source_store.filter_unprocessed(
+            [url for url in urls if url not in self.processed_mix_urls]
+        )
 
     def mark_source_processed(self, url: str) -> None:
         if not url:
             return
         self.processed_mix_urls.add(url)
-        if not self.redis_client:
-            return
-        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
-        key = f"{self.redis_prefix}:{digest}"
-        try:
-            self.redis_client.setex(key, self.source_ttl_seconds, datetime.utcnow().isoformat())
-        except Exception as exc:
-            self.logger.debug("Redis setex failed for MixesDB: %s", exc)
+        self.source_store.mark_processed(url)
 
     def closed(self, reason):
         self.record_run_timestamp()
@@ -1135,8 +1132,13 @@ class MixesdbSpider(scrapy.Spider):
 
     def handle_error(self, failure):
         """Handle request failures"""
+        if failure.check(UnchangedResponse):
+            self.logger.debug(f"Skipping unchanged page: {failure.request.url}")
+            return
         self.logger.error(f"Request failed: {failure.request.url} - {failure.value}")
 
     def closed(self, reason):
         """Log spider completion statistics"""
         self.logger.info(f"Enhanced MixesDB spider closed: {reason}")
+        self.logger.info(f"Source dedupe: {self.source_store.get_stats()}")
+        self.source_store.close()
@@ -19,6 +19,7 @@ try:
     from ..items import SetlistItem, TrackItem, TrackArtistItem, SetlistTrackItem, EnhancedTrackAdjacencyItem, PlaylistItem
     from ..nlp_spider_mixin import NLPFallbackSpiderMixin
     from ..track_id_generator import generate_track_id
+    from ..utils.source_dedupe import ProcessedSourceStore
 except ImportError:
     # Fallback for standalone execution
     import sys
@@ -27,6 +28,7 @@ except ImportError:
     from items import SetlistItem, TrackItem, TrackArtistItem, SetlistTrackItem, EnhancedTrackAdjacencyItem, PlaylistItem
     from nlp_spider_mixin import NLPFallbackSpiderMixin
     from track_id_generator import generate_track_id
+    from utils.source_dedupe import ProcessedSourceStore
 
 class SetlistFmSpider(NLPFallbackSpiderMixin, scrapy.Spider):
     name = 'setlistfm'
@@ -70,6 +72,10 @@ class SetlistFmSpider(NLPFallbackSpiderMixin, scrapy.Spider):
             else os.getenv('SCRAPER_FORCE_RUN', '0').lower() in ('1', 'true', 'yes')
         )
         self.initialize_state_store()
+        # Setlist IDs are already short and unique, so keys use them verbatim
+        self.source_store = ProcessedSourceStore(
+            self.redis_client, self.redis_prefix, self.source_ttl_seconds, hash_keys=False, logger=self.logger
+        )
 
         # If a direct URL is provided (HTML page), use it directly
         if start_url and ('.html' in start_url or 'setlist/' in start_url):
@@ -337,10 +343,13 @@ class SetlistFmSpider(NLPFallbackSpiderMixin, scrapy.Spider):
                 # This is a hard limit, not a retry situation
                 raise CloseSpider('api_rate_limit_exceeded')
 
-            # Process each setlist
-            for setlist in data.get('setlist', []):
+            # Process each setlist, deduping the whole page in one batch
+            setlists = data.get('setlist', [])
+            unprocessed = set(self.source_store.filter_unprocessed([s.get('id') for s in setlists]))
+            for setlist in setlists:
                 setlist_id = setlist.get('id')
-                if self.is_source_processed(setlist_id):
+                # Setlists without an id cannot be deduped and are always processed
+                if setlist_id and setlist_id not in unprocessed:
                     continue
 
                 # Create venue item
@@ -485,23 +494,12 @@ class SetlistFmSpider(NLPFallbackSpiderMixin, scrapy.Spider):
     def is_source_processed(self, identifier: str) -> bool:
         if not identifier:
             return False
-        if not self.redis_client:
-            return False
-        key = f"{self.redis_prefix}:{identifier}"
-        try:
-            return bool(self.redis_client.exists(key))
-        except Exception as exc:
-            self.logger.debug("Redis exists check failed for Setlist.fm: %s", exc)
-            return False
+        return self.source_store.is_processed(identifier)
 
     def mark_source_processed(self, identifier: str) -> None:
-        if not identifier or not self.redis_client:
+        if not identifier:
             return
-        key = f"{self.redis_prefix}:{identifier}"
-        try:
-            self.redis_client.setex(key, self.source_ttl_seconds, datetime.utcnow().isoformat())
-        except Exception as exc:
-            self.logger.debug("Redis setex failed for Setlist.fm: %s", exc)
+        self.source_store.mark_processed(identifier)
 
     def generate_track_adjacencies(self, tracks_data, setlist_data):
         """
@@ -708,6 +706,7 @@ class SetlistFmSpider(NLPFallbackSpiderMixin, scrapy.Spider):
 
     def closed(self, reason):
         self.record_run_timestamp()
+        self.source_store.close()
 
     def record_run_timestamp(self):
         if not self.redis_client or not self.last_run_key:
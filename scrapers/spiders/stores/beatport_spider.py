@@ -35,7 +35,6 @@ import json
 import re
 import logging
 import os
-import hashlib
 import psutil
 from typing import Dict, Optional, List
 from datetime import datetime
@@ -55,6 +54,8 @@ try:
     from ...item_loaders import TrackLoader, ArtistLoader
     from ...track_id_generator import generate_track_id
     from ...utils.memory_monitor import MemoryMonitor
+    from ...utils.playwright_context_pool import PlaywrightContextPool
+    from ...utils.source_dedupe import ProcessedSourceStore
 except ImportError:
     # Fallback for standalone execution
     import sys
@@ -67,6 +68,8 @@ except ImportError:
     from item_loaders import TrackLoader, ArtistLoader
     from track_id_generator import generate_track_id
     from utils.memory_monitor import MemoryMonitor
+    from utils.playwright_context_pool import PlaywrightContextPool
+    from utils.source_dedupe import ProcessedSourceStore
 
 
 class BeatportSpider(scrapy.Spider):
@@ -166,12 +169,16 @@ class BeatportSpider(scrapy.Spider):
 
         # Initialize memory monitor for Playwright page leak detection
         self.memory_monitor = MemoryMonitor(spider_name=self.name, logger=self.logger)
+        self.context_pool = PlaywrightContextPool(self.name, memory_monitor=self.memory_monitor, logger=self.logger)
 
         # Load target tracks
         self.load_target_tracks()
 
         # Initialize Redis-backed state for cross-run dedupe
         self.initialize_state_store()
+        self.source_store = ProcessedSourceStore(
+            self.redis_client, self.redis_prefix, self.source_ttl_seconds, logger=self.logger
+        )
         self.apply_robots_policy()
 
         # Support for custom start URLs (from orchestrator)
@@ -337,14 +344,16 @@ class BeatportSpider(scrapy.Spider):
         page = failure.request.meta.get("playwright_page")
         if page:
             try:
-                # Close page asynchronously - Scrapy will handle the coroutine
-                import asyncio
-                asyncio.create_task(page.close())
+                # Close page (or its recycled context) asynchronously
+                self.context_pool.release(page, failure.request.meta)
                 self.memory_monitor.page_closed()
                 self.logger.debug(f"Closed page on error: {failure.request.url}")
             except Exception as e:
                 self.logger.error(f"Error closing page in errback: {e}")
                 self.memory_monitor.page_errored()
+        else:
+            # Return the context pool lease taken when the request was built
+            self.context_pool.release(None, failure.request.meta)
 
         # Call original error handler
         return self.handle_error(failure)
@@ -378,15 +387,14 @@ class BeatportSpider(scrapy.Spider):
                 headers=headers,
                 callback=callback,
                 errback=self.errback_close_page,
-                meta={
-                    'playwright': True,
-                    'playwright_page_methods': [
-                        PageMethod('route', '**/*', self.abort_non_essential_requests),
+                meta=self.context_pool.request_meta(
+                    url,
+                    page_methods=[
                         PageMethod('wait_for_load_state', 'networkidle', timeout=15000),
                     ],
-                    'download_timeout': 30,
-                    'download_delay': delay,
-                }
+                    download_timeout=30,
+                    download_delay=delay,
+                )
             )
 
     def parse_search_results(self, response):
@@ -404,8 +412,7 @@ class BeatportSpider(scrapy.Spider):
             # Ensure Playwright page is always closed
             if page:
                 try:
-                    import asyncio
-                    asyncio.create_task(page.close())
+                    self.context_pool.release(page, response.meta)
                     self.memory_monitor.page_closed()
                     self.logger.debug(f"Closed Playwright page: {response.url}")
                 except Exception as e:
@@ -445,13 +452,9 @@ class BeatportSpider(scrapy.Spider):
             self.logger.warning(f"No track links found in search results: {response.url}")
             return
 
-        # Process up to 20 tracks per search page
-        for link in track_links[:20]:
-            full_url = response.urljoin(link)
-
-            if full_url in self.processed_urls or self.is_source_processed(full_url):
-                continue
-
+        # Process up to 20 tracks per search page, deduped in one batch
+        candidates = list(dict.fromkeys(response.urljoin(link) for link in track_links[:20]))
+        for full_url in self.filter_unprocessed_sources(candidates):
             self.processed_urls.add(full_url)
 
             from scrapy_playwright.page import PageMethod
@@ -460,13 +463,12 @@ class BeatportSpider(scrapy.Spider):
                 url=full_url,
                 callback=self.parse_track,
                 errback=self.errback_close_page,
-                meta={
-                    'playwright': True,
-                    'playwright_page_methods': [
-                        PageMethod('route', '**/*', self.abort_non_essential_requests),
+                meta=self.context_pool.request_meta(
+                    full_url,
+                    page_methods=[
                         PageMethod('wait_for_load_state', 'networkidle', timeout=15000),
                     ],
-                }
+                )
             )
 
     def parse_track(self, response):
@@ -495,8 +497,7 @@ class BeatportSpider(scrapy.Spider):
             # Ensure Playwright page is always closed
             if page:
                 try:
-                    import asyncio
-                    asyncio.create_task(page.close())
+                    self.context_pool.release(page, response.meta)
                     self.memory_monitor.page_closed()
                     self.logger.debug(f"Closed Playwright page: {response.url}")
                 except Exception as e:
@@ -876,32 +877,23 @@ class BeatportSpider(scrapy.Spider):
         return None
 
     def is_source_processed(self, url: str) -> bool:
-        """Check Redis to see if a track URL was already scraped."""
+        """Check the dedupe store to see if a track URL was already scraped."""
         if url in self.processed_urls:
             return True
-        if not self.redis_client:
-            return False
-        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
-        key = f"{self.redis_prefix}:{digest}"
-        try:
-            return bool(self.redis_client.exists(key))
-        except Exception as exc:
-            self.logger.debug("Redis exists check failed: %s", exc)
-            return False
+        return self.source_store.is_processed(url)
+
+    def filter_unprocessed_sources(self, urls: List[str]) -> List[str]:
+        """Batch variant of is_source_processed for a page of discovered links."""
+        return self.source_store.filter_unprocessed(
+            [url for url in urls if url not in self.processed_urls]
+        )
 
     def mark_source_processed(self, url: str) -> None:
         """Persistently mark a track URL as processed."""
         if not url:
             return
         self.processed_urls.add(url)
-        if not self.redis_client:
-            return
-        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
-        key = f"{self.redis_prefix}:{digest}"
-        try:
-            self.redis_client.setex(key, self.source_ttl_seconds, datetime.utcnow().isoformat())
-        except Exception as exc:
-            self.logger.debug("Redis setex failed: %s", exc)
+        self.source_store.mark_processed(url)
 
     def handle_error(self, failure):
         """Enhanced error handling with retry logic."""
@@ -929,6 +921,8 @@ class BeatportSpider(scrapy.Spider):
         self.logger.info(f"Target tracks loaded: {len(self.target_tracks)}")
         self.logger.info(f"Target tracks found: {len(self.found_target_tracks)}")
         self.logger.info(f"URLs processed: {len(self.processed_urls)}")
+        self.logger.info(f"Source dedupe: {self.source_store.get_stats()}")
+        self.source_store.close()
 
         if self.found_target_tracks:
             self.logger.info(f"\n✓ FOUND TARGET TRACKS:")
@@ -942,6 +936,7 @@ class BeatportSpider(scrapy.Spider):
 
         # Log final memory statistics
         self.memory_monitor.log_final_stats()
+        self.logger.info(f"Playwright context pool: {self.context_pool.get_stats()}")
 
         # Record run timestamp
         if self.redis_client and self.last_run_key:
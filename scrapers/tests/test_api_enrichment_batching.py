@@ -0,0 +1,148 @@
+"""
+Unit tests for APIEnrichmentPipeline micro-batching
+
+The enrichment service is replaced by an httpx.MockTransport, so batches,
+per-track results and the per-track fallback are checked without a network.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from scrapers.pipelines.api_enrichment_pipeline import APIEnrichmentPipeline
+
+SERVICE_URL = 'http://enrichment.test'
+
+
+class FakeEnrichmentService:
+    """Records requests and answers them with a per-path handler"""
+
+    def __init__(self, batch_status=200, fail_titles=()):
+        self.batch_status = batch_status
+        self.fail_titles = set(fail_titles)
+        self.requests = []
+
+    def result(self, task):
+        if task['track_title'] in self.fail_titles:
+            return {'track_id': task['track_id'], 'status': 'failed', 'errors': ['not found'],
+                    'metadata_acquired': {}}
+        return {'track_id': task['track_id'], 'status': 'completed', 'sources_used': ['spotify'],
+                'metadata_acquired': {'spotify_id': f"sp-{task['track_id']}"}}
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        self.requests.append((request.url.path, body))
+        if request.url.path == '/enrich/batch/sync':
+            if self.batch_status != 200:
+                return httpx.Response(self.batch_status)
+            return httpx.Response(200, json={'results': [self.result(task) for task in body]})
+        return httpx.Response(200, json=self.result(body))
+
+    def paths(self):
+        return [path for path, _ in self.requests]
+
+
+def make_pipeline(service, **kwargs):
+    pipeline = APIEnrichmentPipeline(enrichment_service_url=SERVICE_URL, **kwargs)
+    pipeline.metrics = None
+    pipeline.http_client = httpx.AsyncClient(transport=httpx.MockTransport(service))
+    return pipeline
+
+
+def track(n):
+    return {'item_type': 'track', 'track_id': f't{n}', 'artist_name': 'Eric Prydz', 'track_name': f'Track {n}'}
+
+
+async def process_all(pipeline, items):
+    return await asyncio.wait_for(
+        asyncio.gather(*(pipeline.process_item(item, spider=None) for item in items)), timeout=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting():
+    service = FakeEnrichmentService()
+    pipeline = make_pipeline(service, batch_size=3, batch_max_wait=60)
+
+    items = await process_all(pipeline, [track(n) for n in range(3)])
+
+    assert service.paths() == ['/enrich/batch/sync']
+    assert [task['track_id'] for task in service.requests[0][1]] == ['t0', 't1', 't2']
+    assert [item['spotify_id'] for item in items] == ['sp-t0', 'sp-t1', 'sp-t2']
+    await pipeline.close_spider(None)
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_sent_after_max_wait():
+    service = FakeEnrichmentService()
+    pipeline = make_pipeline(service, batch_size=10, batch_max_wait=0.05)
+
+    pending = asyncio.gather(*(pipeline.process_item(track(n), spider=None) for n in range(4)))
+    await asyncio.sleep(0.01)
+    assert service.requests == []
+
+    items = await asyncio.wait_for(pending, timeout=2)
+    assert service.paths() == ['/enrich/batch/sync']
+    assert len(service.requests[0][1]) == 4
+    assert all(item['spotify_id'] for item in items)
+    assert pipeline.stats['batches_sent'] == 1
+    await pipeline.close_spider(None)
+
+
+@pytest.mark.asyncio
+async def test_failed_tracks_only_fail_themselves():
+    service = FakeEnrichmentService(fail_titles={'Track 1'})
+    pipeline = make_pipeline(service, batch_size=3, batch_max_wait=60)
+
+    first, failed, third = await process_all(pipeline, [track(n) for n in range(3)])
+
+    assert (first['spotify_id'], third['spotify_id']) == ('sp-t0', 'sp-t2')
+    assert 'spotify_id' not in failed
+    assert pipeline.stats['enriched'] == 2
+    await pipeline.close_spider(None)
+
+
+@pytest.mark.asyncio
+async def test_batch_wide_connection_error_reaches_every_item():
+    def refuse(request):
+        raise httpx.ConnectError('connection refused', request=request)
+
+    pipeline = make_pipeline(refuse, batch_size=2, batch_max_wait=60)
+
+    items = await process_all(pipeline, [track(0), track(1)])
+
+    assert all('spotify_id' not in item for item in items)
+    assert pipeline.stats['service_unavailable'] == 2
+    await pipeline.close_spider(None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('status', [404, 405])
+async def test_service_without_batch_endpoint_falls_back_to_per_track_calls(status):
+    service = FakeEnrichmentService(batch_status=status)
+    pipeline = make_pipeline(service, batch_size=2, batch_max_wait=60)
+
+    items = await process_all(pipeline, [track(0), track(1)])
+
+    assert service.paths() == ['/enrich/batch/sync', '/enrich', '/enrich']
+    assert [item['spotify_id'] for item in items] == ['sp-t0', 'sp-t1']
+    assert pipeline.batch_endpoint_available is False
+
+    # Later tracks skip the missing endpoint entirely
+    await process_all(pipeline, [track(2), track(3)])
+    assert service.paths()[3:] == ['/enrich', '/enrich']
+    await pipeline.close_spider(None)
+
+
+@pytest.mark.asyncio
+async def test_close_spider_flushes_buffered_tracks():
+    service = FakeEnrichmentService()
+    pipeline = make_pipeline(service, batch_size=10, batch_max_wait=60)
+
+    pending = asyncio.ensure_future(pipeline.process_item(track(0), spider=None))
+    await asyncio.sleep(0)
+    await pipeline.close_spider(None)
+
+    assert (await pending)['spotify_id'] == 'sp-t0'
+    assert service.paths() == ['/enrich/batch/sync']
@@ -0,0 +1,168 @@
+"""
+Unit tests for the conditional-request HTTP cache
+
+Runs the real middleware, policy and SQLite storage against a temporary
+cache directory; responses are built by hand instead of downloaded.
+"""
+import os
+
+import pytest
+from scrapy import Spider
+from scrapy.http import HtmlResponse, Request, Response
+from scrapy.utils.test import get_crawler
+
+from scrapers.middlewares.http_cache import (
+    CompressedLRUCacheStorage,
+    ConditionalCachePolicy,
+    ConditionalHttpCacheMiddleware,
+    UnchangedResponse,
+)
+
+URL = 'https://www.mixesdb.com/w/2024-01-01_-_Artist_@_Club'
+
+
+@pytest.fixture
+def crawler(tmp_path):
+    crawler = get_crawler(Spider, {
+        'HTTPCACHE_ENABLED': True,
+        'HTTPCACHE_DIR': str(tmp_path),
+        'HTTPCACHE_POLICY': 'scrapers.middlewares.http_cache.ConditionalCachePolicy',
+        'HTTPCACHE_STORAGE': 'scrapers.middlewares.http_cache.CompressedLRUCacheStorage',
+        'HTTPCACHE_MAX_BYTES': 1024 * 1024,
+    })
+    crawler.spider = crawler._create_spider('test')
+    return crawler
+
+
+@pytest.fixture
+def middleware(crawler):
+    middleware = ConditionalHttpCacheMiddleware.from_crawler(crawler)
+    middleware.spider_opened(crawler.spider)
+    yield middleware
+    middleware.spider_closed(crawler.spider)
+
+
+def page(body=b'<html>tracklist</html>', status=200, etag=b'"v1"'):
+    headers = {'Content-Type': 'text/html', 'Date': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    if etag:
+        headers['ETag'] = etag
+    return HtmlResponse(URL, status=status, headers=headers, body=body)
+
+
+def fetch(middleware, spider, response, **meta):
+    """Run a request through the middleware as the downloader would"""
+    request = Request(URL, meta=meta)
+    cached = middleware.process_request(request, spider)
+    if cached is not None:
+        return request, cached
+    response = response.replace(request=request) if response.status != 304 else Response(URL, status=304)
+    result = middleware.process_response(request, response, spider)
+    result.request = request
+    return request, result
+
+
+def test_policy_treats_only_304_as_unchanged(crawler):
+    policy = ConditionalCachePolicy(crawler.settings)
+    request = Request(URL)
+    cached = page()
+
+    assert policy.is_cached_response_valid(cached, Response(URL, status=304), request)
+    assert not policy.is_cached_response_valid(cached, Response(URL, status=503), request)
+    assert not policy.is_cached_response_valid(cached, page(body=b'changed'), request)
+
+
+def test_server_error_on_revalidation_reaches_retry_middleware(middleware, crawler):
+    spider = crawler.spider
+    fetch(middleware, spider, page())
+
+    request, result = fetch(middleware, spider, page(status=503, etag=None), httpcache_skip_unchanged=True)
+
+    assert request.headers.get('If-None-Match') == b'"v1"'
+    assert result.status == 503
+    assert 'cached' not in result.flags
+
+
+def test_unchanged_leaf_page_is_skipped_only_once_processed(middleware, crawler):
+    spider = crawler.spider
+    _, first = fetch(middleware, spider, page())
+    assert 'cached' not in first.flags
+
+    # Stored but never processed (e.g. the callback failed): parse it again
+    _, revalidated = fetch(middleware, spider, Response(URL, status=304), httpcache_skip_unchanged=True)
+    assert 'unchanged' in revalidated.flags
+
+    middleware.item_scraped({'track': 'x'}, revalidated, spider)
+    with pytest.raises(UnchangedResponse):
+        fetch(middleware, spider, Response(URL, status=304), httpcache_skip_unchanged=True)
+    assert crawler.stats.get_value('httpcache/unchanged_skipped') == 1
+
+    # Hub, search and pagination pages do not opt in and are always parsed
+    _, hub = fetch(middleware, spider, Response(URL, status=304))
+    assert 'unchanged' in hub.flags
+
+
+@pytest.mark.parametrize('signal', ['spider_error', 'item_error'])
+def test_callback_or_pipeline_error_clears_the_processed_mark(middleware, crawler, signal):
+    spider = crawler.spider
+    _, response = fetch(middleware, spider, page())
+    middleware.item_scraped({'track': 'x'}, response, spider)
+
+    if signal == 'spider_error':
+        middleware.spider_error(None, response, spider)
+    else:
+        middleware.item_error({'track': 'y'}, response, spider, None)
+    # A later item from the same page cannot re-mark it
+    middleware.item_scraped({'track': 'z'}, response, spider)
+
+    _, result = fetch(middleware, spider, Response(URL, status=304), httpcache_skip_unchanged=True)
+    assert result.status == 200 and 'unchanged' in result.flags
+
+
+def test_changed_page_resets_the_processed_mark(middleware, crawler):
+    spider = crawler.spider
+    _, response = fetch(middleware, spider, page())
+    middleware.item_scraped({'track': 'x'}, response, spider)
+
+    _, changed = fetch(middleware, spider, page(body=b'<html>new tracks</html>', etag=b'"v2"'))
+    assert 'cached' not in changed.flags
+
+    _, result = fetch(middleware, spider, Response(URL, status=304), httpcache_skip_unchanged=True)
+    assert result.body == b'<html>new tracks</html>'
+
+
+def test_storage_accounts_compressed_sizes_and_evicts_least_recently_used(crawler):
+    spider = crawler.spider
+    storage = CompressedLRUCacheStorage(crawler.settings)
+    storage.open_spider(spider)
+
+    def store(n, body):
+        request = Request(f'https://example.com/{n}')
+        storage.store_response(spider, request, HtmlResponse(request.url, body=body, headers={'ETag': b'"x"'}))
+        return request
+
+    def row_sizes():
+        return dict(storage.db.execute('SELECT url, size FROM responses').fetchall())
+
+    store(1, b'a' * 50000)
+    assert storage.total_bytes < 1000  # bodies are stored compressed
+
+    body = os.urandom(2000)
+    first = store(1, body)  # replacing an entry does not count it twice
+    second = store(2, os.urandom(2000))
+    assert storage.total_bytes == sum(row_sizes().values())
+
+    restored = storage.retrieve_response(spider, first)
+    assert restored.body == body and restored.headers[b'ETag'] == b'"x"'
+
+    # Touching the first entry makes the second the least recently used
+    storage.max_bytes = storage.total_bytes + 1000
+    store(3, os.urandom(2000))
+    assert storage.retrieve_response(spider, second) is None
+    assert storage.retrieve_response(spider, first) is not None
+    assert storage.total_bytes == sum(row_sizes().values()) <= storage.max_bytes
+    assert crawler.stats.get_value('httpcache/evicted') == 1
+
+    storage.close_spider(spider)
+    storage.open_spider(spider)
+    assert storage.total_bytes == sum(row_sizes().values())
+    storage.close_spider(spider)
@@ -0,0 +1,189 @@
+"""
+Unit tests for PlaywrightContextPool leasing, recycling and page slots
+
+Pages and contexts are small fakes recording close(); no browser is started.
+"""
+import asyncio
+
+import pytest
+
+from scrapers.middlewares.playwright_page_cap import PlaywrightPageCapMiddleware
+from scrapers.utils.playwright_context_pool import PlaywrightContextPool
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeMemoryMonitor:
+    def __init__(self, memory_mb=0.0):
+        self.memory_mb = memory_mb
+
+    def browser_memory_mb(self):
+        return self.memory_mb
+
+
+class FakeSpider:
+    def __init__(self, context_pool):
+        self.context_pool = context_pool
+
+
+def make_pool(**kwargs):
+    kwargs.setdefault('max_pages_per_context', 100)
+    kwargs.setdefault('recycle_memory_mb', 1000)
+    kwargs.setdefault('max_open_pages', 8)
+    return PlaywrightContextPool('test', **kwargs)
+
+
+async def admitted(pool, url):
+    """Build request meta and admit it as PlaywrightPageCapMiddleware would"""
+    meta = pool.request_meta(url)
+    await pool.acquire_page_slot(meta)
+    return meta
+
+
+@pytest.mark.asyncio
+async def test_requests_for_a_domain_lease_the_same_context_once_downloaded():
+    pool = make_pool(context_kwargs={'java_script_enabled': True})
+
+    first = pool.request_meta('https://www.example.com/a', page_methods=['wait'], download_timeout=30)
+    second = pool.request_meta('https://WWW.example.com/b')
+    other = pool.request_meta('https://other.example/c')
+
+    assert first['playwright_context'] == second['playwright_context'] == 'test:www.example.com:0'
+    assert other['playwright_context'] == 'test:other.example:0'
+    assert first['playwright_context_kwargs'] == {'java_script_enabled': True}
+    assert (first['playwright_page_methods'], first['download_timeout']) == (['wait'], 30)
+    # Building meta takes no lease: the request may never be downloaded
+    assert pool.get_stats()['contexts_created'] == 0
+
+    for meta in (first, second, other):
+        await pool.acquire_page_slot(meta)
+    assert pool._contexts['test:www.example.com:0'].leases == 2
+    assert pool.get_stats()['contexts_created'] == 2
+
+
+@pytest.mark.asyncio
+async def test_context_is_retired_after_max_pages_and_closed_when_idle():
+    pool = make_pool(max_pages_per_context=2)
+    browser_context = FakeContext()
+    metas = [await admitted(pool, 'https://example.com/') for _ in range(3)]
+    pages = [FakePage(browser_context) for _ in metas]
+
+    await pool.release(pages[0], metas[0])
+    assert pages[0].closed and not browser_context.closed
+
+    # The second page retires the context; the third is still in flight
+    await pool.release(pages[1], metas[1])
+    assert pool.request_meta('https://example.com/')['playwright_context'] == 'test:example.com:1'
+    assert pages[1].closed and not browser_context.closed
+
+    await pool.release(pages[2], metas[2])
+    assert browser_context.closed
+    assert 'test:example.com:0' not in pool._contexts
+    assert pool.get_stats()['contexts_recycled'] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_request_returns_its_lease_without_a_page():
+    pool = make_pool(max_pages_per_context=1)
+    meta = await admitted(pool, 'https://example.com/')
+
+    await pool.release(None, meta)
+
+    assert pool._contexts['test:example.com:0'].leases == 0
+    assert pool.pages_served == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_dropped_before_download_do_not_keep_a_retired_context_open():
+    pool = make_pool(max_pages_per_context=1)
+    browser_context = FakeContext()
+    rendered = await admitted(pool, 'https://example.com/a')
+    # Built for the same context, then queued (or dropped by the dupefilter)
+    queued = pool.request_meta('https://example.com/b')
+
+    await pool.release(FakePage(browser_context), rendered)
+    assert browser_context.closed
+    assert pool.get_stats()['contexts_open'] == 0
+
+    # Downloaded later, the request moves to the domain's current context
+    await pool.acquire_page_slot(queued)
+    assert queued['playwright_context'] == 'test:example.com:1'
+    assert pool._contexts['test:example.com:1'].leases == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_pressure_retires_only_the_oldest_context_until_rearmed():
+    monitor = FakeMemoryMonitor()
+    pool = make_pool(memory_monitor=monitor, recycle_memory_mb=1000)
+    contexts = {domain: FakeContext() for domain in ('old.example', 'new.example')}
+
+    async def render(domain):
+        meta = await admitted(pool, f'https://{domain}/')
+        await pool.release(FakePage(contexts[domain]), meta)
+
+    await render('old.example')
+    await render('new.example')
+
+    monitor.memory_mb = 1200
+    await render('new.example')
+    assert contexts['old.example'].closed
+    assert not contexts['new.example'].closed
+
+    # Still above the limit while the browser frees memory: nothing else retires
+    await render('new.example')
+    monitor.memory_mb = 900
+    await render('new.example')
+    assert not contexts['new.example'].closed
+    assert pool.get_stats()['contexts_recycled'] == 1
+
+    # Dropping below the re-arm level allows the next recycle
+    monitor.memory_mb = 700
+    await render('new.example')
+    monitor.memory_mb = 1200
+    await render('new.example')
+    assert pool.get_stats()['contexts_recycled'] == 2
+
+
+@pytest.mark.asyncio
+async def test_page_slots_cap_open_pages_across_domains():
+    pool = make_pool(max_open_pages=2)
+    middleware = PlaywrightPageCapMiddleware()
+    spider = FakeSpider(pool)
+    requests = [pool.request_meta(f'https://site{n}.example/') for n in range(3)]
+
+    class FakeRequest:
+        def __init__(self, meta):
+            self.meta = meta
+
+    await middleware.process_request(FakeRequest(requests[0]), spider)
+    await middleware.process_request(FakeRequest(requests[1]), spider)
+    third = asyncio.ensure_future(middleware.process_request(FakeRequest(requests[2]), spider))
+    await asyncio.sleep(0)
+    assert not third.done()
+
+    # A retry of an admitted request reuses its slot instead of waiting
+    await asyncio.wait_for(middleware.process_request(FakeRequest(requests[0]), spider), timeout=1)
+
+    await pool.release(FakePage(FakeContext()), requests[0])
+    await asyncio.wait_for(third, timeout=1)
+
+    # Requests outside the pool are not gated
+    await asyncio.wait_for(
+        middleware.process_request(FakeRequest({'playwright': True, 'playwright_context': 'default'}), spider),
+        timeout=1,
+    )
@@ -0,0 +1,164 @@
+"""
+Unit tests for the two-tier processed-source dedupe store
+
+Covers the in-memory Bloom tier, its Redis bitmap mirror and the EXISTS
+confirmation that catches false positives and expired keys.
+"""
+import fnmatch
+
+import pytest
+
+from scrapers.utils.source_dedupe import BloomFilter, ProcessedSourceStore
+
+PREFIX = 'scraped:setlists:test'
+
+
+class FakePool:
+    def disconnect(self):
+        pass
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the string, bitmap and pipeline commands the store uses"""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.connection_pool = FakePool()
+        self._queued = []
+
+    # Pipeline: the fake is its own pipeline and queues calls until execute()
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        queued, self._queued = self._queued, []
+        self.commands.append([name for name, _ in queued])
+        return [getattr(self, f'_{name}')(*args) for name, args in queued]
+
+    def setex(self, key, ttl, value):
+        self._queued.append(('setex', (key, ttl, value)))
+
+    def setbit(self, key, offset, value):
+        self._queued.append(('setbit', (key, offset, value)))
+
+    def expire(self, key, seconds):
+        self._queued.append(('expire', (key, seconds)))
+
+    def exists(self, key):
+        self._queued.append(('exists', (key,)))
+
+    def _setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def _setbit(self, key, offset, value):
+        bits = bytearray(self.data.get(key, b''))
+        if len(bits) <= offset >> 3:
+            bits.extend(bytes((offset >> 3) + 1 - len(bits)))
+        bits[offset >> 3] |= 0x80 >> (offset & 7)
+        self.data[key] = bytes(bits)
+
+    def _expire(self, key, seconds):
+        return key in self.data
+
+    def _exists(self, key):
+        return int(key in self.data)
+
+    # Direct commands
+    def mget(self, keys):
+        self.commands.append(['mget'])
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def scan_iter(self, match=None, count=None):
+        return iter([key for key in list(self.data) if fnmatch.fnmatch(key, match)])
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    # Bitmaps are read through a second, binary client; the fake serves both
+    monkeypatch.setattr(ProcessedSourceStore, '_binary_client', staticmethod(lambda client: client))
+    return FakeRedis()
+
+
+def make_store(redis_client, **kwargs):
+    return ProcessedSourceStore(redis_client, PREFIX, ttl_seconds=3600, capacity=1000, **kwargs)
+
+
+def bitmap_keys(fake_redis):
+    return [key for key in fake_redis.data if key.startswith(f'{PREFIX}:bloom:')]
+
+
+def test_bloom_bits_use_redis_setbit_layout():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    positions = bloom.add('https://example.com/set/1')
+
+    mirror = FakeRedis()
+    for offset in positions:
+        mirror._setbit('bitmap', offset, 1)
+
+    restored = BloomFilter(capacity=100, error_rate=0.01)
+    restored.merge(mirror.data['bitmap'])
+    assert restored.bits == bloom.bits
+    assert 'https://example.com/set/1' in restored
+
+
+def test_bloom_miss_skips_redis(fake_redis):
+    store = make_store(fake_redis)
+    fake_redis.commands.clear()
+
+    assert store.filter_unprocessed(['https://a', 'https://b', None]) == ['https://a', 'https://b']
+    assert fake_redis.commands == []
+    assert store.get_stats()['bloom_negatives'] == 2
+
+
+def test_marks_are_mirrored_to_the_bitmap_and_confirmed_in_one_round_trip(fake_redis):
+    make_store(fake_redis).mark_many(['https://a', 'https://b'])
+    [bitmap_key] = bitmap_keys(fake_redis)
+
+    # A later run loads the bitmap instead of scanning the per-source keys
+    store = make_store(fake_redis)
+    assert bytes(store.bloom.bits[:len(fake_redis.data[bitmap_key])]) == fake_redis.data[bitmap_key]
+    fake_redis.commands.clear()
+
+    assert store.filter_unprocessed(['https://a', 'https://b', 'https://c']) == ['https://c']
+    assert fake_redis.commands == [['exists', 'exists']]
+    assert store.get_stats()['redis_confirmed'] == 2
+
+
+def test_bloom_positive_without_a_live_key_is_scraped_again(fake_redis):
+    make_store(fake_redis).mark_processed('https://a')
+    # The TTL'd marker expired; the bitmap still has its bits
+    fake_redis.data.pop(make_store(fake_redis).key_for('https://a'))
+
+    store = make_store(fake_redis)
+    assert store.filter_unprocessed(['https://a']) == ['https://a']
+    assert store.get_stats()['false_positives'] == 1
+
+    # Marked in this process: answered from memory without Redis
+    store.mark_processed('https://a')
+    fake_redis.commands.clear()
+    assert store.is_processed('https://a')
+    assert fake_redis.commands == []
+
+
+def test_first_run_seeds_the_bitmap_from_existing_keys(fake_redis):
+    legacy = make_store(None)
+    fake_redis.data[legacy.key_for('https://old')] = '2024-01-01T00:00:00'
+    fake_redis.data[f'{PREFIX}:last_run'] = '2024-01-01T00:00:00'
+
+    store = make_store(fake_redis)
+
+    assert len(bitmap_keys(fake_redis)) == 1
+    assert store.token_for('https://old') in store.bloom
+    assert store.filter_unprocessed(['https://old', 'https://new']) == ['https://new']
+
+
+def test_unhashed_keys_and_no_redis_fall_back_to_memory():
+    store = make_store(None, hash_keys=False)
+
+    assert store.key_for('setlist-123') == f'{PREFIX}:setlist-123'
+    store.mark_processed('setlist-123')
+    assert store.filter_unprocessed(['setlist-123', 'setlist-456']) == ['setlist-456']
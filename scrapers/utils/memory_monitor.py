@@ -52,6 +52,24 @@ class MemoryMonitor:
             self.logger.warning(f"Failed to get memory info: {e}")
             return 0.0
 
+    def browser_memory_mb(self) -> float:
+        """
+        Get memory of the browser processes launched by this process, in MB.
+
+        Chromium runs outside the Scrapy process, so its pages and contexts
+        never show up in _get_memory_mb().
+        """
+        total = 0
+        try:
+            for child in self.process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except Exception as e:
+            self.logger.warning(f"Failed to get browser memory info: {e}")
+        return total / 1024 / 1024
+
     def page_opened(self):
         """Track Playwright page opened."""
         self.pages_opened += 1
@@ -85,7 +103,8 @@ class MemoryMonitor:
             f"open={open_pages} errored={self.pages_errored} | "
             f"Memory: current={current_memory:.1f}MB "
             f"delta={memory_delta:+.1f}MB "
-            f"peak={self.peak_memory_mb:.1f}MB"
+            f"peak={self.peak_memory_mb:.1f}MB "
+            f"browser={self.browser_memory_mb():.1f}MB"
         )
 
         # Warn if potential leak detected
@@ -175,5 +194,9 @@ playwright_memory_usage_mb{{spider="{self.spider_name}"}} {current_memory:.2f}
 # HELP playwright_memory_peak_mb Peak memory usage in MB
 # TYPE playwright_memory_peak_mb gauge
 playwright_memory_peak_mb{{spider="{self.spider_name}"}} {self.peak_memory_mb:.2f}
+
+# HELP playwright_browser_memory_mb Memory used by browser child processes in MB
+# TYPE playwright_browser_memory_mb gauge
+playwright_browser_memory_mb{{spider="{self.spider_name}"}} {self.browser_memory_mb():.2f}
 """
         return metrics
@@ -0,0 +1,218 @@
+"""
+Playwright Browser Context Pool for scrapy-playwright Spiders
+
+Reuses one browser context per domain instead of paying context setup on
+every request, and recycles a context once it has rendered too many pages.
+When the browser grows past a memory limit (measured by MemoryMonitor) only
+the oldest context is recycled, and memory recycling stays disarmed until
+usage falls back below RECYCLE_REARM_RATIO of the limit, so one spike does
+not retire every context as its pages are released.
+
+scrapy-playwright creates a context lazily the first time a request names
+it in `playwright_context`, so recycling is done by naming: a retired
+context's domain moves to the next generation name, and the retired context
+is closed once its last in-flight page is released.
+
+Open pages are capped across all domains at PLAYWRIGHT_MAX_PAGES_PER_WORKER:
+PlaywrightPageCapMiddleware takes a page slot and a context lease from the
+pool before a pooled request is downloaded and release() returns both.
+Requests dropped before download (dupefilter, offsite) never hold a lease,
+so they cannot keep a retired context open. scrapy-playwright's own
+PLAYWRIGHT_MAX_CONTEXTS still bounds the number of contexts. Resource
+blocking is applied globally through PLAYWRIGHT_ABORT_REQUEST, so pooled
+requests need no per-page route() handler.
+
+Usage in spider:
+    self.context_pool = PlaywrightContextPool(self.name, memory_monitor=self.memory_monitor)
+
+    yield Request(url, meta=self.context_pool.request_meta(url, page_methods=[...]))
+
+    # In the callback/errback, instead of page.close():
+    self.context_pool.release(page, response.meta)
+"""
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+
+@dataclass
+class PooledContext:
+    """Bookkeeping for one named scrapy-playwright context"""
+    name: str
+    domain: str
+    leases: int = 0
+    pages_served: int = 0
+    retired: bool = False
+    browser_context: Any = None
+
+
+class PlaywrightContextPool:
+    """
+    Per-domain, recycled Playwright contexts.
+
+    A lease is taken by acquire_page_slot() when the request reaches the
+    downloader and returned by release(), which must be called from both the
+    callback and the errback so retired contexts can be closed once idle and
+    page slots are handed back.
+    """
+
+    PAGE_SLOT_META = '_playwright_pool_page_slot'
+    DOMAIN_META = '_playwright_pool_domain'
+    RECYCLE_REARM_RATIO = 0.8
+
+    def __init__(self,
+                 spider_name: str,
+                 memory_monitor=None,
+                 max_pages_per_context: int = None,
+                 recycle_memory_mb: float = None,
+                 max_open_pages: int = None,
+                 context_kwargs: Optional[Dict] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.spider_name = spider_name
+        self.memory_monitor = memory_monitor
+        self.logger = logger or logging.getLogger(f'{spider_name}.context_pool')
+
+        self.max_pages_per_context = int(
+            max_pages_per_context or os.getenv('PLAYWRIGHT_CONTEXT_MAX_PAGES', '100')
+        )
+        self.recycle_memory_mb = float(
+            recycle_memory_mb or os.getenv('PLAYWRIGHT_RECYCLE_MEMORY_MB', '1024')
+        )
+        self.max_open_pages = max(1, int(
+            max_open_pages or os.getenv('PLAYWRIGHT_MAX_PAGES_PER_WORKER', '8')
+        ))
+        self.context_kwargs = context_kwargs or {}
+
+        self._generation: Dict[str, int] = defaultdict(int)
+        self._contexts: Dict[str, PooledContext] = {}  # oldest first
+        self._page_slots = asyncio.Semaphore(self.max_open_pages)
+        self._memory_recycle_armed = True
+
+        self.contexts_created = 0
+        self.contexts_recycled = 0
+        self.pages_served = 0
+
+    def context_name(self, url: str) -> str:
+        return self._domain_context_name(urlparse(url).netloc.lower())
+
+    def _domain_context_name(self, domain: str) -> str:
+        return f"{self.spider_name}:{domain}:{self._generation[domain]}"
+
+    def request_meta(self, url: str, page_methods: Optional[List] = None, **extra) -> Dict:
+        """Build Request.meta that renders `url` in the domain's context"""
+        meta = {
+            'playwright': True,
+            'playwright_context': self.context_name(url),
+            self.DOMAIN_META: urlparse(url).netloc.lower(),
+            'playwright_context_kwargs': dict(self.context_kwargs),
+            'playwright_include_page': True,
+            'playwright_page_methods': list(page_methods or []),
+        }
+        meta.update(extra)
+        return meta
+
+    async def acquire_page_slot(self, meta: Dict):
+        """
+        Wait for one of the worker's page slots before a pooled request is downloaded.
+
+        Takes a lease on the domain's current context and points the request
+        at it, since the context named when the request was built may have
+        been retired while it was queued. The slot and lease are recorded in
+        `meta`, so retries of the same request reuse them, and are handed
+        back by release().
+        """
+        domain = meta.get(self.DOMAIN_META)
+        if domain is None or meta.get(self.PAGE_SLOT_META):
+            return
+        await self._page_slots.acquire()
+
+        name = self._domain_context_name(domain)
+        context = self._contexts.get(name)
+        if context is None:
+            context = PooledContext(name=name, domain=domain)
+            self._contexts[name] = context
+            self.contexts_created += 1
+        context.leases += 1
+        meta['playwright_context'] = name
+        meta[self.PAGE_SLOT_META] = True
+
+    def release(self, page, meta: Dict) -> asyncio.Future:
+        """
+        Return a lease and close the page, or its whole context if retired.
+
+        `page` may be None (request failed before a page was opened).
+        Safe to call from synchronous Scrapy callbacks.
+        """
+        return asyncio.ensure_future(self._release(page, meta))
+
+    async def _release(self, page, meta: Dict):
+        name = meta.get('playwright_context')
+        context = self._contexts.get(name) if name else None
+        leased = meta.pop(self.PAGE_SLOT_META, False)
+        if leased:
+            self._page_slots.release()
+
+        if context is not None:
+            if leased:
+                context.leases -= 1
+            if page is not None:
+                context.pages_served += 1
+                self.pages_served += 1
+                context.browser_context = page.context
+            if not context.retired and context.pages_served >= self.max_pages_per_context:
+                self._retire(context, f"after {context.pages_served} pages")
+            self._check_memory()
+
+        idle = [c for c in self._contexts.values() if c.retired and c.leases <= 0]
+        try:
+            if page is not None and not any(c is context for c in idle):
+                await page.close()
+            for retired in idle:
+                self._contexts.pop(retired.name, None)
+                if retired.browser_context is not None:
+                    # Closing the context also closes any page still attached
+                    await retired.browser_context.close()
+                    self.logger.debug(f"Closed recycled Playwright context {retired.name}")
+        except Exception as e:
+            self.logger.warning(f"Error closing Playwright page/context {name}: {e}")
+
+    def _check_memory(self):
+        """Retire the oldest live context once per excursion above the memory limit"""
+        if self.memory_monitor is None:
+            return
+        memory_mb = self.memory_monitor.browser_memory_mb()
+        if not self._memory_recycle_armed:
+            if memory_mb < self.recycle_memory_mb * self.RECYCLE_REARM_RATIO:
+                self._memory_recycle_armed = True
+            return
+        if memory_mb < self.recycle_memory_mb:
+            return
+        oldest = next((c for c in self._contexts.values() if not c.retired), None)
+        if oldest is not None:
+            self._retire(oldest, f"with browser memory at {memory_mb:.0f} MB")
+            self._memory_recycle_armed = False
+
+    def _retire(self, context: PooledContext, reason: str):
+        context.retired = True
+        self._generation[context.domain] += 1
+        self.contexts_recycled += 1
+        self.logger.info(
+            f"Recycling Playwright context {context.name} {reason} "
+            f"({context.leases} still in flight)"
+        )
+
+    def get_stats(self) -> Dict:
+        """Return pool statistics as dictionary."""
+        stats = {
+            'contexts_created': self.contexts_created,
+            'contexts_recycled': self.contexts_recycled,
+            'contexts_open': len(self._contexts),
+            'pages_served': self.pages_served,
+        }
+        if self.memory_monitor is not None and self.pages_served:
+            stats['browser_memory_mb'] = self.memory_monitor.browser_memory_mb()
+        return stats
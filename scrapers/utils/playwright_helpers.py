@@ -17,6 +17,7 @@ Usage in spider:
 """
 from typing import Dict, List, Set
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +175,45 @@ def should_abort_request_strict(route, request) -> bool:
     return False
 
 
+def get_blocked_resource_types() -> Set[str]:
+    """
+    Resource types blocked for every Playwright request.
+
+    Configured with PLAYWRIGHT_BLOCKED_RESOURCE_TYPES (comma-separated,
+    empty string disables type blocking).
+    """
+    configured = os.getenv('PLAYWRIGHT_BLOCKED_RESOURCE_TYPES')
+    if configured is None:
+        return {'image', 'stylesheet', 'font', 'media'}
+    return {rtype.strip() for rtype in configured.split(',') if rtype.strip()}
+
+
+_ABORT_RESOURCE_TYPES = get_blocked_resource_types()
+
+
+def abort_blocked_resource(request) -> bool:
+    """
+    Predicate for scrapy-playwright's PLAYWRIGHT_ABORT_REQUEST setting.
+
+    Applies to every page the download handler opens, so spiders need no
+    per-page route() handler. Unlike the route handlers above it only
+    decides; scrapy-playwright performs the abort.
+
+    Usage in settings.py:
+        PLAYWRIGHT_ABORT_REQUEST = 'utils.playwright_helpers.abort_blocked_resource'
+    """
+    url = request.url.lower()
+
+    for pattern in ALLOW_LIST_PATTERNS:
+        if pattern in url:
+            return False
+
+    if request.resource_type in _ABORT_RESOURCE_TYPES:
+        return True
+
+    return any(pattern in url for pattern in BLOCKED_URL_PATTERNS)
+
+
 # ============================================================================
 # PLAYWRIGHT PAGE METHODS GENERATORS
 # ============================================================================
@@ -0,0 +1,252 @@
+"""
+Processed-source deduplication shared by the spiders
+Two-tier check in front of the per-source Redis keys
+(`{prefix}:{sha1(url)}` with a TTL) the spiders already write.
+
+1. A Bloom filter kept in process memory and mirrored to a Redis bitmap
+   (`{prefix}:bloom:{generation}`), loaded once at start-up. A miss means
+   the source was never marked, so no Redis round trip is needed.
+2. Bloom positives are confirmed against the TTL'd keys with a single
+   pipelined EXISTS per batch, so false positives and expired entries
+   are still scraped.
+
+Bitmaps rotate every TTL period; the current and previous generation are
+consulted, which covers every key that can still be alive. The first run
+against an existing prefix seeds the bitmap from the keys already in Redis.
+"""
+import hashlib
+import logging
+import math
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import redis
+
+DEFAULT_CAPACITY = int(os.getenv('SCRAPER_DEDUPE_CAPACITY', '1000000'))
+DEFAULT_ERROR_RATE = float(os.getenv('SCRAPER_DEDUPE_ERROR_RATE', '0.01'))
+DEFAULT_REFRESH_INTERVAL = float(os.getenv('SCRAPER_DEDUPE_REFRESH_SECONDS', '300'))
+
+# Keys under the state prefix that are not processed-source markers
+_RESERVED_SUFFIXES = ('last_run', 'bloom:')
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over a bytearray.
+
+    Bit `n` lives in byte `n // 8` at mask `0x80 >> (n % 8)`, the same layout
+    Redis uses for SETBIT/GETBIT, so the buffer can be loaded from and
+    mirrored to a Redis string directly.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, token: str) -> List[int]:
+        """Bit offsets for `token` (Kirsch-Mitzenmacher double hashing)"""
+        digest = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, token: str) -> List[int]:
+        positions = self.positions(token)
+        for offset in positions:
+            self.bits[offset >> 3] |= 0x80 >> (offset & 7)
+        return positions
+
+    def __contains__(self, token: str) -> bool:
+        return all(self.bits[offset >> 3] & (0x80 >> (offset & 7)) for offset in self.positions(token))
+
+    def merge(self, raw: Optional[bytes]) -> None:
+        """OR a bitmap fetched from Redis into the local filter"""
+        if not raw:
+            return
+        for index, byte in enumerate(raw[:len(self.bits)]):
+            if byte:
+                self.bits[index] |= byte
+
+
+class ProcessedSourceStore:
+    """
+    Batch-friendly replacement for per-URL `exists`/`setex` dedupe calls.
+
+    Usage:
+        store = ProcessedSourceStore(redis_client, 'scraped:setlists:mixesdb', ttl_seconds)
+        for url in store.filter_unprocessed(candidate_urls):
+            yield Request(url, ...)
+        ...
+        store.mark_processed(response.url)
+
+    With `redis_client=None` only the local filter is used, which matches the
+    previous behaviour of the spiders when Redis is unavailable.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis],
+        prefix: str,
+        ttl_seconds: int,
+        hash_keys: bool = True,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self.hash_keys = hash_keys
+        self.refresh_interval = refresh_interval
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.bloom = BloomFilter(capacity, error_rate)
+        self._marked = set()
+        self._loaded_at = 0.0
+        self._bitmap_client: Optional[redis.Redis] = None
+
+        self.stats = {
+            'checked': 0,
+            'bloom_negatives': 0,
+            'redis_confirmed': 0,
+            'false_positives': 0,
+            'redis_round_trips': 0,
+        }
+
+        if self.redis_client is not None:
+            self._bitmap_client = self._binary_client(self.redis_client)
+            self._load_bitmaps(seed=True)
+
+    def token_for(self, source: str) -> str:
+        return hashlib.sha1(source.encode('utf-8')).hexdigest() if self.hash_keys else source
+
+    def key_for(self, source: str) -> str:
+        return f"{self.prefix}:{self.token_for(source)}"
+
+    def is_processed(self, source: str) -> bool:
+        return bool(source) and not self.filter_unprocessed([source])
+
+    def filter_unprocessed(self, sources: Iterable[str]) -> List[str]:
+        """Return the sources not yet processed, in input order, with at most one Redis round trip"""
+        sources = [source for source in sources if source]
+        if not sources:
+            return []
+        self._maybe_refresh()
+        self.stats['checked'] += len(sources)
+
+        candidates = [source for source in sources if self.token_for(source) in self.bloom]
+        self.stats['bloom_negatives'] += len(sources) - len(candidates)
+        if not candidates:
+            return sources
+        processed = {source for source in candidates if source in self._marked}
+        unconfirmed = [source for source in candidates if source not in processed]
+        if unconfirmed and self.redis_client is not None:
+            processed |= self._confirm(unconfirmed)
+        return [source for source in sources if source not in processed]
+
+    def mark_processed(self, source: str) -> None:
+        self.mark_many([source])
+
+    def mark_many(self, sources: Iterable[str]) -> None:
+        """Write the TTL'd keys and the bitmap bits for `sources` in one pipeline"""
+        sources = [source for source in sources if source]
+        if not sources:
+            return
+        self._marked.update(sources)
+        positions = [self.bloom.add(self.token_for(source)) for source in sources]
+        if self.redis_client is None:
+            return
+
+        bitmap_key = self._bitmap_key(self._generation())
+        marked_at = datetime.utcnow().isoformat()
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for source, offsets in zip(sources, positions):
+                pipe.setex(self.key_for(source), self.ttl_seconds, marked_at)
+                for offset in offsets:
+                    pipe.setbit(bitmap_key, offset, 1)
+            pipe.expire(bitmap_key, self.ttl_seconds * 2)
+            pipe.execute()
+            self.stats['redis_round_trips'] += 1
+        except Exception as exc:
+            self.logger.debug("Redis mark failed for %s: %s", self.prefix, exc)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+    def close(self) -> None:
+        if self._bitmap_client is not None:
+            self._bitmap_client.connection_pool.disconnect()
+            self._bitmap_client = None
+
+    def _confirm(self, candidates: List[str]) -> set:
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for source in candidates:
+                pipe.exists(self.key_for(source))
+            results = pipe.execute()
+            self.stats['redis_round_trips'] += 1
+        except Exception as exc:
+            # Same fallback as the old per-URL check: treat as not processed
+            self.logger.debug("Redis exists check failed for %s: %s", self.prefix, exc)
+            return set()
+
+        processed = {source for source, exists in zip(candidates, results) if exists}
+        self.stats['redis_confirmed'] += len(processed)
+        self.stats['false_positives'] += len(candidates) - len(processed)
+        return processed
+
+    def _generation(self) -> int:
+        return int(time.time() // self.ttl_seconds)
+
+    def _bitmap_key(self, generation: int) -> str:
+        return f"{self.prefix}:bloom:{generation}"
+
+    @staticmethod
+    def _binary_client(client: redis.Redis) -> redis.Redis:
+        """Spiders use decode_responses=True, which would mangle the raw bitmap on GET"""
+        pool = client.connection_pool
+        kwargs = dict(pool.connection_kwargs)
+        kwargs['decode_responses'] = False
+        return redis.Redis(connection_pool=type(pool)(connection_class=pool.connection_class, **kwargs))
+
+    def _maybe_refresh(self) -> None:
+        if self._bitmap_client is not None and time.monotonic() - self._loaded_at >= self.refresh_interval:
+            # Pick up sources marked by concurrent runs since the last load
+            self._load_bitmaps(seed=False)
+
+    def _load_bitmaps(self, seed: bool) -> None:
+        generation = self._generation()
+        keys = [self._bitmap_key(generation), self._bitmap_key(generation - 1)]
+        self._loaded_at = time.monotonic()
+        try:
+            bitmaps = self._bitmap_client.mget(keys)
+        except Exception as exc:
+            self.logger.debug("Could not load dedupe bitmap for %s: %s", self.prefix, exc)
+            return
+        for raw in bitmaps:
+            self.bloom.merge(raw)
+        if seed and not any(bitmaps):
+            self._seed_from_keys(keys[0])
+
+    def _seed_from_keys(self, bitmap_key: str) -> None:
+        """Build the first bitmap from the per-source keys written before it existed"""
+        seeded = 0
+        try:
+            for key in self.redis_client.scan_iter(match=f"{self.prefix}:*", count=1000):
+                token = key[len(self.prefix) + 1:]
+                if token.startswith(_RESERVED_SUFFIXES):
+                    continue
+                self.bloom.add(token)
+                seeded += 1
+            if seeded:
+                self._bitmap_client.set(bitmap_key, bytes(self.bloom.bits), ex=self.ttl_seconds * 2)
+        except Exception as exc:
+            self.logger.debug("Could not seed dedupe bitmap for %s: %s", self.prefix, exc)
+            return
+        self.logger.info("Seeded dedupe bitmap for %s from %d existing keys", self.prefix, seeded)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark micro-batching in the scrapers' APIEnrichmentPipeline
+
+Starts a local fake metadata-enrichment service (FastAPI on an ephemeral
+port) with a fixed number of request slots, which charges a fixed cost per
+HTTP request plus a smaller cost per track, and fails every Nth track so
+partial-failure handling is exercised.
+The pipeline is then driven the way Scrapy drives it: many process_item
+calls in flight at once (CONCURRENT_ITEMS), once with batching disabled
+(batch_size=1, one POST /enrich per track) and once batched
+(POST /enrich/batch/sync).
+
+Usage:
+    python scripts/benchmark_enrichment_batching.py --tracks 2000 --batch-size 20
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import socket
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import uvicorn
+from fastapi import FastAPI
+
+PIPELINE_PATH = Path(__file__).resolve().parent.parent / 'scrapers' / 'pipelines' / 'api_enrichment_pipeline.py'
+
+
+def load_pipeline_class():
+    # Load the module directly so the pipelines package (and its database
+    # dependencies) is not imported
+    spec = importlib.util.spec_from_file_location('api_enrichment_pipeline', PIPELINE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Per-track warnings for the deliberately failed tracks would drown the table
+    logging.getLogger(module.__name__).setLevel(logging.ERROR)
+    return module.APIEnrichmentPipeline
+
+
+def fake_enrichment_app(request_latency: float, track_latency: float, fail_every: int,
+                        workers: int, counters: Dict):
+    app = FastAPI()
+    request_slots = asyncio.Semaphore(workers)
+
+    async def handle_request():
+        counters['requests'] += 1
+        async with request_slots:
+            await asyncio.sleep(request_latency)
+
+    async def enrich(task: Dict) -> Dict:
+        await asyncio.sleep(track_latency)
+        failed = fail_every and int(task['track_id'].rsplit('-', 1)[1]) % fail_every == 0
+        return {
+            'track_id': task['track_id'],
+            'status': 'failed' if failed else 'completed',
+            'sources_used': [] if failed else ['spotify'],
+            'metadata_acquired': {} if failed else {'spotify_id': f"sp-{task['track_id']}", 'bpm': 128},
+            'errors': ['not found'] if failed else [],
+            'duration_seconds': track_latency,
+            'cached': False,
+            'timestamp': None,
+        }
+
+    @app.post('/enrich')
+    async def enrich_one(task: Dict):
+        await handle_request()
+        return await enrich(task)
+
+    @app.post('/enrich/batch/sync')
+    async def enrich_batch(tasks: List[Dict]):
+        await handle_request()
+        results = await asyncio.gather(*(enrich(task) for task in tasks))
+        return {'batch_size': len(tasks), 'correlation_id': 'bench', 'results': results}
+
+    return app
+
+
+async def run(pipeline_cls, url: str, tracks: int, batch_size: int, concurrent_items: int, counters: Dict):
+    counters['requests'] = 0
+    pipeline = pipeline_cls(enrichment_service_url=url, batch_size=batch_size, batch_max_wait=0.05,
+                            max_pending=concurrent_items)
+    slots = asyncio.Semaphore(concurrent_items)
+
+    async def process(n: int) -> Dict:
+        item = {'item_type': 'track', 'track_id': f'track-{n}', 'artist_name': 'Artist', 'track_name': f'Track {n}'}
+        async with slots:
+            return await pipeline.process_item(item, spider=None)
+
+    started = time.perf_counter()
+    items = await asyncio.gather(*(process(n) for n in range(tracks)))
+    elapsed = time.perf_counter() - started
+    await pipeline.close_spider(spider=None)
+
+    enriched = sum(1 for item in items if item.get('spotify_id'))
+    return elapsed, counters['requests'], enriched
+
+
+async def main_async(args):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    counters = {'requests': 0}
+    app = fake_enrichment_app(args.request_latency, args.track_latency, args.fail_every,
+                              args.server_workers, counters)
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    pipeline_cls = load_pipeline_class()
+    url = f'http://127.0.0.1:{port}'
+
+    print(f"{args.tracks} tracks, {args.concurrent_items} items in flight, {args.server_workers} server slots, "
+          f"{args.request_latency * 1000:.0f}ms/request + {args.track_latency * 1000:.0f}ms/track\n")
+    print(f"{'mode':<10} {'requests':>9} {'enriched':>9} {'total (s)':>10} {'per track (ms)':>15}", flush=True)
+
+    for name, batch_size in (('single', 1), ('batched', args.batch_size)):
+        elapsed, requests, enriched = await run(
+            pipeline_cls, url, args.tracks, batch_size, args.concurrent_items, counters
+        )
+        print(f"{name:<10} {requests:>9} {enriched:>9} {elapsed:>10.2f} "
+              f"{elapsed / args.tracks * 1000:>15.2f}", flush=True)
+
+    server.should_exit = True
+    await serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tracks', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--concurrent-items', type=int, default=100)
+    parser.add_argument('--request-latency', type=float, default=0.02)
+    parser.add_argument('--track-latency', type=float, default=0.002)
+    parser.add_argument('--fail-every', type=int, default=10)
+    parser.add_argument('--server-workers', type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark tracklist extraction throughput in the NLP processor
+
+Runs the same corpus through three paths:
+  * per-text   - one `extract_tracklist` call per text with the cache disabled
+                 (the old one-document-per-request behaviour)
+  * batched    - `extract_tracklists` over batches, so texts that need NER
+                 share one `nlp.pipe` call
+  * re-scrape  - the batched run repeated on a warm cache, as when unchanged
+                 pages are scraped again
+
+The corpus is a directory of saved tracklist text (*.txt, one page per file).
+Without --corpus a synthetic corpus mixing structured and free-text
+tracklists is generated.
+
+Usage:
+    python scripts/benchmark_nlp_extraction.py --corpus ./saved_tracklists --batch-size 32
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'services' / 'nlp-processor'))
+
+from tracklist_extractor import TracklistExtractor
+
+ARTISTS = ["Eric Prydz", "Adam Beyer", "Charlotte de Witte", "Amelie Lens", "Fisher", "Chris Lake",
+           "Solomun", "Tale Of Us", "Maceo Plex", "Peggy Gou", "Bicep", "Four Tet"]
+TITLES = ["Opus", "Your Mind", "Doppler", "Feel It", "Losing It", "Turn Off The Lights", "Glue",
+          "Baby", "Nova", "Starlight", "Apricots", "Atlas"]
+
+
+def generate_corpus(count: int, tracks_per_text: int, seed: int):
+    """Synthetic pages in the formats the extractor handles, plus unstructured prose"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(count):
+        picks = [(rng.choice(ARTISTS), rng.choice(TITLES)) for _ in range(tracks_per_text)]
+        style = i % 4
+        if style == 0:
+            lines = [f"[{n * 4:02d}:{rng.randrange(60):02d}] {a} - {t}" for n, (a, t) in enumerate(picks)]
+        elif style == 1:
+            lines = [f"{n + 1}. {a} - {t}" for n, (a, t) in enumerate(picks)]
+        elif style == 2:
+            lines = [f"Track {n + 1}: {a} - {t}" for n, (a, t) in enumerate(picks)]
+        else:
+            lines = [f"then {a.lower()} dropped {t.lower()} and the crowd went wild." for a, t in picks]
+        corpus.append(f"Mix #{i} recorded live\n" + "\n".join(lines))
+    return corpus
+
+
+def load_corpus(directory: Path):
+    return [p.read_text(encoding='utf-8', errors='replace') for p in sorted(directory.glob('*.txt'))]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def run(args):
+    corpus = load_corpus(Path(args.corpus)) if args.corpus else generate_corpus(args.texts, args.tracks_per_text, args.seed)
+    if not corpus:
+        sys.exit(f"No *.txt files found in {args.corpus}")
+    batches = [corpus[i:i + args.batch_size] for i in range(0, len(corpus), args.batch_size)]
+    print(f"Corpus: {len(corpus)} texts, {sum(len(t) for t in corpus) / 1024:.0f} KiB, batches of {args.batch_size}")
+
+    uncached = TracklistExtractor(cache_size=0)
+    cached = TracklistExtractor(cache_size=max(len(corpus), 1))
+    cached.nlp = uncached.nlp  # Share the loaded model
+    if uncached.nlp is None:
+        print("Warning: spaCy model not available, NER step is skipped")
+
+    runs = {}
+    for _ in range(args.repeat):
+        elapsed, single = timed(lambda: [uncached.extract_tracklist(text) for text in corpus])
+        runs.setdefault('per-text', []).append(elapsed)
+
+        cached._cache.clear()
+        elapsed, batched = timed(lambda: [r for batch in batches for r in cached.extract_tracklists(batch)])
+        runs.setdefault('batched', []).append(elapsed)
+
+        elapsed, _ = timed(lambda: [r for batch in batches for r in cached.extract_tracklists(batch)])
+        runs.setdefault('re-scrape', []).append(elapsed)
+
+    if single != batched:
+        print("Warning: batched results differ from per-text results")
+
+    baseline = statistics.median(runs['per-text'])
+    for name, timings in runs.items():
+        median = statistics.median(timings)
+        print(f"{name + ':':<12}{median * 1000:8.1f}ms  {len(corpus) / median:8.0f} texts/s  "
+              f"x{baseline / median:.1f}")
+    print(f"Tracks extracted: {sum(len(tracks) for tracks in batched)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tracklist extraction throughput')
+    parser.add_argument('--corpus', help='Directory of saved tracklist text files (*.txt)')
+    parser.add_argument('--texts', type=int, default=500, help='Synthetic texts when no corpus is given')
+    parser.add_argument('--tracks-per-text', type=int, default=20, help='Tracks per synthetic text')
+    parser.add_argument('--batch-size', type=int, default=32, help='Texts per extract_tracklists call')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per path (median is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark Playwright rendering strategies used by the scrapers
+
+Generates local HTML fixtures (tracklist pages that pull in images, a web
+font, a stylesheet and an audio file) and serves them from a local HTTP
+server, then renders every fixture with a capped number of concurrent pages:
+
+  * fresh   - new browser context per page, nothing blocked
+  * route   - shared context, per-page route() handler (previous spider setup)
+  * pooled  - per-domain pooled contexts recycled every --recycle-pages pages,
+              blocking decided by utils.playwright_helpers.abort_blocked_resource
+
+Reports pages rendered per minute and browser memory per open page (peak
+browser RSS above the idle browser, divided by the page cap).
+
+Requires playwright with chromium installed (playwright install chromium).
+
+Usage:
+    python scripts/benchmark_playwright_pool.py --pages 200 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scrapers'))
+
+from playwright.async_api import async_playwright
+
+from utils.memory_monitor import MemoryMonitor
+from utils.playwright_helpers import abort_blocked_resource
+
+TRACKS_PER_PAGE = 40
+
+
+def write_fixtures(root: Path, pages: int):
+    """Tracklist pages plus the heavy assets they reference"""
+    (root / 'assets').mkdir()
+    (root / 'assets' / 'cover.jpg').write_bytes(os.urandom(200 * 1024))
+    (root / 'assets' / 'font.woff2').write_bytes(os.urandom(80 * 1024))
+    (root / 'assets' / 'preview.mp3').write_bytes(os.urandom(500 * 1024))
+    (root / 'assets' / 'site.css').write_text(
+        "@font-face { font-family: Site; src: url('/assets/font.woff2'); }\n"
+        "body { font-family: Site; } .tlpItem { padding: 4px; }\n" * 50
+    )
+
+    for n in range(pages):
+        rows = "\n".join(
+            f'<div class="tlpItem"><img src="/assets/cover.jpg?{n}-{t}" width="40">'
+            f'<span class="trackValue">Artist {t} - Track {n}-{t}</span></div>'
+            for t in range(TRACKS_PER_PAGE)
+        )
+        (root / f'tracklist-{n}.html').write_text(
+            f"<html><head><title>Tracklist {n}</title>"
+            f'<link rel="stylesheet" href="/assets/site.css?{n}"></head>'
+            f'<body><h1>Tracklist {n}</h1><audio src="/assets/preview.mp3?{n}" preload="auto"></audio>'
+            f'<div class="tlLink">{rows}</div>'
+            f"<script>document.body.dataset.rendered = '1';</script></body></html>"
+        )
+
+
+def serve(root: Path) -> ThreadingHTTPServer:
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def block_route(route):
+    if route.request.resource_type in {'image', 'stylesheet', 'font', 'media'}:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def abort_route(route):
+    if abort_blocked_resource(route.request):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def render(mode: str, browser, urls, concurrency: int, recycle_pages: int, monitor: MemoryMonitor):
+    slots = asyncio.Semaphore(concurrency)
+    shared = await browser.new_context() if mode == 'route' else None
+    pool = {'context': None, 'served': 0}
+    leases, retired = {}, set()
+    peak = 0.0
+
+    async def lease_pooled_context():
+        if pool['context'] is None or pool['served'] >= recycle_pages:
+            if pool['context'] is not None:
+                retired.add(pool['context'])
+                if leases[pool['context']] == 0:
+                    await pool['context'].close()
+            pool['context'] = await browser.new_context()
+            await pool['context'].route('**/*', abort_route)
+            leases[pool['context']] = 0
+            pool['served'] = 0
+        pool['served'] += 1
+        leases[pool['context']] += 1
+        return pool['context']
+
+    async def release_pooled_context(context):
+        leases[context] -= 1
+        if context in retired and leases[context] == 0:
+            await context.close()
+
+    async def render_one(url):
+        nonlocal peak
+        async with slots:
+            if mode == 'fresh':
+                context = await browser.new_context()
+            elif mode == 'route':
+                context = shared
+            else:
+                context = await lease_pooled_context()
+            page = await context.new_page()
+            if mode == 'route':
+                await page.route('**/*', block_route)
+            await page.goto(url, wait_until='load')
+            await page.wait_for_selector('div.tlLink')
+            peak = max(peak, monitor.browser_memory_mb())
+            await page.close()
+            if mode == 'fresh':
+                await context.close()
+            elif mode == 'pooled':
+                await release_pooled_context(context)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(render_one(url) for url in urls))
+    elapsed = time.perf_counter() - started
+
+    if shared is not None:
+        await shared.close()
+    if pool['context'] is not None:
+        await pool['context'].close()
+    return elapsed, peak
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_fixtures(root, args.pages)
+        server = serve(root)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/tracklist-{n}.html" for n in range(args.pages)]
+
+        monitor = MemoryMonitor(spider_name='benchmark')
+        print(f"{args.pages} fixture pages, {args.concurrency} concurrent pages, "
+              f"pooled contexts recycled every {args.recycle_pages} pages\n")
+        print(f"{'mode':<8} {'total (s)':>10} {'pages/min':>10} {'idle (MB)':>10} {'MB/page':>9}", flush=True)
+
+        async with async_playwright() as playwright:
+            for mode in ('fresh', 'route', 'pooled'):
+                browser = await playwright.chromium.launch(headless=True)
+                await asyncio.sleep(0.5)
+                idle = monitor.browser_memory_mb()
+                elapsed, peak = await render(mode, browser, urls, args.concurrency, args.recycle_pages, monitor)
+                await browser.close()
+                print(f"{mode:<8} {elapsed:>10.2f} {args.pages / elapsed * 60:>10.0f} "
+                      f"{idle:>10.1f} {(peak - idle) / args.concurrency:>9.1f}", flush=True)
+
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--recycle-pages', type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark task selection in the scraper orchestrator's SmartScheduler
+
+Fills the scheduler with tasks spread over many domains and measures:
+  * dispatch  - one get_next_task + mark_task_complete per domain, i.e. one
+                full politeness round across every queued domain
+  * idle poll - get_next_task while every domain is still inside its crawl
+                delay, as a polling worker sees between rounds
+
+The legacy scheduler (scan every domain under the lock, list.pop(0)) is
+reproduced here for comparison. robots.txt is never fetched: the checker
+answers from its cache after the first lookup per domain.
+
+Usage:
+    python scripts/benchmark_smart_scheduler.py --domains 1000 --tasks-per-domain 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'services' / 'scraper-orchestrator'))
+
+from robots_parser import RobotRules, RobotsChecker, SmartScheduler
+
+
+class CachedRobotsChecker(RobotsChecker):
+    """Serves a long fixed crawl delay without network access, so each domain is dispatched once"""
+
+    async def fetch_robots_txt(self, domain: str) -> Optional[RobotRules]:
+        return RobotRules(crawl_delay=3600.0)
+
+
+class LegacySmartScheduler:
+    """The previous implementation: linear scan per call"""
+
+    def __init__(self, robots_checker: RobotsChecker):
+        self.robots_checker = robots_checker
+        self.domain_queues: Dict[str, List[Dict]] = defaultdict(list)
+        self.processing_domains = set()
+        self._lock = asyncio.Lock()
+
+    def add_task(self, url: str, task_data: Dict):
+        domain = url.split('/')[2]
+        self.domain_queues[domain].append({"url": url, "domain": domain, "data": task_data})
+
+    async def get_next_task(self) -> Optional[Dict]:
+        async with self._lock:
+            available_domains = []
+            current_time = time.time()
+            for domain, queue in self.domain_queues.items():
+                if not queue or domain in self.processing_domains:
+                    continue
+                stats = self.robots_checker.domain_stats[domain]
+                delay = await self.robots_checker.get_crawl_delay(queue[0]["url"])
+                if current_time - stats.last_request_time >= delay:
+                    available_domains.append((domain, delay))
+            if not available_domains:
+                return None
+            available_domains.sort(key=lambda x: (x[1], -len(self.domain_queues[x[0]])))
+            domain = available_domains[0][0]
+            self.processing_domains.add(domain)
+            return self.domain_queues[domain].pop(0)
+
+    def mark_task_complete(self, domain: str):
+        self.processing_domains.discard(domain)
+
+
+async def run(scheduler_cls, domains: int, tasks_per_domain: int, polls: int):
+    checker = CachedRobotsChecker()
+    scheduler = scheduler_cls(checker)
+    for t in range(tasks_per_domain):
+        for d in range(domains):
+            scheduler.add_task(f"https://site{d}.example/tracklist/{t}", {"n": t})
+
+    started = time.perf_counter()
+    dispatched = 0
+    while dispatched < domains:
+        task = await scheduler.get_next_task()
+        if task is None:
+            break
+        # The legacy scheduler keys readiness off the request time recorded
+        # by DomainStats, so record one as a real worker would
+        checker.update_domain_stats(task["url"], 0.1)
+        scheduler.mark_task_complete(task["domain"])
+        dispatched += 1
+    dispatch_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(polls):
+        assert await scheduler.get_next_task() is None
+    poll_time = (time.perf_counter() - started) / polls
+
+    await checker.close()
+    return dispatched, dispatch_time, poll_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--domains', type=int, default=1000)
+    parser.add_argument('--tasks-per-domain', type=int, default=5)
+    parser.add_argument('--polls', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.domains} domains x {args.tasks_per_domain} tasks "
+          f"({args.domains * args.tasks_per_domain} queued)\n")
+    print(f"{'scheduler':<10} {'dispatched':>10} {'round (s)':>10} {'per task (us)':>14} {'idle poll (us)':>15}", flush=True)
+
+    for name, cls in (("legacy", LegacySmartScheduler), ("heap", SmartScheduler)):
+        dispatched, dispatch_time, poll_time = asyncio.run(
+            run(cls, args.domains, args.tasks_per_domain, args.polls)
+        )
+        print(f"{name:<10} {dispatched:>10} {dispatch_time:>10.3f} "
+              f"{dispatch_time / max(1, dispatched) * 1e6:>14.1f} {poll_time * 1e6:>15.1f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
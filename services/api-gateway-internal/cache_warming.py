@@ -0,0 +1,269 @@
+"""
+Workload-Derived Cache Warming
+==============================
+
+Keeps the lookups the gateway actually serves warm, instead of a fixed list.
+
+- WorkloadTracker records every adapter query (provider, operation,
+  arguments) with an exponentially decayed request count, plus the cache
+  keys the query touched.
+- CacheWarmer periodically takes the hot set, reads the remaining TTL of
+  those cache keys from Redis and re-fetches entries that are missing or
+  expire within the refresh-ahead window. Each cycle spends at most a
+  configured share of each provider's quota.
+
+Refresh-ahead means popular entries are replaced before they expire, so
+callers never see a cold miss on a hot key.
+"""
+
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter as PrometheusCounter, Gauge
+
+logger = structlog.get_logger(__name__)
+
+api_gateway_cache_warming_total = PrometheusCounter(
+    'api_gateway_cache_warming_total',
+    'Cache warming fetches by outcome',
+    ['provider', 'outcome']
+)
+
+api_gateway_cache_warming_hot_queries = Gauge(
+    'api_gateway_cache_warming_hot_queries',
+    'Queries in the current hot set',
+    ['provider']
+)
+
+QueryKey = Tuple[str, str, Tuple[Tuple[str, Any], ...]]
+
+# Runs one query with caching forced to refresh; returns the cache keys it used
+RefreshQuery = Callable[[str, str, Dict[str, Any]], Awaitable[List[str]]]
+
+
+@dataclass
+class QueryStats:
+    """Decayed request frequency and cache keys for one query."""
+    score: float
+    last_seen: float
+    cache_keys: List[str] = field(default_factory=list)
+    warmed_at: float = 0.0
+
+
+class WorkloadTracker:
+    """
+    Request frequency per provider and per query.
+
+    Scores halve every `half_life` seconds without requests, so the hot set
+    follows the current workload rather than all-time totals.
+    """
+
+    def __init__(self, half_life: float = 21600, max_tracked: int = 10000):
+        """
+        Initialize tracker.
+
+        Args:
+            half_life: Seconds for an idle query's score to halve
+            max_tracked: Maximum queries tracked; the coldest are pruned
+        """
+        self.half_life = half_life
+        self.max_tracked = max_tracked
+        self.queries: Dict[QueryKey, QueryStats] = {}
+        self.requests_by_operation: Counter = Counter()
+
+    @staticmethod
+    def query_key(provider: str, operation: str, kwargs: Dict[str, Any]) -> QueryKey:
+        return (provider, operation, tuple(sorted(kwargs.items())))
+
+    def _decayed(self, stats: QueryStats, now: float) -> float:
+        return stats.score * 0.5 ** (max(0.0, now - stats.last_seen) / self.half_life)
+
+    def record(
+        self,
+        provider: str,
+        operation: str,
+        kwargs: Dict[str, Any],
+        cache_keys: Optional[List[str]] = None,
+        now: Optional[float] = None
+    ):
+        """Count one request for a query."""
+        now = time.time() if now is None else now
+        key = self.query_key(provider, operation, kwargs)
+        self.requests_by_operation[(provider, operation)] += 1
+
+        stats = self.queries.get(key)
+        if stats is None:
+            stats = self.queries[key] = QueryStats(score=0.0, last_seen=now)
+            if len(self.queries) > self.max_tracked:
+                self._prune(now)
+        stats.score = self._decayed(stats, now) + 1.0
+        stats.last_seen = now
+        if cache_keys:
+            stats.cache_keys = list(dict.fromkeys(cache_keys))
+
+    def mark_warmed(self, key: QueryKey, cache_keys: List[str], now: Optional[float] = None):
+        stats = self.queries.get(key)
+        if stats is None:
+            return
+        stats.warmed_at = time.time() if now is None else now
+        if cache_keys:
+            stats.cache_keys = list(dict.fromkeys(cache_keys))
+
+    def _prune(self, now: float):
+        """Drop the coldest half of tracked queries."""
+        ranked = sorted(self.queries.items(), key=lambda item: self._decayed(item[1], now))
+        for key, _ in ranked[:len(ranked) // 2]:
+            del self.queries[key]
+
+    def hot_set(self, limit: int, min_score: float = 2.0, now: Optional[float] = None) -> List[Tuple[QueryKey, QueryStats]]:
+        """Most requested queries, hottest first; one-off lookups are excluded."""
+        now = time.time() if now is None else now
+        scored = [
+            (self._decayed(stats, now), key, stats)
+            for key, stats in self.queries.items()
+        ]
+        scored = [item for item in scored if item[0] >= min_score]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(key, stats) for _, key, stats in scored[:limit]]
+
+    def snapshot(self) -> str:
+        """JSON snapshot so the workload survives restarts."""
+        return json.dumps([
+            [provider, operation, dict(args), stats.score, stats.last_seen, stats.cache_keys]
+            for (provider, operation, args), stats in self.queries.items()
+        ])
+
+    def load(self, snapshot: str):
+        for provider, operation, kwargs, score, last_seen, cache_keys in json.loads(snapshot):
+            key = self.query_key(provider, operation, kwargs)
+            self.queries[key] = QueryStats(score=score, last_seen=last_seen, cache_keys=cache_keys)
+
+    def get_stats(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "tracked_queries": len(self.queries),
+            "requests": {f"{provider}.{operation}": count
+                         for (provider, operation), count in self.requests_by_operation.items()},
+            "hot": [
+                {"provider": provider, "operation": operation, "args": dict(args),
+                 "score": round(self._decayed(stats, time.time()), 2)}
+                for (provider, operation, args), stats in self.hot_set(top)
+            ],
+        }
+
+
+class CacheWarmer:
+    """
+    Refresh-ahead warming of the hot set within a share of provider quota.
+
+    Usage:
+        warmer = CacheWarmer(tracker, redis_client, refresh_query, quotas={"spotify": 10.0})
+        await warmer.warm_once()
+    """
+
+    def __init__(
+        self,
+        tracker: WorkloadTracker,
+        redis_client,
+        refresh_query: RefreshQuery,
+        quotas: Dict[str, float],
+        quota_share: float = 0.1,
+        interval: float = 300,
+        refresh_ahead: float = 21600,
+        hot_set_size: int = 200,
+        min_score: float = 2.0
+    ):
+        """
+        Initialize warmer.
+
+        Args:
+            tracker: Workload tracker to take the hot set from
+            redis_client: Sync Redis client holding the adapter cache
+            refresh_query: Re-fetches one query, bypassing cache reads
+            quotas: Provider rate limits in requests per second
+            quota_share: Share of each provider's quota warming may use
+            interval: Seconds between warming cycles
+            refresh_ahead: Refresh entries expiring within this many seconds
+            hot_set_size: Maximum queries considered per cycle
+            min_score: Minimum decayed request count to count as hot
+        """
+        self.tracker = tracker
+        self.redis = redis_client
+        self.refresh_query = refresh_query
+        self.quotas = quotas
+        self.quota_share = quota_share
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.hot_set_size = hot_set_size
+        self.min_score = min_score
+
+    def budget(self, provider: str) -> int:
+        """Fetches allowed per cycle for a provider."""
+        return int(self.quotas.get(provider, 0.0) * self.interval * self.quota_share)
+
+    def _remaining_ttls(self, cache_keys: List[str]) -> Dict[str, int]:
+        pipe = self.redis.pipeline(transaction=False)
+        for key in cache_keys:
+            pipe.ttl(key)
+        return dict(zip(cache_keys, pipe.execute()))
+
+    async def due_queries(self) -> List[Tuple[QueryKey, str]]:
+        """Hot queries whose entries are missing or expire within the refresh-ahead window."""
+        hot = self.tracker.hot_set(self.hot_set_size, self.min_score)
+        per_provider = Counter(provider for (provider, _, _), _ in hot)
+        for provider in self.quotas:
+            api_gateway_cache_warming_hot_queries.labels(provider=provider).set(per_provider.get(provider, 0))
+
+        all_keys = sorted({k for _, stats in hot for k in stats.cache_keys})
+        ttls = await asyncio.to_thread(self._remaining_ttls, all_keys) if all_keys else {}
+
+        now = time.time()
+        due = []
+        for key, stats in hot:
+            if not stats.cache_keys:
+                continue  # Nothing cacheable seen for this query
+            remaining = [ttls.get(k, -2) for k in stats.cache_keys]
+            if any(ttl == -2 for ttl in remaining):
+                # Cold: expired or evicted. Responses that are never stored
+                # (empty results) are not retried every cycle.
+                if now - stats.warmed_at >= self.refresh_ahead:
+                    due.append((key, "prefetched"))
+            elif any(0 <= ttl < self.refresh_ahead for ttl in remaining):
+                due.append((key, "refreshed"))
+        return due
+
+    async def warm_once(self) -> Dict[str, int]:
+        """Run one warming cycle; returns counts per outcome."""
+        due = await self.due_queries()
+        by_provider: Dict[str, List[Tuple[QueryKey, str]]] = {}
+        for key, reason in due:
+            by_provider.setdefault(key[0], []).append((key, reason))
+
+        totals: Counter = Counter()
+
+        async def warm_provider(provider: str, queries: List[Tuple[QueryKey, str]]):
+            budget = self.budget(provider)
+            for key, reason in queries:
+                if budget <= 0:
+                    outcome = "skipped"
+                else:
+                    budget -= 1
+                    _, operation, args = key
+                    try:
+                        cache_keys = await self.refresh_query(provider, operation, dict(args))
+                        self.tracker.mark_warmed(key, cache_keys)
+                        outcome = reason
+                    except Exception as e:
+                        logger.warning("Cache warming failed for query", provider=provider,
+                                       operation=operation, error=str(e))
+                        outcome = "failed"
+                totals[outcome] += 1
+                api_gateway_cache_warming_total.labels(provider=provider, outcome=outcome).inc()
+
+        # Providers have separate quotas, so they are warmed concurrently
+        await asyncio.gather(*(warm_provider(p, q) for p, q in by_provider.items()))
+        return dict(totals)
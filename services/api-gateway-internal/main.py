@@ -9,15 +9,19 @@ Centralized gateway using common/api_gateway library with:
 - Circuit breaker protection (from common.api_gateway)
 - Comprehensive Prometheus metrics (from common.api_gateway)
 - OpenTelemetry distributed tracing (NEW)
+- Priority-aware scheduling per provider (weighted fair queuing with
+  quota reserved for interactive requests)
+- Workload-derived, refresh-ahead cache warming
 
 All resilience patterns are now provided by the common/api_gateway library,
 eliminating code duplication and ensuring consistent behavior.
 """
 
+import asyncio
 import os
 import sys
-from contextlib import asynccontextmanager
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager, nullcontext
+from typing import Optional, Dict, Any, List
 
 import structlog
 from fastapi import FastAPI, HTTPException, Query
@@ -39,6 +43,9 @@ from opentelemetry.trace import Status, StatusCode
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.secrets_manager import get_redis_config, get_api_keys
 from common.api_gateway import CacheManager, RateLimiter, CircuitBreaker
+from common.api_gateway.base_client import cache_refresh, observe_cache_keys
+from scheduler import ProviderScheduler, SchedulerQueueFull
+from cache_warming import CacheWarmer, WorkloadTracker
 
 from adapters import (
     SpotifyAdapter,
@@ -57,8 +64,30 @@ cache_manager: Optional[CacheManager] = None
 rate_limiter: Optional[RateLimiter] = None
 circuit_breakers: Dict[str, CircuitBreaker] = {}
 adapters: Dict[str, Any] = {}
+schedulers: Dict[str, ProviderScheduler] = {}
 tracer: Optional[trace.Tracer] = None
 
+# Provider quotas: (requests/sec, burst capacity, max concurrent calls)
+PROVIDER_LIMITS = {
+    "spotify": (10.0, 10, 8),
+    "musicbrainz": (1.0, 1, 1),  # 1 req/sec (strict)
+    "lastfm": (5.0, 5, 4),
+}
+SCHEDULER_RESERVE_FRACTION = float(os.getenv("SCHEDULER_RESERVE_FRACTION", "0.2"))
+SCHEDULER_MAX_QUEUE_SIZE = int(os.getenv("SCHEDULER_MAX_QUEUE_SIZE", "1000"))
+BULK_PRIORITY = 1
+
+# Cache warming
+CACHE_WARMING_INTERVAL = int(os.getenv("CACHE_WARMING_INTERVAL", "300"))
+CACHE_WARMING_QUOTA_SHARE = float(os.getenv("CACHE_WARMING_QUOTA_SHARE", "0.1"))
+CACHE_REFRESH_AHEAD_SECONDS = int(os.getenv("CACHE_REFRESH_AHEAD_SECONDS", "21600"))
+CACHE_WARMING_HOT_SET_SIZE = int(os.getenv("CACHE_WARMING_HOT_SET_SIZE", "200"))
+WORKLOAD_HALF_LIFE_SECONDS = int(os.getenv("WORKLOAD_HALF_LIFE_SECONDS", "21600"))
+WORKLOAD_SNAPSHOT_KEY = "api_gateway:workload"
+
+workload_tracker = WorkloadTracker(half_life=WORKLOAD_HALF_LIFE_SECONDS)
+cache_warmer: Optional[CacheWarmer] = None
+
 
 def initialize_tracing():
     """Initialize OpenTelemetry tracing with Tempo backend."""
@@ -105,72 +134,52 @@ def initialize_tracing():
     return tracer
 
 
+async def refresh_query(provider: str, operation: str, kwargs: Dict[str, Any]) -> List[str]:
+    """Re-fetch one query as bulk work, replacing its cache entries."""
+    return (await scheduled_call(provider, BULK_PRIORITY, operation, record=False, refresh=True, **kwargs))[1]
+
+
 async def warm_cache():
     """
-    Warm cache on startup with popular queries.
+    Run one cache warming cycle.
 
-    This pre-populates the cache with commonly accessed data to improve
-    initial response times and reduce load on external APIs.
+    Pre-fetches the hot set derived from recorded traffic and refreshes hot
+    entries before their TTL expires, so popular lookups never hit a cold
+    miss. Warming runs at bulk priority within CACHE_WARMING_QUOTA_SHARE of
+    each provider's quota.
     """
-    if not adapters:
+    if not cache_warmer:
         logger.warning("No adapters available for cache warming")
         return
 
     with tracer.start_as_current_span("cache_warming") as span:
-        warmed_count = 0
-
-        # Popular artists to warm cache with
-        popular_queries = [
-            {"artist": "Deadmau5", "title": "Strobe"},
-            {"artist": "Daft Punk", "title": "One More Time"},
-            {"artist": "Skrillex", "title": "Scary Monsters and Nice Sprites"},
-            {"artist": "Calvin Harris", "title": "Summer"},
-            {"artist": "Martin Garrix", "title": "Animals"},
-        ]
-
-        span.set_attribute("cache_warming.query_count", len(popular_queries))
-
-        logger.info("Starting cache warming", query_count=len(popular_queries))
-
-        # Warm Spotify cache if available
-        if "spotify" in adapters:
-            spotify = adapters["spotify"]
-            for query in popular_queries:
-                try:
-                    with tracer.start_as_current_span("cache_warming.spotify_search") as search_span:
-                        search_span.set_attribute("artist", query["artist"])
-                        search_span.set_attribute("title", query["title"])
-
-                        await spotify.search_track(
-                            artist=query["artist"],
-                            title=query["title"],
-                            limit=1
-                        )
-                        warmed_count += 1
-
-                        search_span.set_status(Status(StatusCode.OK))
-
-                except Exception as e:
-                    logger.warning(
-                        "Cache warming failed for query",
-                        query=query,
-                        error=str(e)
-                    )
-
-        span.set_attribute("cache_warming.warmed_count", warmed_count)
+        results = await cache_warmer.warm_once()
+
+        for outcome, count in results.items():
+            span.set_attribute(f"cache_warming.{outcome}", count)
         span.set_status(Status(StatusCode.OK))
 
-        logger.info(
-            "Cache warming complete",
-            warmed_count=warmed_count,
-            total_queries=len(popular_queries)
-        )
+        # Keep the workload across restarts
+        snapshot = workload_tracker.snapshot()
+        await asyncio.to_thread(redis_client.set, WORKLOAD_SNAPSHOT_KEY, snapshot)
+
+        logger.info("Cache warming complete", **results)
+
+
+async def cache_warming_loop():
+    """Warm the cache every CACHE_WARMING_INTERVAL seconds."""
+    while True:
+        try:
+            await warm_cache()
+        except Exception as e:
+            logger.error("Cache warming failed", error=str(e))
+        await asyncio.sleep(CACHE_WARMING_INTERVAL)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and cleanup resources."""
-    global redis_client, cache_manager, rate_limiter, circuit_breakers, adapters, tracer
+    global redis_client, cache_manager, rate_limiter, circuit_breakers, adapters, schedulers, tracer, cache_warmer
 
     logger.info("Initializing API Gateway with unified common/api_gateway library")
 
@@ -195,9 +204,8 @@ async def lifespan(app: FastAPI):
     rate_limiter = RateLimiter()
 
     # Configure provider-specific rate limits
-    rate_limiter.configure_provider("spotify", rate=10.0, capacity=10)  # 10 req/sec
-    rate_limiter.configure_provider("musicbrainz", rate=1.0, capacity=1)  # 1 req/sec (strict)
-    rate_limiter.configure_provider("lastfm", rate=5.0, capacity=5)  # 5 req/sec
+    for provider, (rate, capacity, _) in PROVIDER_LIMITS.items():
+        rate_limiter.configure_provider(provider, rate=rate, capacity=capacity)
 
     logger.info("✅ Initialized CacheManager and RateLimiter from common.api_gateway")
 
@@ -241,6 +249,19 @@ async def lifespan(app: FastAPI):
         )
         logger.info("✅ Last.fm adapter initialized with unified client")
 
+    # Priority scheduling in front of every adapter, paced at the provider quota
+    for provider in adapters:
+        rate, capacity, max_concurrency = PROVIDER_LIMITS[provider]
+        schedulers[provider] = ProviderScheduler(
+            provider,
+            rate=rate,
+            capacity=capacity,
+            max_concurrency=max_concurrency,
+            reserve_fraction=SCHEDULER_RESERVE_FRACTION,
+            max_queue_size=SCHEDULER_MAX_QUEUE_SIZE
+        )
+    logger.info("✅ Created priority schedulers for all adapters")
+
     logger.info(
         "API Gateway initialized",
         adapters=list(adapters.keys()),
@@ -248,18 +269,35 @@ async def lifespan(app: FastAPI):
         implementation="common/api_gateway"
     )
 
-    # Warm cache with popular queries
+    # Warm cache from the recorded workload
     try:
-        await warm_cache()
+        snapshot = redis_client.get(WORKLOAD_SNAPSHOT_KEY)
+        if snapshot:
+            workload_tracker.load(snapshot)
+            logger.info("Loaded workload snapshot", tracked_queries=len(workload_tracker.queries))
     except Exception as e:
-        logger.error("Cache warming failed", error=str(e))
-        # Don't fail startup if cache warming fails
+        logger.warning("Could not load workload snapshot", error=str(e))
+
+    cache_warmer = CacheWarmer(
+        workload_tracker,
+        redis_client,
+        refresh_query,
+        quotas={provider: PROVIDER_LIMITS[provider][0] for provider in adapters},
+        quota_share=CACHE_WARMING_QUOTA_SHARE,
+        interval=CACHE_WARMING_INTERVAL,
+        refresh_ahead=CACHE_REFRESH_AHEAD_SECONDS,
+        hot_set_size=CACHE_WARMING_HOT_SET_SIZE
+    )
+    warming_task = asyncio.create_task(cache_warming_loop())
 
     yield
 
     # Cleanup
     logger.info("Shutting down API Gateway")
 
+    warming_task.cancel()
+    await asyncio.gather(warming_task, return_exceptions=True)
+
     if redis_client:
         redis_client.close()
 
@@ -305,6 +343,32 @@ def get_adapter(provider: str):
     return adapters[provider]
 
 
+async def scheduled_call(
+    provider: str,
+    priority: int,
+    operation: str,
+    record: bool = True,
+    refresh: bool = False,
+    **kwargs
+):
+    """
+    Run an adapter call through the provider's priority scheduler.
+
+    Served queries are recorded for cache warming together with the cache
+    keys they used. Returns (result, cache_keys).
+    """
+    method = getattr(adapters[provider], operation)
+    with observe_cache_keys() as cache_keys, (cache_refresh() if refresh else nullcontext()):
+        try:
+            result = await schedulers[provider].run(priority, lambda: method(**kwargs))
+        except SchedulerQueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e))
+
+    if record:
+        workload_tracker.record(provider, operation, kwargs, cache_keys)
+    return result, cache_keys
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -334,12 +398,13 @@ async def health_check():
 async def unified_search(
     provider: str,
     query: SearchQuery,
-    priority: int = Query(5, ge=1, le=10, description="Request priority")
+    priority: int = Query(5, ge=1, le=10, description="Request priority (8-10 interactive, 1-3 bulk)")
 ):
     """
     Unified search endpoint with distributed tracing.
 
     Features:
+    - Priority scheduling (weighted fair queuing per provider)
     - Token bucket rate limiting
     - Automatic retries with exponential backoff
     - Circuit breaker protection
@@ -361,7 +426,8 @@ async def unified_search(
         try:
             # Route to appropriate adapter method
             if provider == "spotify":
-                results = await adapter.search_track(
+                results, _ = await scheduled_call(
+                    provider, priority, "search_track",
                     artist=query.artist,
                     title=query.title,
                     limit=query.limit
@@ -370,17 +436,20 @@ async def unified_search(
                 # MusicBrainz uses different search pattern
                 results = []
             elif provider == "lastfm":
-                results = await adapter.get_track_info(
+                results, _ = await scheduled_call(
+                    provider, priority, "get_track_info",
                     artist=query.artist,
                     track=query.title
                 )
             elif provider == "beatport":
-                results = await adapter.search_track(
+                results, _ = await scheduled_call(
+                    provider, priority, "search_track",
                     artist=query.artist,
                     title=query.title
                 )
             elif provider == "discogs":
-                results = await adapter.search_release(
+                results, _ = await scheduled_call(
+                    provider, priority, "search_release",
                     artist=query.artist,
                     title=query.title
                 )
@@ -400,6 +469,8 @@ async def unified_search(
                 "results": results
             }
 
+        except HTTPException:
+            raise
         except Exception as e:
             # Set span status to ERROR
             span.set_status(Status(StatusCode.ERROR, str(e)))
@@ -416,16 +487,15 @@ async def unified_search(
 @app.get("/api/{provider}/track/{track_id}")
 async def get_track(
     provider: str,
-    track_id: str
+    track_id: str,
+    priority: int = Query(5, ge=1, le=10, description="Request priority (8-10 interactive, 1-3 bulk)")
 ):
     """Get track metadata by ID."""
     adapter = get_adapter(provider)
 
     try:
-        if provider == "spotify":
-            result = await adapter.get_track(track_id)
-        elif provider == "beatport":
-            result = await adapter.get_track(track_id)
+        if provider in ("spotify", "beatport"):
+            result, _ = await scheduled_call(provider, priority, "get_track", track_id=track_id)
         else:
             raise HTTPException(
                 status_code=400,
@@ -438,6 +508,8 @@ async def get_track(
             "data": result
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Get track failed",
@@ -449,18 +521,23 @@ async def get_track(
 
 
 @app.get("/api/spotify/audio-features/{track_id}")
-async def get_spotify_audio_features(track_id: str):
+async def get_spotify_audio_features(
+    track_id: str,
+    priority: int = Query(5, ge=1, le=10, description="Request priority (8-10 interactive, 1-3 bulk)")
+):
     """Get Spotify audio features."""
     adapter = get_adapter("spotify")
 
     try:
-        result = await adapter.get_audio_features(track_id)
+        result, _ = await scheduled_call("spotify", priority, "get_audio_features", track_id=track_id)
         return {
             "provider": "spotify",
             "track_id": track_id,
             "data": result
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Get audio features failed",
@@ -506,6 +583,26 @@ async def reset_circuit_breaker(provider: str):
         raise HTTPException(status_code=400, detail=f"Provider {provider} does not have circuit breaker")
 
 
+@app.get("/admin/scheduler")
+async def get_scheduler_stats():
+    """Get per-provider queue depth and wait time by priority class."""
+    return {provider: scheduler.get_stats() for provider, scheduler in schedulers.items()}
+
+
+@app.get("/admin/cache/workload")
+async def get_cache_workload(top: int = Query(20, ge=1, le=500)):
+    """Get recorded request frequency per adapter operation and the hottest queries."""
+    return workload_tracker.get_stats(top)
+
+
+@app.post("/admin/cache/warm")
+async def trigger_cache_warming():
+    """Run a cache warming cycle now."""
+    if not cache_warmer:
+        raise HTTPException(status_code=503, detail="Cache warming not initialized")
+    return await cache_warmer.warm_once()
+
+
 @app.get("/admin/cache/stats")
 async def get_cache_stats():
     """Get cache statistics from unified clients."""
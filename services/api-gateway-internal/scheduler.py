@@ -0,0 +1,254 @@
+"""
+Priority-Aware Provider Scheduler
+=================================
+
+Sits in front of the adapters so interactive lookups do not queue behind
+bulk enrichment backfills competing for the same provider quota.
+
+- Priority classes: request priority 1-10 maps to bulk (1-3), normal (4-7)
+  and interactive (8-10).
+- Weighted fair queuing: every queued call gets a virtual finish tag
+  (class start tag + 1 / class weight) and the smallest tag is dispatched
+  first, so each backlogged class receives throughput in proportion to its
+  weight and none starves.
+- Quota reservation: dispatch is paced by a token bucket matching the
+  provider rate limit, and non-interactive calls may not use the last
+  reserved tokens or concurrency slots, which stay free for interactive
+  traffic.
+
+Queue depth and wait time are exported per provider and priority class.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = structlog.get_logger(__name__)
+
+api_gateway_scheduler_queue_depth = Gauge(
+    'api_gateway_scheduler_queue_depth',
+    'Calls waiting in the provider scheduler',
+    ['provider', 'priority_class']
+)
+
+api_gateway_scheduler_wait_seconds = Histogram(
+    'api_gateway_scheduler_wait_seconds',
+    'Time calls wait in the provider scheduler before dispatch',
+    ['provider', 'priority_class'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+api_gateway_scheduler_rejected_total = Counter(
+    'api_gateway_scheduler_rejected_total',
+    'Calls rejected because the provider queue was full',
+    ['provider', 'priority_class']
+)
+
+
+class PriorityClass(str, Enum):
+    """Scheduling classes, most urgent first."""
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+
+DEFAULT_WEIGHTS = {
+    PriorityClass.INTERACTIVE: 8.0,
+    PriorityClass.NORMAL: 3.0,
+    PriorityClass.BULK: 1.0,
+}
+
+
+def priority_class(priority: int) -> PriorityClass:
+    """Map a 1-10 request priority (10 = most urgent) to a scheduling class."""
+    if priority >= 8:
+        return PriorityClass.INTERACTIVE
+    if priority >= 4:
+        return PriorityClass.NORMAL
+    return PriorityClass.BULK
+
+
+class SchedulerQueueFull(Exception):
+    """Raised when a provider queue has no room for another call."""
+    pass
+
+
+@dataclass
+class _ClassQueue:
+    weight: float
+    entries: Deque = field(default_factory=deque)
+    last_finish: float = 0.0
+    dispatched: int = 0
+    total_wait: float = 0.0
+
+
+class ProviderScheduler:
+    """
+    Weighted fair queue with interactive quota reservation for one provider.
+
+    Usage:
+        scheduler = ProviderScheduler("spotify", rate=10.0, capacity=10, max_concurrency=8)
+        result = await scheduler.run(priority, lambda: adapter.search_track(...))
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        rate: float,
+        capacity: int,
+        max_concurrency: int = 8,
+        reserve_fraction: float = 0.2,
+        max_queue_size: int = 1000,
+        weights: Optional[Dict[PriorityClass, float]] = None
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            provider: Provider name (metrics label)
+            rate: Dispatch rate in calls per second (provider rate limit)
+            capacity: Token bucket burst capacity
+            max_concurrency: Maximum calls in flight to the provider
+            reserve_fraction: Share of tokens and slots kept for interactive calls
+            max_queue_size: Maximum queued calls before rejecting new ones
+            weights: Per-class WFQ weights
+        """
+        self.provider = provider
+        self.rate = rate
+        self.capacity = float(capacity)
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        # Never reserve everything: other classes must still be able to run
+        self.reserved_tokens = min(capacity * reserve_fraction, capacity - 1.0)
+        self.reserved_slots = min(int(max_concurrency * reserve_fraction), max_concurrency - 1)
+
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.queues = {cls: _ClassQueue(weight=weights[cls]) for cls in PriorityClass}
+        self.tokens = float(capacity)
+        self.in_flight = 0
+        self.virtual_time = 0.0
+        self._last_refill = time.monotonic()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q.entries) for q in self.queues.values())
+
+    async def run(self, priority: int, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Wait for a dispatch slot according to `priority`, then await `call()`."""
+        await self.acquire(priority_class(priority))
+        try:
+            return await call()
+        finally:
+            self.release()
+
+    async def acquire(self, cls: PriorityClass):
+        if self.queued >= self.max_queue_size:
+            api_gateway_scheduler_rejected_total.labels(provider=self.provider, priority_class=cls.value).inc()
+            raise SchedulerQueueFull(f"Scheduler queue for {self.provider} is full")
+
+        queue = self.queues[cls]
+        start = max(self.virtual_time, queue.last_finish)
+        queue.last_finish = start + 1.0 / queue.weight
+        future = asyncio.get_running_loop().create_future()
+        queue.entries.append((queue.last_finish, time.monotonic(), future))
+        self._set_depth(cls)
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Dispatched just as the caller went away: hand the slot back
+                self.release()
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _admissible(self, cls: PriorityClass) -> bool:
+        if cls == PriorityClass.INTERACTIVE:
+            return self.tokens >= 1.0 and self.in_flight < self.max_concurrency
+        return (self.tokens >= 1.0 + self.reserved_tokens and
+                self.in_flight < self.max_concurrency - self.reserved_slots)
+
+    def _dispatch(self):
+        self._refill()
+        while True:
+            heads = []
+            for cls, queue in self.queues.items():
+                while queue.entries and queue.entries[0][2].done():
+                    queue.entries.popleft()  # Caller cancelled while waiting
+                    self._set_depth(cls)
+                if queue.entries:
+                    heads.append((queue.entries[0][0], cls))
+            if not heads:
+                return
+
+            # Smallest finish tag first, skipping classes held back by the reservation
+            for _, cls in sorted(heads, key=lambda head: head[0]):
+                if self._admissible(cls):
+                    break
+            else:
+                self._schedule_retry([cls for _, cls in heads])
+                return
+
+            finish, enqueued_at, future = self.queues[cls].entries.popleft()
+            self.virtual_time = max(self.virtual_time, finish - 1.0 / self.queues[cls].weight)
+            self.tokens -= 1.0
+            self.in_flight += 1
+
+            wait = time.monotonic() - enqueued_at
+            queue = self.queues[cls]
+            queue.dispatched += 1
+            queue.total_wait += wait
+            api_gateway_scheduler_wait_seconds.labels(provider=self.provider, priority_class=cls.value).observe(wait)
+            self._set_depth(cls)
+            future.set_result(None)
+
+    def _schedule_retry(self, waiting):
+        """Re-run dispatch once enough tokens are due; slot releases trigger dispatch themselves."""
+        needed = min(1.0 if cls == PriorityClass.INTERACTIVE else 1.0 + self.reserved_tokens for cls in waiting)
+        if self._timer is not None or self.tokens >= needed:
+            return
+        delay = (needed - self.tokens) / self.rate
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def _set_depth(self, cls: PriorityClass):
+        api_gateway_scheduler_queue_depth.labels(provider=self.provider, priority_class=cls.value).set(
+            len(self.queues[cls].entries)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and wait time per priority class."""
+        self._refill()
+        return {
+            "in_flight": self.in_flight,
+            "tokens": round(self.tokens, 2),
+            "reserved_tokens": self.reserved_tokens,
+            "reserved_slots": self.reserved_slots,
+            "classes": {
+                cls.value: {
+                    "queue_depth": len(queue.entries),
+                    "dispatched": queue.dispatched,
+                    "avg_wait_seconds": round(queue.total_wait / queue.dispatched, 4) if queue.dispatched else 0.0,
+                }
+                for cls, queue in self.queues.items()
+            },
+        }
@@ -0,0 +1,100 @@
+"""Unit tests for workload-derived, refresh-ahead cache warming"""
+import pytest
+
+from cache_warming import CacheWarmer, WorkloadTracker
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = []
+
+    def ttl(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        return [self.redis.ttls.get(key, -2) for key in self.keys]
+
+
+class FakeRedis:
+    """Remaining TTL per key; missing keys report -2 like Redis"""
+
+    def __init__(self, ttls):
+        self.ttls = dict(ttls)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def _record(tracker, title, times, now=None):
+    for _ in range(times):
+        tracker.record("spotify", "search_track", {"artist": "Deadmau5", "title": title},
+                       [f"spotify:search:deadmau5:{title.lower()}"], now=now)
+
+
+def test_hot_set_follows_decayed_frequency():
+    tracker = WorkloadTracker(half_life=100)
+    _record(tracker, "Strobe", 8, now=0.0)
+    _record(tracker, "Ghosts", 3, now=300.0)
+    _record(tracker, "Once", 1, now=300.0)
+
+    hot = tracker.hot_set(10, min_score=2.0, now=300.0)
+
+    # Strobe decayed to 1 after three half-lives; one-off queries never count
+    assert [dict(key[2])["title"] for key, _ in hot] == ["Ghosts"]
+    assert tracker.requests_by_operation[("spotify", "search_track")] == 12
+
+
+@pytest.mark.asyncio
+async def test_warms_expiring_and_cold_hot_keys_within_quota_share():
+    tracker = WorkloadTracker()
+    _record(tracker, "Strobe", 10)    # Expires soon -> refresh ahead
+    _record(tracker, "Ghosts", 9)     # Fresh -> untouched
+    _record(tracker, "Raise", 8)      # Evicted -> prefetch
+    _record(tracker, "Professional", 7)  # Expires soon, but over budget
+    redis = FakeRedis({
+        "spotify:search:deadmau5:strobe": 60,
+        "spotify:search:deadmau5:ghosts": 600000,
+        "spotify:search:deadmau5:professional": 60,
+    })
+    refreshed = []
+
+    async def refresh_query(provider, operation, kwargs):
+        refreshed.append(kwargs["title"])
+        return [f"spotify:search:deadmau5:{kwargs['title'].lower()}"]
+
+    # 10 req/s * 1s interval * 0.2 share = 2 fetches per cycle
+    warmer = CacheWarmer(tracker, redis, refresh_query, quotas={"spotify": 10.0},
+                         quota_share=0.2, interval=1, refresh_ahead=3600)
+    results = await warmer.warm_once()
+
+    assert refreshed == ["Strobe", "Raise"]
+    assert results == {"refreshed": 1, "prefetched": 1, "skipped": 1}
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_cold_queries_are_not_retried_every_cycle():
+    tracker = WorkloadTracker()
+    _record(tracker, "Nothing", 5)
+    calls = []
+
+    async def refresh_query(provider, operation, kwargs):
+        calls.append(kwargs)
+        return []
+
+    warmer = CacheWarmer(tracker, FakeRedis({}), refresh_query, quotas={"spotify": 10.0},
+                         interval=60, refresh_ahead=3600)
+    await warmer.warm_once()
+    await warmer.warm_once()
+
+    assert len(calls) == 1
+
+
+def test_snapshot_round_trip():
+    tracker = WorkloadTracker()
+    _record(tracker, "Strobe", 3)
+
+    restored = WorkloadTracker()
+    restored.load(tracker.snapshot())
+
+    assert restored.hot_set(5)[0][1].cache_keys == ["spotify:search:deadmau5:strobe"]
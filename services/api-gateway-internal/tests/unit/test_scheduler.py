@@ -0,0 +1,110 @@
+"""Unit tests for the priority-aware provider scheduler"""
+import asyncio
+import time
+
+import pytest
+
+from scheduler import PriorityClass, ProviderScheduler, SchedulerQueueFull, priority_class
+
+INTERACTIVE, NORMAL, BULK = 9, 5, 1
+
+
+def _p99(values):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * 0.99))]
+
+
+async def _timed_call(scheduler, priority, latencies, duration=0.01):
+    started = time.monotonic()
+    await scheduler.run(priority, lambda: asyncio.sleep(duration))
+    latencies.append(time.monotonic() - started)
+
+
+def test_priority_classes():
+    assert [priority_class(p) for p in (10, 8, 7, 4, 3, 1)] == [
+        PriorityClass.INTERACTIVE, PriorityClass.INTERACTIVE,
+        PriorityClass.NORMAL, PriorityClass.NORMAL,
+        PriorityClass.BULK, PriorityClass.BULK,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_interactive_p99_stays_bounded_under_bulk_backfill():
+    scheduler = ProviderScheduler("test", rate=100.0, capacity=10, max_concurrency=4)
+    bulk_latencies, interactive_latencies = [], []
+
+    backfill = [asyncio.create_task(_timed_call(scheduler, BULK, bulk_latencies)) for _ in range(200)]
+    interactive = []
+    for _ in range(40):
+        await asyncio.sleep(0.02)
+        interactive.append(asyncio.create_task(_timed_call(scheduler, INTERACTIVE, interactive_latencies)))
+    await asyncio.gather(*backfill, *interactive)
+
+    # The backfill alone needs ~2s at 100 req/s; interactive calls must not wait behind it
+    assert max(bulk_latencies) > 1.5
+    assert _p99(interactive_latencies) < 0.1
+    assert scheduler.get_stats()["classes"]["bulk"]["dispatched"] == 200
+
+
+@pytest.mark.asyncio
+async def test_backlogged_classes_share_dispatches_by_weight():
+    scheduler = ProviderScheduler("test", rate=1000.0, capacity=1, max_concurrency=1, reserve_fraction=0)
+    order = []
+
+    async def call(cls):
+        order.append(cls)
+
+    # Hold the only slot so every class builds a backlog before dispatch starts
+    await scheduler.acquire(PriorityClass.BULK)
+    tasks = [
+        asyncio.create_task(scheduler.run(priority, lambda p=priority: call(priority_class(p))))
+        for priority in [INTERACTIVE] * 40 + [NORMAL] * 40 + [BULK] * 40
+    ]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    # 8:3:1 weights over the first 48 dispatches, within one of tag rounding
+    first = order[:48]
+    assert abs(first.count(PriorityClass.INTERACTIVE) - 32) <= 1
+    assert abs(first.count(PriorityClass.NORMAL) - 12) <= 1
+    assert abs(first.count(PriorityClass.BULK) - 4) <= 1
+
+
+@pytest.mark.asyncio
+async def test_reserved_slot_is_kept_for_interactive_calls():
+    scheduler = ProviderScheduler("test", rate=1000.0, capacity=100, max_concurrency=5, reserve_fraction=0.2)
+    release = asyncio.Event()
+    running = []
+
+    async def hold(cls):
+        running.append(cls)
+        await release.wait()
+
+    tasks = [asyncio.create_task(scheduler.run(BULK, lambda: hold(PriorityClass.BULK))) for _ in range(6)]
+    await asyncio.sleep(0.01)
+    assert scheduler.in_flight == 4  # One of five slots stays free
+
+    tasks.append(asyncio.create_task(scheduler.run(INTERACTIVE, lambda: hold(PriorityClass.INTERACTIVE))))
+    await asyncio.sleep(0.01)
+    assert running[-1] == PriorityClass.INTERACTIVE and scheduler.in_flight == 5
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_and_cancelled_waiters_are_skipped():
+    scheduler = ProviderScheduler("test", rate=1000.0, capacity=10, max_concurrency=1, max_queue_size=2)
+    await scheduler.acquire(PriorityClass.INTERACTIVE)
+
+    waiting = [asyncio.create_task(scheduler.acquire(PriorityClass.BULK)) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(SchedulerQueueFull):
+        await scheduler.acquire(PriorityClass.BULK)
+
+    waiting[0].cancel()
+    scheduler.release()
+    await asyncio.wait_for(waiting[1], 1)
+    assert scheduler.in_flight == 1 and scheduler.queued == 0
@@ -11,10 +11,11 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-import httpx
 import structlog
 from pydantic import BaseModel, Field
 
+from common.llm_client import AdaptiveLimiter, LLMClient, compact_html
+
 logger = structlog.get_logger(__name__)
 
 
@@ -46,6 +47,9 @@ class OllamaConfig(BaseModel):
     default_model: str = "llama3.2:3b"  # Fast, capable 3B parameter model
     timeout: int = 120
     max_retries: int = 3
+    max_concurrency: int = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "8"))
+    cache_size: int = int(os.getenv("OLLAMA_CACHE_SIZE", "512"))
+    cache_ttl: int = int(os.getenv("OLLAMA_CACHE_TTL", "3600"))
     temperature: float = 0.1  # Low temperature for consistent extraction
     top_p: float = 0.9
 
@@ -233,9 +237,13 @@ class OllamaExtractor:
 
     def __init__(self, config: Optional[OllamaConfig] = None):
         self.config = config or OllamaConfig()
-        self.client = httpx.AsyncClient(
-            base_url=self.config.base_url,
-            timeout=httpx.Timeout(self.config.timeout)
+        self.llm = LLMClient(
+            self.config.base_url,
+            timeout=self.config.timeout,
+            max_retries=self.config.max_retries,
+            cache_size=self.config.cache_size,
+            cache_ttl=self.config.cache_ttl,
+            limiter=AdaptiveLimiter(maximum=self.config.max_concurrency)
         )
         self.templates = PromptTemplates()
 
@@ -321,59 +329,37 @@ class OllamaExtractor:
 
     async def _call_ollama(self, model: str, prompt: str) -> tuple[Dict[str, Any], int]:
         """
-        Make API call to Ollama with retry logic
+        Make API call to Ollama through the shared client
+
+        Retries, request coalescing, result caching and concurrency limits
+        are handled by LLMClient.
 
         Returns:
             Tuple of (extracted_data dict, tokens_processed)
         """
-        for attempt in range(self.config.max_retries):
-            try:
-                response = await self.client.post(
-                    "/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": self.config.temperature,
-                            "top_p": self.config.top_p,
-                            "num_predict": 2048,  # Max tokens to generate
-                        },
-                        "format": "json"  # Request JSON output
-                    }
-                )
-
-                response.raise_for_status()
-                result = response.json()
-
-                # Extract response text
-                response_text = result.get("response", "")
-                tokens = result.get("eval_count", 0)
-
-                # Parse JSON from response
-                extracted_data = self._parse_json_response(response_text)
-
-                return extracted_data, tokens
-
-            except httpx.HTTPError as e:
-                logger.warning(
-                    "Ollama API call failed",
-                    attempt=attempt + 1,
-                    max_retries=self.config.max_retries,
-                    error=str(e)
-                )
-
-                if attempt == self.config.max_retries - 1:
-                    raise
+        result = await self.llm.generate(
+            model=model,
+            prompt=prompt,
+            options={
+                "temperature": self.config.temperature,
+                "top_p": self.config.top_p,
+                "num_predict": 2048,  # Max tokens to generate
+            },
+            format="json"  # Request JSON output
+        )
 
-                # Exponential backoff
-                await asyncio.sleep(2 ** attempt)
+        # Extract response text
+        response_text = result.get("response", "")
+        tokens = result.get("eval_count", 0)
 
-            except json.JSONDecodeError as e:
-                logger.error("Failed to parse Ollama JSON response", error=str(e))
-                raise
+        # Parse JSON from response
+        try:
+            extracted_data = self._parse_json_response(response_text)
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse Ollama JSON response", error=str(e))
+            raise
 
-        raise Exception("Max retries exceeded for Ollama API call")
+        return extracted_data, tokens
 
     def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
         """Parse JSON from Ollama response, handling markdown code blocks"""
@@ -421,6 +407,9 @@ class OllamaExtractor:
         context: Optional[Dict[str, Any]]
     ) -> str:
         """Format prompt template with raw text and context"""
+        # Drop scripts, styles and page chrome so the limit below keeps content
+        raw_text = compact_html(raw_text)
+
         # Truncate raw_text if too long (keep first 8000 chars)
         if len(raw_text) > 8000:
             raw_text = raw_text[:8000] + "\n\n[Content truncated...]"
@@ -479,7 +468,7 @@ class OllamaExtractor:
         items: List[Dict[str, Any]],
         extraction_type: str,
         model: Optional[str] = None,
-        concurrency: int = 3
+        concurrency: Optional[int] = None
     ) -> List[ExtractionResult]:
         """
         Process multiple extraction tasks concurrently
@@ -488,12 +477,13 @@ class OllamaExtractor:
             items: List of dicts with 'raw_text' and optional 'context'
             extraction_type: Type of extraction
             model: Ollama model to use
-            concurrency: Max concurrent extractions
+            concurrency: Optional cap on concurrent extractions; the shared
+                client's adaptive limit applies either way
 
         Returns:
             List of ExtractionResult objects
         """
-        semaphore = asyncio.Semaphore(concurrency)
+        semaphore = asyncio.Semaphore(concurrency or len(items) or 1)
 
         async def extract_one(item: Dict[str, Any]) -> ExtractionResult:
             async with semaphore:
@@ -509,19 +499,16 @@ class OllamaExtractor:
 
     async def close(self):
         """Close HTTP client"""
-        await self.client.aclose()
+        await self.llm.close()
 
     async def health_check(self) -> Dict[str, Any]:
         """Check Ollama service health"""
         try:
-            response = await self.client.get("/api/tags", timeout=5.0)
-            response.raise_for_status()
-
-            models = response.json().get("models", [])
+            models = await self.llm.list_models()
 
             return {
                 "status": "healthy",
-                "available_models": [m.get("name") for m in models],
+                "available_models": models,
                 "base_url": self.config.base_url
             }
         except Exception as e:
@@ -0,0 +1,124 @@
+"""Unit tests for the shared Ollama client against a local fake Ollama server"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from common.llm_client import AdaptiveLimiter, LLMClient, compact_html
+from ollama_extractor import OllamaConfig, OllamaExtractor
+
+SERVICES_DIR = Path(__file__).resolve().parents[3]
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    """Answers /api/generate after a short delay and records every prompt"""
+
+    prompts = []
+    delay = 0.05
+    response = {"tracks": [{"position": 1, "artist": "Eric Prydz", "title": "Opus"}]}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeOllama.prompts.append(body["prompt"])
+        time.sleep(FakeOllama.delay)
+        self._reply({"model": body["model"], "response": json.dumps(self.response), "eval_count": 42})
+
+    def do_GET(self):
+        self._reply({"models": [{"name": "llama3.2:3b"}]})
+
+    def _reply(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama_url():
+    FakeOllama.prompts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_are_coalesced_then_cached(ollama_url):
+    client = LLMClient(ollama_url)
+    try:
+        results = await asyncio.gather(*(client.generate("m", "same prompt") for _ in range(5)))
+        cached = await client.generate("m", "same prompt")
+        other = await client.generate("m", "same prompt", options={"temperature": 0.9})
+        uncached = await client.generate("m", "same prompt", cache=False)
+    finally:
+        await client.close()
+
+    assert all(r == results[0] for r in results + [cached, other, uncached])
+    assert len(FakeOllama.prompts) == 3
+    assert client.stats["coalesced"] == 4
+    assert client.stats["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_grows_when_fast_and_backs_off_when_slow():
+    limiter = AdaptiveLimiter(initial=2, maximum=4)
+    for _ in range(20):
+        await limiter.acquire()
+        await limiter.release(0.1)
+    assert limiter.limit == 4
+
+    await limiter.acquire()
+    await limiter.release(1.0)
+    assert limiter.limit == 3
+
+    await limiter.acquire()
+    await limiter.release(None, ok=False)
+    assert limiter.limit == pytest.approx(2.25)
+
+
+def test_compact_html_drops_scripts_styles_and_navigation():
+    html = """<html><head><style>body { color: red }</style><script>track('x')</script></head>
+    <body><nav><a href="/about">About</a></nav>
+    <div class="result"><a href="/tracklist/1/opus.html">Eric Prydz - Opus</a></div>
+    <aside>Popular: <a href="/tracklist/2/other.html">Other</a></aside>
+    <p>Played   at&nbsp;Printworks</p></body></html>"""
+
+    compacted = compact_html(html)
+
+    assert compacted == '<a href="/tracklist/1/opus.html">Eric Prydz - Opus</a>\nPlayed at\xa0Printworks'
+    assert compact_html("1. Eric Prydz - Opus") == "1. Eric Prydz - Opus"
+
+
+@pytest.mark.asyncio
+async def test_extractor_prompts_with_compacted_html(ollama_url):
+    extractor = OllamaExtractor(OllamaConfig(base_url=ollama_url))
+    page = "<html><script>" + "x" * 10000 + "</script><body><li>Eric Prydz - Opus</li></body></html>"
+    try:
+        results = await extractor.batch_extract([{"raw_text": page}] * 3, "tracklist")
+        health = await extractor.health_check()
+    finally:
+        await extractor.close()
+
+    assert all(r.success and r.extracted_data == FakeOllama.response for r in results)
+    assert len(FakeOllama.prompts) == 1
+    assert "Eric Prydz - Opus" in FakeOllama.prompts[0] and "xxxx" not in FakeOllama.prompts[0]
+    assert health["available_models"] == ["llama3.2:3b"]
+
+
+@pytest.mark.skipif(not (SERVICES_DIR / "common" / "llm_client.py").exists(),
+                    reason="Shared source tree not available")
+def test_vendored_copies_match_shared_client():
+    shared = (SERVICES_DIR / "common" / "llm_client.py").read_text()
+    for copy in ["browser-collector/common/llm_client.py", "nlp-processor/llm_client.py"]:
+        assert (SERVICES_DIR / copy).read_text() == shared, f"{copy} is out of sync with common/llm_client.py"
@@ -0,0 +1,283 @@
+"""
+Shared async client for the Ollama generate API
+
+Services build from their own directory, so this module is vendored as-is into
+services/nlp-processor/llm_client.py and
+services/browser-collector/common/llm_client.py. Edit this copy and sync the
+others; unit tests fail when the copies drift.
+
+Features:
+- Identical in-flight requests are coalesced into a single Ollama call
+- Results are cached (LRU + TTL) by model, prompt, options and content hash
+- Concurrency adapts to observed latency (AIMD around the best latency seen)
+- `compact_html` strips scripts, styles and page chrome before prompting
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Elements whose content never helps extraction
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer", "aside"}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_BLOCK_TAGS = {"p", "div", "li", "tr", "br", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "table", "ul", "ol"}
+_LOOKS_LIKE_HTML = re.compile(r"<\s*(html|body|div|p|a|span|script|li|table|!doctype)\b", re.IGNORECASE)
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+
+class _HTMLCompactor(HTMLParser):
+    """Keeps visible text and link targets, drops everything in _SKIPPED_TAGS"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            if tag not in _VOID_TAGS:
+                self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                # Link targets are what URL extraction prompts look for
+                self.parts.append(f'<a href="{href}">')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag not in _SKIPPED_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif not self.skip_depth and tag == "a":
+            self.parts.append("</a>")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def compact_html(text: str) -> str:
+    """
+    Reduce an HTML page to its visible text and links
+
+    Scripts, styles and navigation/header/footer/sidebar chrome are removed,
+    so prompts spend their context on content. Plain text is returned as-is.
+    """
+    if not _LOOKS_LIKE_HTML.search(text):
+        return text
+
+    parser = _HTMLCompactor()
+    try:
+        parser.feed(text)
+        parser.close()
+    except Exception as e:
+        logger.warning(f"HTML compaction failed, using raw text: {e}")
+        return text
+
+    compacted = _SPACES.sub(" ", "".join(parser.parts))
+    compacted = "\n".join(line.strip() for line in compacted.split("\n"))
+    return _BLANK_LINES.sub("\n", compacted).strip()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that follows observed latency
+
+    The best smoothed latency seen acts as the baseline. While requests finish
+    within `tolerance` times the baseline the limit grows by one per window of
+    requests (additive increase); slower requests, timeouts and errors shrink
+    it by `backoff` (multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        initial: int = 3,
+        minimum: int = 1,
+        maximum: int = 16,
+        tolerance: float = 2.0,
+        backoff: float = 0.75,
+        smoothing: float = 0.2
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: Optional[float] = None, ok: bool = True):
+        async with self._condition:
+            self.in_flight -= 1
+            self._update(latency, ok)
+            self._condition.notify_all()
+
+    def _update(self, latency: Optional[float], ok: bool):
+        if not ok or latency is None:
+            self.limit = max(self.minimum, self.limit * self.backoff)
+            return
+
+        self.latency = latency if self.latency is None else (
+            self.smoothing * latency + (1 - self.smoothing) * self.latency
+        )
+        self.baseline = self.latency if self.baseline is None else min(self.baseline, self.latency)
+
+        if latency > self.baseline * self.tolerance:
+            self.limit = max(self.minimum, self.limit * self.backoff)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+
+class LLMClient:
+    """
+    Async Ollama client shared by the services that prompt LLMs
+
+    `generate` returns the raw Ollama response body. Identical concurrent
+    calls share one request and recent results are served from the cache;
+    pass `cache=False` for sampling-style prompts that should not be reused.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 120,
+        max_retries: int = 3,
+        cache_size: int = 512,
+        cache_ttl: float = 3600,
+        limiter: Optional[AdaptiveLimiter] = None
+    ):
+        self.base_url = base_url
+        self.max_retries = max(1, max_retries)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.limiter = limiter or AdaptiveLimiter()
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=httpx.Timeout(timeout))
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "errors": 0}
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def cache_key(model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+                  format: Optional[str] = None) -> str:
+        payload = json.dumps([model, options or {}, format], sort_keys=True)
+        return f"{content_hash(payload)}:{content_hash(prompt)}"
+
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[str] = None,
+        cache: bool = True
+    ) -> Dict[str, Any]:
+        """Run one /api/generate call (non-streaming)"""
+        body = {"model": model, "prompt": prompt, "stream": False, "options": options or {}}
+        if format:
+            body["format"] = format
+        if not cache:
+            return await self._request(body)
+
+        key = self.cache_key(model, prompt, options, format)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            future = asyncio.ensure_future(self._request(body))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f, key=key: self._finish(key, f))
+
+        # One caller giving up must not cancel the request for the others
+        return dict(await asyncio.shield(future))
+
+    def _finish(self, key: str, future: asyncio.Future):
+        self._in_flight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self._cache_put(key, future.result())
+
+    async def _request(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in range(self.max_retries):
+            await self.limiter.acquire()
+            started = time.monotonic()
+            ok = False
+            try:
+                self.stats["requests"] += 1
+                response = await self.client.post("/api/generate", json=body)
+                response.raise_for_status()
+                result = response.json()
+                ok = True
+                return result
+            except httpx.HTTPError as e:
+                self.stats["errors"] += 1
+                logger.warning(
+                    f"Ollama request failed (attempt {attempt + 1}/{self.max_retries}): {e}"
+                )
+                if attempt == self.max_retries - 1:
+                    raise
+            finally:
+                await self.limiter.release(time.monotonic() - started if ok else None, ok)
+
+            # Exponential backoff
+            await asyncio.sleep(2 ** attempt)
+
+        raise RuntimeError("Max retries exceeded for Ollama API call")
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return dict(result)
+
+    def _cache_put(self, key: str, result: Dict[str, Any]):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def list_models(self) -> List[str]:
+        response = await self.client.get("/api/tags", timeout=5.0)
+        response.raise_for_status()
+        return [m.get("name") for m in response.json().get("models", [])]
+
+    async def close(self):
+        await self.client.aclose()
@@ -16,6 +16,7 @@ import os
 import re
 from enum import Enum
 import hashlib
+import socket
 
 import redis
 import redis.asyncio as aioredis
@@ -55,6 +56,11 @@ batch_size_histogram = Histogram('batch_size', 'Batch operation sizes', ['operat
 connection_pool_usage = Gauge('connection_pool_usage', 'Connection pool utilization')
 database_operation_duration = Histogram('database_operation_duration_seconds', 'Database operation duration', ['operation_type'])
 
+# Task worker pool metrics
+tasks_in_flight = Gauge('transformation_tasks_in_flight', 'Tasks fetched by this consumer and not yet acked')
+task_fetch_batch_size = Histogram('transformation_task_fetch_batch_size', 'Tasks fetched per queue round trip', buckets=[1, 2, 5, 10, 20, 50, 100])
+recovered_tasks_total = Counter('transformation_tasks_recovered_total', 'In-flight tasks requeued from dead consumers')
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Data Transformer Service",
@@ -85,6 +91,18 @@ redis_client = redis.Redis(connection_pool=redis_connection_pool)
 # Async Redis client for background workers (REQUIRED for async operations)
 async_redis_client: Optional[aioredis.Redis] = None
 
+# Reliable task queue: tasks move atomically from the queue to a per-consumer
+# processing list and are removed from it (acked) only once processed, so
+# tasks in flight when a consumer dies are requeued instead of lost
+TASK_QUEUE_KEY = "transformation:queue"
+TASK_PROCESSING_KEY_PREFIX = "transformation:processing:"
+TASK_CONSUMER_KEY_PREFIX = "transformation:consumer:"
+TASK_STATUS_TTL_SECONDS = 86400
+TASK_WORKER_CONCURRENCY = int(os.getenv("TASK_WORKER_CONCURRENCY", "4"))
+TASK_FETCH_BATCH_SIZE = int(os.getenv("TASK_FETCH_BATCH_SIZE", "10"))
+TASK_CONSUMER_HEARTBEAT_TTL = int(os.getenv("TASK_CONSUMER_HEARTBEAT_TTL", "30"))
+TASK_CONSUMER_ID = os.getenv("TASK_CONSUMER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
 # Database configuration
 DATABASE_CONFIG = {
     "host": os.getenv("POSTGRES_HOST", "db-connection-pool"),
@@ -533,6 +551,23 @@ class DataEnricher:
         
         return None
 
+def task_status_mapping(task: TransformationTask) -> Dict[str, str]:
+    """Redis hash fields for a task's status; the track payload is summarised, not copied"""
+    mapping = {}
+    for field, value in task.dict(exclude={"source_data"}).items():
+        if value is None:
+            continue
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, (dict, list)):
+            value = json.dumps(value, default=str)
+        mapping[field] = str(value)
+    
+    mapping["record_count"] = str(len(task.source_data) if isinstance(task.source_data, list) else 1)
+    return mapping
+
 # =====================
 # Transformation Engine
 # =====================
@@ -694,10 +729,20 @@ class TransformationEngine:
         return deduplicated
     
     async def _update_task_status(self, task: TransformationTask):
-        """Update task status in Redis"""
+        """Update task status in Redis (hset + expire in one round trip)"""
         task_key = f"transformation:task:{task.id}"
-        redis_client.hset(task_key, mapping=task.dict())
-        redis_client.expire(task_key, 86400)  # Expire after 24 hours
+        mapping = task_status_mapping(task)
+        
+        if async_redis_client:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(task_key, mapping=mapping)
+                pipe.expire(task_key, TASK_STATUS_TTL_SECONDS)
+                await pipe.execute()
+        else:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hset(task_key, mapping=mapping)
+            pipe.expire(task_key, TASK_STATUS_TTL_SECONDS)
+            pipe.execute()
     
     async def _store_results(self, result: TransformationResult):
         """Store transformation results in database with optimized batch operations"""
@@ -917,92 +962,195 @@ async def init_database():
 # Background Workers
 # =====================
 
-async def task_processor():
-    """Background worker to process transformation tasks from Redis queue with robust async handling
-
-    CRITICAL FIX (2025-10-02):
-    - Uses async Redis client (redis.asyncio) instead of sync client
-    - Properly handles blpop timeouts without flooding logs
-    - Implements exponential backoff for connection errors
-    - Prevents event loop blocking with async/await patterns
+class TaskWorkerPool:
     """
-    if not async_redis_client:
-        logger.error("❌ Async Redis client not initialized - task processor cannot start")
-        return
-
-    consecutive_errors = 0
-    max_consecutive_errors = 10
-    logger.info("✅ Task processor started - waiting for transformation tasks")
-
-    while True:
+    Concurrent, crash-safe consumer for the transformation queue
+
+    A fetcher moves up to `batch_size` tasks per round trip from the queue
+    into this consumer's processing list (BLMOVE for the first, pipelined
+    LMOVEs for the rest) and hands them to `concurrency` workers through a
+    bounded local queue, so fetching pauses while all workers are busy.
+    A task is removed from the processing list only after it has been
+    processed. Each consumer refreshes a heartbeat key; processing lists
+    whose owner's heartbeat has expired are moved back onto the queue.
+    """
+    
+    def __init__(
+        self,
+        redis_conn: aioredis.Redis,
+        engine: "TransformationEngine",
+        concurrency: int = TASK_WORKER_CONCURRENCY,
+        batch_size: int = TASK_FETCH_BATCH_SIZE,
+        consumer_id: str = TASK_CONSUMER_ID,
+        heartbeat_ttl: int = TASK_CONSUMER_HEARTBEAT_TTL
+    ):
+        self.redis = redis_conn
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.consumer_id = consumer_id
+        self.heartbeat_ttl = heartbeat_ttl
+        self.processing_key = f"{TASK_PROCESSING_KEY_PREFIX}{consumer_id}"
+        self.heartbeat_key = f"{TASK_CONSUMER_KEY_PREFIX}{consumer_id}"
+        self._pending: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+    
+    async def run(self):
+        """Recover orphaned tasks, then fetch and process until cancelled"""
+        await self._heartbeat()
+        await self.recover_inflight_tasks(include_own=True)
+        
+        background = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        background.append(asyncio.create_task(self._heartbeat_loop()))
+        logger.info(f"✅ Task worker pool started: consumer={self.consumer_id}, "
+                    f"workers={self.concurrency}, fetch_batch={self.batch_size}")
         try:
-            # Use async blpop with timeout (non-blocking for event loop)
+            await self._fetch_loop()
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+    
+    async def fetch_batch(self, timeout: int = 5) -> List[str]:
+        """Move up to batch_size tasks into the processing list; blocks for the first"""
+        first = await self.redis.blmove(TASK_QUEUE_KEY, self.processing_key, timeout, "LEFT", "RIGHT")
+        if first is None:
+            return []
+        
+        batch = [first]
+        if self.batch_size > 1:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for _ in range(self.batch_size - 1):
+                    pipe.lmove(TASK_QUEUE_KEY, self.processing_key, "LEFT", "RIGHT")
+                batch.extend(raw for raw in await pipe.execute() if raw is not None)
+        
+        task_fetch_batch_size.observe(len(batch))
+        return batch
+    
+    async def ack(self, raw_task: str):
+        """Remove a processed task from the processing list"""
+        await self.redis.lrem(self.processing_key, 1, raw_task)
+        tasks_in_flight.dec()
+    
+    async def recover_inflight_tasks(self, include_own: bool = False) -> int:
+        """Requeue tasks held by consumers whose heartbeat has expired"""
+        recovered = 0
+        async for key in self.redis.scan_iter(match=f"{TASK_PROCESSING_KEY_PREFIX}*"):
+            owner = key[len(TASK_PROCESSING_KEY_PREFIX):]
+            if owner == self.consumer_id:
+                if not include_own:
+                    continue
+            elif await self.redis.exists(f"{TASK_CONSUMER_KEY_PREFIX}{owner}"):
+                continue
+            
+            # Oldest in-flight task ends up at the head of the queue
+            while await self.redis.lmove(key, TASK_QUEUE_KEY, "RIGHT", "LEFT") is not None:
+                recovered += 1
+        
+        if recovered:
+            recovered_tasks_total.inc(recovered)
+            logger.warning(f"⚠️ Requeued {recovered} in-flight tasks from stopped consumers")
+        return recovered
+    
+    async def _fetch_loop(self):
+        consecutive_errors = 0
+        max_consecutive_errors = 10
+        
+        while True:
             try:
-                # blpop with 5-second timeout - returns None if queue empty (NOT an error)
-                task_data = await async_redis_client.blpop(["transformation:queue"], timeout=5)
+                batch = await self.fetch_batch()
             except aioredis.ConnectionError as e:
                 # Connection error - needs exponential backoff
                 consecutive_errors += 1
                 logger.error(f"Redis connection error (attempt {consecutive_errors}): {str(e)}")
-                await asyncio.sleep(min(5 * consecutive_errors, 60))
+                if consecutive_errors >= max_consecutive_errors:
+                    logger.critical(f"Task fetcher experienced {consecutive_errors} consecutive errors. Pausing for recovery.")
+                    consecutive_errors = 0
+                    await asyncio.sleep(30)
+                else:
+                    await asyncio.sleep(min(5 * consecutive_errors, 60))
                 continue
             except aioredis.TimeoutError:
                 # Timeout is NORMAL when queue is empty - don't log as error
                 consecutive_errors = 0
-                await asyncio.sleep(1)
                 continue
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                # Unexpected Redis error
                 logger.warning(f"Unexpected Redis error: {str(e)}")
                 await asyncio.sleep(5)
                 continue
-
-            # Successfully got response from Redis
+            
             consecutive_errors = 0
-
-            if task_data is None:
-                # Timeout - no tasks in queue (this is normal)
-                await asyncio.sleep(1)
-                continue
-
-            # Task retrieved successfully
-            queue_name, task_json = task_data
-
+            for raw_task in batch:
+                tasks_in_flight.inc()
+                await self._pending.put(raw_task)
+    
+    async def _worker(self, worker_id: int):
+        while True:
+            raw_task = await self._pending.get()
+            # Cancellation mid-task skips the ack, leaving the task for recovery
+            await self._process(raw_task, worker_id)
+            try:
+                await self.ack(raw_task)
+            except Exception as e:
+                logger.error(f"Failed to ack task on worker {worker_id}: {str(e)}")
+    
+    async def _process(self, raw_task: str, worker_id: int):
+        try:
+            task = TransformationTask(**json.loads(raw_task))
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in task queue: {str(e)}")
+            return
+        except Exception as e:
+            logger.error(f"Error parsing task: {str(e)}")
+            return
+        
+        logger.info(f"Worker {worker_id} processing transformation task: {task.id} (operation: {task.operation.value})")
+        active_transformations.labels(operation=task.operation.value).inc()
+        try:
+            result = await self.engine.process_task(task)
+            logger.info(f"✅ Completed task {task.id}: {result.output_count} tracks processed in {result.processing_time:.2f}s")
+        except Exception as task_error:
+            logger.error(f"❌ Error processing task {task.id}: {str(task_error)}")
+        finally:
+            active_transformations.labels(operation=task.operation.value).dec()
+    
+    async def _heartbeat(self):
+        await self.redis.set(self.heartbeat_key, datetime.now().isoformat(), ex=self.heartbeat_ttl)
+    
+    async def _heartbeat_loop(self):
+        interval = max(1, self.heartbeat_ttl // 3)
+        beats = 0
+        while True:
+            await asyncio.sleep(interval)
             try:
-                task_dict = json.loads(task_json)
-                task = TransformationTask(**task_dict)
-
-                logger.info(f"Processing transformation task: {task.id} (operation: {task.operation.value})")
-
-                # Process task with metrics
-                active_transformations.labels(operation=task.operation.value).inc()
-                try:
-                    result = await transformation_engine.process_task(task)
-                    logger.info(f"✅ Completed task {task.id}: {result.output_count} tracks processed in {result.processing_time:.2f}s")
-                except Exception as task_error:
-                    logger.error(f"❌ Error processing task {task.id}: {str(task_error)}")
-                finally:
-                    active_transformations.labels(operation=task.operation.value).dec()
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in task queue: {str(e)}")
+                await self._heartbeat()
+                beats += 1
+                # Sweep for dead consumers about once per heartbeat TTL
+                if beats % 3 == 0:
+                    await self.recover_inflight_tasks()
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"Error parsing task: {str(e)}")
+                logger.warning(f"Task consumer heartbeat failed: {str(e)}")
 
-            # Check for too many consecutive errors
-            if consecutive_errors >= max_consecutive_errors:
-                logger.critical(f"Task processor experienced {consecutive_errors} consecutive errors. Pausing for recovery.")
-                consecutive_errors = 0
-                await asyncio.sleep(30)
 
-        except asyncio.CancelledError:
-            logger.info("Task processor cancelled - shutting down gracefully")
-            break
-        except Exception as e:
-            # Catch-all for unexpected errors
-            logger.error(f"Unexpected error in task processor loop: {str(e)}", exc_info=True)
-            consecutive_errors += 1
-            await asyncio.sleep(min(5 * consecutive_errors, 60))
+async def task_processor():
+    """Background worker to process transformation tasks from the Redis queue
+
+    Runs a TaskWorkerPool on the async Redis client: batched fetches,
+    TASK_WORKER_CONCURRENCY concurrent workers and a reliable processing
+    list so in-flight tasks survive a crash.
+    """
+    if not async_redis_client:
+        logger.error("❌ Async Redis client not initialized - task processor cannot start")
+        return
+
+    pool = TaskWorkerPool(async_redis_client, transformation_engine)
+    try:
+        await pool.run()
+    except asyncio.CancelledError:
+        logger.info("Task processor cancelled - shutting down gracefully")
 
 # =====================
 # API Endpoints
@@ -1191,14 +1339,23 @@ async def submit_transformation_task(task: TransformationTask):
     
     task.created_at = datetime.now()
     
-    # Add to Redis queue
+    # Add to Redis queue and store task metadata in one round trip
     task_json = json.dumps(task.dict(), default=str)
-    redis_client.rpush("transformation:queue", task_json)
-    
-    # Store task metadata
     task_key = f"transformation:task:{task.id}"
-    redis_client.hset(task_key, mapping=task.dict())
-    redis_client.expire(task_key, 86400)
+    mapping = task_status_mapping(task)
+    
+    if async_redis_client:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.rpush(TASK_QUEUE_KEY, task_json)
+            pipe.hset(task_key, mapping=mapping)
+            pipe.expire(task_key, TASK_STATUS_TTL_SECONDS)
+            await pipe.execute()
+    else:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.rpush(TASK_QUEUE_KEY, task_json)
+        pipe.hset(task_key, mapping=mapping)
+        pipe.expire(task_key, TASK_STATUS_TTL_SECONDS)
+        pipe.execute()
     
     return {"task_id": task.id, "status": "queued"}
 
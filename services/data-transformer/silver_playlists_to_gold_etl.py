@@ -25,6 +25,17 @@ Usage:
 
     # Dry run (no database writes)
     python silver_playlists_to_gold_etl.py --dry-run --limit 10
+
+    # Larger bulk-mapping chunks
+    python silver_playlists_to_gold_etl.py --chunk-size 2000
+
+Performance:
+    Playlists are processed in chunks. For each chunk every referenced DJ
+    artist and silver track is resolved to its gold ID with one set-based
+    query per entity type, and the resulting playlist rows are written with
+    one UPDATE and one INSERT. Resolved mappings are kept in a bounded LRU
+    cache across chunks, since the same popular tracks appear in thousands
+    of playlists.
 """
 
 import asyncio
@@ -32,9 +43,9 @@ import asyncpg
 import logging
 import sys
 import os
-import re
 import json
-from typing import Optional, Dict, Any, List
+from collections import Counter, OrderedDict
+from typing import Optional, Dict, Any, List, Iterable
 from uuid import UUID
 from datetime import datetime
 import argparse
@@ -61,6 +72,76 @@ GENERIC_ARTIST_NAMES = {
     "va",
 }
 
+# Number of silver playlists mapped and written per bulk round trip
+DEFAULT_CHUNK_SIZE = int(os.getenv('SILVER_PLAYLIST_CHUNK_SIZE', '500'))
+
+# Upper bound on silver→gold mappings kept in memory across chunks
+DEFAULT_MAPPING_CACHE_SIZE = int(os.getenv('SILVER_GOLD_MAPPING_CACHE_SIZE', '100000'))
+
+DRY_RUN_ARTIST_ID = UUID('00000000-0000-0000-0000-000000000000')
+
+
+class MappingLRUCache:
+    """
+    Bounded LRU cache for silver→gold ID mappings.
+
+    Negative results (None) are cached too, so an unmappable track is not
+    re-queried for every playlist that references it.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_size: int = DEFAULT_MAPPING_CACHE_SIZE):
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[Any, Optional[UUID]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any, default: Any = _MISSING) -> Any:
+        """Return the cached mapping, or ``default`` (a sentinel) if absent."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: Any, value: Optional[UUID]) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def missing(self, keys: Iterable[Any]) -> List[Any]:
+        """Return the distinct keys that are not cached, preserving order."""
+        seen = set()
+        result = []
+        for key in keys:
+            if key in self._entries or key in seen:
+                continue
+            seen.add(key)
+            result.append(key)
+        return result
+
+    def is_missing(self, value: Any) -> bool:
+        return value is self._MISSING
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _is_mappable_artist_name(artist_name: Optional[str]) -> bool:
+    """Return True if the artist name should be mapped into the gold layer."""
+    if not artist_name or artist_name.strip() == '':
+        return False
+    return artist_name.lower().strip() not in GENERIC_ARTIST_NAMES
+
 
 class SilverPlaylistsToGoldETL:
     """
@@ -69,9 +150,17 @@ class SilverPlaylistsToGoldETL:
     Fills the missing medallion architecture layer for playlists.
     """
 
-    def __init__(self, dry_run: bool = False):
+    def __init__(
+        self,
+        dry_run: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache_size: int = DEFAULT_MAPPING_CACHE_SIZE
+    ):
         self.dry_run = dry_run
+        self.chunk_size = max(1, chunk_size)
         self.pool: Optional[asyncpg.Pool] = None
+        self.artist_cache = MappingLRUCache(cache_size)
+        self.track_cache = MappingLRUCache(cache_size)
         self.stats = {
             'silver_playlists_processed': 0,
             'playlists_created': 0,
@@ -79,7 +168,10 @@ class SilverPlaylistsToGoldETL:
             'playlist_tracks_created': 0,
             'errors': 0,
             'skipped_no_tracks': 0,
-            'skipped_invalid': 0
+            'skipped_invalid': 0,
+            'chunks_processed': 0,
+            'mapping_cache_hits': 0,
+            'mapping_cache_misses': 0
         }
 
     async def connect(self):
@@ -116,339 +208,350 @@ class SilverPlaylistsToGoldETL:
             await self.pool.close()
             logger.info("✅ Database connection pool closed")
 
-    async def map_silver_artist_to_gold(
+    async def resolve_artists_bulk(
         self,
         conn: asyncpg.Connection,
-        silver_artist_id: Optional[UUID],
-        artist_name: str
-    ) -> Optional[UUID]:
+        artists: Dict[str, Optional[UUID]]
+    ) -> None:
         """
-        Map silver layer artist to gold layer artist.
+        Resolve many silver artists to gold artists in set-based statements.
 
-        First tries to find by silver_artist_id mapping, then by name.
+        Args:
+            artists: Mapping of artist_name → silver_artist_id
 
-        Returns artist_id (UUID) from gold artists table if successful, None if failed.
+        Existing gold artists are found with one ANY() lookup; the remainder are
+        created with one INSERT ... SELECT unnest(). Results land in artist_cache.
         """
-        if not artist_name or artist_name.strip() == '':
-            logger.debug(
-                f"⚠️ Empty artist name provided (silver_artist_id={silver_artist_id})"
-            )
-            return None
+        names = self.artist_cache.missing(
+            name for name in artists if _is_mappable_artist_name(name)
+        )
+        if not names:
+            return
 
-        normalized = artist_name.lower().strip()
-        if normalized in GENERIC_ARTIST_NAMES:
-            logger.debug(
-                f"Skipping generic artist name '{artist_name}' (silver_artist_id={silver_artist_id})"
-            )
-            return None
+        if self.dry_run:
+            logger.debug(f"[DRY RUN] Would map {len(names)} artists")
+            for name in names:
+                self.artist_cache.put(name, DRY_RUN_ARTIST_ID)
+            return
 
-        # Normalize artist name
-        normalized = re.sub(r'\s+', ' ', normalized)
+        existing = await conn.fetch("""
+            SELECT DISTINCT ON (artist_name) artist_name, id
+            FROM gold_artist_analytics
+            WHERE artist_name = ANY($1::text[])
+        """, names)
 
-        try:
-            if self.dry_run:
-                logger.debug(f"[DRY RUN] Would map artist: {artist_name}")
-                return UUID('00000000-0000-0000-0000-000000000000')  # Dummy UUID
-
-            # Try to find by name in gold layer artists table
-            existing = await conn.fetchrow("""
-                SELECT id FROM gold_artist_analytics
-                WHERE artist_name = $1
-                LIMIT 1
-            """, artist_name)
+        found = {row['artist_name']: row['id'] for row in existing}
+        for name, artist_id in found.items():
+            self.artist_cache.put(name, artist_id)
 
-            if existing:
-                logger.debug(
-                    f"✓ Found existing gold artist: '{artist_name}' (id={existing['id']})"
-                )
-                return existing['id']
-
-            # Create new artist in gold layer if not found
-            artist_id = await conn.fetchval("""
-                INSERT INTO gold_artist_analytics (artist_name, silver_artist_id)
-                VALUES ($1, $2)
-                RETURNING id
-            """, artist_name, silver_artist_id)
-
-            logger.info(
-                f"✅ Created gold artist: '{artist_name}' (UUID: {artist_id})",
-                extra={'artist_name': artist_name, 'artist_id': artist_id}
-            )
-            return artist_id
+        to_create = [name for name in names if name not in found]
+        if not to_create:
+            return
 
-        except Exception as e:
-            logger.error(
-                f"❌ Error mapping artist '{artist_name}': {e}",
-                extra={
-                    'artist_name': artist_name,
-                    'silver_artist_id': silver_artist_id,
-                    'error': str(e)
-                },
-                exc_info=True
-            )
-            return None
+        created = await conn.fetch("""
+            INSERT INTO gold_artist_analytics (artist_name, silver_artist_id)
+            SELECT * FROM unnest($1::text[], $2::uuid[])
+            RETURNING artist_name, id
+        """, to_create, [artists[name] for name in to_create])
+
+        for row in created:
+            self.artist_cache.put(row['artist_name'], row['id'])
+
+        logger.info(f"✅ Created {len(created)} gold artists")
 
-    async def map_silver_track_to_gold(
+    async def resolve_tracks_bulk(
         self,
         conn: asyncpg.Connection,
-        silver_track_id: UUID
-    ) -> Optional[UUID]:
+        silver_track_ids: Iterable[UUID]
+    ) -> Dict[UUID, Optional[UUID]]:
         """
-        Map silver layer track to its gold layer track_id.
+        Resolve many silver tracks to gold tracks with a single query.
 
-        Uses the silver_enriched_tracks table to get normalized_title and artist_name,
-        then finds matching track in gold tracks table.
+        An artist+title match is preferred, then a title-only match, both
+        through LATERAL joins. Results, including unmappable tracks, land in
+        track_cache.
+
+        Returns a silver_track_id → gold_track_id mapping for every requested ID.
         """
-        if not silver_track_id:
-            logger.debug("⚠️ map_silver_track_to_gold called with NULL silver_track_id")
-            return None
+        mapping: Dict[UUID, Optional[UUID]] = {}
+        pending = []
+        for silver_track_id in dict.fromkeys(tid for tid in silver_track_ids if tid):
+            cached = self.track_cache.get(silver_track_id)
+            if self.track_cache.is_missing(cached):
+                pending.append(silver_track_id)
+            else:
+                mapping[silver_track_id] = cached
+        if not pending:
+            return mapping
+
+        rows = await conn.fetch("""
+            SELECT
+                s.id AS silver_track_id,
+                s.track_title,
+                COALESCE(exact.id, title_only.id) AS gold_track_id
+            FROM silver_enriched_tracks s
+            LEFT JOIN LATERAL (
+                SELECT g.id
+                FROM gold_track_analytics g
+                WHERE g.track_title = s.track_title
+                  AND g.artist_name = s.artist_name
+                  AND NULLIF(TRIM(s.artist_name), '') IS NOT NULL
+                LIMIT 1
+            ) exact ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT g.id
+                FROM gold_track_analytics g
+                WHERE g.track_title = s.track_title
+                LIMIT 1
+            ) title_only ON exact.id IS NULL
+            WHERE s.id = ANY($1::uuid[])
+        """, pending)
+
+        resolved = {}
+        for row in rows:
+            title = row['track_title']
+            if not title or title.strip() == '':
+                resolved[row['silver_track_id']] = None
+            else:
+                resolved[row['silver_track_id']] = row['gold_track_id']
+
+        unmapped = 0
+        for silver_track_id in pending:
+            gold_track_id = resolved.get(silver_track_id)
+            if gold_track_id is None:
+                unmapped += 1
+            self.track_cache.put(silver_track_id, gold_track_id)
+            mapping[silver_track_id] = gold_track_id
+
+        logger.debug(
+            f"Resolved {len(pending) - unmapped}/{len(pending)} silver tracks to gold "
+            f"({unmapped} unmapped, {len(mapping) - len(pending)} cached)"
+        )
+        return mapping
 
-        try:
-            # Get silver track info
-            silver_track = await conn.fetchrow("""
-                SELECT artist_name, track_title
-                FROM silver_enriched_tracks
-                WHERE id = $1
-            """, silver_track_id)
-
-            if not silver_track:
-                logger.warning(
-                    f"⚠️ Silver track not found in silver_enriched_tracks: {silver_track_id}",
-                    extra={'silver_track_id': silver_track_id}
-                )
-                return None
+    async def _fetch_silver_tracks(
+        self,
+        conn: asyncpg.Connection,
+        playlist_ids: List[UUID]
+    ) -> Dict[UUID, List[asyncpg.Record]]:
+        """Fetch silver_playlist_tracks for many playlists, grouped by playlist."""
+        rows = await conn.fetch("""
+            SELECT playlist_id, track_id, position
+            FROM silver_playlist_tracks
+            WHERE playlist_id = ANY($1::uuid[])
+            ORDER BY playlist_id, position ASC
+        """, playlist_ids)
+
+        tracks_by_playlist: Dict[UUID, List[asyncpg.Record]] = {pid: [] for pid in playlist_ids}
+        for row in rows:
+            tracks_by_playlist[row['playlist_id']].append(row)
+        return tracks_by_playlist
+
+    def _build_gold_playlist_row(
+        self,
+        silver_playlist: Dict[str, Any],
+        silver_tracks: List[asyncpg.Record],
+        track_mapping: Dict[UUID, Optional[UUID]],
+        counts: Counter
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the gold_playlist_analytics row for one playlist from resolved mappings.
 
-            artist_name = silver_track['artist_name']
-            track_title = silver_track['track_title']
+        Returns None (and counts the skip) if the playlist has no mappable tracks.
+        """
+        playlist_id = silver_playlist['id']
+        playlist_name = silver_playlist['playlist_name']
+        artist_name = silver_playlist['artist_name']
 
-            if not track_title or track_title.strip() == '':
-                logger.warning(
-                    f"⚠️ Empty track_title for silver track {silver_track_id} (artist={artist_name})",
-                    extra={'silver_track_id': silver_track_id, 'artist_name': artist_name}
-                )
-                return None
-
-            normalized_title = track_title.lower().strip()
-            normalized_title = re.sub(r'\s+', ' ', normalized_title)
-
-            # First try: exact title + artist match
-            if artist_name and artist_name.strip() != '':
-                normalized_artist = artist_name.lower().strip()
-                normalized_artist = re.sub(r'\s+', ' ', normalized_artist)
-
-                track_id = await conn.fetchval("""
-                    SELECT id
-                    FROM gold_track_analytics
-                    WHERE track_title = $1 AND artist_name = $2
-                    LIMIT 1
-                """, track_title, artist_name)
-
-                if track_id:
-                    logger.debug(
-                        f"✓ Mapped silver track {silver_track_id} → gold track {track_id} (artist+title match)"
-                    )
-                    return track_id
-                else:
-                    logger.debug(
-                        f"⚠️ No artist+title match for '{artist_name} - {track_title}' (silver_id={silver_track_id})"
-                    )
-
-            # Second try: title-only match (for tracks without artist info)
-            track_id = await conn.fetchval("""
-                SELECT id FROM gold_track_analytics
-                WHERE track_title = $1
-                LIMIT 1
-            """, track_title)
+        if not silver_tracks:
+            logger.warning(
+                f"⚠️ No tracks found for playlist '{playlist_name}' (silver_id={playlist_id})",
+                extra={
+                    'playlist_id': playlist_id,
+                    'playlist_name': playlist_name,
+                    'artist_name': artist_name
+                }
+            )
+            counts['skipped_no_tracks'] += 1
+            return None
 
-            if track_id:
-                logger.debug(
-                    f"✓ Mapped silver track {silver_track_id} → gold track {track_id} (title-only match)"
-                )
+        tracks_mapped = 0
+        for track_row in silver_tracks:
+            gold_track_id = track_mapping.get(track_row['track_id'])
+            if gold_track_id:
+                tracks_mapped += 1
             else:
-                logger.warning(
-                    f"⚠️ No gold track found for '{artist_name} - {track_title}' (silver_id={silver_track_id})",
-                    extra={
-                        'silver_track_id': silver_track_id,
-                        'artist_name': artist_name,
-                        'track_title': track_title
-                    }
-                )
-
-            return track_id
+                logger.debug(f"Could not map silver track {track_row['track_id']} to gold")
 
-        except Exception as e:
-            logger.error(
-                f"❌ Error mapping silver track {silver_track_id}: {e}",
-                extra={'silver_track_id': silver_track_id, 'error': str(e)},
-                exc_info=True
-            )
+        if tracks_mapped == 0:
+            logger.warning(f"No tracks mapped for playlist {playlist_id}")
+            counts['skipped_no_tracks'] += 1
             return None
 
-    async def transform_silver_playlist(
+        # Note: No playlist_tracks table exists in gold layer
+        # Track associations are managed through silver_playlist_tracks
+        # Gold layer records the identified share via track_identification_rate
+        return {
+            'silver_playlist_id': playlist_id,
+            'playlist_name': playlist_name,
+            'artist_name': artist_name if artist_name else 'Unknown',
+            'event_name': silver_playlist.get('event_name'),
+            'event_date': silver_playlist.get('event_date'),
+            'track_count': len(silver_tracks),
+            'tracks_mapped': tracks_mapped,
+            'track_identification_rate': round(tracks_mapped / len(silver_tracks), 2)
+        }
+
+    async def _write_gold_playlists_bulk(
         self,
         conn: asyncpg.Connection,
-        silver_playlist: Dict[str, Any]
-    ) -> bool:
+        rows: List[Dict[str, Any]],
+        counts: Counter
+    ) -> None:
+        """Upsert gold playlists with one UPDATE and one INSERT over unnest() arrays."""
+        if self.dry_run:
+            for row in rows:
+                logger.info(f"[DRY RUN] Would create/update playlist: {row['playlist_name']}")
+            counts['playlists_created'] += len(rows)
+            return
+
+        existing = await conn.fetch("""
+            SELECT DISTINCT ON (silver_playlist_id) silver_playlist_id, id
+            FROM gold_playlist_analytics
+            WHERE silver_playlist_id = ANY($1::uuid[])
+        """, [row['silver_playlist_id'] for row in rows])
+        existing_ids = {r['silver_playlist_id']: r['id'] for r in existing}
+
+        updates = [row for row in rows if row['silver_playlist_id'] in existing_ids]
+        inserts = [row for row in rows if row['silver_playlist_id'] not in existing_ids]
+
+        def columns(batch: List[Dict[str, Any]]) -> List[List[Any]]:
+            return [
+                [row['playlist_name'] for row in batch],
+                [row['artist_name'] for row in batch],
+                [row['event_name'] for row in batch],
+                [row['event_date'] for row in batch],
+                [row['track_count'] for row in batch],
+                [row['track_identification_rate'] for row in batch],
+            ]
+
+        if updates:
+            await conn.execute("""
+                UPDATE gold_playlist_analytics g
+                SET playlist_name = v.playlist_name,
+                    artist_name = v.artist_name,
+                    event_name = v.event_name,
+                    event_date = v.event_date,
+                    track_count = v.track_count,
+                    track_identification_rate = v.track_identification_rate,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM unnest(
+                    $1::uuid[], $2::text[], $3::text[], $4::text[],
+                    $5::date[], $6::int[], $7::numeric[]
+                ) AS v(id, playlist_name, artist_name, event_name,
+                       event_date, track_count, track_identification_rate)
+                WHERE g.id = v.id
+            """, [existing_ids[row['silver_playlist_id']] for row in updates], *columns(updates))
+            counts['playlists_updated'] += len(updates)
+
+        if inserts:
+            await conn.execute("""
+                INSERT INTO gold_playlist_analytics (
+                    silver_playlist_id, playlist_name, artist_name,
+                    event_name, event_date, track_count, track_identification_rate
+                )
+                SELECT * FROM unnest(
+                    $1::uuid[], $2::text[], $3::text[], $4::text[],
+                    $5::date[], $6::int[], $7::numeric[]
+                )
+            """, [row['silver_playlist_id'] for row in inserts], *columns(inserts))
+            counts['playlists_created'] += len(inserts)
+
+    async def transform_silver_playlist_chunk(
+        self,
+        conn: asyncpg.Connection,
+        silver_playlists: List[Dict[str, Any]]
+    ) -> Counter:
         """
-        Transform a single silver playlist to gold tables.
+        Transform a chunk of silver playlists to gold tables.
 
         Steps:
-        1. Map DJ artist from silver to gold layer
-        2. Create/update playlist in playlists table (legacy gold table)
-        3. Get tracks from silver_playlist_tracks join table
-        4. Map each track from silver to gold layer
-        5. Create playlist_tracks relationships with positions
-
-        Returns True if successful, False otherwise.
+        1. Fetch tracks for every playlist from silver_playlist_tracks (one query)
+        2. Bulk-map DJ artists from silver to gold layer
+        3. Bulk-map every referenced silver track to its gold track
+        4. Build playlist rows from the cached mappings
+        5. Upsert all playlist rows into gold_playlist_analytics in bulk
+
+        Returns the chunk's stats. They are not added to self.stats here: the
+        caller applies them with _apply_stats once the transaction commits, so
+        a rolled-back chunk that is retried playlist by playlist is not
+        counted twice.
         """
-        try:
-            playlist_id = silver_playlist['id']
-            playlist_name = silver_playlist['playlist_name']
-            artist_name = silver_playlist['artist_name']
-            silver_artist_id = silver_playlist.get('artist_id')
-
-            # Generate unique source identifier for this playlist
-            # Use "silver_{uuid}" format to ensure uniqueness
-            source = f"silver_{playlist_id}"
-
-            # Step 1: Map DJ artist from silver to gold
-            dj_artist_id = None
-            if artist_name:
-                dj_artist_id = await self.map_silver_artist_to_gold(
-                    conn, silver_artist_id, artist_name
-                )
+        counts: Counter = Counter()
+        if not silver_playlists:
+            return counts
+
+        playlist_ids = [p['id'] for p in silver_playlists]
+        tracks_by_playlist = await self._fetch_silver_tracks(conn, playlist_ids)
+
+        await self.resolve_artists_bulk(conn, {
+            p['artist_name']: p.get('artist_id')
+            for p in silver_playlists if p.get('artist_name')
+        })
+        track_mapping = await self.resolve_tracks_bulk(conn, (
+            row['track_id']
+            for rows in tracks_by_playlist.values()
+            for row in rows
+        ))
+
+        gold_rows = []
+        for silver_playlist in silver_playlists:
+            row = self._build_gold_playlist_row(
+                silver_playlist,
+                tracks_by_playlist.get(silver_playlist['id'], []),
+                track_mapping,
+                counts
+            )
+            if row:
+                gold_rows.append(row)
 
-            # Step 2: Get tracks from silver_playlist_tracks
-            silver_tracks = await conn.fetch("""
-                SELECT track_id, position
-                FROM silver_playlist_tracks
-                WHERE playlist_id = $1
-                ORDER BY position ASC
-            """, playlist_id)
-
-            # Skip if no tracks
-            if not silver_tracks or len(silver_tracks) == 0:
-                logger.warning(
-                    f"⚠️ No tracks found for playlist '{playlist_name}' (silver_id={playlist_id})",
-                    extra={
-                        'playlist_id': playlist_id,
-                        'playlist_name': playlist_name,
-                        'artist_name': artist_name
-                    }
-                )
-                self.stats['skipped_no_tracks'] += 1
-                return False
+        if not gold_rows:
+            return counts
 
-            logger.debug(
-                f"Processing playlist '{playlist_name}' with {len(silver_tracks)} tracks (silver_id={playlist_id})"
-            )
+        await self._write_gold_playlists_bulk(conn, gold_rows, counts)
 
-            # Step 3: Create/update playlist in gold playlists table
-            if self.dry_run:
-                logger.info(f"[DRY RUN] Would create/update playlist: {playlist_name}")
-                gold_playlist_id = UUID('00000000-0000-0000-0000-000000000001')
-                self.stats['playlists_created'] += 1
-            else:
-                # Create unique source_url using silver playlist ID
-                source_url = f"silver_etl:{playlist_id}"
-
-                # Check if playlist already exists
-                existing_playlist_id = await conn.fetchval("""
-                    SELECT id FROM gold_playlist_analytics
-                    WHERE silver_playlist_id = $1
-                """, playlist_id)
-
-                if existing_playlist_id:
-                    # Update existing playlist
-                    gold_playlist_id = await conn.fetchval("""
-                        UPDATE gold_playlist_analytics
-                        SET playlist_name = $2,
-                            artist_name = $3,
-                            event_name = $4,
-                            event_date = $5,
-                            track_count = $6,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = $1
-                        RETURNING id
-                    """,
-                        existing_playlist_id,
-                        playlist_name,
-                        artist_name if artist_name else 'Unknown',
-                        silver_playlist.get('event_name'),
-                        silver_playlist.get('event_date'),
-                        len(silver_tracks)
-                    )
-                    logger.debug(f"Updated gold playlist {gold_playlist_id} from silver {playlist_id}")
-                    self.stats['playlists_updated'] += 1
-                else:
-                    # Insert new playlist
-                    gold_playlist_id = await conn.fetchval("""
-                        INSERT INTO gold_playlist_analytics (
-                            silver_playlist_id, playlist_name, artist_name,
-                            event_name, event_date, track_count
-                        )
-                        VALUES ($1, $2, $3, $4, $5, $6)
-                        RETURNING id
-                    """,
-                        playlist_id,
-                        playlist_name,
-                        artist_name if artist_name else 'Unknown',
-                        silver_playlist.get('event_name'),
-                        silver_playlist.get('event_date'),
-                        len(silver_tracks)
-                    )
-                    logger.debug(f"Created gold playlist {gold_playlist_id} from silver {playlist_id}")
-                    self.stats['playlists_created'] += 1
-
-            # Step 4 & 5: Map tracks from silver to gold and create relationships
-            tracks_added = 0
-            for track_row in silver_tracks:
-                silver_track_id = track_row['track_id']
-                position = track_row['position']
-
-                # Map silver track to gold track
-                gold_track_id = await self.map_silver_track_to_gold(conn, silver_track_id)
-
-                if not gold_track_id:
-                    logger.debug(f"Could not map silver track {silver_track_id} to gold")
-                    continue
-
-                # Create playlist_tracks relationship
-                if self.dry_run:
-                    logger.debug(f"[DRY RUN] Would link track {gold_track_id} at position {position}")
-                    tracks_added += 1
-                else:
-                    # Note: No playlist_tracks table exists in gold layer
-                    # Track associations are managed through silver_playlist_tracks
-                    # Gold layer tracks transitions via silver_track_transitions
-                    logger.debug(f"Mapped track {gold_track_id} at position {position} for playlist {gold_playlist_id}")
-
-                    tracks_added += 1
-                    self.stats['playlist_tracks_created'] += 1
-
-            if tracks_added == 0:
-                logger.warning(f"No tracks mapped for playlist {playlist_id}")
-                self.stats['skipped_no_tracks'] += 1
-                return False
-
-            self.stats['silver_playlists_processed'] += 1
-
-            if self.stats['silver_playlists_processed'] % 10 == 0:
-                logger.info(
-                    f"Progress: {self.stats['silver_playlists_processed']} playlists processed, "
-                    f"{self.stats['playlists_created']} created, {self.stats['playlists_updated']} updated, "
-                    f"{self.stats['playlist_tracks_created']} track relationships created"
-                )
+        counts['silver_playlists_processed'] += len(gold_rows)
+        counts['playlist_tracks_created'] += sum(row['tracks_mapped'] for row in gold_rows)
+        return counts
 
-            return True
+    def _apply_stats(self, counts: Counter) -> None:
+        """Add a committed chunk's stats to the run totals."""
+        for key, value in counts.items():
+            self.stats[key] += value
 
-        except Exception as e:
-            logger.error(
-                f"Error transforming silver playlist (id={silver_playlist.get('id')}): {e}",
-                exc_info=True
-            )
-            self.stats['errors'] += 1
-            return False
+        logger.info(
+            f"Progress: {self.stats['silver_playlists_processed']} playlists processed, "
+            f"{self.stats['playlists_created']} created, {self.stats['playlists_updated']} updated, "
+            f"{self.stats['playlist_tracks_created']} track relationships created "
+            f"(cache: {len(self.track_cache)} tracks, {len(self.artist_cache)} artists)"
+        )
+
+    async def _transform_individually(
+        self,
+        conn: asyncpg.Connection,
+        silver_playlists: List[Dict[str, Any]]
+    ) -> None:
+        """Fallback for a failed chunk: one transaction per playlist for error isolation."""
+        for silver_playlist in silver_playlists:
+            try:
+                async with conn.transaction():
+                    counts = await self.transform_silver_playlist_chunk(conn, [silver_playlist])
+            except Exception as e:
+                logger.error(f"Transaction failed for playlist {silver_playlist['id']}: {e}")
+                self.artist_cache.clear()
+                self.stats['errors'] += 1
+            else:
+                self._apply_stats(counts)
 
     async def run(self, limit: Optional[int] = None):
         """
@@ -470,8 +573,9 @@ class SilverPlaylistsToGoldETL:
         try:
             async with self.pool.acquire() as conn:
                 # Query all silver playlists for ETL processing
-                # The transform_silver_playlist method handles both INSERT (new playlists)
-                # and UPDATE (already-processed playlists with changed metadata)
+                # transform_silver_playlist_chunk handles both INSERT (new playlists)
+                # and UPDATE (already-processed playlists with changed metadata);
+                # _transform_individually isolates failures when a chunk cannot be written
                 query = """
                     SELECT DISTINCT
                         sep.id,
@@ -503,22 +607,34 @@ class SilverPlaylistsToGoldETL:
                     await self.close()
                     return self.stats
 
-                # Process each silver playlist
-                for silver_playlist in silver_playlists:
-                    # Use savepoint for error isolation (not full transaction)
+                # Process silver playlists in chunks; each chunk is one transaction
+                for chunk_start in range(0, total_playlists, self.chunk_size):
+                    chunk = [
+                        dict(p) for p in
+                        silver_playlists[chunk_start:chunk_start + self.chunk_size]
+                    ]
                     try:
                         async with conn.transaction():
-                            await self.transform_silver_playlist(conn, dict(silver_playlist))
+                            counts = await self.transform_silver_playlist_chunk(conn, chunk)
                     except Exception as e:
-                        logger.error(f"Transaction failed for playlist {silver_playlist['id']}: {e}")
-                        self.stats['errors'] += 1
-                        continue
+                        logger.error(
+                            f"Chunk transaction failed at offset {chunk_start} "
+                            f"({len(chunk)} playlists): {e} - retrying playlists individually"
+                        )
+                        # Artists created inside the rolled-back transaction no longer exist
+                        self.artist_cache.clear()
+                        await self._transform_individually(conn, chunk)
+                    else:
+                        self._apply_stats(counts)
+                    self.stats['chunks_processed'] += 1
 
         finally:
             await self.close()
 
         # Report statistics
         duration = (datetime.now() - start_time).total_seconds()
+        self.stats['mapping_cache_hits'] = self.artist_cache.hits + self.track_cache.hits
+        self.stats['mapping_cache_misses'] = self.artist_cache.misses + self.track_cache.misses
 
         logger.info("="*80)
         logger.info("SILVER-TO-GOLD PLAYLIST ETL PROCESS COMPLETE")
@@ -529,6 +645,10 @@ class SilverPlaylistsToGoldETL:
         logger.info(f"Playlists updated: {self.stats['playlists_updated']}")
         logger.info(f"Playlist-track relationships created: {self.stats['playlist_tracks_created']}")
         logger.info(f"Skipped (no tracks): {self.stats['skipped_no_tracks']}")
+        logger.info(
+            f"Mapping cache: {self.stats['mapping_cache_hits']} hits, "
+            f"{self.stats['mapping_cache_misses']} misses"
+        )
         logger.info(f"Errors: {self.stats['errors']}")
 
         if self.stats['silver_playlists_processed'] > 0:
@@ -547,9 +667,17 @@ async def main():
     parser = argparse.ArgumentParser(description="Silver-to-Gold Playlist ETL Process")
     parser.add_argument('--limit', type=int, help="Maximum number of playlists to process")
     parser.add_argument('--dry-run', action='store_true', help="Run without writing to database")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Playlists mapped and written per bulk round trip")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAPPING_CACHE_SIZE,
+                        help="Maximum silver→gold mappings cached across chunks")
     args = parser.parse_args()
 
-    etl = SilverPlaylistsToGoldETL(dry_run=args.dry_run)
+    etl = SilverPlaylistsToGoldETL(
+        dry_run=args.dry_run,
+        chunk_size=args.chunk_size,
+        cache_size=args.cache_size
+    )
 
     try:
         stats = await etl.run(limit=args.limit)
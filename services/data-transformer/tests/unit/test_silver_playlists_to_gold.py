@@ -0,0 +1,214 @@
+"""Unit tests for bulk silver→gold playlist mapping, caching and writing"""
+from collections import Counter
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from silver_playlists_to_gold_etl import MappingLRUCache, SilverPlaylistsToGoldETL
+
+
+class FakeConnection:
+    """
+    Answers the ETL's set-based queries from in-memory tables
+
+    Writes are recorded per transaction and discarded when it raises, so a
+    rolled-back chunk leaves no trace.
+    """
+
+    def __init__(self):
+        self.silver_playlists = []
+        self.silver_playlist_tracks = []
+        self.silver_tracks = {}
+        self.gold_tracks = []
+        self.gold_artists = {}
+        self.gold_playlists = {}
+        self.fail_inserts_for = set()
+        self.queries = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        artists, playlists = dict(self.gold_artists), dict(self.gold_playlists)
+        try:
+            yield
+        except Exception:
+            self.gold_artists, self.gold_playlists = artists, playlists
+            raise
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        if 'FROM silver_enriched_playlists' in query:
+            return self.silver_playlists
+        if 'FROM silver_playlist_tracks' in query:
+            return [row for row in self.silver_playlist_tracks if row['playlist_id'] in args[0]]
+        if 'INSERT INTO gold_artist_analytics' in query:
+            created = []
+            for name in args[0]:
+                self.gold_artists[name] = uuid4()
+                created.append({'artist_name': name, 'id': self.gold_artists[name]})
+            return created
+        if 'FROM gold_artist_analytics' in query:
+            return [{'artist_name': name, 'id': self.gold_artists[name]}
+                    for name in args[0] if name in self.gold_artists]
+        if 'FROM silver_enriched_tracks' in query:
+            return [self._resolve(self.silver_tracks[tid]) for tid in args[0] if tid in self.silver_tracks]
+        if 'FROM gold_playlist_analytics' in query:
+            return [{'silver_playlist_id': pid, 'id': gold_id}
+                    for pid, gold_id in self.gold_playlists.items() if pid in args[0]]
+        raise AssertionError(f'unexpected query: {query}')
+
+    def _resolve(self, silver):
+        exact = [g['id'] for g in self.gold_tracks
+                 if g['track_title'] == silver['track_title'] and g['artist_name'] == silver['artist_name']
+                 and (silver['artist_name'] or '').strip()]
+        title_only = [g['id'] for g in self.gold_tracks if g['track_title'] == silver['track_title']]
+        return {
+            'silver_track_id': silver['id'],
+            'track_title': silver['track_title'],
+            'gold_track_id': (exact or title_only or [None])[0],
+        }
+
+    async def execute(self, query, *args):
+        self.queries.append(query)
+        if 'INSERT INTO gold_playlist_analytics' in query:
+            if self.fail_inserts_for & set(args[0]):
+                raise RuntimeError('insert failed')
+            for pid in args[0]:
+                self.gold_playlists[pid] = uuid4()
+
+    def count(self, fragment):
+        return sum(fragment in query for query in self.queries)
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    async def close(self):
+        pass
+
+
+def add_track(conn, title, artist='Eric Prydz', gold=True):
+    silver_id = uuid4()
+    conn.silver_tracks[silver_id] = {'id': silver_id, 'track_title': title, 'artist_name': artist}
+    if gold:
+        conn.gold_tracks.append({'id': uuid4(), 'track_title': title, 'artist_name': artist})
+    return silver_id
+
+
+def add_playlist(conn, name, track_ids, artist='Eric Prydz'):
+    playlist = {'id': uuid4(), 'playlist_name': name, 'artist_id': None, 'artist_name': artist,
+                'event_name': None, 'event_date': None}
+    conn.silver_playlists.append(playlist)
+    conn.silver_playlist_tracks.extend(
+        {'playlist_id': playlist['id'], 'track_id': tid, 'position': n} for n, tid in enumerate(track_ids)
+    )
+    return playlist
+
+
+def test_cache_evicts_least_recently_used_and_keeps_negatives():
+    cache = MappingLRUCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', None)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    cache.put('c', 3)
+
+    assert 'b' not in cache and len(cache) == 2
+    assert cache.is_missing(cache.get('b'))
+    cache.put('b', None)
+    assert cache.get('b') is None and not cache.is_missing(cache.get('b'))
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert cache.missing(['c', 'x', 'x', 'b', 'y']) == ['x', 'y']
+
+
+@pytest.mark.asyncio
+async def test_artists_are_found_or_created_in_bulk_and_cached():
+    conn = FakeConnection()
+    conn.gold_artists['Eric Prydz'] = existing = uuid4()
+    etl = SilverPlaylistsToGoldETL()
+
+    await etl.resolve_artists_bulk(conn, {'Eric Prydz': None, 'Adam Beyer': None, 'Various Artists': None, '': None})
+
+    assert etl.artist_cache.get('Eric Prydz') == existing
+    assert etl.artist_cache.get('Adam Beyer') == conn.gold_artists['Adam Beyer']
+    assert 'Various Artists' not in etl.artist_cache
+    assert (conn.count('SELECT DISTINCT ON (artist_name)'), conn.count('INSERT INTO gold_artist_analytics')) == (1, 1)
+
+    await etl.resolve_artists_bulk(conn, {'Eric Prydz': None, 'Adam Beyer': None})
+    assert len(conn.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_tracks_resolve_in_one_query_and_unmapped_tracks_are_cached():
+    conn = FakeConnection()
+    exact = add_track(conn, 'Opus')
+    title_only = add_track(conn, 'Pjanoo', artist='')
+    unmapped = add_track(conn, 'Unreleased ID', gold=False)
+    untitled = add_track(conn, ' ')
+    etl = SilverPlaylistsToGoldETL()
+
+    mapping = await etl.resolve_tracks_bulk(conn, [exact, title_only, unmapped, untitled, exact, None])
+
+    assert mapping[exact] == conn.gold_tracks[0]['id']
+    assert mapping[title_only] == conn.gold_tracks[1]['id']
+    assert mapping[unmapped] is None and mapping[untitled] is None
+    assert conn.count('FROM silver_enriched_tracks') == 1
+
+    assert await etl.resolve_tracks_bulk(conn, [exact, unmapped]) == {exact: mapping[exact], unmapped: None}
+    assert conn.count('FROM silver_enriched_tracks') == 1
+
+
+@pytest.mark.asyncio
+async def test_write_splits_existing_playlists_into_one_update_and_one_insert():
+    conn = FakeConnection()
+    known, new = uuid4(), uuid4()
+    conn.gold_playlists[known] = uuid4()
+    etl = SilverPlaylistsToGoldETL()
+    counts = Counter()
+
+    def row(pid):
+        return {'silver_playlist_id': pid, 'playlist_name': 'Set', 'artist_name': 'Eric Prydz', 'event_name': None,
+                'event_date': None, 'track_count': 2, 'tracks_mapped': 1, 'track_identification_rate': 0.5}
+
+    await etl._write_gold_playlists_bulk(conn, [row(known), row(new)], counts)
+
+    assert (conn.count('UPDATE gold_playlist_analytics'), conn.count('INSERT INTO gold_playlist_analytics')) == (1, 1)
+    assert counts == Counter(playlists_updated=1, playlists_created=1)
+    assert etl.stats['playlists_created'] == etl.stats['playlists_updated'] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_retried_per_playlist_and_counted_once():
+    conn = FakeConnection()
+    opus, pjanoo = add_track(conn, 'Opus'), add_track(conn, 'Pjanoo')
+    updated = add_playlist(conn, 'Updated set', [opus, pjanoo])
+    broken = add_playlist(conn, 'Broken set', [opus])
+    created = add_playlist(conn, 'New set', [pjanoo], artist='Adam Beyer')
+    add_playlist(conn, 'Empty set', [])
+    conn.gold_playlists[updated['id']] = uuid4()
+    conn.fail_inserts_for = {broken['id']}
+
+    etl = SilverPlaylistsToGoldETL(chunk_size=10)
+
+    async def connect():
+        etl.pool = FakePool(conn)
+
+    etl.connect = connect
+    stats = await etl.run()
+
+    # The chunk's UPDATE ran before its INSERT failed; it only counts once retried
+    assert conn.count('UPDATE gold_playlist_analytics') == 2
+    assert stats['playlists_updated'] == 1
+    assert stats['playlists_created'] == 1
+    assert stats['silver_playlists_processed'] == 2
+    assert stats['playlist_tracks_created'] == 3
+    assert stats['skipped_no_tracks'] == 1
+    assert stats['errors'] == 1
+    assert stats['chunks_processed'] == 1
+    assert created['id'] in conn.gold_playlists and broken['id'] not in conn.gold_playlists
+    # Artists created by the rolled-back chunk are re-resolved, not served from cache
+    assert 'Adam Beyer' in conn.gold_artists
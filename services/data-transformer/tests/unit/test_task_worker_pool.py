@@ -0,0 +1,132 @@
+"""Unit tests for the reliable, concurrent transformation task consumer"""
+import asyncio
+import fnmatch
+import json
+
+import pytest
+
+import main
+from main import TaskWorkerPool, TransformationOperation, TransformationTask
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeAsyncRedis:
+    """In-memory stand-in for the list/key commands the worker pool uses"""
+
+    def __init__(self):
+        self.lists = {}
+        self.keys = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def lmove(self, src, dst, wherefrom="LEFT", whereto="RIGHT"):
+        source = self.lists.get(src)
+        if not source:
+            return None
+        value = source.pop(0 if wherefrom == "LEFT" else -1)
+        target = self.lists.setdefault(dst, [])
+        if whereto == "LEFT":
+            target.insert(0, value)
+        else:
+            target.append(value)
+        return value
+
+    async def blmove(self, src, dst, timeout, wherefrom="LEFT", whereto="RIGHT"):
+        value = await self.lmove(src, dst, wherefrom, whereto)
+        if value is None:
+            await asyncio.sleep(0.01)
+        return value
+
+    async def lrem(self, key, count, value):
+        self.lists.get(key, []).remove(value)
+        return 1
+
+    async def scan_iter(self, match=None):
+        for key in list(self.lists):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+    async def set(self, key, value, ex=None):
+        self.keys[key] = value
+
+
+class SlowEngine:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.done = []
+
+    async def process_task(self, task):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        self.done.append(task.id)
+        return main.TransformationResult(
+            task_id=task.id, operation=task.operation, status=main.ProcessingStatus.COMPLETED,
+            input_count=0, output_count=0, skipped_count=0, error_count=0, processing_time=0.05
+        )
+
+
+def _task_json(i):
+    task = TransformationTask(id=f"t{i}", operation=TransformationOperation.NORMALIZE, source_data=[])
+    return json.dumps(task.dict(), default=str)
+
+
+@pytest.mark.asyncio
+async def test_workers_process_batches_concurrently_and_ack():
+    redis = FakeAsyncRedis()
+    redis.lists[main.TASK_QUEUE_KEY] = [_task_json(i) for i in range(8)]
+    engine = SlowEngine()
+    pool = TaskWorkerPool(redis, engine, concurrency=4, batch_size=4, consumer_id="c1")
+
+    runner = asyncio.create_task(pool.run())
+    for _ in range(100):
+        if len(engine.done) == 8:
+            break
+        await asyncio.sleep(0.02)
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+    assert sorted(engine.done) == sorted(f"t{i}" for i in range(8))
+    assert engine.max_running == 4
+    assert redis.lists[pool.processing_key] == []
+
+
+@pytest.mark.asyncio
+async def test_recovers_tasks_from_dead_consumers_only():
+    redis = FakeAsyncRedis()
+    redis.lists[main.TASK_QUEUE_KEY] = [_task_json(9)]
+    redis.lists[f"{main.TASK_PROCESSING_KEY_PREFIX}dead"] = [_task_json(1), _task_json(2)]
+    redis.lists[f"{main.TASK_PROCESSING_KEY_PREFIX}alive"] = [_task_json(3)]
+    redis.keys[f"{main.TASK_CONSUMER_KEY_PREFIX}alive"] = "now"
+
+    pool = TaskWorkerPool(redis, SlowEngine(), consumer_id="c1")
+    recovered = await pool.recover_inflight_tasks()
+
+    assert recovered == 2
+    assert redis.lists[main.TASK_QUEUE_KEY] == [_task_json(1), _task_json(2), _task_json(9)]
+    assert redis.lists[f"{main.TASK_PROCESSING_KEY_PREFIX}alive"] == [_task_json(3)]
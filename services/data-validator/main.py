@@ -7,7 +7,7 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator, ValidationError
-from typing import List, Optional, Dict, Any, Union, Set
+from typing import List, Optional, Dict, Any, Union, Set, Tuple, Callable, AsyncIterator
 from datetime import datetime, timedelta
 import asyncio
 import logging
@@ -16,13 +16,17 @@ import os
 import re
 from enum import Enum
 import hashlib
+import time
+from dataclasses import dataclass
 
 import redis
 import asyncpg
 from prometheus_client import Counter, Gauge, Histogram, generate_latest
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import httpx
 
+from minhash_lsh import LSHIndex, MinHasher, decode_signature, encode_signature, shingles
+
 # Configure logging
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
@@ -47,6 +51,23 @@ validation_tasks_total = Counter('validation_tasks_total', 'Total validation tas
 active_validations = Gauge('active_validations', 'Number of active validations', ['validation_type'])
 validation_duration = Histogram('validation_duration_seconds', 'Validation duration', ['validation_type'])
 validation_results = Counter('validation_results_total', 'Validation results', ['validation_type', 'result'])
+validation_rule_duration = Histogram('validation_rule_duration_seconds', 'Time spent applying a compiled rule to a batch', ['rule_id'])
+validation_rule_records = Counter('validation_rule_records_total', 'Records evaluated per compiled rule', ['rule_id'])
+validation_rule_issues = Counter('validation_rule_issues_total', 'Issues raised per compiled rule', ['rule_id', 'severity'])
+duplicate_index_size = Gauge('duplicate_index_size', 'Tracks in the near-duplicate LSH index')
+
+# Batch validation: records are validated column-wise in chunks of this size,
+# yielding to the event loop between chunks while results stream out
+BATCH_CHUNK_SIZE = int(os.getenv("VALIDATION_BATCH_CHUNK_SIZE", "5000"))
+BATCH_MAX_RECORDS = int(os.getenv("VALIDATION_BATCH_MAX_RECORDS", "250000"))
+
+# Near-duplicate detection (MinHash/LSH); num_perm must be divisible by bands
+DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.7"))
+MINHASH_NUM_PERM = int(os.getenv("MINHASH_NUM_PERM", "64"))
+LSH_BANDS = int(os.getenv("LSH_BANDS", "16"))
+# Oldest tracks are evicted past the cap; the Redis copy expires if left idle
+DUPLICATE_INDEX_MAX_ENTRIES = int(os.getenv("DUPLICATE_INDEX_MAX_ENTRIES", "500000"))
+DUPLICATE_INDEX_TTL_SECONDS = int(os.getenv("DUPLICATE_INDEX_TTL_SECONDS", str(30 * 86400)))
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -180,6 +201,13 @@ class ValidationResult(BaseModel):
     issues: List[ValidationIssue] = []
     recommendations: List[str] = []
 
+class BatchValidationRequest(BaseModel):
+    """Batch of records validated by the streaming /validate/batch endpoint"""
+    validation_types: List[ValidationType] = [ValidationType.SCHEMA, ValidationType.QUALITY]
+    records: List[TrackData]
+    rules: Optional[List[str]] = None  # Specific rules to apply
+    include_valid: bool = True  # Emit a result line for records without issues
+
 # =====================
 # Validation Rules Registry
 # =====================
@@ -327,62 +355,56 @@ class SchemaValidator:
         
         for rule_id, rule in self.rules.items():
             if rule_id == "required_title":
-                if not track.title or not track.title.strip():
-                    issues.append(ValidationIssue(
-                        rule_id=rule_id,
-                        rule_name=rule.name,
-                        severity=rule.severity,
-                        field="title",
-                        message="Title is required",
-                        suggestions=["Add a valid title"]
-                    ))
+                issues.extend(self._validate_required("title", track.title, rule))
             
             elif rule_id == "required_artist":
-                if not track.artist or not track.artist.strip():
-                    issues.append(ValidationIssue(
-                        rule_id=rule_id,
-                        rule_name=rule.name,
-                        severity=rule.severity,
-                        field="artist",
-                        message="Artist is required",
-                        suggestions=["Add a valid artist name"]
-                    ))
+                issues.extend(self._validate_required("artist", track.artist, rule))
             
             elif rule_id == "title_length":
                 if track.title:
-                    title_length = len(track.title)
-                    min_len = rule.parameters.get("min_length", 1)
-                    max_len = rule.parameters.get("max_length", 255)
-                    
-                    if title_length < min_len or title_length > max_len:
-                        issues.append(ValidationIssue(
-                            rule_id=rule_id,
-                            rule_name=rule.name,
-                            severity=rule.severity,
-                            field="title",
-                            message=f"Title length ({title_length}) outside valid range ({min_len}-{max_len})",
-                            value=str(title_length),
-                            suggestions=[f"Ensure title is between {min_len} and {max_len} characters"]
-                        ))
+                    issues.extend(self._validate_length("title", track.title, rule))
             
             elif rule_id == "artist_length":
                 if track.artist:
-                    artist_length = len(track.artist)
-                    min_len = rule.parameters.get("min_length", 1)
-                    max_len = rule.parameters.get("max_length", 255)
-                    
-                    if artist_length < min_len or artist_length > max_len:
-                        issues.append(ValidationIssue(
-                            rule_id=rule_id,
-                            rule_name=rule.name,
-                            severity=rule.severity,
-                            field="artist",
-                            message=f"Artist length ({artist_length}) outside valid range ({min_len}-{max_len})",
-                            value=str(artist_length),
-                            suggestions=[f"Ensure artist name is between {min_len} and {max_len} characters"]
-                        ))
+                    issues.extend(self._validate_length("artist", track.artist, rule))
         
         return issues
+    
+    def _validate_required(self, field: str, value: Optional[str], rule: ValidationRule) -> List[ValidationIssue]:
+        """Validate a required text field is present and not blank"""
+        if value and value.strip():
+            return []
+        
+        label = "Title" if field == "title" else "Artist"
+        return [ValidationIssue(
+            rule_id=rule.id,
+            rule_name=rule.name,
+            severity=rule.severity,
+            field=field,
+            message=f"{label} is required",
+            suggestions=["Add a valid title" if field == "title" else "Add a valid artist name"]
+        )]
+    
+    def _validate_length(self, field: str, value: str, rule: ValidationRule) -> List[ValidationIssue]:
+        """Validate a text field length is within the rule's range"""
+        length = len(value)
+        min_len = rule.parameters.get("min_length", 1)
+        max_len = rule.parameters.get("max_length", 255)
+        
+        if min_len <= length <= max_len:
+            return []
+        
+        label = "Title" if field == "title" else "Artist"
+        noun = "title" if field == "title" else "artist name"
+        return [ValidationIssue(
+            rule_id=rule.id,
+            rule_name=rule.name,
+            severity=rule.severity,
+            field=field,
+            message=f"{label} length ({length}) outside valid range ({min_len}-{max_len})",
+            value=str(length),
+            suggestions=[f"Ensure {noun} is between {min_len} and {max_len} characters"]
+        )]
 
 class QualityValidator:
     """Validates data quality and format"""
@@ -814,51 +836,466 @@ class BusinessRulesValidator:
         return issues
 
 class DuplicateDetector:
-    """Detects duplicate tracks"""
+    """
+    Detects duplicate tracks in two tiers
+
+    1. Exact: an md5 fingerprint of the normalised title/artist catches
+       identical tracks with one dict lookup
+    2. Near: a MinHash/LSH index over title/artist shingles catches remix
+       tags, featuring variations and typos without pairwise comparison
+
+    Every track checked is added to the index, which is persisted in Redis,
+    so duplicates are also found against tracks seen in earlier runs. The
+    index holds at most `max_entries` tracks, least recently checked evicted
+    first, and the Redis copy expires after `ttl_seconds` without writes.
+    """
     
-    def __init__(self):
-        self.similarity_threshold = 0.8
+    SIGNATURES_KEY = "validation:duplicates:signatures"
+    FINGERPRINTS_KEY = "validation:duplicates:fingerprints"
+    PARAMS_KEY = "validation:duplicates:params"
+    
+    _VERSION_WORDS = re.compile(r'\b(remix|edit|mix|extended|radio|original)\b')
+    _FEATURING = re.compile(r'\b(feat|ft|featuring)\b')
+    _PUNCTUATION = re.compile(r'[^\w\s]')
+    _WHITESPACE = re.compile(r'\s+')
+    
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        similarity_threshold: float = DUPLICATE_SIMILARITY_THRESHOLD,
+        num_perm: int = MINHASH_NUM_PERM,
+        bands: int = LSH_BANDS,
+        max_entries: int = DUPLICATE_INDEX_MAX_ENTRIES,
+        ttl_seconds: int = DUPLICATE_INDEX_TTL_SECONDS
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.redis = redis_client
+        self.hasher = MinHasher(num_perm)
+        self.index = LSHIndex(num_perm, bands)
+        self.fingerprints: Dict[str, str] = {}  # fingerprint -> track key
+        self.entries: Dict[str, str] = {}  # track key -> fingerprint, oldest first
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._params = f"minhash:{num_perm}"
+        self._loaded = redis_client is None
+        self._load_lock = asyncio.Lock()
+        self._find_lock = asyncio.Lock()
+    
+    async def load(self):
+        """Load the persisted index in a worker thread so the event loop keeps running"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if not self._loaded:
+                await asyncio.to_thread(self._ensure_loaded)
     
     async def detect_duplicates(self, tracks: List[TrackData]) -> List[ValidationIssue]:
         """Detect duplicate tracks in a list"""
+        return [issue for _, issue in await self.find_duplicates_async(tracks)]
+    
+    async def find_duplicates_async(self, tracks: List[TrackData]) -> List[Tuple[int, ValidationIssue]]:
+        """Run find_duplicates in a worker thread, one batch at a time since it updates the index"""
+        await self.load()
+        async with self._find_lock:
+            return await asyncio.to_thread(self.find_duplicates, tracks)
+    
+    def find_duplicates(self, tracks: List[TrackData]) -> List[Tuple[int, ValidationIssue]]:
+        """Detect duplicate tracks, returning (index of the duplicate, issue) pairs"""
+        self._ensure_loaded()
         issues = []
+        batch_fingerprints: Dict[str, int] = {}
+        batch_keys: Dict[str, int] = {}
+        new_entries: List[Tuple[str, str, Tuple[int, ...]]] = []
+        evicted: List[Tuple[str, str]] = []
         
-        # Create fingerprints for each track
-        fingerprints = {}
         for i, track in enumerate(tracks):
-            fingerprint = self._generate_fingerprint(track)
-            if fingerprint in fingerprints:
-                # Found duplicate
-                original_idx = fingerprints[fingerprint]
-                issues.append(ValidationIssue(
-                    rule_id="duplicate_detection",
-                    rule_name="Duplicate Detection",
-                    severity=ValidationSeverity.WARNING,
-                    field=None,
-                    message=f"Potential duplicate of track at index {original_idx}",
-                    value=f"{track.title} - {track.artist}",
-                    suggestions=["Review and remove duplicate if confirmed"]
-                ))
-            else:
-                fingerprints[fingerprint] = i
+            key = f"{track.source}:{track.source_id}"
+            title, artist = self._normalize(track)
+            fingerprint = self._generate_fingerprint(title, artist)
+            
+            # Tier 1: exact fingerprint, in this batch then in earlier runs
+            if fingerprint in batch_fingerprints:
+                issues.append((i, self._issue(track, f"track at index {batch_fingerprints[fingerprint]}")))
+                continue
+            batch_fingerprints[fingerprint] = i
+            
+            known = self.fingerprints.get(fingerprint)
+            if known is not None and known != key:
+                issues.append((i, self._issue(track, f"previously seen track {known}")))
+                continue
+            
+            # Tier 2: near-duplicates via LSH candidates
+            text = f"{self._FEATURING.sub(' ', title)} {self._FEATURING.sub(' ', artist)}"
+            text = self._WHITESPACE.sub(' ', text).strip()
+            if not text:
+                continue
+            
+            signature = self.hasher.signature(shingles(text))
+            matches = self.index.query(signature, self.similarity_threshold, exclude=key)
+            if matches:
+                match_key, similarity = matches[0]
+                match = (f"track at index {batch_keys[match_key]}" if match_key in batch_keys
+                         else f"previously seen track {match_key}")
+                issues.append((i, self._issue(track, match, similarity)))
+            
+            self._add(key, fingerprint, signature, evicted)
+            batch_keys[key] = i
+            new_entries.append((key, fingerprint, signature))
         
+        self._evict(evicted)
+        new_entries = [entry for entry in new_entries if entry[0] in self.entries]
+        self._persist(new_entries, evicted)
+        duplicate_index_size.set(len(self.index))
         return issues
     
-    def _generate_fingerprint(self, track: TrackData) -> str:
-        """Generate fingerprint for duplicate detection"""
+    def _issue(self, track: TrackData, match: str, similarity: Optional[float] = None) -> ValidationIssue:
+        if similarity is None:
+            message = f"Potential duplicate of {match}"
+        else:
+            message = f"Potential near-duplicate of {match} (similarity {similarity:.2f})"
+        return ValidationIssue(
+            rule_id="duplicate_detection",
+            rule_name="Duplicate Detection",
+            severity=ValidationSeverity.WARNING,
+            field=None,
+            message=message,
+            value=f"{track.title} - {track.artist}",
+            suggestions=["Review and remove duplicate if confirmed"]
+        )
+    
+    def _normalize(self, track: TrackData) -> Tuple[str, str]:
+        """Lower-cased title/artist without version tags, punctuation or extra spaces"""
         title = (track.title or "").lower().strip()
         artist = (track.artist or "").lower().strip()
         
         # Remove common words and characters for better matching
-        title = re.sub(r'\b(remix|edit|mix|extended|radio|original)\b', '', title)
-        title = re.sub(r'[^\w\s]', '', title)
-        title = re.sub(r'\s+', ' ', title).strip()
+        title = self._VERSION_WORDS.sub('', title)
+        title = self._PUNCTUATION.sub('', title)
+        title = self._WHITESPACE.sub(' ', title).strip()
         
-        artist = re.sub(r'[^\w\s]', '', artist)
-        artist = re.sub(r'\s+', ' ', artist).strip()
+        artist = self._PUNCTUATION.sub('', artist)
+        artist = self._WHITESPACE.sub(' ', artist).strip()
         
+        return title, artist
+    
+    def _generate_fingerprint(self, title: str, artist: str) -> str:
+        """Generate fingerprint for exact duplicate detection"""
         fingerprint_data = f"{title}|{artist}"
         return hashlib.md5(fingerprint_data.encode()).hexdigest()
+    
+    def _add(self, key: str, fingerprint: str, signature: Optional[Tuple[int, ...]], evicted: List[Tuple[str, str]]):
+        """Index a track as the most recently seen entry"""
+        previous = self.entries.pop(key, None)
+        if previous is not None and previous != fingerprint and self.fingerprints.get(previous) == key:
+            # The record changed since it was indexed; its old fingerprint goes
+            del self.fingerprints[previous]
+            evicted.append(("", previous))
+        self.entries[key] = fingerprint
+        self.fingerprints[fingerprint] = key
+        if signature is not None:
+            self.index.insert(key, signature)
+    
+    def _evict(self, evicted: List[Tuple[str, str]]):
+        """Drop the oldest entries until the index fits in max_entries"""
+        while len(self.entries) > self.max_entries:
+            key = next(iter(self.entries))
+            fingerprint = self.entries.pop(key)
+            self.index.remove(key)
+            if self.fingerprints.get(fingerprint) == key:
+                del self.fingerprints[fingerprint]
+            evicted.append((key, fingerprint))
+    
+    def _ensure_loaded(self):
+        """Load the persisted index on first use"""
+        if self._loaded:
+            return
+        
+        try:
+            stored_params = self.redis.get(self.PARAMS_KEY)
+            if stored_params and stored_params != self._params:
+                # Signatures from other MinHash parameters are not comparable
+                logger.warning(f"Duplicate index built with {stored_params}, now {self._params}; "
+                               f"discarding stored signatures")
+                self.redis.delete(self.SIGNATURES_KEY)
+            self.redis.set(self.PARAMS_KEY, self._params)
+            
+            signatures = {
+                key: decode_signature(encoded)
+                for key, encoded in self.redis.hscan_iter(self.SIGNATURES_KEY, count=1000)
+            }
+            evicted: List[Tuple[str, str]] = []
+            for fingerprint, key in self.redis.hscan_iter(self.FINGERPRINTS_KEY, count=1000):
+                self._add(key, fingerprint, signatures.get(key), evicted)
+            # Signatures without a fingerprint can never be evicted; drop them now
+            evicted.extend((key, "") for key in signatures if key not in self.entries)
+            self._evict(evicted)
+            self._persist([], evicted)
+            
+            duplicate_index_size.set(len(self.index))
+            logger.info(f"✅ Loaded duplicate index: {len(self.index)} signatures, "
+                        f"{len(self.fingerprints)} fingerprints")
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Could not load duplicate index from Redis, starting empty: {e}")
+        finally:
+            self._loaded = True
+    
+    def _persist(self, entries: List[Tuple[str, str, Tuple[int, ...]]], evicted: List[Tuple[str, str]]):
+        """Write newly indexed tracks and drop evicted ones in one pipeline"""
+        if not self.redis or not (entries or evicted):
+            return
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if entries:
+                pipe.hset(self.SIGNATURES_KEY, mapping={key: encode_signature(sig) for key, _, sig in entries})
+                pipe.hset(self.FINGERPRINTS_KEY, mapping={fp: key for key, fp, _ in entries})
+            evicted_keys = [key for key, _ in evicted if key and key not in self.entries]
+            evicted_fingerprints = [fp for _, fp in evicted if fp and fp not in self.fingerprints]
+            if evicted_keys:
+                pipe.hdel(self.SIGNATURES_KEY, *evicted_keys)
+            if evicted_fingerprints:
+                pipe.hdel(self.FINGERPRINTS_KEY, *evicted_fingerprints)
+            if self.ttl_seconds > 0:
+                for redis_key in (self.SIGNATURES_KEY, self.FINGERPRINTS_KEY, self.PARAMS_KEY):
+                    pipe.expire(redis_key, self.ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Failed to persist duplicate index: {e}")
+
+# =====================
+# Compiled Validation Plan
+# =====================
+
+@dataclass
+class CompiledRule:
+    """A rule bound to the columns it reads and the check that applies it"""
+    rule: ValidationRule
+    columns: Optional[Tuple[str, ...]]  # None: the check receives the whole record
+    check: Callable[..., List[ValidationIssue]]
+    skip_empty: bool = True  # Skip records whose first column is empty
+    passes: Optional[Callable[[Any], bool]] = None  # Cheap pre-check; True means no issues
+    memoize: bool = True  # Reuse results for repeated values within a batch
+
+
+class ValidationPlan:
+    """
+    Rules compiled once and applied column-wise to whole batches
+
+    Compilation resolves rule parameters into sets and bound checks up front;
+    at run time each rule walks only the columns it reads, skips values that
+    pass a cheap pre-check, and evaluates every distinct value once per batch
+    (genres, keys, artists and sources repeat heavily in scraped data).
+    Issues are identical to the per-record validators, which remain the
+    single source of the check logic.
+    """
+
+    def __init__(self, rules: List[CompiledRule]):
+        self.rules = rules
+        self._duration = {c.rule.id: validation_rule_duration.labels(rule_id=c.rule.id) for c in rules}
+        self._records = {c.rule.id: validation_rule_records.labels(rule_id=c.rule.id) for c in rules}
+
+    @property
+    def rule_ids(self) -> List[str]:
+        return [c.rule.id for c in self.rules]
+
+    def run(self, tracks: List[TrackData]) -> List[List[ValidationIssue]]:
+        """Validate a batch, returning the issues of each record in input order"""
+        per_record: List[List[ValidationIssue]] = [[] for _ in tracks]
+        columns: Dict[str, List[Any]] = {}
+
+        def column(name: str) -> List[Any]:
+            if name not in columns:
+                columns[name] = [getattr(track, name, None) for track in tracks]
+            return columns[name]
+
+        for compiled in self.rules:
+            rule_id = compiled.rule.id
+            started = time.perf_counter()
+            severities: Dict[str, int] = {}
+
+            if compiled.columns is None:
+                values = tracks
+            elif len(compiled.columns) == 1:
+                values = column(compiled.columns[0])
+            else:
+                values = list(zip(*(column(name) for name in compiled.columns)))
+
+            check, passes = compiled.check, compiled.passes
+            skip_empty = compiled.skip_empty
+            multi_column = compiled.columns is not None and len(compiled.columns) > 1
+            cache: Dict[Any, List[ValidationIssue]] = {}
+
+            for i, value in enumerate(values):
+                if skip_empty and not (value[0] if multi_column else value):
+                    continue
+                if passes is not None and passes(value):
+                    continue
+
+                if compiled.memoize:
+                    issues = cache.get(value)
+                    if issues is None:
+                        issues = cache[value] = check(value)
+                else:
+                    issues = check(value)
+
+                if issues:
+                    per_record[i].extend(issues)
+                    for issue in issues:
+                        severities[issue.severity.value] = severities.get(issue.severity.value, 0) + 1
+
+            self._duration[rule_id].observe(time.perf_counter() - started)
+            self._records[rule_id].inc(len(tracks))
+            for severity, count in severities.items():
+                validation_rule_issues.labels(rule_id=rule_id, severity=severity).inc(count)
+
+        return per_record
+
+
+def compile_validation_plan(
+    validation_types: List[ValidationType],
+    rule_ids: Optional[List[str]] = None,
+    validators: Optional[Dict[ValidationType, Any]] = None
+) -> ValidationPlan:
+    """
+    Compile the enabled rules of the given types into a ValidationPlan
+
+    Args:
+        validation_types: Types to include, in evaluation order (DUPLICATE is
+            batch-level and handled by DuplicateDetector, not the plan)
+        rule_ids: Optional subset of rule ids to apply
+        validators: Validator instances providing the checks, by type
+
+    Returns:
+        ValidationPlan
+    """
+    if validators is None:
+        validators = {
+            ValidationType.SCHEMA: SchemaValidator(),
+            ValidationType.QUALITY: QualityValidator(),
+            ValidationType.COMPLETENESS: CompletenessValidator(),
+            ValidationType.CONSISTENCY: ConsistencyValidator(),
+            ValidationType.BUSINESS_RULES: BusinessRulesValidator(),
+        }
+    selected = set(rule_ids) if rule_ids else None
+
+    compiled: List[CompiledRule] = []
+    for validation_type in dict.fromkeys(validation_types):
+        validator = validators.get(validation_type)
+        if validator is None:
+            continue
+        for rule_id, rule in validator.rules.items():
+            if selected is not None and rule_id not in selected:
+                continue
+            compiled_rule = _compile_rule(rule, validator)
+            if compiled_rule is None:
+                logger.warning(f"No compiled check for validation rule '{rule_id}', skipping")
+                continue
+            compiled.append(compiled_rule)
+
+    return ValidationPlan(compiled)
+
+
+# Characters the title quality check does not count as special
+_TITLE_PUNCTUATION = str.maketrans("", "", " -()[].")
+
+
+def _not_all_caps(value: str) -> bool:
+    """Fast pre-check mirroring the quality validators' uppercase ratio test"""
+    return len(value) <= 2 or sum(map(str.isupper, value)) <= len(value) * 0.5
+
+
+def _no_special_characters(value: str) -> bool:
+    """Fast pre-check: the title contains no characters the quality check counts as special"""
+    remainder = value.translate(_TITLE_PUNCTUATION)
+    return not remainder or remainder.isalnum()
+
+
+def _compile_rule(rule: ValidationRule, validator: Any) -> Optional[CompiledRule]:
+    """Bind a rule to its columns and check, resolving parameters once"""
+    rule_id = rule.id
+
+    if rule_id in ("required_title", "required_artist"):
+        field = "title" if rule_id == "required_title" else "artist"
+        return CompiledRule(
+            rule, (field,),
+            check=lambda v, f=field: validator._validate_required(f, v, rule),
+            skip_empty=False,
+            passes=lambda v: bool(v) and not v.isspace()
+        )
+
+    if rule_id in ("title_length", "artist_length"):
+        field = "title" if rule_id == "title_length" else "artist"
+        min_len = rule.parameters.get("min_length", 1)
+        max_len = rule.parameters.get("max_length", 255)
+        return CompiledRule(
+            rule, (field,),
+            check=lambda v, f=field: validator._validate_length(f, v, rule),
+            passes=lambda v: min_len <= len(v) <= max_len,
+            memoize=False
+        )
+
+    if rule_id == "title_quality":
+        return CompiledRule(
+            rule, ("title",),
+            check=lambda v: validator._validate_title_quality(v, rule),
+            passes=lambda v: _not_all_caps(v) and _no_special_characters(v),
+            memoize=False
+        )
+
+    if rule_id == "artist_quality":
+        return CompiledRule(
+            rule, ("artist",),
+            check=lambda v: validator._validate_artist_quality(v, rule),
+            passes=lambda v: _not_all_caps(v) and not v.startswith(("dj ", "Dj "))
+        )
+
+    if rule_id == "bpm_range":
+        return CompiledRule(rule, ("bpm",), check=lambda v: validator._validate_bpm_range(v, rule))
+
+    if rule_id == "duration_format":
+        return CompiledRule(rule, ("duration",), check=lambda v: validator._validate_duration_format(v, rule))
+
+    if rule_id == "url_validity":
+        url_match = validator.url_pattern.match
+        return CompiledRule(
+            rule, ("url",),
+            check=lambda v: validator._validate_url(v, rule),
+            passes=lambda v: url_match(v) is not None,
+            memoize=False
+        )
+
+    if rule_id == "metadata_completeness":
+        return CompiledRule(
+            rule, None,
+            check=lambda track: validator._validate_metadata_completeness(track, rule),
+            skip_empty=False,
+            memoize=False
+        )
+
+    if rule_id in ("genre_consistency", "key_consistency"):
+        field = "genre" if rule_id == "genre_consistency" else "key"
+        known = frozenset(rule.parameters.get("known_genres" if field == "genre" else "valid_keys", []))
+        helper = (validator._validate_genre_consistency if field == "genre"
+                  else validator._validate_key_consistency)
+        return CompiledRule(
+            rule, (field,),
+            check=lambda v: helper(v, rule),
+            passes=known.__contains__
+        )
+
+    if rule_id == "release_date_reasonable":
+        return CompiledRule(rule, ("release_date",), check=lambda v: validator._validate_release_date(v, rule))
+
+    if rule_id == "source_id_format":
+        return CompiledRule(
+            rule, ("source", "source_id"),
+            check=lambda v: validator._validate_source_id_format(v[0], v[1], rule),
+            skip_empty=False,
+            passes=lambda v: bool(v[1]) and not v[1].isspace() and (v[0] != "1001tracklists" or v[1].isdigit())
+        )
+
+    return None
+
 
 # =====================
 # Validation Engine
@@ -873,7 +1310,26 @@ class ValidationEngine:
         self.completeness_validator = CompletenessValidator()
         self.consistency_validator = ConsistencyValidator()
         self.business_rules_validator = BusinessRulesValidator()
-        self.duplicate_detector = DuplicateDetector()
+        self.duplicate_detector = DuplicateDetector(redis_client)
+        self.validators = {
+            ValidationType.SCHEMA: self.schema_validator,
+            ValidationType.QUALITY: self.quality_validator,
+            ValidationType.COMPLETENESS: self.completeness_validator,
+            ValidationType.CONSISTENCY: self.consistency_validator,
+            ValidationType.BUSINESS_RULES: self.business_rules_validator,
+        }
+        self._plans: Dict[Tuple[Tuple[ValidationType, ...], Optional[Tuple[str, ...]]], ValidationPlan] = {}
+    
+    def get_plan(self, validation_types: List[ValidationType], rule_ids: Optional[List[str]] = None) -> ValidationPlan:
+        """Compiled plan for a combination of validation types and rules, built once"""
+        key = (tuple(validation_types), tuple(sorted(rule_ids)) if rule_ids else None)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = compile_validation_plan(validation_types, rule_ids, self.validators)
+            self._plans[key] = plan
+            logger.info(f"Compiled validation plan for {[vt.value for vt in validation_types]}: "
+                        f"{len(plan.rules)} rules")
+        return plan
     
     async def validate_task(self, task: ValidationTask) -> ValidationResult:
         """Process a validation task"""
@@ -891,48 +1347,26 @@ class ValidationEngine:
             else:
                 tracks = task.data
             
-            all_issues = []
-            
-            # Run validations based on requested types
+            # Rules run column-wise over the whole batch; duplicate detection
+            # compares records with each other so it runs on the batch as well
             for validation_type in task.validation_types:
                 active_validations.labels(validation_type=validation_type.value).inc()
+            
+            try:
+                plan = self.get_plan(task.validation_types, task.rules)
+                all_issues = [issue for issues in plan.run(tracks) for issue in issues]
                 
-                try:
-                    if validation_type == ValidationType.SCHEMA:
-                        for track in tracks:
-                            issues = await self.schema_validator.validate(track)
-                            all_issues.extend(issues)
-                    
-                    elif validation_type == ValidationType.QUALITY:
-                        for track in tracks:
-                            issues = await self.quality_validator.validate(track)
-                            all_issues.extend(issues)
-                    
-                    elif validation_type == ValidationType.COMPLETENESS:
-                        for track in tracks:
-                            issues = await self.completeness_validator.validate(track)
-                            all_issues.extend(issues)
-                    
-                    elif validation_type == ValidationType.CONSISTENCY:
-                        for track in tracks:
-                            issues = await self.consistency_validator.validate(track)
-                            all_issues.extend(issues)
-                    
-                    elif validation_type == ValidationType.BUSINESS_RULES:
-                        for track in tracks:
-                            issues = await self.business_rules_validator.validate(track)
-                            all_issues.extend(issues)
-                    
-                    elif validation_type == ValidationType.DUPLICATE:
-                        issues = await self.duplicate_detector.detect_duplicates(tracks)
-                        all_issues.extend(issues)
-                    
+                if ValidationType.DUPLICATE in task.validation_types:
+                    all_issues.extend(await self.duplicate_detector.detect_duplicates(tracks))
+                
+                for validation_type in task.validation_types:
                     validation_tasks_total.labels(
                         validation_type=validation_type.value,
                         status="success"
                     ).inc()
-                    
-                finally:
+            
+            finally:
+                for validation_type in task.validation_types:
                     active_validations.labels(validation_type=validation_type.value).dec()
             
             # Calculate metrics
@@ -943,14 +1377,7 @@ class ValidationEngine:
             # Determine if data is valid (no errors)
             is_valid = error_count == 0
             
-            # Calculate quality score
-            total_possible_issues = len(tracks) * len(VALIDATION_RULES)
-            if total_possible_issues > 0:
-                # Weight errors more heavily than warnings
-                weighted_issues = error_count * 3 + warning_count * 1 + info_count * 0.5
-                score = max(0.0, 1.0 - (weighted_issues / total_possible_issues))
-            else:
-                score = 1.0
+            score = self._calculate_score(len(tracks), error_count, warning_count, info_count)
             
             # Generate recommendations
             recommendations = self._generate_recommendations(all_issues)
@@ -1025,6 +1452,46 @@ class ValidationEngine:
         finally:
             await self._update_task_status(task)
     
+    async def validate_batch(
+        self,
+        tracks: List[TrackData],
+        validation_types: List[ValidationType],
+        rule_ids: Optional[List[str]] = None,
+        chunk_size: int = BATCH_CHUNK_SIZE
+    ) -> AsyncIterator[Tuple[int, List[ValidationIssue]]]:
+        """
+        Validate a large batch chunk by chunk
+
+        Yields (index, issues) for every record in input order, handing control
+        back to the event loop between chunks so results can stream while the
+        rest of the batch is validated.
+        """
+        plan = self.get_plan(validation_types, rule_ids)
+        
+        duplicates: Dict[int, List[ValidationIssue]] = {}
+        if ValidationType.DUPLICATE in validation_types:
+            for index, issue in await self.duplicate_detector.find_duplicates_async(tracks):
+                duplicates.setdefault(index, []).append(issue)
+        
+        for offset in range(0, len(tracks), chunk_size):
+            chunk_issues = plan.run(tracks[offset:offset + chunk_size])
+            for i, issues in enumerate(chunk_issues, start=offset):
+                if i in duplicates:
+                    issues = issues + duplicates[i]
+                yield i, issues
+            await asyncio.sleep(0)
+    
+    @staticmethod
+    def _calculate_score(track_count: int, error_count: int, warning_count: int, info_count: int) -> float:
+        """Overall quality score in [0, 1]"""
+        total_possible_issues = track_count * len(VALIDATION_RULES)
+        if total_possible_issues <= 0:
+            return 1.0
+        
+        # Weight errors more heavily than warnings
+        weighted_issues = error_count * 3 + warning_count * 1 + info_count * 0.5
+        return max(0.0, 1.0 - (weighted_issues / total_possible_issues))
+    
     def _generate_recommendations(self, issues: List[ValidationIssue]) -> List[str]:
         """Generate recommendations based on validation issues"""
         recommendations = []
@@ -1079,14 +1546,17 @@ class ValidationEngine:
                     result.error_count, result.warning_count, result.info_count,
                     result.processing_time, datetime.now())
                 
-                # Store validation issues
-                for issue in result.issues:
-                    await conn.execute("""
+                # Store validation issues in one round trip
+                if result.issues:
+                    await conn.executemany("""
                         INSERT INTO validation_issues
                         (task_id, rule_id, rule_name, severity, field, message, value, suggestions)
                         VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    """, result.task_id, issue.rule_id, issue.rule_name, issue.severity.value,
-                        issue.field, issue.message, issue.value, json.dumps(issue.suggestions))
+                    """, [
+                        (result.task_id, issue.rule_id, issue.rule_name, issue.severity.value,
+                         issue.field, issue.message, issue.value, json.dumps(issue.suggestions))
+                        for issue in result.issues
+                    ])
                 
         except Exception as e:
             logger.error(f"Failed to store validation result: {str(e)}")
@@ -1379,6 +1849,110 @@ async def validate_sync(task: ValidationTask):
     result = await validation_engine.validate_task(task)
     return result
 
+@app.post("/validate/batch")
+async def validate_batch(request: BatchValidationRequest):
+    """
+    Validate a large batch, streaming one NDJSON result line per record
+
+    Each line holds the record index, source identifiers, validity and its
+    issues; the final line is a {"summary": ...} object. Per-record issues are
+    streamed rather than persisted; only the batch summary is stored.
+    """
+    if len(request.records) > BATCH_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.records)} records exceeds the maximum of {BATCH_MAX_RECORDS}"
+        )
+    
+    task_id = f"validate_batch_{datetime.now().timestamp()}"
+    validation_types = request.validation_types
+    
+    async def stream_results():
+        start_time = time.perf_counter()
+        counts = {severity: 0 for severity in ValidationSeverity}
+        invalid_records = 0
+        serialized: Dict[int, Tuple[ValidationIssue, Dict[str, Any]]] = {}  # Memoized issues are shared between records
+        
+        for validation_type in validation_types:
+            active_validations.labels(validation_type=validation_type.value).inc()
+        try:
+            async for index, issues in validation_engine.validate_batch(
+                request.records, validation_types, request.rules
+            ):
+                is_valid = True
+                for issue in issues:
+                    counts[issue.severity] += 1
+                    if issue.severity == ValidationSeverity.ERROR:
+                        is_valid = False
+                if not is_valid:
+                    invalid_records += 1
+                if not issues and not request.include_valid:
+                    continue
+                
+                record = request.records[index]
+                issue_dicts = []
+                for issue in issues:
+                    entry = serialized.get(id(issue))
+                    if entry is None:
+                        # Keep the issue referenced so its id() can't be reused
+                        entry = serialized[id(issue)] = (issue, issue.dict())
+                    issue_dicts.append(entry[1])
+                
+                yield json.dumps({
+                    "index": index,
+                    "source": record.source,
+                    "source_id": record.source_id,
+                    "is_valid": is_valid,
+                    "issues": issue_dicts
+                }, default=str) + "\n"
+                
+                if len(serialized) > BATCH_CHUNK_SIZE * 4:
+                    serialized.clear()
+            
+            for validation_type in validation_types:
+                validation_tasks_total.labels(validation_type=validation_type.value, status="success").inc()
+        except Exception as e:
+            logger.error(f"Batch validation {task_id} failed: {str(e)}")
+            for validation_type in validation_types:
+                validation_tasks_total.labels(validation_type=validation_type.value, status="failed").inc()
+            yield json.dumps({"error": f"Validation failed: {str(e)}"}) + "\n"
+            return
+        finally:
+            for validation_type in validation_types:
+                active_validations.labels(validation_type=validation_type.value).dec()
+        
+        processing_time = time.perf_counter() - start_time
+        error_count = counts[ValidationSeverity.ERROR]
+        result = ValidationResult(
+            task_id=task_id,
+            validation_types=validation_types,
+            status=ValidationStatus.COMPLETED,
+            is_valid=error_count == 0,
+            score=validation_engine._calculate_score(
+                len(request.records), error_count,
+                counts[ValidationSeverity.WARNING], counts[ValidationSeverity.INFO]
+            ),
+            total_issues=sum(counts.values()),
+            error_count=error_count,
+            warning_count=counts[ValidationSeverity.WARNING],
+            info_count=counts[ValidationSeverity.INFO],
+            processing_time=processing_time
+        )
+        
+        for validation_type in validation_types:
+            validation_duration.labels(validation_type=validation_type.value).observe(processing_time)
+        await validation_engine._store_result(result)
+        
+        summary = result.dict(exclude={"issues", "recommendations"})
+        summary.update({"records": len(request.records), "invalid_records": invalid_records})
+        yield json.dumps({"summary": summary}, default=str) + "\n"
+    
+    return StreamingResponse(
+        stream_results(),
+        media_type="application/x-ndjson",
+        headers={"X-Validation-Task-Id": task_id}
+    )
+
 @app.get("/tasks/{task_id}")
 async def get_task_status(task_id: str):
     """Get status of a validation task"""
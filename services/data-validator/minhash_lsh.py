@@ -0,0 +1,159 @@
+"""
+MinHash / LSH index for near-duplicate track detection
+
+Tracks are reduced to sets of character shingles of their normalised
+"title artist" text. A MinHash signature estimates the Jaccard similarity of
+two shingle sets from the fraction of positions where their signatures agree,
+and locality-sensitive hashing splits each signature into bands so that only
+tracks sharing at least one identical band are ever compared. Lookups
+therefore touch a handful of buckets instead of scanning every known track.
+
+Hashing is deterministic (crc32 shingles, seeded multiply-shift hash
+functions), so signatures can be stored and reloaded between runs. numpy is
+used to hash all shingles against all functions at once when available; the
+pure-Python path computes identical signatures.
+"""
+
+import random
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_MASK_64 = (1 << 64) - 1
+_MAX_HASH = (1 << 32) - 1
+
+Signature = Tuple[int, ...]
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Character shingles of `text`; short texts yield the text itself"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def encode_signature(signature: Signature) -> str:
+    """Compact hex encoding for storage"""
+    return struct.pack(f"<{len(signature)}I", *signature).hex()
+
+
+def decode_signature(encoded: str) -> Signature:
+    raw = bytes.fromhex(encoded)
+    return struct.unpack(f"<{len(raw) // 4}I", raw)
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with `num_perm` seeded hash functions
+
+    Each function is a multiply-shift hash of the 32-bit shingle hash,
+    ((a * h + b) mod 2^64) >> 32 with odd a, which is universal and maps
+    directly onto numpy's wrapping uint64 arithmetic.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array([a for a, _ in self._perms], dtype=np.uint64)
+            self._b = np.array([b for _, b in self._perms], dtype=np.uint64)
+
+    def signature(self, shingle_set: Iterable[str]) -> Signature:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingle_set]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+
+        if np is not None:
+            h = np.array(hashes, dtype=np.uint64)[:, None]
+            values = (h * self._a + self._b) >> np.uint64(32)
+            return tuple(values.min(axis=0).tolist())
+
+        return tuple(
+            min(((a * h + b) & _MASK_64) >> 32 for h in hashes)
+            for a, b in self._perms
+        )
+
+
+def estimate_similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class LSHIndex:
+    """
+    Banded LSH index over MinHash signatures
+
+    With b bands of r rows, two sets with Jaccard similarity s share a bucket
+    with probability 1 - (1 - s^r)^b; the defaults (16 bands of 4 rows) make
+    pairs above ~0.7 similarity almost certain candidates while pairs below
+    ~0.3 rarely are. Candidates are then filtered on estimated similarity.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures: Dict[str, Signature] = {}
+        self._buckets: List[Dict[Signature, List[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.signatures
+
+    def _band_keys(self, signature: Signature):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def insert(self, key: str, signature: Signature):
+        """Add or replace the signature stored under `key`"""
+        if len(signature) != self.num_perm:
+            raise ValueError(f"Signature has {len(signature)} values, expected {self.num_perm}")
+        if key in self.signatures:
+            self.remove(key)
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def remove(self, key: str):
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def query(
+        self,
+        signature: Signature,
+        threshold: float,
+        exclude: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """Keys whose estimated similarity is at least `threshold`, most similar first"""
+        candidates: Set[str] = set()
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket:
+                candidates.update(bucket)
+        candidates.discard(exclude)
+
+        matches = []
+        for key in candidates:
+            similarity = estimate_similarity(signature, self.signatures[key])
+            if similarity >= threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda m: (-m[1], m[0]))
+        return matches
@@ -0,0 +1,142 @@
+"""Unit tests for exact and MinHash/LSH near-duplicate detection"""
+import threading
+
+import pytest
+
+import main
+from main import DuplicateDetector, TrackData
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the Redis commands the detector uses"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.strings = {}
+        self.ttls = {}
+        self.scan_threads = []
+        self.pipeline_threads = []
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def set(self, key, value):
+        self.strings[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    def hscan_iter(self, key, count=None):
+        self.scan_threads.append(threading.current_thread())
+        return iter(list(self.hashes.get(key, {}).items()))
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        self.pipeline_threads.append(threading.current_thread())
+        return []
+
+
+def _track(source_id, title, artist):
+    return TrackData(source="1001tracklists", source_id=source_id, title=title, artist=artist)
+
+
+def test_exact_duplicates_keep_index_message():
+    issues = DuplicateDetector().find_duplicates([
+        _track("1", "Strobe (Original Mix)", "deadmau5"),
+        _track("2", "Strobe", "Deadmau5"),
+    ])
+
+    assert [(i, issue.message) for i, issue in issues] == [
+        (1, "Potential duplicate of track at index 0")
+    ]
+
+
+def test_near_duplicates_catch_featuring_and_typos():
+    issues = dict(DuplicateDetector().find_duplicates([
+        _track("1", "Language (feat. Nadia Ali)", "Porter Robinson"),
+        _track("2", "Language ft Nadia Ali", "Porter Robinson"),
+        _track("3", "Sad Machine", "Porter Robinson"),
+        _track("4", "Sad Machne", "Porter Robinson"),
+        _track("5", "Shelter", "Porter Robinson"),
+    ]))
+
+    assert sorted(issues) == [1, 3]
+    assert issues[1].message.startswith("Potential near-duplicate of track at index 0")
+    assert issues[3].message.startswith("Potential near-duplicate of track at index 2")
+
+
+def test_index_persists_between_runs():
+    fake_redis = FakeRedis()
+    DuplicateDetector(fake_redis).find_duplicates([_track("1", "Opus", "Eric Prydz")])
+
+    detector = DuplicateDetector(fake_redis)
+    # Revalidating the same record is not a duplicate of itself
+    assert detector.find_duplicates([_track("1", "Opus", "Eric Prydz")]) == []
+
+    issues = detector.find_duplicates([_track("2", "Opus (Extended Mix)", "Eric Prydz")])
+
+    assert len(detector.index) == 1
+    assert [(i, issue.message) for i, issue in issues] == [
+        (0, "Potential duplicate of previously seen track 1001tracklists:1")
+    ]
+
+
+def test_index_is_capped_oldest_first_in_memory_and_redis():
+    fake_redis = FakeRedis()
+    detector = DuplicateDetector(fake_redis, max_entries=2, ttl_seconds=60)
+
+    detector.find_duplicates([_track("1", "Opus", "Eric Prydz"), _track("2", "Strobe", "Deadmau5")])
+    # Seeing track 1 again makes track 2 the oldest entry
+    detector.find_duplicates([_track("1", "Opus", "Eric Prydz")])
+    detector.find_duplicates([_track("3", "Shelter", "Porter Robinson")])
+
+    assert list(detector.entries) == ["1001tracklists:1", "1001tracklists:3"]
+    assert len(detector.index) == len(detector.fingerprints) == 2
+    assert set(fake_redis.hashes[DuplicateDetector.SIGNATURES_KEY]) == set(detector.entries)
+    assert set(fake_redis.hashes[DuplicateDetector.FINGERPRINTS_KEY].values()) == set(detector.entries)
+    assert fake_redis.ttls[DuplicateDetector.SIGNATURES_KEY] == 60
+
+    # The evicted track is no longer reported as a duplicate
+    assert detector.find_duplicates([_track("4", "Strobe", "Deadmau5")]) == []
+
+
+def test_oversized_stored_index_is_trimmed_on_load():
+    fake_redis = FakeRedis()
+    DuplicateDetector(fake_redis).find_duplicates([
+        _track(str(i), title, "Porter Robinson") for i, title in enumerate(["Shelter", "Divinity", "Flicker"])
+    ])
+
+    detector = DuplicateDetector(fake_redis, max_entries=1)
+    detector.find_duplicates([])
+
+    assert len(detector.index) == 1
+    assert len(fake_redis.hashes[DuplicateDetector.SIGNATURES_KEY]) == 1
+    assert len(fake_redis.hashes[DuplicateDetector.FINGERPRINTS_KEY]) == 1
+
+
+@pytest.mark.asyncio
+async def test_index_loads_and_updates_off_the_event_loop():
+    fake_redis = FakeRedis()
+    DuplicateDetector(fake_redis).find_duplicates([_track("1", "Opus", "Eric Prydz")])
+    fake_redis.scan_threads.clear()
+    fake_redis.pipeline_threads.clear()
+
+    detector = DuplicateDetector(fake_redis)
+    issues = await detector.detect_duplicates([_track("2", "Opus", "Eric Prydz"), _track("3", "Strobe", "deadmau5")])
+
+    assert [issue.message for issue in issues] == ["Potential duplicate of previously seen track 1001tracklists:1"]
+    assert fake_redis.scan_threads and fake_redis.pipeline_threads
+    assert threading.main_thread() not in fake_redis.scan_threads + fake_redis.pipeline_threads
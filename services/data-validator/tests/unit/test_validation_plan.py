@@ -0,0 +1,72 @@
+"""Unit tests for the compiled validation plan and batch validation"""
+import pytest
+
+import main
+from main import TrackData, ValidationType
+
+ALL_TYPES = [
+    ValidationType.SCHEMA,
+    ValidationType.QUALITY,
+    ValidationType.COMPLETENESS,
+    ValidationType.CONSISTENCY,
+    ValidationType.BUSINESS_RULES,
+]
+
+TRACKS = [
+    TrackData(source="1001tracklists", source_id="123", title="Strobe", artist="deadmau5",
+              genre="Progressive", key="Am", bpm=128, duration="10:37", release_date="2009-09-22",
+              url="https://www.1001tracklists.com/track/123"),
+    TrackData(source="1001tracklists", source_id="abc", title="SANDSTORM!!!", artist="dj Darude",
+              genre="Trance-ish", key="H", bpm="fast", duration="1:2:3:4", release_date="someday",
+              url="not a url"),
+    TrackData(source="mixesdb", source_id=" ", title="   ", artist=None, bpm=300, duration="9000",
+              release_date="1850"),
+    TrackData(source="1001tracklists", source_id="124", title="Strobe", artist="deadmau5",
+              genre="Progressive", key="Am", bpm=128),
+]
+
+
+def _per_record_validators():
+    return [
+        main.SchemaValidator(),
+        main.QualityValidator(),
+        main.CompletenessValidator(),
+        main.ConsistencyValidator(),
+        main.BusinessRulesValidator(),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_plan_matches_per_record_validators():
+    plan = main.compile_validation_plan(ALL_TYPES)
+    per_record = plan.run(TRACKS)
+
+    validators = _per_record_validators()
+    for track, plan_issues in zip(TRACKS, per_record):
+        expected = []
+        for validator in validators:
+            expected.extend(await validator.validate(track))
+        assert sorted(i.json() for i in plan_issues) == sorted(i.json() for i in expected)
+
+
+def test_plan_respects_rule_subset():
+    plan = main.compile_validation_plan(ALL_TYPES, rule_ids=["required_artist"])
+
+    assert plan.rule_ids == ["required_artist"]
+    per_record = plan.run(TRACKS)
+    assert [len(issues) for issues in per_record] == [0, 0, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_validate_batch_yields_every_record_with_duplicates():
+    engine = main.ValidationEngine()
+    engine.duplicate_detector = main.DuplicateDetector()  # In-memory index only
+    results = [
+        (index, issues) async for index, issues in engine.validate_batch(
+            TRACKS, [ValidationType.SCHEMA, ValidationType.DUPLICATE], chunk_size=3
+        )
+    ]
+
+    assert [index for index, _ in results] == [0, 1, 2, 3]
+    assert [i.rule_id for i in results[3][1]] == ["duplicate_detection"]
+    assert {i.rule_id for i in results[2][1]} == {"required_title", "required_artist"}
@@ -0,0 +1,279 @@
+"""
+DLQ Message Store
+=================
+
+Local SQLite store for dead-lettered messages.
+
+The DLQ manager drains enrichment.dlq.queue into this store, so browsing,
+grouping and statistics are served from indexed SQL instead of peeking at
+RabbitMQ with basic_get/basic_nack. Replay re-publishes the stored body and
+headers, then removes the row.
+
+Messages are removed from RabbitMQ once stored, so the queue's x-message-ttl
+no longer applies; prune_older_than() enforces the same retention here.
+
+Times are stored as epoch seconds and returned as timezone-aware UTC
+datetimes; naive datetimes passed in are taken to be UTC.
+
+Indexes:
+- error_type, timestamp  (grouping and filtered listing)
+- source_service, timestamp
+- timestamp, message_id  (default listing order)
+- ingested_at            (retention pruning)
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dlq_messages (
+    message_id TEXT PRIMARY KEY,
+    correlation_id TEXT,
+    routing_key TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    error_type TEXT NOT NULL,
+    error_message TEXT NOT NULL,
+    stack_trace TEXT,
+    source_service TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    metadata TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dlq_error_type ON dlq_messages(error_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_dlq_source_service ON dlq_messages(source_service, timestamp);
+CREATE INDEX IF NOT EXISTS idx_dlq_timestamp ON dlq_messages(timestamp, message_id);
+CREATE INDEX IF NOT EXISTS idx_dlq_ingested_at ON dlq_messages(ingested_at);
+"""
+
+_MESSAGE_COLUMNS = (
+    "message_id, correlation_id, routing_key, timestamp, retry_count, error_type, "
+    "error_message, stack_trace, source_service, payload, metadata"
+)
+
+
+def _to_epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _from_epoch(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+class DLQStore:
+    """Thread-safe SQLite store of dead-lettered messages"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Shared between the ingest thread and API handlers; guarded by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def insert(self, message: Dict[str, Any], headers: Dict[str, Any], body: bytes) -> None:
+        """
+        Store a dead-lettered message.
+
+        Args:
+            message: Parsed fields (see DLQMessage); timestamp as datetime
+            headers: Original AMQP headers, re-sent on replay
+            body: Raw message body, re-sent on replay
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO dlq_messages (
+                    message_id, correlation_id, routing_key, timestamp, retry_count,
+                    error_type, error_message, stack_trace, source_service,
+                    payload, metadata, headers, body, ingested_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    message['message_id'],
+                    message.get('correlation_id'),
+                    message['routing_key'],
+                    _to_epoch(message['timestamp']),
+                    message.get('retry_count', 0),
+                    message['error_type'],
+                    message['error_message'],
+                    message.get('stack_trace'),
+                    message['source_service'],
+                    json.dumps(message['payload'], default=str),
+                    json.dumps(message.get('metadata') or {}, default=str),
+                    json.dumps(headers, default=str),
+                    body,
+                    time.time()
+                )
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _row_to_message(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'message_id': row['message_id'],
+            'correlation_id': row['correlation_id'],
+            'routing_key': row['routing_key'],
+            'timestamp': _from_epoch(row['timestamp']),
+            'retry_count': row['retry_count'],
+            'error_type': row['error_type'],
+            'error_message': row['error_message'],
+            'stack_trace': row['stack_trace'],
+            'source_service': row['source_service'],
+            'payload': json.loads(row['payload']),
+            'metadata': json.loads(row['metadata']) if row['metadata'] else None,
+        }
+
+    def list_messages(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        error_type: Optional[str] = None,
+        source_service: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """List messages, oldest first, optionally filtered on indexed columns"""
+        clauses, params = [], []
+        if error_type:
+            clauses.append("error_type = ?")
+            params.append(error_type)
+        if source_service:
+            clauses.append("source_service = ?")
+            params.append(source_service)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(_to_epoch(since))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_MESSAGE_COLUMNS} FROM dlq_messages {where} "
+                f"ORDER BY timestamp, message_id LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+        return [self._row_to_message(row) for row in rows]
+
+    def get_for_replay(self, message_ids: List[str]) -> List[Tuple[str, str, Optional[str], Dict[str, Any], bytes]]:
+        """
+        Fetch what is needed to re-publish messages.
+
+        Returns:
+            (message_id, routing_key, correlation_id, headers, body) tuples
+        """
+        if not message_ids:
+            return []
+        placeholders = ",".join("?" * len(message_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT message_id, routing_key, correlation_id, headers, body "
+                f"FROM dlq_messages WHERE message_id IN ({placeholders})",
+                message_ids
+            ).fetchall()
+        return [
+            (r['message_id'], r['routing_key'], r['correlation_id'], json.loads(r['headers']), r['body'])
+            for r in rows
+        ]
+
+    def delete(self, message_ids: List[str]) -> int:
+        """Remove messages; returns number of rows deleted"""
+        if not message_ids:
+            return 0
+        placeholders = ",".join("?" * len(message_ids))
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM dlq_messages WHERE message_id IN ({placeholders})",
+                message_ids
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def prune_older_than(self, max_age_seconds: float) -> int:
+        """Remove messages stored more than max_age_seconds ago; returns rows deleted"""
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM dlq_messages WHERE ingested_at < ?", (cutoff,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM dlq_messages").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts by error type and service plus oldest/newest timestamps"""
+        with self._lock:
+            total, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM dlq_messages"
+            ).fetchone()
+            by_error_type = dict(self._conn.execute(
+                "SELECT error_type, COUNT(*) FROM dlq_messages GROUP BY error_type"
+            ).fetchall())
+            by_service = dict(self._conn.execute(
+                "SELECT source_service, COUNT(*) FROM dlq_messages GROUP BY source_service"
+            ).fetchall())
+        return {
+            'total': total,
+            'by_error_type': by_error_type,
+            'by_service': by_service,
+            'oldest': _from_epoch(oldest) if oldest is not None else None,
+            'newest': _from_epoch(newest) if newest is not None else None,
+        }
+
+    def error_groups(self, samples: int = 5) -> List[Dict[str, Any]]:
+        """Group by error type (most common first) with sample message IDs"""
+        with self._lock:
+            groups = self._conn.execute(
+                """
+                SELECT error_type, COUNT(*) AS count,
+                       MIN(timestamp) AS first_seen, MAX(timestamp) AS last_seen
+                FROM dlq_messages
+                GROUP BY error_type
+                ORDER BY count DESC
+                """
+            ).fetchall()
+            sample_rows = self._conn.execute(
+                """
+                SELECT error_type, message_id FROM (
+                    SELECT error_type, message_id,
+                           ROW_NUMBER() OVER (PARTITION BY error_type ORDER BY timestamp) AS rn
+                    FROM dlq_messages
+                ) WHERE rn <= ?
+                """,
+                (samples,)
+            ).fetchall()
+
+        samples_by_type: Dict[str, List[str]] = {}
+        for row in sample_rows:
+            samples_by_type.setdefault(row['error_type'], []).append(row['message_id'])
+
+        return [
+            {
+                'error_type': g['error_type'],
+                'count': g['count'],
+                'sample_messages': samples_by_type.get(g['error_type'], []),
+                'first_seen': _from_epoch(g['first_seen']),
+                'last_seen': _from_epoch(g['last_seen']),
+            }
+            for g in groups
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -4,8 +4,13 @@ Dead-Letter Queue (DLQ) Manager Service
 
 FastAPI service for monitoring, analyzing, and replaying failed enrichment messages.
 
+A background ingest thread consumes enrichment.dlq.queue into a local indexed
+SQLite store (see dlq_store.py). Listing, grouping and statistics are served
+from that store, so browsing never touches the live queue; replay re-publishes
+from the store.
+
 Endpoints:
-- GET /dlq/messages - List failed messages with pagination
+- GET /dlq/messages - List failed messages with pagination (filter by error_type/source_service)
 - GET /dlq/stats - Statistics (total failed, by error type, by service)
 - POST /dlq/replay/{message_id} - Replay a specific message
 - POST /dlq/replay/batch - Replay multiple messages
@@ -17,9 +22,12 @@ Endpoints:
 
 import logging
 import json
+import os
+import threading
+import time
 import uuid
 import traceback
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
 from contextlib import asynccontextmanager
 
@@ -36,6 +44,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from common.secrets_manager import get_rabbitmq_config
 from rabbitmq_setup import RabbitMQSetup
+from dlq_store import DLQStore
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +53,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DLQ_QUEUE = 'enrichment.dlq.queue'
+DLQ_STORE_PATH = os.getenv('DLQ_STORE_PATH', '/app/data/dlq_store.db')
+DLQ_INGEST_PREFETCH = int(os.getenv('DLQ_INGEST_PREFETCH', '500'))
+# Same retention the queue's x-message-ttl gave before messages were drained into the store
+DLQ_STORE_RETENTION_SECONDS = int(os.getenv(
+    'DLQ_STORE_RETENTION_SECONDS', str(RabbitMQSetup.MESSAGE_TTL // 1000)
+))
+DLQ_PRUNE_INTERVAL_SECONDS = int(os.getenv('DLQ_PRUNE_INTERVAL_SECONDS', '3600'))
+
 # ============================================================================
 # PROMETHEUS METRICS
 # ============================================================================
@@ -66,6 +84,17 @@ dlq_replay_total = Counter(
     ['status']
 )
 
+dlq_ingested_total = Counter(
+    'dlq_ingested_total',
+    'DLQ messages consumed into the local store',
+    ['status']
+)
+
+dlq_pruned_total = Counter(
+    'dlq_pruned_total',
+    'DLQ messages removed from the local store after the retention period'
+)
+
 dlq_message_age = Histogram(
     'dlq_message_age_seconds',
     'Age of messages in DLQ',
@@ -128,36 +157,172 @@ class ErrorGroup(BaseModel):
 # DLQ MANAGER
 # ============================================================================
 
+def _rabbitmq_parameters(config: Dict[str, Any]) -> pika.ConnectionParameters:
+    """Build pika connection parameters from the RabbitMQ config"""
+    credentials = pika.PlainCredentials(
+        username=config['username'],
+        password=config['password']
+    )
+
+    return pika.ConnectionParameters(
+        host=config['host'],
+        port=config['port'],
+        virtual_host=config['vhost'],
+        credentials=credentials,
+        heartbeat=600,
+        blocked_connection_timeout=300
+    )
+
+
+def parse_dlq_message(method, properties, body: bytes) -> Dict[str, Any]:
+    """
+    Parse a dead-lettered AMQP message into DLQMessage fields.
+
+    Bodies that are not valid JSON are kept as {'raw': ...} so they can still
+    be browsed and replayed.
+    """
+    try:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            payload = {'value': payload}
+    except ValueError:
+        payload = {'raw': body.decode('utf-8', errors='replace')}
+    headers = properties.headers or {}
+
+    return {
+        'message_id': properties.message_id or str(uuid.uuid4()),
+        'correlation_id': properties.correlation_id,
+        'routing_key': method.routing_key,
+        'timestamp': (
+            datetime.fromtimestamp(properties.timestamp, tz=timezone.utc)
+            if properties.timestamp else datetime.now(timezone.utc)
+        ),
+        'retry_count': headers.get('x-retry-count', 0),
+        'error_type': headers.get('x-error-type', 'unknown'),
+        'error_message': headers.get('x-error-message', 'No error message'),
+        'stack_trace': headers.get('x-stack-trace'),
+        'source_service': headers.get('x-source-service', 'unknown'),
+        'payload': payload,
+        'metadata': headers.get('x-metadata', {})
+    }
+
+
+class DLQIngestor:
+    """
+    Drains the DLQ into the local store on a background thread.
+
+    Uses its own BlockingConnection (pika connections are not thread-safe).
+    Each message is acknowledged only after it has been committed to the store,
+    and stored messages older than the retention period are pruned hourly.
+    """
+
+    def __init__(self, store: DLQStore, config: Dict[str, Any], queue: str = DLQ_QUEUE):
+        self.store = store
+        self.config = config
+        self.queue = queue
+        self.connection = None
+        self.channel = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="dlq-ingestor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        connection = self.connection
+        if connection and connection.is_open:
+            try:
+                connection.add_callback_threadsafe(self._stop_consuming)
+            except Exception as e:
+                logger.warning(f"Error stopping DLQ ingestor: {e}")
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self.channel is not None
+
+    def _stop_consuming(self):
+        if self.channel and self.channel.is_open:
+            self.channel.stop_consuming()
+
+    def prune(self):
+        """Drop stored messages past retention (the queue TTL no longer applies once drained)"""
+        try:
+            pruned = self.store.prune_older_than(DLQ_STORE_RETENTION_SECONDS)
+        except Exception as e:
+            logger.error(f"Failed to prune DLQ store: {e}")
+            return
+        if pruned:
+            dlq_pruned_total.inc(pruned)
+            logger.info(f"Pruned {pruned} DLQ messages older than {DLQ_STORE_RETENTION_SECONDS}s")
+
+    def _schedule_prune(self):
+        self.prune()
+        if self.connection and self.connection.is_open and not self._stopping.is_set():
+            self.connection.call_later(DLQ_PRUNE_INTERVAL_SECONDS, self._schedule_prune)
+
+    def _on_message(self, channel, method, properties, body):
+        message = parse_dlq_message(method, properties, body)
+
+        try:
+            self.store.insert(message, properties.headers or {}, body)
+        except Exception as e:
+            logger.error(f"Failed to store DLQ message {message['message_id']}: {e}")
+            dlq_ingested_total.labels(status='store_error').inc()
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        dlq_ingested_total.labels(status='stored').inc()
+        dlq_message_age.observe(max(0.0, (datetime.now(timezone.utc) - message['timestamp']).total_seconds()))
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.connection = pika.BlockingConnection(_rabbitmq_parameters(self.config))
+                self.channel = self.connection.channel()
+                self.channel.basic_qos(prefetch_count=DLQ_INGEST_PREFETCH)
+                self.channel.basic_consume(queue=self.queue, on_message_callback=self._on_message)
+                logger.info(f"✓ DLQ ingestor consuming {self.queue}")
+                self._schedule_prune()
+                self.channel.start_consuming()
+            except Exception as e:
+                if self._stopping.is_set():
+                    break
+                logger.error(f"DLQ ingestor connection lost: {e}; reconnecting in 5s")
+                self._stopping.wait(5)
+            finally:
+                try:
+                    if self.connection and self.connection.is_open:
+                        self.connection.close()
+                except Exception:
+                    pass
+                self.channel = None
+
+
 class DLQManager:
     """Manages DLQ operations"""
 
-    def __init__(self):
+    def __init__(self, store: Optional[DLQStore] = None):
         self.config = get_rabbitmq_config()
         self.connection = None
         self.channel = None
         self.setup = RabbitMQSetup()
+        self.store = store or DLQStore(DLQ_STORE_PATH)
+        self.ingestor = DLQIngestor(self.store, self.config)
 
     def connect(self) -> bool:
-        """Establish RabbitMQ connection"""
+        """Establish RabbitMQ connection and start draining the DLQ into the store"""
         try:
-            credentials = pika.PlainCredentials(
-                username=self.config['username'],
-                password=self.config['password']
-            )
-
-            parameters = pika.ConnectionParameters(
-                host=self.config['host'],
-                port=self.config['port'],
-                virtual_host=self.config['vhost'],
-                credentials=credentials,
-                heartbeat=600,
-                blocked_connection_timeout=300
-            )
-
-            self.connection = pika.BlockingConnection(parameters)
+            self.connection = pika.BlockingConnection(_rabbitmq_parameters(self.config))
             self.channel = self.connection.channel()
+            self.setup.connect()
 
             logger.info("✓ DLQ Manager connected to RabbitMQ")
+            self.ingestor.start()
             return True
 
         except Exception as e:
@@ -166,71 +331,31 @@ class DLQManager:
 
     def get_messages(
         self,
-        queue: str = 'enrichment.dlq.queue',
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        error_type: Optional[str] = None,
+        source_service: Optional[str] = None
     ) -> List[DLQMessage]:
         """
-        Get messages from DLQ (non-destructive peek).
+        Get messages from the DLQ store.
 
         Args:
-            queue: Queue name to read from
             limit: Maximum messages to return
             offset: Number of messages to skip
+            error_type: Only messages with this error type
+            source_service: Only messages from this service
 
         Returns:
-            List of DLQ messages
+            List of DLQ messages, oldest first
         """
-        if not self.channel:
-            raise HTTPException(status_code=503, detail="Not connected to RabbitMQ")
-
-        messages = []
-
         try:
-            # Use basic_get to peek at messages without consuming
-            for i in range(offset + limit):
-                method, properties, body = self.channel.basic_get(queue=queue, auto_ack=False)
-
-                if not method:
-                    break  # No more messages
-
-                # Skip offset messages
-                if i < offset:
-                    self.channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-                    continue
-
-                # Parse message
-                try:
-                    payload = json.loads(body)
-
-                    # Extract headers
-                    headers = properties.headers or {}
-
-                    # Create DLQ message
-                    dlq_msg = DLQMessage(
-                        message_id=properties.message_id or str(uuid.uuid4()),
-                        correlation_id=properties.correlation_id,
-                        routing_key=method.routing_key,
-                        timestamp=datetime.fromtimestamp(properties.timestamp) if properties.timestamp else datetime.utcnow(),
-                        retry_count=headers.get('x-retry-count', 0),
-                        error_type=headers.get('x-error-type', 'unknown'),
-                        error_message=headers.get('x-error-message', 'No error message'),
-                        stack_trace=headers.get('x-stack-trace'),
-                        source_service=headers.get('x-source-service', 'unknown'),
-                        payload=payload,
-                        metadata=headers.get('x-metadata', {})
-                    )
-
-                    messages.append(dlq_msg)
-
-                    # Re-queue message (non-destructive)
-                    self.channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-
-                except Exception as e:
-                    logger.error(f"Failed to parse message: {e}")
-                    self.channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-
-            return messages
+            rows = self.store.list_messages(
+                limit=limit,
+                offset=offset,
+                error_type=error_type,
+                source_service=source_service
+            )
+            return [DLQMessage(**row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to get DLQ messages: {e}")
@@ -238,113 +363,89 @@ class DLQManager:
 
     def get_stats(self) -> DLQStats:
         """Get DLQ statistics"""
-        if not self.channel:
-            raise HTTPException(status_code=503, detail="Not connected to RabbitMQ")
-
         try:
-            # Get queue stats
+            # Get queue stats (messages not yet ingested, retry/analysis queues)
             queue_stats = self.setup.get_queue_stats()
-
-            # Get sample messages for analysis
-            messages = self.get_messages(limit=1000)
-
-            # Analyze error types
-            by_error_type = {}
-            by_service = {}
-            oldest_age = None
-            newest_age = None
-
-            for msg in messages:
-                # Count by error type
-                by_error_type[msg.error_type] = by_error_type.get(msg.error_type, 0) + 1
-
-                # Count by service
-                by_service[msg.source_service] = by_service.get(msg.source_service, 0) + 1
-
-                # Track age
-                age = (datetime.utcnow() - msg.timestamp).total_seconds()
-                if oldest_age is None or age > oldest_age:
-                    oldest_age = age
-                if newest_age is None or age < newest_age:
-                    newest_age = age
+            stored = self.store.stats()
+            now = datetime.now(timezone.utc)
 
             # Update Prometheus metrics
             for queue, count in queue_stats.items():
                 dlq_messages_total.labels(queue=queue).set(count)
+            dlq_messages_total.labels(queue='store').set(stored['total'])
 
-            for error_type, count in by_error_type.items():
+            for error_type, count in stored['by_error_type'].items():
                 dlq_messages_by_error.labels(error_type=error_type).set(count)
 
+            oldest_age = (now - stored['oldest']).total_seconds() if stored['oldest'] else None
+            newest_age = (now - stored['newest']).total_seconds() if stored['newest'] else None
+
             return DLQStats(
-                total_messages=queue_stats.get('enrichment.dlq.queue', 0),
-                by_error_type=by_error_type,
-                by_service=by_service,
-                oldest_message_age_seconds=int(oldest_age) if oldest_age else None,
-                newest_message_age_seconds=int(newest_age) if newest_age else None,
-                queue_stats=queue_stats
+                total_messages=stored['total'] + queue_stats.get(DLQ_QUEUE, 0),
+                by_error_type=stored['by_error_type'],
+                by_service=stored['by_service'],
+                oldest_message_age_seconds=int(oldest_age) if oldest_age is not None else None,
+                newest_message_age_seconds=int(newest_age) if newest_age is not None else None,
+                queue_stats={**queue_stats, 'store': stored['total']}
             )
 
         except Exception as e:
             logger.error(f"Failed to get DLQ stats: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
-    def replay_message(self, message_id: str) -> bool:
+    def _replay_from_store(self, message_ids: List[str]) -> List[str]:
         """
-        Replay a single message from DLQ.
+        Re-publish stored messages to the retry queue and remove them from the store.
 
-        Args:
-            message_id: ID of message to replay
+        Each row is deleted as soon as its message is published, so a failure
+        part-way through never replays the earlier messages a second time.
 
         Returns:
-            True if replay successful, False otherwise
+            IDs of messages that were replayed
         """
         if not self.channel:
             raise HTTPException(status_code=503, detail="Not connected to RabbitMQ")
 
+        replayed = []
         try:
-            # Find message by ID
-            found = False
-
-            while True:
-                method, properties, body = self.channel.basic_get(queue='enrichment.dlq.queue', auto_ack=False)
-
-                if not method:
-                    break
-
-                if properties.message_id == message_id:
-                    found = True
-
-                    # Publish to retry queue
-                    self.channel.basic_publish(
-                        exchange='',
-                        routing_key='enrichment.dlq.retry',
-                        body=body,
-                        properties=pika.BasicProperties(
-                            message_id=properties.message_id,
-                            correlation_id=properties.correlation_id,
-                            timestamp=int(datetime.utcnow().timestamp()),
-                            headers={
-                                **properties.headers,
-                                'x-replayed-at': datetime.utcnow().isoformat(),
-                                'x-original-routing-key': method.routing_key
-                            }
-                        )
+            for message_id, routing_key, correlation_id, headers, body in self.store.get_for_replay(message_ids):
+                self.channel.basic_publish(
+                    exchange='',
+                    routing_key='enrichment.dlq.retry',
+                    body=body,
+                    properties=pika.BasicProperties(
+                        message_id=message_id,
+                        correlation_id=correlation_id,
+                        timestamp=int(time.time()),
+                        headers={
+                            **headers,
+                            'x-replayed-at': datetime.now(timezone.utc).isoformat(),
+                            'x-original-routing-key': routing_key
+                        }
                     )
+                )
+                self.store.delete([message_id])
+                replayed.append(message_id)
+        finally:
+            dlq_replay_total.labels(status='success').inc(len(replayed))
+        return replayed
 
-                    # Acknowledge (remove from DLQ)
-                    self.channel.basic_ack(delivery_tag=method.delivery_tag)
+    def replay_message(self, message_id: str) -> bool:
+        """
+        Replay a single message from DLQ.
 
-                    dlq_replay_total.labels(status='success').inc()
-                    logger.info(f"✓ Replayed message {message_id}")
-                    break
-                else:
-                    # Not the message we're looking for - re-queue
-                    self.channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        Args:
+            message_id: ID of message to replay
 
-            if not found:
+        Returns:
+            True if replay successful, False otherwise
+        """
+        try:
+            if not self._replay_from_store([message_id]):
                 dlq_replay_total.labels(status='not_found').inc()
                 raise HTTPException(status_code=404, detail=f"Message {message_id} not found")
 
+            logger.info(f"✓ Replayed message {message_id}")
             return True
 
         except HTTPException:
@@ -364,22 +465,23 @@ class DLQManager:
         Returns:
             ReplayResponse with success/failure counts
         """
-        replayed = 0
-        failed = 0
-        errors = []
+        try:
+            replayed = set(self._replay_from_store(message_ids))
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to replay batch: {e}")
+            dlq_replay_total.labels(status='error').inc()
+            raise HTTPException(status_code=500, detail=str(e))
 
-        for msg_id in message_ids:
-            try:
-                self.replay_message(msg_id)
-                replayed += 1
-            except Exception as e:
-                failed += 1
-                errors.append(f"{msg_id}: {str(e)}")
+        errors = [f"{msg_id}: not found" for msg_id in message_ids if msg_id not in replayed]
+        if errors:
+            dlq_replay_total.labels(status='not_found').inc(len(errors))
 
         return ReplayResponse(
-            success=failed == 0,
-            replayed_count=replayed,
-            failed_count=failed,
+            success=not errors,
+            replayed_count=len(replayed),
+            failed_count=len(errors),
             errors=errors
         )
 
@@ -393,33 +495,11 @@ class DLQManager:
         Returns:
             True if deletion successful, False otherwise
         """
-        if not self.channel:
-            raise HTTPException(status_code=503, detail="Not connected to RabbitMQ")
-
         try:
-            found = False
-
-            while True:
-                method, properties, body = self.channel.basic_get(queue='enrichment.dlq.queue', auto_ack=False)
-
-                if not method:
-                    break
-
-                if properties.message_id == message_id:
-                    found = True
-
-                    # Acknowledge (remove from queue)
-                    self.channel.basic_ack(delivery_tag=method.delivery_tag)
-
-                    logger.warning(f"⚠ Deleted message {message_id} from DLQ")
-                    break
-                else:
-                    # Not the message we're looking for - re-queue
-                    self.channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-
-            if not found:
+            if not self.store.delete([message_id]):
                 raise HTTPException(status_code=404, detail=f"Message {message_id} not found")
 
+            logger.warning(f"⚠ Deleted message {message_id} from DLQ")
             return True
 
         except HTTPException:
@@ -433,59 +513,19 @@ class DLQManager:
         Group DLQ messages by error type for analysis.
 
         Returns:
-            List of error groups with statistics
+            List of error groups with statistics, most common first
         """
         try:
-            messages = self.get_messages(limit=1000)
-
-            # Group by error type
-            groups = {}
-
-            for msg in messages:
-                if msg.error_type not in groups:
-                    groups[msg.error_type] = {
-                        'count': 0,
-                        'sample_messages': [],
-                        'first_seen': msg.timestamp,
-                        'last_seen': msg.timestamp
-                    }
-
-                group = groups[msg.error_type]
-                group['count'] += 1
-
-                # Keep first 5 message IDs as samples
-                if len(group['sample_messages']) < 5:
-                    group['sample_messages'].append(msg.message_id)
-
-                # Update timestamps
-                if msg.timestamp < group['first_seen']:
-                    group['first_seen'] = msg.timestamp
-                if msg.timestamp > group['last_seen']:
-                    group['last_seen'] = msg.timestamp
-
-            # Convert to list
-            error_groups = [
-                ErrorGroup(
-                    error_type=error_type,
-                    count=data['count'],
-                    sample_messages=data['sample_messages'],
-                    first_seen=data['first_seen'],
-                    last_seen=data['last_seen']
-                )
-                for error_type, data in groups.items()
-            ]
-
-            # Sort by count (most common first)
-            error_groups.sort(key=lambda x: x.count, reverse=True)
-
-            return error_groups
+            return [ErrorGroup(**group) for group in self.store.error_groups()]
 
         except Exception as e:
             logger.error(f"Failed to group errors: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
     def close(self):
-        """Close RabbitMQ connection"""
+        """Stop ingesting and close RabbitMQ connection and store"""
+        self.ingestor.stop()
+        self.setup.close()
         try:
             if self.channel and self.channel.is_open:
                 self.channel.close()
@@ -494,6 +534,7 @@ class DLQManager:
             logger.info("✓ DLQ Manager disconnected from RabbitMQ")
         except Exception as e:
             logger.warning(f"Error closing RabbitMQ connection: {e}")
+        self.store.close()
 
 
 # ============================================================================
@@ -553,7 +594,8 @@ async def health_check():
         "status": "healthy",
         "service": "dlq-manager",
         "timestamp": datetime.utcnow().isoformat(),
-        "rabbitmq_connected": dlq_manager is not None and dlq_manager.channel is not None
+        "rabbitmq_connected": dlq_manager is not None and dlq_manager.channel is not None,
+        "ingestor_running": dlq_manager is not None and dlq_manager.ingestor.is_running
     }
 
 
@@ -566,14 +608,20 @@ async def metrics():
 @app.get("/dlq/messages", response_model=List[DLQMessage])
 async def get_dlq_messages(
     limit: int = Query(100, ge=1, le=1000, description="Maximum messages to return"),
-    offset: int = Query(0, ge=0, description="Number of messages to skip")
+    offset: int = Query(0, ge=0, description="Number of messages to skip"),
+    error_type: Optional[str] = Query(None, description="Filter by error type"),
+    source_service: Optional[str] = Query(None, description="Filter by source service")
 ):
     """
     List failed messages in DLQ with pagination.
 
+    Served from the local DLQ store; the live queue is not touched.
+
     Args:
         limit: Maximum messages to return (1-1000)
         offset: Number of messages to skip
+        error_type: Only messages with this error type
+        source_service: Only messages from this service
 
     Returns:
         List of DLQ messages
@@ -581,7 +629,12 @@ async def get_dlq_messages(
     if not dlq_manager:
         raise HTTPException(status_code=503, detail="DLQ Manager not initialized")
 
-    return dlq_manager.get_messages(limit=limit, offset=offset)
+    return dlq_manager.get_messages(
+        limit=limit,
+        offset=offset,
+        error_type=error_type,
+        source_service=source_service
+    )
 
 
 @app.get("/dlq/stats", response_model=DLQStats)
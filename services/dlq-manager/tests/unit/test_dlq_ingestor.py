@@ -0,0 +1,86 @@
+"""Unit tests for draining the DLQ queue into the store"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from dlq_store import DLQStore
+from main import DLQIngestor, parse_dlq_message
+
+
+class FakeChannel:
+    def __init__(self):
+        self.acked = []
+        self.nacked = []
+
+    def basic_ack(self, delivery_tag):
+        self.acked.append(delivery_tag)
+
+    def basic_nack(self, delivery_tag, requeue):
+        self.nacked.append((delivery_tag, requeue))
+
+
+class FailingStore:
+    def insert(self, message, headers, body):
+        raise RuntimeError('disk full')
+
+
+def delivery(tag=1, message_id='m1', timestamp=1704110400, headers=None):
+    method = SimpleNamespace(delivery_tag=tag, routing_key='enrichment.track')
+    properties = SimpleNamespace(
+        message_id=message_id,
+        correlation_id='corr',
+        timestamp=timestamp,
+        headers={'x-error-type': 'TimeoutError', 'x-source-service': 'metadata-enrichment', **(headers or {})},
+    )
+    return method, properties
+
+
+@pytest.fixture
+def store():
+    store = DLQStore(':memory:')
+    yield store
+    store.close()
+
+
+def test_message_is_acked_only_after_it_is_stored(store):
+    channel = FakeChannel()
+    method, properties = delivery()
+
+    DLQIngestor(store, config={})._on_message(channel, method, properties, b'{"track_id": "t1"}')
+
+    assert channel.acked == [1] and channel.nacked == []
+    [stored] = store.list_messages()
+    assert stored['message_id'] == 'm1' and stored['payload'] == {'track_id': 't1'}
+    assert store.get_for_replay(['m1'])[0][3]['x-error-type'] == 'TimeoutError'
+
+
+def test_store_failure_requeues_instead_of_acking():
+    channel = FakeChannel()
+    method, properties = delivery(tag=7)
+
+    DLQIngestor(FailingStore(), config={})._on_message(channel, method, properties, b'{}')
+
+    assert channel.acked == []
+    assert channel.nacked == [(7, True)]
+
+
+def test_amqp_timestamp_is_parsed_as_utc():
+    method, properties = delivery(timestamp=1704110400)
+    assert parse_dlq_message(method, properties, b'not json')['timestamp'] == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+    method, properties = delivery(timestamp=None)
+    parsed = parse_dlq_message(method, properties, b'not json')
+    assert parsed['timestamp'].tzinfo is not None
+    assert parsed['payload'] == {'raw': 'not json'}
+
+
+def test_prune_removes_messages_past_retention(store, monkeypatch):
+    method, properties = delivery()
+    DLQIngestor(store, config={})._on_message(FakeChannel(), method, properties, b'{}')
+    monkeypatch.setattr(main, 'DLQ_STORE_RETENTION_SECONDS', -1)
+
+    DLQIngestor(store, config={}).prune()
+
+    assert store.count() == 0
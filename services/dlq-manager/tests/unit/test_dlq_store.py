@@ -0,0 +1,107 @@
+"""Unit tests for the SQLite store of dead-lettered messages"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import dlq_store
+from dlq_store import DLQStore
+
+T0 = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store():
+    store = DLQStore(':memory:')
+    yield store
+    store.close()
+
+
+def message(message_id, minutes=0, error_type='TimeoutError', source_service='metadata-enrichment', **extra):
+    return {
+        'message_id': message_id,
+        'correlation_id': f'corr-{message_id}',
+        'routing_key': 'enrichment.track',
+        'timestamp': T0 + timedelta(minutes=minutes),
+        'retry_count': 3,
+        'error_type': error_type,
+        'error_message': 'boom',
+        'source_service': source_service,
+        'payload': {'track_id': message_id},
+        **extra,
+    }
+
+
+def ids(messages):
+    return [m['message_id'] for m in messages]
+
+
+def test_list_is_ordered_by_timestamp_and_filters_on_indexed_columns(store):
+    store.insert(message('c', minutes=2), {}, b'{}')
+    store.insert(message('b', minutes=0, error_type='ValueError'), {}, b'{}')
+    store.insert(message('a', minutes=0, source_service='scraper'), {}, b'{}')
+
+    assert ids(store.list_messages()) == ['a', 'b', 'c']
+    assert ids(store.list_messages(limit=1, offset=1)) == ['b']
+    assert ids(store.list_messages(error_type='TimeoutError')) == ['a', 'c']
+    assert ids(store.list_messages(source_service='scraper')) == ['a']
+    assert ids(store.list_messages(since=T0 + timedelta(minutes=1))) == ['c']
+
+    first = store.list_messages()[0]
+    assert first['timestamp'] == T0 and first['timestamp'].tzinfo is not None
+    assert first['payload'] == {'track_id': 'a'} and first['metadata'] == {}
+
+
+def test_naive_datetimes_are_taken_as_utc(store):
+    store.insert(message('a', timestamp=T0.replace(tzinfo=None)), {}, b'{}')
+
+    assert store.list_messages()[0]['timestamp'] == T0
+    assert ids(store.list_messages(since=T0.replace(tzinfo=None))) == ['a']
+
+
+def test_prune_uses_ingest_time_not_message_time(store, monkeypatch):
+    now = T0.timestamp()
+    monkeypatch.setattr(dlq_store.time, 'time', lambda: now)
+    # An old message ingested just now is kept
+    store.insert(message('old', minutes=-600), {}, b'{}')
+    now += 3600
+    store.insert(message('new'), {}, b'{}')
+    now += 1800
+
+    assert store.prune_older_than(3000) == 1
+    assert ids(store.list_messages()) == ['new']
+    assert store.count() == 1
+
+
+def test_replay_fetches_headers_and_body_then_delete_removes_rows(store):
+    store.insert(message('a'), {'x-error-type': 'TimeoutError'}, b'{"track_id": "a"}')
+    store.insert(message('b'), {}, b'raw')
+
+    replay = store.get_for_replay(['a', 'missing'])
+    assert replay == [('a', 'enrichment.track', 'corr-a', {'x-error-type': 'TimeoutError'}, b'{"track_id": "a"}')]
+    assert store.get_for_replay([]) == []
+
+    assert store.delete(['a', 'missing']) == 1
+    assert store.delete([]) == 0
+    assert ids(store.list_messages()) == ['b']
+
+
+def test_stats_and_error_groups_report_aware_utc_times(store):
+    store.insert(message('a', minutes=0), {}, b'{}')
+    store.insert(message('b', minutes=5), {}, b'{}')
+    store.insert(message('c', minutes=10, error_type='ValueError', source_service='scraper'), {}, b'{}')
+
+    stats = store.stats()
+    assert stats['total'] == 3
+    assert stats['by_error_type'] == {'TimeoutError': 2, 'ValueError': 1}
+    assert stats['by_service'] == {'metadata-enrichment': 2, 'scraper': 1}
+    assert (stats['oldest'], stats['newest']) == (T0, T0 + timedelta(minutes=10))
+
+    timeouts, values = store.error_groups(samples=1)
+    assert (timeouts['error_type'], timeouts['count'], timeouts['sample_messages']) == ('TimeoutError', 2, ['a'])
+    assert (timeouts['first_seen'], timeouts['last_seen']) == (T0, T0 + timedelta(minutes=5))
+    assert values['sample_messages'] == ['c']
+
+
+def test_empty_store_stats(store):
+    assert store.stats() == {'total': 0, 'by_error_type': {}, 'by_service': {}, 'oldest': None, 'newest': None}
+    assert store.error_groups() == []
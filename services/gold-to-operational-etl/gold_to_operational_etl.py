@@ -34,6 +34,9 @@ Usage:
 
     # Dry run
     python gold_to_operational_etl.py --dry-run --limit 100
+
+    # High-throughput full migration (keyset pages + binary COPY + parallel phases)
+    python gold_to_operational_etl.py --full --bulk-copy --page-size 20000
 """
 
 import asyncio
@@ -42,9 +45,11 @@ import logging
 import sys
 import os
 import argparse
-from typing import Optional, Dict, List, Set
+import time
+from typing import Optional, Dict, List, Set, Callable, Any, Awaitable
 from datetime import datetime
 from decimal import Decimal
+from uuid import UUID
 
 # Add common directory to path
 sys.path.insert(0, '/app/common')
@@ -68,6 +73,20 @@ INVALID_ARTIST_PATTERNS = {
     '[unknown]', '(unknown)', 'n/a', 'tba', 'tbd'
 }
 
+# Rows read from the gold layer per keyset page in bulk copy mode
+DEFAULT_KEYSET_PAGE_SIZE = int(os.getenv('ETL_KEYSET_PAGE_SIZE', '10000'))
+
+# Lowest UUID; keyset pagination starts strictly after it
+KEYSET_START_ID = UUID('00000000-0000-0000-0000-000000000000')
+
+
+def _affected_rows(status: str) -> int:
+    """Parse the row count from an asyncpg command status (e.g. 'INSERT 0 42')."""
+    try:
+        return int(status.rsplit(' ', 1)[-1])
+    except (ValueError, AttributeError, IndexError):
+        return 0
+
 
 class GoldToOperationalETL:
     """
@@ -88,6 +107,8 @@ class GoldToOperationalETL:
             'skipped_invalid_artist': 0,
             'errors': 0
         }
+        # Bulk copy mode: rows read/merged, pages, seconds and rows/s per phase
+        self.phase_metrics: Dict[str, Dict[str, Any]] = {}
 
     async def connect(self):
         """Initialize database connection pool"""
@@ -249,8 +270,8 @@ class GoldToOperationalETL:
                 gta.bpm,
                 gta.key,
                 gta.energy,
-                gta.valence,
                 gta.danceability,
+                gta.valence,
                 gta.genre_primary as genre,
                 gta.first_seen_at as created_at,
                 NOW() as updated_at,
@@ -369,8 +390,8 @@ class GoldToOperationalETL:
                 t2.id as song_id_2,
                 t1.id as source_track_id,
                 t2.id as target_track_id,
-                stt.transition_count as occurrence_count,
-                stt.transition_count::float as weight
+                stt.occurrence_count as occurrence_count,
+                stt.occurrence_count::float as weight
             FROM silver_track_transitions stt
             -- Map silver track IDs to gold track IDs
             JOIN gold_track_analytics gta1 ON stt.from_track_id = gta1.silver_track_id
@@ -389,7 +410,7 @@ class GoldToOperationalETL:
               AND gta2.data_quality_score >= 0.5
               AND a1.name IS NOT NULL AND a1.name != '' AND LOWER(a1.name) NOT IN ('unknown', 'unknown artist', 'various artists', 'va')
               AND a2.name IS NOT NULL AND a2.name != '' AND LOWER(a2.name) NOT IN ('unknown', 'unknown artist', 'various artists', 'va')
-              AND stt.transition_count >= 1
+              AND stt.occurrence_count >= 1
               AND NOT EXISTS (
                   SELECT 1 FROM song_adjacency sa
                   WHERE sa.song_id_1 = t1.id AND sa.song_id_2 = t2.id
@@ -463,7 +484,7 @@ class GoldToOperationalETL:
             )
             raise
 
-    async def run_migration(self, batch_size: int = 1000):
+    async def run_migration(self, batch_size: int = 1000, limit: Optional[int] = None):
         """
         Execute full ETL pipeline.
 
@@ -472,12 +493,18 @@ class GoldToOperationalETL:
         2. Tracks (referenced by track_artists)
         3. Track-Artist relationships (referenced by song_adjacency validation)
         4. Song adjacencies (graph edges)
+
+        Args:
+            batch_size: Rows per batch
+            limit: Optional cap on rows processed per phase (for testing)
         """
         logger.info("=" * 80)
         logger.info("🚀 Starting Gold-to-Operational ETL Migration")
         logger.info(f"Mode: {'DRY RUN' if self.dry_run else 'LIVE'}")
         logger.info(f"Type: {'FULL' if self.full_migration else 'INCREMENTAL'}")
         logger.info(f"Batch size: {batch_size}")
+        if limit:
+            logger.info(f"Limit: {limit} rows per phase")
         logger.info("=" * 80)
 
         start_time = datetime.utcnow()
@@ -485,36 +512,22 @@ class GoldToOperationalETL:
         try:
             # Phase 1: Artists
             logger.info("\n📋 Phase 1/4: Migrating Artists")
-            while True:
-                count = await self.migrate_artists(batch_size)
-                self.stats['gold_tracks_processed'] += count
-                if count < batch_size:
-                    break
-                logger.info(f"Processed batch of {count}, continuing...")
+            self.stats['gold_tracks_processed'] += await self._run_batches(
+                self.migrate_artists, batch_size, limit
+            )
 
             # Phase 2: Tracks
             logger.info("\n📋 Phase 2/4: Migrating Tracks")
-            while True:
-                count = await self.migrate_tracks(batch_size)
-                if count < batch_size:
-                    break
-                logger.info(f"Processed batch of {count}, continuing...")
+            await self._run_batches(self.migrate_tracks, batch_size, limit)
 
             # Phase 3: Track-Artist relationships
             logger.info("\n📋 Phase 3/4: Creating Track-Artist Relationships")
-            while True:
-                count = await self.migrate_track_artists(batch_size)
-                if count < batch_size:
-                    break
-                logger.info(f"Processed batch of {count}, continuing...")
+            await self._run_batches(self.migrate_track_artists, batch_size, limit)
 
             # Phase 4: Song Adjacencies
             logger.info("\n📋 Phase 4/4: Building Song Adjacency Graph")
-            while True:
-                count = await self.migrate_song_adjacencies(batch_size // 2)  # Smaller batches for complex joins
-                if count < (batch_size // 2):
-                    break
-                logger.info(f"Processed batch of {count}, continuing...")
+            # Smaller batches for complex joins
+            await self._run_batches(self.migrate_song_adjacencies, batch_size // 2, limit)
 
             duration = (datetime.utcnow() - start_time).total_seconds()
 
@@ -538,6 +551,416 @@ class GoldToOperationalETL:
             self.stats['errors'] += 1
             raise
 
+    async def _run_batches(
+        self,
+        migrate: Callable[[int], Awaitable[int]],
+        batch_size: int,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Call one row-by-row phase until a short batch, or until `limit` rows.
+
+        Returns: Total rows processed by the phase
+        """
+        total = 0
+        while True:
+            size = batch_size if not limit else min(batch_size, limit - total)
+            count = await migrate(size)
+            total += count
+            if count < size or (limit and total >= limit):
+                break
+            logger.info(f"Processed batch of {count}, continuing...")
+        return total
+
+    # =========================================================================
+    # Bulk copy mode
+    # =========================================================================
+
+    async def _copy_pages(
+        self,
+        phase: str,
+        read_page_sql: str,
+        stage_table: str,
+        stage_ddl: str,
+        stage_columns: List[str],
+        merge_sql: str,
+        transform: Optional[Callable[[List[asyncpg.Record]], List[tuple]]] = None,
+        page_size: int = DEFAULT_KEYSET_PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Generic keyset → binary COPY → merge loop for one phase.
+
+        Each page is read with ``WHERE id > $1 ORDER BY id LIMIT $2`` (no OFFSET),
+        copied into a session-local staging table with asyncpg's binary COPY and
+        merged with a single INSERT ... ON CONFLICT. Every page commits on its own,
+        so the operational tables are never locked for longer than one page.
+
+        Args:
+            phase: Phase name used for metrics and logging
+            read_page_sql: Page query taking ($1 = last id, $2 = page size); must
+                select ``id`` first
+            stage_table: Name of the TEMP staging table
+            stage_ddl: Column definitions for the staging table
+            stage_columns: Columns passed to COPY, in record order
+            merge_sql: INSERT ... SELECT FROM staging ... ON CONFLICT statement
+            transform: Optional per-page record transform/filter (defaults to
+                dropping the leading id column)
+            limit: Optional cap on rows read for the phase (for testing)
+
+        Returns: Number of rows merged into the operational table
+        """
+        metrics = self.phase_metrics.setdefault(phase, {'rows_read': 0, 'rows_merged': 0, 'pages': 0})
+        started = time.monotonic()
+        last_id = KEYSET_START_ID
+        merged_total = 0
+
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {stage_table} ({stage_ddl}) ON COMMIT DELETE ROWS"
+            )
+
+            while True:
+                size = page_size if not limit else min(page_size, limit - metrics['rows_read'])
+                if size <= 0:
+                    break
+                page = await conn.fetch(read_page_sql, last_id, size)
+                if not page:
+                    break
+
+                last_id = page[-1]['id']
+                records = transform(page) if transform else [tuple(r)[1:] for r in page]
+                metrics['rows_read'] += len(page)
+                metrics['pages'] += 1
+
+                if self.dry_run:
+                    merged_total += len(records)
+                elif records:
+                    async with conn.transaction():
+                        await conn.copy_records_to_table(
+                            stage_table, records=records, columns=stage_columns
+                        )
+                        status = await conn.execute(merge_sql)
+                    merged_total += _affected_rows(status)
+
+                if len(page) < size:
+                    break
+
+        metrics['rows_merged'] += merged_total
+        metrics['seconds'] = time.monotonic() - started
+        metrics['rows_per_sec'] = metrics['rows_read'] / metrics['seconds'] if metrics['seconds'] > 0 else 0.0
+
+        logger.info(
+            f"{'[DRY RUN] ' if self.dry_run else ''}✅ {phase}: {metrics['rows_read']} rows read, "
+            f"{merged_total} merged in {metrics['pages']} pages "
+            f"({metrics['seconds']:.1f}s, {metrics['rows_per_sec']:.0f} rows/s)"
+        )
+        return merged_total
+
+    def _artist_page_records(self, page: List[asyncpg.Record]) -> List[tuple]:
+        """Distinct, valid (name, normalized_name) pairs from a gold page."""
+        artists: Dict[str, str] = {}
+        invalid = 0
+        for row in page:
+            name = (row['artist_name'] or '').strip()
+            if not self.is_valid_artist_name(name):
+                invalid += 1
+                continue
+            artists.setdefault(name.lower(), name)
+        self.stats['skipped_invalid_artist'] += invalid
+        return [(name, normalized) for normalized, name in artists.items()]
+
+    def _track_page_records(self, page: List[asyncpg.Record]) -> List[tuple]:
+        """
+        Gold rows with a valid artist, reshaped for the tracks staging table.
+
+        Drops the leading (id, artist_name) columns and appends id as gold_track_id.
+        Invalid artists are counted once, by the artists phase, as in row mode.
+        """
+        return [
+            tuple(row)[2:] + (row['id'],)
+            for row in page
+            if self.is_valid_artist_name(row['artist_name'])
+        ]
+
+    async def bulk_migrate_artists(
+        self,
+        page_size: int = DEFAULT_KEYSET_PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> int:
+        """Bulk copy mode equivalent of migrate_artists."""
+        count = await self._copy_pages(
+            phase='artists',
+            read_page_sql="""
+                SELECT id, artist_name
+                FROM gold_track_analytics
+                WHERE id > $1
+                  AND data_quality_score >= 0.5
+                ORDER BY id
+                LIMIT $2
+            """,
+            stage_table='etl_stage_artists',
+            stage_ddl='name TEXT, normalized_name TEXT',
+            stage_columns=['name', 'normalized_name'],
+            merge_sql="""
+                INSERT INTO artists (name, normalized_name)
+                SELECT DISTINCT ON (normalized_name) name, normalized_name
+                FROM etl_stage_artists
+                ORDER BY normalized_name, name
+                ON CONFLICT (normalized_name) DO NOTHING
+            """,
+            transform=self._artist_page_records,
+            page_size=page_size,
+            limit=limit
+        )
+        self.stats['artists_created'] += count
+        return count
+
+    async def bulk_migrate_tracks(
+        self,
+        page_size: int = DEFAULT_KEYSET_PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> int:
+        """Bulk copy mode equivalent of migrate_tracks."""
+        count = await self._copy_pages(
+            phase='tracks',
+            read_page_sql="""
+                SELECT
+                    id, artist_name,
+                    TRIM(track_title) AS title,
+                    LOWER(TRIM(track_title)) AS normalized_title,
+                    spotify_id, isrc, bpm, key, energy, danceability, valence,
+                    genre_primary, first_seen_at,
+                    data_quality_score, enrichment_completeness, playlist_appearances,
+                    compatible_keys, key_family, silver_track_id
+                FROM gold_track_analytics
+                WHERE id > $1
+                  AND data_quality_score >= 0.5
+                  AND track_title IS NOT NULL
+                  AND TRIM(track_title) != ''
+                ORDER BY id
+                LIMIT $2
+            """,
+            stage_table='etl_stage_tracks',
+            stage_ddl="""
+                title TEXT, normalized_title TEXT,
+                spotify_id TEXT, isrc TEXT, bpm DECIMAL(6,2), key TEXT,
+                energy DECIMAL(3,2), danceability DECIMAL(3,2), valence DECIMAL(3,2),
+                genre_primary TEXT, first_seen_at TIMESTAMP,
+                data_quality_score DECIMAL(3,2), enrichment_completeness DECIMAL(3,2),
+                playlist_appearances INTEGER, compatible_keys TEXT[], key_family TEXT,
+                silver_track_id UUID, gold_track_id UUID
+            """,
+            stage_columns=[
+                'title', 'normalized_title', 'spotify_id', 'isrc',
+                'bpm', 'key', 'energy', 'danceability', 'valence', 'genre_primary',
+                'first_seen_at', 'data_quality_score', 'enrichment_completeness',
+                'playlist_appearances', 'compatible_keys', 'key_family',
+                'silver_track_id', 'gold_track_id'
+            ],
+            merge_sql="""
+                INSERT INTO tracks (
+                    title, normalized_title, spotify_id, isrc, bpm, key,
+                    energy, danceability, valence, genre, created_at, updated_at,
+                    metadata
+                )
+                SELECT DISTINCT ON (title, normalized_title)
+                    title, normalized_title, spotify_id, isrc, bpm, key,
+                    energy, danceability, valence, genre_primary, first_seen_at, NOW(),
+                    jsonb_build_object(
+                        'data_quality_score', data_quality_score,
+                        'enrichment_completeness', enrichment_completeness,
+                        'playlist_appearances', playlist_appearances,
+                        'compatible_keys', compatible_keys,
+                        'key_family', key_family,
+                        'gold_track_id', gold_track_id::text,
+                        'silver_track_id', silver_track_id::text
+                    )
+                FROM etl_stage_tracks
+                ORDER BY title, normalized_title, data_quality_score DESC NULLS LAST
+                ON CONFLICT (title, normalized_title) DO UPDATE SET
+                    spotify_id = COALESCE(EXCLUDED.spotify_id, tracks.spotify_id),
+                    isrc = COALESCE(EXCLUDED.isrc, tracks.isrc),
+                    bpm = COALESCE(EXCLUDED.bpm, tracks.bpm),
+                    key = COALESCE(EXCLUDED.key, tracks.key),
+                    energy = COALESCE(EXCLUDED.energy, tracks.energy),
+                    danceability = COALESCE(EXCLUDED.danceability, tracks.danceability),
+                    valence = COALESCE(EXCLUDED.valence, tracks.valence),
+                    genre = COALESCE(EXCLUDED.genre, tracks.genre),
+                    updated_at = NOW(),
+                    metadata = tracks.metadata || EXCLUDED.metadata
+            """,
+            transform=self._track_page_records,
+            page_size=page_size,
+            limit=limit
+        )
+        self.stats['tracks_created'] += count
+        return count
+
+    async def bulk_migrate_track_artists(
+        self,
+        page_size: int = DEFAULT_KEYSET_PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> int:
+        """Bulk copy mode equivalent of migrate_track_artists."""
+        count = await self._copy_pages(
+            phase='track_artists',
+            read_page_sql="""
+                SELECT
+                    id,
+                    LOWER(TRIM(track_title)) AS normalized_title,
+                    spotify_id,
+                    LOWER(TRIM(artist_name)) AS normalized_artist
+                FROM gold_track_analytics
+                WHERE id > $1
+                  AND data_quality_score >= 0.5
+                ORDER BY id
+                LIMIT $2
+            """,
+            stage_table='etl_stage_track_artists',
+            stage_ddl='normalized_title TEXT, spotify_id TEXT, normalized_artist TEXT',
+            stage_columns=['normalized_title', 'spotify_id', 'normalized_artist'],
+            merge_sql="""
+                INSERT INTO track_artists (track_id, artist_id, role)
+                SELECT DISTINCT
+                    t.id as track_id,
+                    a.id as artist_id,
+                    'primary' as role
+                FROM etl_stage_track_artists s
+                JOIN tracks t ON LOWER(TRIM(t.title)) = s.normalized_title
+                    AND (s.spotify_id IS NULL OR t.spotify_id = s.spotify_id)
+                JOIN artists a ON a.normalized_name = s.normalized_artist
+                ON CONFLICT (track_id, artist_id, role) DO NOTHING
+            """,
+            page_size=page_size,
+            limit=limit
+        )
+        self.stats['track_artists_created'] += count
+        return count
+
+    async def bulk_migrate_song_adjacencies(
+        self,
+        page_size: int = DEFAULT_KEYSET_PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Bulk copy mode equivalent of migrate_song_adjacencies.
+
+        Pages silver_track_transitions by id; the same artist attribution rules apply.
+        """
+        count = await self._copy_pages(
+            phase='song_adjacency',
+            read_page_sql="""
+                SELECT id, from_track_id, to_track_id, occurrence_count
+                FROM silver_track_transitions
+                WHERE id > $1
+                  AND occurrence_count >= 1
+                ORDER BY id
+                LIMIT $2
+            """,
+            stage_table='etl_stage_transitions',
+            stage_ddl='from_track_id UUID, to_track_id UUID, occurrence_count INTEGER',
+            stage_columns=['from_track_id', 'to_track_id', 'occurrence_count'],
+            merge_sql="""
+                INSERT INTO song_adjacency (
+                    song_id_1, song_id_2, source_track_id, target_track_id,
+                    occurrence_count, weight
+                )
+                SELECT DISTINCT ON (t1.id, t2.id)
+                    t1.id, t2.id, t1.id, t2.id,
+                    stt.occurrence_count,
+                    stt.occurrence_count::float
+                FROM etl_stage_transitions stt
+                JOIN gold_track_analytics gta1 ON stt.from_track_id = gta1.silver_track_id
+                JOIN gold_track_analytics gta2 ON stt.to_track_id = gta2.silver_track_id
+                JOIN tracks t1 ON LOWER(TRIM(t1.title)) = LOWER(TRIM(gta1.track_title))
+                    AND (gta1.spotify_id IS NULL OR t1.spotify_id = gta1.spotify_id)
+                JOIN tracks t2 ON LOWER(TRIM(t2.title)) = LOWER(TRIM(gta2.track_title))
+                    AND (gta2.spotify_id IS NULL OR t2.spotify_id = gta2.spotify_id)
+                -- ✅ CRITICAL: Ensure BOTH endpoints have valid artist attribution
+                JOIN track_artists ta1 ON t1.id = ta1.track_id AND ta1.role = 'primary'
+                JOIN artists a1 ON ta1.artist_id = a1.id
+                JOIN track_artists ta2 ON t2.id = ta2.track_id AND ta2.role = 'primary'
+                JOIN artists a2 ON ta2.artist_id = a2.id
+                WHERE gta1.data_quality_score >= 0.5
+                  AND gta2.data_quality_score >= 0.5
+                  AND a1.name IS NOT NULL AND a1.name != '' AND LOWER(a1.name) NOT IN ('unknown', 'unknown artist', 'various artists', 'va')
+                  AND a2.name IS NOT NULL AND a2.name != '' AND LOWER(a2.name) NOT IN ('unknown', 'unknown artist', 'various artists', 'va')
+                  AND NOT EXISTS (
+                      SELECT 1 FROM song_adjacency sa
+                      WHERE sa.song_id_1 = t1.id AND sa.song_id_2 = t2.id
+                  )
+                ORDER BY t1.id, t2.id, stt.occurrence_count DESC
+                ON CONFLICT (source_track_id, target_track_id) DO UPDATE SET
+                    occurrence_count = song_adjacency.occurrence_count + EXCLUDED.occurrence_count,
+                    weight = (song_adjacency.occurrence_count + EXCLUDED.occurrence_count)::float,
+                    updated_at = NOW()
+            """,
+            page_size=page_size,
+            limit=limit
+        )
+        self.stats['adjacencies_created'] += count
+        return count
+
+    async def run_bulk_migration(self, page_size: int = DEFAULT_KEYSET_PAGE_SIZE, limit: Optional[int] = None):
+        """
+        Execute the pipeline in bulk copy mode.
+
+        Phases run on their own pooled connections with dependency ordering:
+        1. Artists and tracks (independent of each other) in parallel
+        2. Track-artist relationships (needs both)
+        3. Song adjacencies (needs track-artist attribution)
+
+        `limit` caps the rows read per phase, as in run_migration.
+        """
+        logger.info("=" * 80)
+        logger.info("🚀 Starting Gold-to-Operational ETL Migration (bulk copy)")
+        logger.info(f"Mode: {'DRY RUN' if self.dry_run else 'LIVE'}")
+        logger.info(f"Keyset page size: {page_size}")
+        if limit:
+            logger.info(f"Limit: {limit} rows per phase")
+        logger.info("=" * 80)
+
+        start_time = datetime.utcnow()
+
+        try:
+            logger.info("\n📋 Phase 1/3: Migrating Artists and Tracks (parallel)")
+            await asyncio.gather(
+                self.bulk_migrate_artists(page_size, limit),
+                self.bulk_migrate_tracks(page_size, limit)
+            )
+
+            logger.info("\n📋 Phase 2/3: Creating Track-Artist Relationships")
+            await self.bulk_migrate_track_artists(page_size, limit)
+
+            logger.info("\n📋 Phase 3/3: Building Song Adjacency Graph")
+            await self.bulk_migrate_song_adjacencies(page_size, limit)
+
+            duration = (datetime.utcnow() - start_time).total_seconds()
+
+            logger.info("\n" + "=" * 80)
+            logger.info("✅ Bulk ETL Migration Complete!")
+            logger.info(f"Duration: {duration:.2f}s")
+            logger.info("\nThroughput per phase:")
+            for phase, metrics in self.phase_metrics.items():
+                logger.info(
+                    f"  {phase}: {metrics['rows_read']} read, {metrics['rows_merged']} merged, "
+                    f"{metrics['rows_per_sec']:.0f} rows/s"
+                )
+            logger.info("\nStatistics:")
+            logger.info(f"  Artists created: {self.stats['artists_created']}")
+            logger.info(f"  Tracks created/updated: {self.stats['tracks_created']}")
+            logger.info(f"  Track-artist relationships: {self.stats['track_artists_created']}")
+            logger.info(f"  Song adjacencies: {self.stats['adjacencies_created']}")
+            if self.stats['skipped_invalid_artist'] > 0:
+                logger.info(f"  Skipped (invalid artist): {self.stats['skipped_invalid_artist']}")
+            logger.info("=" * 80)
+
+        except Exception as e:
+            logger.error(f"❌ Bulk ETL failed: {e}", exc_info=True)
+            self.stats['errors'] += 1
+            raise
+
 
 async def main():
     """Main entry point"""
@@ -546,6 +969,10 @@ async def main():
     parser.add_argument('--full', action='store_true', help='Full migration (process all gold tracks)')
     parser.add_argument('--batch-size', type=int, default=1000, help='Batch size for processing')
     parser.add_argument('--limit', type=int, help='Limit total records processed (for testing)')
+    parser.add_argument('--bulk-copy', action='store_true',
+                        help='Keyset-paginated binary COPY mode with parallel phases (recommended with --full)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_KEYSET_PAGE_SIZE,
+                        help='Keyset page size for --bulk-copy')
 
     args = parser.parse_args()
 
@@ -553,7 +980,10 @@ async def main():
 
     try:
         await etl.connect()
-        await etl.run_migration(batch_size=args.batch_size)
+        if args.bulk_copy:
+            await etl.run_bulk_migration(page_size=args.page_size, limit=args.limit)
+        else:
+            await etl.run_migration(batch_size=args.batch_size, limit=args.limit)
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
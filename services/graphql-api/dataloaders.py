@@ -0,0 +1,103 @@
+"""
+Per-request DataLoaders for the GraphQL API
+
+Nested fields (track → artists, artist → tracks, mix → tracks) are resolved
+through these loaders, so every parent in a list is answered by a single
+`= ANY($1::uuid[])` query per relationship instead of one round trip per
+parent. A fresh GraphQLLoaders is built for each request: results are cached
+for that request only and never leak between clients.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+from strawberry.dataloader import DataLoader
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on children returned per parent for nested list fields
+NESTED_LIST_LIMIT = 100
+
+ARTISTS_BY_ID_SQL = """
+    SELECT id, name, metadata->>'genre' AS genre, metadata->>'popularity' AS popularity
+    FROM artists
+    WHERE id = ANY($1::uuid[])
+"""
+
+ARTISTS_BY_TRACK_SQL = """
+    SELECT ta.track_id, a.id, a.name,
+           a.metadata->>'genre' AS genre, a.metadata->>'popularity' AS popularity,
+           ta.role
+    FROM track_artists ta
+    JOIN artists a ON a.id = ta.artist_id
+    WHERE ta.track_id = ANY($1::uuid[])
+    ORDER BY ta.track_id, (ta.role = 'primary') DESC, ta.position
+"""
+
+TRACKS_BY_ARTIST_SQL = """
+    SELECT artist_id, id, title, duration_ms, bpm, genre
+    FROM (
+        SELECT ta.artist_id, t.id, t.title, t.duration_ms, t.bpm, t.genre,
+               ROW_NUMBER() OVER (PARTITION BY ta.artist_id ORDER BY t.title, t.id) AS rn
+        FROM track_artists ta
+        JOIN tracks t ON t.id = ta.track_id
+        WHERE ta.artist_id = ANY($1::uuid[])
+    ) ranked
+    WHERE rn <= $2
+    ORDER BY artist_id, rn
+"""
+
+TRACKS_BY_MIX_SQL = """
+    SELECT playlist_id, id, title, duration_ms, bpm, genre
+    FROM (
+        SELECT pt.playlist_id, t.id, t.title, t.duration_ms, t.bpm, t.genre,
+               ROW_NUMBER() OVER (PARTITION BY pt.playlist_id ORDER BY pt.position NULLS LAST, t.id) AS rn
+        FROM playlist_tracks pt
+        JOIN tracks t ON t.id = pt.track_id
+        WHERE pt.playlist_id = ANY($1::uuid[])
+    ) ranked
+    WHERE rn <= $2
+    ORDER BY playlist_id, rn
+"""
+
+
+class GraphQLLoaders:
+    """DataLoaders for one GraphQL request, sharing the service's asyncpg pool"""
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+        self.artist_by_id = DataLoader(load_fn=self._load_artists)
+        self.artists_by_track = DataLoader(load_fn=self._load_artists_by_track)
+        self.tracks_by_artist = DataLoader(load_fn=self._load_tracks_by_artist)
+        self.tracks_by_mix = DataLoader(load_fn=self._load_tracks_by_mix)
+        self.queries = 0
+
+    async def _fetch(self, sql: str, *args) -> List[asyncpg.Record]:
+        self.queries += 1
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(sql, *args)
+
+    async def _load_artists(self, keys: List[str]) -> List[Optional[asyncpg.Record]]:
+        rows = await self._fetch(ARTISTS_BY_ID_SQL, keys)
+        by_id = {str(row['id']): row for row in rows}
+        return [by_id.get(key) for key in keys]
+
+    async def _load_artists_by_track(self, keys: List[str]) -> List[List[asyncpg.Record]]:
+        rows = await self._fetch(ARTISTS_BY_TRACK_SQL, keys)
+        return self._group(keys, rows, 'track_id')
+
+    async def _load_tracks_by_artist(self, keys: List[str]) -> List[List[asyncpg.Record]]:
+        rows = await self._fetch(TRACKS_BY_ARTIST_SQL, keys, NESTED_LIST_LIMIT)
+        return self._group(keys, rows, 'artist_id')
+
+    async def _load_tracks_by_mix(self, keys: List[str]) -> List[List[asyncpg.Record]]:
+        rows = await self._fetch(TRACKS_BY_MIX_SQL, keys, NESTED_LIST_LIMIT)
+        return self._group(keys, rows, 'playlist_id')
+
+    @staticmethod
+    def _group(keys: List[str], rows: List[asyncpg.Record], parent_column: str) -> List[List[Any]]:
+        grouped: Dict[str, List[asyncpg.Record]] = {key: [] for key in keys}
+        for row in rows:
+            grouped.setdefault(str(row[parent_column]), []).append(row)
+        return [grouped[key] for key in keys]
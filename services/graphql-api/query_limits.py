@@ -0,0 +1,120 @@
+"""
+Query complexity limit for the GraphQL API
+
+Depth alone does not stop `artists(limit: 1000) { tracks { artists { ... } } }`
+from fanning out to the whole graph, so operations are also scored before
+execution: every field costs 1, and the cost of a list field's children is
+multiplied by the number of items it can return. The multiplier is the
+literal `limit` argument (clamped to the page cap), the field's declared
+default when `limit` is omitted, and the page cap when `limit` comes from a
+variable, since variable values are not known at validation time.
+"""
+
+import logging
+from typing import Optional, Set, Type
+
+from graphql import (
+    GraphQLError,
+    GraphQLField,
+    GraphQLNamedType,
+    ValidationRule,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+from graphql.language import (
+    FieldNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIST_SIZE = 20
+
+
+def complexity_limit_rule(max_complexity: int, max_list_size: int) -> Type[ValidationRule]:
+    """Build a validation rule rejecting operations scored above max_complexity"""
+
+    class QueryComplexityRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_args):
+            schema = self.context.schema
+            root_type = {
+                OperationType.QUERY: schema.query_type,
+                OperationType.MUTATION: schema.mutation_type,
+                OperationType.SUBSCRIPTION: schema.subscription_type,
+            }.get(node.operation)
+            if root_type is None:
+                return
+
+            cost = self._selection_cost(node.selection_set, root_type, set())
+            if cost > max_complexity:
+                name = node.name.value if node.name else "anonymous"
+                logger.warning(f"Rejected GraphQL operation {name}: complexity {cost} > {max_complexity}")
+                self.report_error(GraphQLError(
+                    f"Query complexity {cost} exceeds the maximum of {max_complexity}",
+                    node
+                ))
+
+        def _list_size(self, node: FieldNode, field_def: GraphQLField) -> int:
+            for argument in node.arguments or ():
+                if argument.name.value == "limit":
+                    if isinstance(argument.value, IntValueNode):
+                        return max(1, min(int(argument.value.value), max_list_size))
+                    return max_list_size
+
+            limit_arg = field_def.args.get("limit")
+            if limit_arg is not None and isinstance(limit_arg.default_value, int):
+                return min(limit_arg.default_value, max_list_size)
+            return DEFAULT_LIST_SIZE
+
+        def _selection_cost(
+            self,
+            selection_set: Optional[SelectionSetNode],
+            parent_type: GraphQLNamedType,
+            fragments_seen: Set[str]
+        ) -> int:
+            if selection_set is None:
+                return 0
+
+            total = 0
+            for selection in selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    field_def = getattr(parent_type, "fields", {}).get(selection.name.value)
+                    if field_def is None:
+                        # Introspection fields and unknown fields (reported by other rules)
+                        continue
+                    multiplier = (
+                        self._list_size(selection, field_def)
+                        if is_list_type(get_nullable_type(field_def.type)) else 1
+                    )
+                    child_cost = self._selection_cost(
+                        selection.selection_set, get_named_type(field_def.type), fragments_seen
+                    )
+                    total += 1 + multiplier * child_cost
+
+                elif isinstance(selection, FragmentSpreadNode):
+                    name = selection.name.value
+                    fragment = self.context.get_fragment(name)
+                    if fragment is None or name in fragments_seen:
+                        continue
+                    fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+                    total += self._selection_cost(
+                        fragment.selection_set, fragment_type or parent_type, fragments_seen | {name}
+                    )
+
+                elif isinstance(selection, InlineFragmentNode):
+                    fragment_type = parent_type
+                    if selection.type_condition is not None:
+                        fragment_type = self.context.schema.get_type(
+                            selection.type_condition.name.value
+                        ) or parent_type
+                    total += self._selection_cost(selection.selection_set, fragment_type, fragments_seen)
+
+            return total
+
+    return QueryComplexityRule
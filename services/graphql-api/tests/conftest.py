@@ -52,7 +52,7 @@ def sample_graphql_query_with_variables():
     """Sample GraphQL query with variables"""
     return {
         "query": """
-            query GetArtist($id: Int!) {
+            query GetArtist($id: ID!) {
                 artist(id: $id) {
                     id
                     name
@@ -60,7 +60,7 @@ def sample_graphql_query_with_variables():
                 }
             }
         """,
-        "variables": {"id": 1}
+        "variables": {"id": "00000000-0000-0000-0000-000000000001"}
     }
 
 
@@ -79,7 +79,7 @@ def sample_tracks_query():
     """Sample GraphQL query for tracks"""
     return """
     query {
-        tracks(artistId: 1) {
+        tracks(artistId: "00000000-0000-0000-0000-000000000001") {
             id
             title
             artistId
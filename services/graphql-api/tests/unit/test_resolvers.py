@@ -0,0 +1,84 @@
+"""Unit tests for GraphQL resolvers, DataLoader batching and query limits"""
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+
+import main
+from dataloaders import GraphQLLoaders
+
+ARTIST_ID = uuid.uuid4()
+TRACK_IDS = [uuid.uuid4() for _ in range(3)]
+
+
+class FakeConnection:
+    """In-memory stand-in for an asyncpg connection; records every query"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def fetch(self, sql, *args):
+        self.calls.append(sql)
+        if "FROM tracks" in sql and "track_artists" not in sql:
+            return [
+                {"id": track_id, "title": f"Track {i}", "duration_ms": 300000, "bpm": 128, "genre": "House"}
+                for i, track_id in enumerate(TRACK_IDS)
+            ]
+        if "FROM track_artists ta" in sql and "JOIN artists" in sql:
+            return [
+                {"track_id": track_id, "id": ARTIST_ID, "name": "Artist", "genre": None,
+                 "popularity": None, "role": "primary"}
+                for track_id in args[0]
+            ]
+        return []
+
+
+class FakePool:
+    def __init__(self):
+        self.calls = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self.calls)
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(main, "db_pool", pool)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_nested_artists_are_batched(fake_pool):
+    result = await main.schema.execute(
+        "{ tracks(limit: 3) { id artistId artists { name } } }",
+        context_value={"loaders": GraphQLLoaders(fake_pool)}
+    )
+
+    assert result.errors is None
+    assert len(result.data["tracks"]) == 3
+    assert all(t["artistId"] == str(ARTIST_ID) for t in result.data["tracks"])
+    # One query for the tracks page, one batched query for all nested artists
+    assert len(fake_pool.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_complexity_limit_rejects_before_execution(fake_pool):
+    result = await main.schema.execute(
+        "{ artists(limit: 1000) { tracks(limit: 100) { artists { name } } } }",
+        context_value={"loaders": GraphQLLoaders(fake_pool)}
+    )
+
+    assert result.errors
+    assert "complexity" in result.errors[0].message
+    assert fake_pool.calls == []
+
+
+@pytest.mark.asyncio
+async def test_depth_limit_rejects_deep_queries(fake_pool):
+    query = "{ artists(limit: 1) { tracks(limit: 1) { artists(limit: 1) { tracks(limit: 1) { artists(limit: 1) { tracks(limit: 1) { artists(limit: 1) { name } } } } } } } }"
+    result = await main.schema.execute(query, context_value={"loaders": GraphQLLoaders(fake_pool)})
+
+    assert result.errors
+    assert fake_pool.calls == []
@@ -772,6 +772,62 @@ async def process_enrichment_batch(tasks: List[EnrichmentTask], correlation_id:
     success_count = sum(1 for r in results if r.status == EnrichmentStatus.COMPLETED)
     logger.info(f"Batch enrichment completed: {success_count}/{len(tasks)} successful")
 
+# Upper bound on tasks per synchronous batch and how many run at once
+SYNC_BATCH_MAX_SIZE = int(os.getenv('ENRICHMENT_SYNC_BATCH_MAX_SIZE', '100'))
+SYNC_BATCH_CONCURRENCY = int(os.getenv('ENRICHMENT_SYNC_BATCH_CONCURRENCY', '5'))
+
+@app.post("/enrich/batch/sync")
+async def enrich_batch_sync(tasks: List[EnrichmentTask]):
+    """
+    Enrich a micro-batch and return one result per task, in request order.
+
+    Used by the scraper pipeline to amortise HTTP overhead across tracks.
+    A failing task yields a FAILED result instead of failing the batch.
+    """
+    correlation_id = str(uuid.uuid4())[:8]
+
+    structlog.contextvars.bind_contextvars(
+        operation="enrich_batch_sync",
+        batch_size=len(tasks),
+        correlation_id=correlation_id
+    )
+
+    if not enrichment_pipeline:
+        raise HTTPException(status_code=503, detail="Enrichment pipeline not available")
+    if len(tasks) > SYNC_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(tasks)} exceeds limit of {SYNC_BATCH_MAX_SIZE}"
+        )
+
+    semaphore = asyncio.Semaphore(SYNC_BATCH_CONCURRENCY)
+
+    async def enrich_one(task: EnrichmentTask):
+        task.correlation_id = task.correlation_id or correlation_id
+        started = time.time()
+        async with semaphore:
+            try:
+                result = await enrichment_pipeline.enrich_track(task)
+                enrichment_tasks_total.labels(source='batch_sync', status=result.status.value).inc()
+                tracks_enriched.labels(status=result.status.value).inc()
+                return result
+            except Exception as e:
+                logger.error("Batch enrichment task failed", error=str(e), track_id=task.track_id)
+                enrichment_tasks_total.labels(source='batch_sync', status='error').inc()
+                return EnrichmentResult(
+                    track_id=task.track_id,
+                    status=EnrichmentStatus.FAILED,
+                    sources_used=[],
+                    metadata_acquired={},
+                    errors=[str(e)],
+                    duration_seconds=time.time() - started,
+                    cached=False,
+                    timestamp=datetime.now()
+                )
+
+    results = await asyncio.gather(*(enrich_one(task) for task in tasks))
+    return {"batch_size": len(tasks), "correlation_id": correlation_id, "results": results}
+
 @app.post("/enrich/trigger")
 async def trigger_enrichment(limit: int = 50):
     """
@@ -0,0 +1,113 @@
+"""Request batching for CPU-bound NLP work
+
+Concurrent requests are queued and handed to a worker pool in batches, so
+spaCy can process them with one `nlp.pipe` call while the event loop keeps
+serving other requests. Batches form naturally while the previous batch is
+running; `max_wait_ms` optionally holds a batch open a little longer.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBatcher:
+    """Coalesces single-item calls into `process_batch(items)` calls on an executor"""
+
+    def __init__(
+        self,
+        process_batch: Callable[[Sequence[Any]], List[Any]],
+        executor: Executor,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        name: str = "batch"
+    ):
+        self.process_batch = process_batch
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            self.batches += 1
+            self.items += len(items)
+
+            try:
+                results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            except Exception as e:
+                if len(batch) == 1:
+                    self._set_exception(batch[0][1], e)
+                    continue
+                # Isolate the failing input instead of failing the whole batch
+                logger.warning(f"{self.name} batch of {len(batch)} failed ({e}), retrying items individually")
+                for item, future in batch:
+                    try:
+                        result = (await loop.run_in_executor(self.executor, self.process_batch, [item]))[0]
+                    except Exception as item_error:
+                        self._set_exception(future, item_error)
+                    else:
+                        self._set_result(future, result)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                self._set_result(future, result)
+
+    @staticmethod
+    def _set_result(future: asyncio.Future, result: Any):
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future, error: Exception):
+        if not future.done():
+            future.set_exception(error)
@@ -14,13 +14,15 @@ from textblob import TextBlob
 import numpy as np
 from pathlib import Path
 from tracklist_extractor import TracklistExtractor
-import ollama
-from ollama import Client as OllamaClient
+from batching import RequestBatcher
+from concurrent.futures import ThreadPoolExecutor
+from llm_client import LLMClient, AdaptiveLimiter, compact_html
 import signal
 import sys
 from contextlib import asynccontextmanager
 import atexit
 import json
+import asyncio
 import gc
 
 # Configure logging
@@ -30,34 +32,38 @@ logger = logging.getLogger(__name__)
 # Initialize Ollama client with external service
 OLLAMA_HOST = os.getenv('OLLAMA_HOST', 'http://ollama-maxwell.phoenix.svc.cluster.local:11434')
 OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'llama3.2:latest')
+OLLAMA_MAX_CONCURRENCY = int(os.getenv('OLLAMA_MAX_CONCURRENCY', '8'))
+OLLAMA_CACHE_SIZE = int(os.getenv('OLLAMA_CACHE_SIZE', '512'))
+OLLAMA_CACHE_TTL = int(os.getenv('OLLAMA_CACHE_TTL', '3600'))
 ollama_client = None
 
-def initialize_ollama_client():
-    """Initialize Ollama client with retry logic"""
+async def initialize_ollama_client():
+    """Initialize the shared async Ollama client"""
     global ollama_client
+    client = LLMClient(
+        OLLAMA_HOST,
+        cache_size=OLLAMA_CACHE_SIZE,
+        cache_ttl=OLLAMA_CACHE_TTL,
+        limiter=AdaptiveLimiter(maximum=OLLAMA_MAX_CONCURRENCY)
+    )
     try:
-        ollama_client = OllamaClient(host=OLLAMA_HOST)
         # Test connection
-        ollama_client.list()
+        await client.list_models()
+        ollama_client = client
         logger.info(f"✅ Connected to Ollama service at {OLLAMA_HOST}")
         return True
     except Exception as e:
+        await client.close()
         logger.warning(f"⚠️ Could not connect to Ollama service: {e}")
         logger.info("NLP service will continue with spaCy-only mode")
         return False
 
-def cleanup_ollama_client():
+async def cleanup_ollama_client():
     """Cleanup Ollama client connections"""
     global ollama_client
     if ollama_client is not None:
         try:
-            # Close the underlying HTTP client if it exists
-            if hasattr(ollama_client, '_client') and ollama_client._client is not None:
-                ollama_client._client.close()
-                logger.info("Ollama HTTP client closed")
-            if hasattr(ollama_client, 'close'):
-                ollama_client.close()
-                logger.info("Ollama client closed")
+            await ollama_client.close()
             ollama_client = None
             logger.info("Ollama client cleanup completed")
         except Exception as e:
@@ -83,7 +89,6 @@ def cleanup_nlp_resources():
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-    cleanup_ollama_client()
     cleanup_nlp_resources()
     logger.info("Shutdown cleanup completed")
     sys.exit(0)
@@ -93,9 +98,31 @@ signal.signal(signal.SIGTERM, signal_handler)
 signal.signal(signal.SIGINT, signal_handler)
 
 # Register atexit handler as fallback
-atexit.register(cleanup_ollama_client)
 atexit.register(cleanup_nlp_resources)
 
+# Worker pool and request batching for spaCy work
+NLP_WORKER_THREADS = int(os.getenv("NLP_WORKER_THREADS", "1"))
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "32"))
+NLP_BATCH_WAIT_MS = float(os.getenv("NLP_BATCH_WAIT_MS", "2"))
+
+# Common DJ/Artist name patterns
+ARTIST_PATTERNS = [
+    re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'),  # First Last
+    re.compile(r'\b[A-Z]{2,}\b'),  # All caps (like DJ names)
+    re.compile(r'\bDJ\s+[A-Z][a-z]+\b'),  # DJ Name
+    re.compile(r'\b[A-Z][a-z]+\s+[A-Z]\b'),  # Name Initial
+    re.compile(r'\b[A-Z][a-z]+\d+\b'),  # Name with numbers
+]
+
+# "by Artist" or "feat. Artist" patterns
+BY_PATTERNS = [
+    re.compile(r'by\s+([A-Z][a-zA-Z\s]+)', re.IGNORECASE),
+    re.compile(r'feat\.?\s+([A-Z][a-zA-Z\s]+)', re.IGNORECASE),
+    re.compile(r'featuring\s+([A-Z][a-zA-Z\s]+)', re.IGNORECASE),
+    re.compile(r'vs\.?\s+([A-Z][a-zA-Z\s]+)', re.IGNORECASE),
+    re.compile(r'&\s+([A-Z][a-zA-Z\s]+)', re.IGNORECASE),
+]
+
 # Metrics tracking
 start_time = time.time()
 request_count = 0
@@ -142,14 +169,7 @@ class MusicNLPProcessor:
             'reverb', 'delay', 'compression', 'distortion'
         }
 
-        # Common DJ/Artist name patterns
-        self.artist_patterns = [
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # First Last
-            r'\b[A-Z]{2,}\b',  # All caps (like DJ names)
-            r'\bDJ\s+[A-Z][a-z]+\b',  # DJ Name
-            r'\b[A-Z][a-z]+\s+[A-Z]\b',  # Name Initial
-            r'\b[A-Z][a-z]+\d+\b',  # Name with numbers
-        ]
+        self.artist_patterns = ARTIST_PATTERNS
 
         self.load_model()
 
@@ -168,8 +188,8 @@ class MusicNLPProcessor:
                 logger.warning("No spaCy model found, using rule-based processing")
                 self.nlp = None
 
-    def extract_entities(self, text: str) -> List[Dict[str, Any]]:
-        """Extract music-related entities from text"""
+    def extract_entities(self, text: str, doc=None) -> List[Dict[str, Any]]:
+        """Extract music-related entities from text, reusing `doc` if already parsed"""
         entities = []
         text_lower = text.lower()
 
@@ -205,7 +225,7 @@ class MusicNLPProcessor:
 
         # Use spaCy if available for additional entities
         if self.nlp:
-            doc = self.nlp(text)
+            doc = doc if doc is not None else self.nlp(text)
             for ent in doc.ents:
                 if ent.label_ in ["PERSON", "ORG", "GPE"]:
                     entities.append({
@@ -232,8 +252,7 @@ class MusicNLPProcessor:
         artists = []
 
         for pattern in self.artist_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
+            for match in pattern.finditer(text):
                 name = match.group()
                 # Filter out common non-artist words
                 if name.lower() not in ['the', 'and', 'with', 'feat', 'featuring']:
@@ -241,17 +260,8 @@ class MusicNLPProcessor:
                     artists.append((name, confidence))
 
         # Look for "by Artist" or "feat. Artist" patterns
-        by_patterns = [
-            r'by\s+([A-Z][a-zA-Z\s]+)',
-            r'feat\.?\s+([A-Z][a-zA-Z\s]+)',
-            r'featuring\s+([A-Z][a-zA-Z\s]+)',
-            r'vs\.?\s+([A-Z][a-zA-Z\s]+)',
-            r'&\s+([A-Z][a-zA-Z\s]+)'
-        ]
-
-        for pattern in by_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in BY_PATTERNS:
+            for match in pattern.finditer(text):
                 name = match.group(1).strip()
                 if len(name) > 2:
                     artists.append((name, 0.9))
@@ -269,8 +279,8 @@ class MusicNLPProcessor:
             logger.warning(f"Sentiment analysis failed: {e}")
             return 0.5  # Neutral default
 
-    def extract_keywords(self, text: str) -> List[str]:
-        """Extract relevant keywords from text"""
+    def extract_keywords(self, text: str, doc=None) -> List[str]:
+        """Extract relevant keywords from text, reusing `doc` if already parsed"""
         keywords = []
         text_lower = text.lower()
 
@@ -286,7 +296,7 @@ class MusicNLPProcessor:
 
         # Use spaCy for additional keyword extraction if available
         if self.nlp:
-            doc = self.nlp(text)
+            doc = doc if doc is not None else self.nlp(text)
             for token in doc:
                 if (token.pos_ in ["NOUN", "ADJ"] and
                     len(token.text) > 3 and
@@ -296,22 +306,57 @@ class MusicNLPProcessor:
 
         return list(set(keywords))[:8]  # Limit to 8 unique keywords
 
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Entities, keywords and sentiment for many texts, parsed in one `nlp.pipe` pass"""
+        if self.nlp:
+            docs = self.nlp.pipe(texts, batch_size=NLP_BATCH_SIZE)
+        else:
+            docs = [None] * len(texts)
+
+        results = []
+        for text, doc in zip(texts, docs):
+            results.append({
+                "entities": self.extract_entities(text, doc),
+                "keywords": self.extract_keywords(text, doc),
+                "sentiment": self.analyze_sentiment(text)
+            })
+        return results
+
 # Initialize NLP processor and tracklist extractor
 nlp_processor = MusicNLPProcessor()
 tracklist_extractor = TracklistExtractor()
 
-# Initialize Ollama client
-ollama_available = initialize_ollama_client()
+# spaCy releases the GIL for little of its work, so one thread by default keeps
+# the event loop free without contending for the interpreter
+nlp_executor = ThreadPoolExecutor(max_workers=NLP_WORKER_THREADS, thread_name_prefix="spacy")
+
+analysis_batcher = RequestBatcher(
+    nlp_processor.analyze_batch, nlp_executor,
+    max_batch_size=NLP_BATCH_SIZE, max_wait_ms=NLP_BATCH_WAIT_MS, name="analysis"
+)
+tracklist_batchers = {
+    flag: RequestBatcher(
+        lambda texts, flag=flag: tracklist_extractor.extract_tracklists(texts, extract_timestamps=flag),
+        nlp_executor, max_batch_size=NLP_BATCH_SIZE, max_wait_ms=NLP_BATCH_WAIT_MS,
+        name=f"tracklist(timestamps={flag})"
+    )
+    for flag in (True, False)
+}
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan context manager for startup and shutdown"""
     # Startup
     logger.info("NLP Processor service starting up...")
+    await initialize_ollama_client()
     yield
     # Shutdown
     logger.info("NLP Processor service shutting down...")
-    cleanup_ollama_client()
+    await analysis_batcher.close()
+    for batcher in tracklist_batchers.values():
+        await batcher.close()
+    nlp_executor.shutdown(wait=False)
+    await cleanup_ollama_client()
     cleanup_nlp_resources()
     logger.info("NLP Processor shutdown completed")
 
@@ -346,6 +391,10 @@ class TracklistExtractionRequest(BaseModel):
     source_url: Optional[str] = None
     extract_timestamps: bool = True
 
+class BatchTracklistExtractionRequest(BaseModel):
+    texts: List[str]
+    extract_timestamps: bool = True
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -388,6 +437,36 @@ nlp_memory_bytes {memory_info.rss}
 # HELP nlp_cpu_percent CPU usage percentage
 # TYPE nlp_cpu_percent gauge
 nlp_cpu_percent {process.cpu_percent()}
+"""
+
+    cache = tracklist_extractor.cache_stats()
+    metrics_text += f"""
+# HELP nlp_tracklist_cache_hits_total Tracklist extractions answered from the content-hash cache
+# TYPE nlp_tracklist_cache_hits_total counter
+nlp_tracklist_cache_hits_total {cache['hits']}
+
+# HELP nlp_tracklist_cache_misses_total Tracklist extractions that missed the content-hash cache
+# TYPE nlp_tracklist_cache_misses_total counter
+nlp_tracklist_cache_misses_total {cache['misses']}
+
+# HELP nlp_tracklist_cache_entries Entries in the tracklist content-hash cache
+# TYPE nlp_tracklist_cache_entries gauge
+nlp_tracklist_cache_entries {cache['size']}
+
+# HELP nlp_batch_size_average Average number of requests per spaCy batch
+# TYPE nlp_batch_size_average gauge
+"""
+    for batcher in [analysis_batcher, *tracklist_batchers.values()]:
+        metrics_text += f'nlp_batch_size_average{{batcher="{batcher.name}"}} {batcher.average_batch_size:.2f}\n'
+
+    if ollama_client is not None:
+        metrics_text += "\n# HELP nlp_ollama_calls_total Ollama client activity by outcome\n# TYPE nlp_ollama_calls_total counter\n"
+        for outcome, value in ollama_client.stats.items():
+            metrics_text += f'nlp_ollama_calls_total{{outcome="{outcome}"}} {value}\n'
+        metrics_text += f"""
+# HELP nlp_ollama_concurrency_limit Current adaptive concurrency limit for Ollama requests
+# TYPE nlp_ollama_concurrency_limit gauge
+nlp_ollama_concurrency_limit {ollama_client.limiter.limit:.2f}
 """
 
     return metrics_text
@@ -399,14 +478,11 @@ async def analyze_text(request: TextAnalysisRequest):
     request_count += 1
 
     try:
-        # Extract entities using the music NLP processor
-        entities = nlp_processor.extract_entities(request.text)
-
-        # Extract keywords
-        keywords = nlp_processor.extract_keywords(request.text)
-
-        # Analyze sentiment
-        sentiment = nlp_processor.analyze_sentiment(request.text)
+        # Entities, keywords and sentiment, batched with concurrent requests
+        result = await analysis_batcher.submit(request.text)
+        entities = result["entities"]
+        keywords = result["keywords"]
+        sentiment = result["sentiment"]
 
         logger.info(f"Analyzed text: {len(request.text)} chars, found {len(entities)} entities")
 
@@ -456,11 +532,7 @@ async def extract_tracklist(request: TracklistExtractionRequest):
     try:
         logger.info(f"Extracting tracklist from {len(request.text)} characters")
 
-        tracks = tracklist_extractor.extract_tracklist(
-            text=request.text,
-            source_url=request.source_url,
-            extract_timestamps=request.extract_timestamps
-        )
+        tracks = await tracklist_batchers[request.extract_timestamps].submit(request.text)
 
         logger.info(f"Extracted {len(tracks)} tracks")
 
@@ -475,6 +547,30 @@ async def extract_tracklist(request: TracklistExtractionRequest):
         logger.error(f"Extraction failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/extract_tracklist/batch")
+async def extract_tracklist_batch(request: BatchTracklistExtractionRequest):
+    """Extract tracklists from many texts in one spaCy pass"""
+    global request_count, error_count
+    request_count += 1
+
+    try:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            nlp_executor, tracklist_extractor.extract_tracklists, request.texts, request.extract_timestamps
+        )
+
+        logger.info(f"Extracted {sum(len(tracks) for tracks in results)} tracks from {len(results)} texts")
+
+        return {
+            "results": [{"tracks": tracks, "count": len(tracks)} for tracks in results],
+            "count": len(results)
+        }
+
+    except Exception as e:
+        error_count += 1
+        logger.error(f"Batch extraction failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/analyze_text")
 async def analyze_text_structure(request: TracklistExtractionRequest):
     """Analyze text structure for debugging"""
@@ -485,7 +581,8 @@ async def analyze_text_structure(request: TracklistExtractionRequest):
         raise HTTPException(status_code=503, detail="spaCy model not loaded")
 
     try:
-        doc = tracklist_extractor.nlp(request.text)
+        loop = asyncio.get_running_loop()
+        doc = await loop.run_in_executor(nlp_executor, tracklist_extractor.nlp, request.text)
 
         # Get format analysis
         format_analysis = tracklist_extractor.analyze_tracklist_format(request.text)
@@ -514,7 +611,8 @@ async def extract_timestamps(request: TracklistExtractionRequest):
     request_count += 1
 
     try:
-        timestamps = tracklist_extractor.extract_timestamps(request.text)
+        loop = asyncio.get_running_loop()
+        timestamps = await loop.run_in_executor(nlp_executor, tracklist_extractor.extract_timestamps, request.text)
 
         return {
             "timestamps": timestamps,
@@ -552,7 +650,6 @@ async def llm_extract_tracklist(request: TracklistExtractionRequest):
         logger.warning("Ollama not available, using spaCy fallback")
         return await extract_tracklist(request)
 
-    response = None
     try:
         prompt = f"""Extract a tracklist from the following text. Return ONLY a JSON array of tracks with this exact format:
 [
@@ -561,7 +658,7 @@ async def llm_extract_tracklist(request: TracklistExtractionRequest):
 ]
 
 Text to analyze:
-{request.text}
+{compact_html(request.text)}
 
 Requirements:
 - Extract track position numbers (if present)
@@ -573,10 +670,9 @@ Requirements:
 
         logger.info(f"Sending tracklist extraction request to Ollama at {OLLAMA_HOST}")
 
-        response = ollama_client.generate(
+        response = await ollama_client.generate(
             model=OLLAMA_MODEL,
             prompt=prompt,
-            stream=False,
             options={
                 "temperature": 0.3,
                 "num_predict": 2000
@@ -615,9 +711,6 @@ Requirements:
         logger.error(f"Ollama extraction failed: {e}")
         # Fallback to spaCy
         return await extract_tracklist(request)
-    finally:
-        # Ensure response is dereferenced
-        response = None
 
 @app.post("/llm/classify_genre")
 async def llm_classify_genre(request: GenreClassificationRequest):
@@ -631,7 +724,6 @@ async def llm_classify_genre(request: GenreClassificationRequest):
             detail="Ollama service not available. Use /analyze endpoint for rule-based genre detection."
         )
 
-    response = None
     try:
         context_parts = []
         if request.artist_name:
@@ -657,10 +749,9 @@ Return valid JSON only, no other text."""
 
         logger.info(f"Sending genre classification request to Ollama")
 
-        response = ollama_client.generate(
+        response = await ollama_client.generate(
             model=OLLAMA_MODEL,
             prompt=prompt,
-            stream=False,
             options={
                 "temperature": 0.4,
                 "num_predict": 300
@@ -688,9 +779,6 @@ Return valid JSON only, no other text."""
         error_count += 1
         logger.error(f"Genre classification failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Ensure response is dereferenced
-        response = None
 
 @app.post("/llm/generate")
 async def llm_generate(request: LLMInferenceRequest):
@@ -704,7 +792,6 @@ async def llm_generate(request: LLMInferenceRequest):
             detail="Ollama service not available"
         )
 
-    response = None
     try:
         full_prompt = request.prompt
         if request.context:
@@ -712,14 +799,15 @@ async def llm_generate(request: LLMInferenceRequest):
 
         logger.info(f"Sending generation request to Ollama")
 
-        response = ollama_client.generate(
+        # Sampled output, so repeated prompts are not served from the cache
+        response = await ollama_client.generate(
             model=OLLAMA_MODEL,
             prompt=full_prompt,
-            stream=False,
             options={
                 "temperature": request.temperature,
                 "num_predict": request.max_tokens
-            }
+            },
+            cache=False
         )
 
         generated_text = response.get('response', '')
@@ -736,9 +824,6 @@ async def llm_generate(request: LLMInferenceRequest):
         error_count += 1
         logger.error(f"LLM generation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Ensure response is dereferenced
-        response = None
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,99 @@
+"""Unit tests for batched, cached tracklist extraction and request batching"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import spacy
+
+from batching import RequestBatcher
+from tracklist_extractor import TracklistExtractor
+
+TEXTS = [
+    "[00:00] Eric Prydz - Opus\n[07:30] Adam Beyer - Your Mind\n[12:10] ID - ID",
+    "1. Charlotte de Witte - Doppler\n2. Amelie Lens - Feel It",
+    "Played last night: Fisher feat. Chris Lake - Losing It was the highlight",
+    "no tracks in here at all",
+]
+
+
+class CountingPipe:
+    """Blank English pipeline that records how many texts reach `pipe`"""
+
+    def __init__(self):
+        self.nlp = spacy.blank("en")
+        self.nlp.add_pipe("sentencizer")
+        self.piped = []
+
+    def __call__(self, text):
+        return self.nlp(text)
+
+    def pipe(self, texts, batch_size=32):
+        texts = list(texts)
+        self.piped.extend(texts)
+        return self.nlp.pipe(texts, batch_size=batch_size)
+
+
+@pytest.fixture
+def extractor():
+    extractor = TracklistExtractor(cache_size=16)
+    extractor.nlp = CountingPipe()
+    return extractor
+
+
+def test_batch_matches_single_extraction(extractor):
+    batched = extractor.extract_tracklists(TEXTS)
+
+    uncached = TracklistExtractor(cache_size=0)
+    uncached.nlp = CountingPipe()
+    assert batched == [uncached.extract_tracklist(text) for text in TEXTS]
+    assert batched[0][0]['artist'] == 'Eric Prydz'
+    assert batched[0][0]['timestamp'] == '00:00'
+
+
+def test_only_unstructured_texts_are_piped_once(extractor):
+    extractor.extract_tracklists(TEXTS + [TEXTS[3]])
+
+    # Structured matches skip NER; the duplicate unstructured text is parsed once
+    assert extractor.nlp.piped == [TEXTS[3]]
+
+
+def test_unchanged_text_is_served_from_cache(extractor):
+    first = extractor.extract_tracklists(TEXTS)
+    extractor.nlp.piped.clear()
+    first[0][0]['artist'] = 'mutated'
+
+    second = extractor.extract_tracklists(TEXTS)
+
+    assert extractor.nlp.piped == []
+    assert second[0][0]['artist'] == 'Eric Prydz'
+    assert extractor.cache_stats() == {"size": 4, "hits": 4, "misses": 4}
+    # Options are part of the key
+    extractor.extract_tracklists(TEXTS[:1], extract_timestamps=False)
+    assert extractor.cache_stats()["misses"] == 5
+
+
+@pytest.mark.asyncio
+async def test_request_batcher_coalesces_and_isolates_failures():
+    calls = []
+
+    def process(items):
+        calls.append(list(items))
+        if "bad" in items:
+            raise ValueError("bad input")
+        return [item.upper() for item in items]
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    batcher = RequestBatcher(process, executor, max_batch_size=8, max_wait_ms=20)
+    try:
+        results = await asyncio.gather(
+            *(batcher.submit(item) for item in ["a", "b", "bad", "c"]),
+            return_exceptions=True
+        )
+    finally:
+        await batcher.close()
+        executor.shutdown()
+
+    assert results[:2] == ["A", "B"] and results[3] == "C"
+    assert isinstance(results[2], ValueError)
+    assert calls[0] == ["a", "b", "bad", "c"]
+    assert batcher.batches == 1 and batcher.average_batch_size == 4
@@ -1,16 +1,55 @@
 """Enhanced tracklist extraction using spaCy NER + regex patterns"""
 import spacy
 import re
-from typing import List, Dict, Optional
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence
 import logging
-import gc
 
 logger = logging.getLogger(__name__)
 
+# Extraction results for recently seen texts, keyed by content hash
+RESULT_CACHE_SIZE = int(os.getenv('TRACKLIST_CACHE_SIZE', '2048'))
+PIPE_BATCH_SIZE = int(os.getenv('SPACY_PIPE_BATCH_SIZE', '32'))
+
+# Patterns are compiled once at import rather than on every call
+TIMESTAMP_BRACKETED = re.compile(r'\[(\d{1,2}:\d{2}(?::\d{2})?)\]\s*([^-\n]+)\s*-\s*([^\n]+)', re.MULTILINE)
+TIMESTAMP_PLAIN = re.compile(r'(\d{1,2}:\d{2}(?::\d{2})?)\s+([^-\n]+)\s+-\s+([^\n]+)', re.MULTILINE)
+NUMBERED_PERIOD = re.compile(r'^\s*\d+\.\s+([^-\n]+)\s+-\s+([^\n]+)', re.MULTILINE)
+NUMBERED_PARENS = re.compile(r'^\s*\d+\)\s+([^-\n]+)\s+-\s+([^\n]+)', re.MULTILINE)
+SLASH_SEPARATED = re.compile(r'^\s*([A-Z][^/\n]{2,40})\s*/\s*([^\n]+)', re.MULTILINE)
+CATALOG_PREFIX = re.compile(r'\[([^\]]+)\]\s+([^-\n]+)\s+-\s+([^\n]+)', re.MULTILINE)
+CATALOG_NUMBER = re.compile(r'^[A-Z]{2,5}\d{2,6}$|^[A-Z]+\s*\d+$')
+TRACK_PREFIX = re.compile(r'Track\s+\d+:\s+([^-\n]+)\s+-\s+([^\n]+)', re.MULTILINE | re.IGNORECASE)
+EM_DASH_SEPARATED = re.compile(r'^\s*([A-Z][^–\n]{2,40})\s*–\s*([^\n]+)', re.MULTILINE)
+LABEL_PREFIX = re.compile(r'\[([A-Za-z\s&]+)\]\s+([^-\n]+)\s+-\s+([^\n]+)', re.MULTILINE)
+STARTS_WITH_DIGIT = re.compile(r'^\d')
+QUOTED = re.compile(r'\"([^\"]+)\"\s*-\s*\"([^\"]+)\"', re.MULTILINE)
+ARTIST_TITLE_LABEL = re.compile(r'([A-Z][a-zA-Z\s&]+)\s+-\s+([^\[\(\n]+)(?:\s*\[([^\]]+)\])?(?:\s*\(([^\)]+)\))?', re.MULTILINE)
+UNKNOWN_TRACK = re.compile(r'(?:ID|Unknown|TBD|TBA)\s*-\s*(?:ID|Unknown|TBD|TBA)', re.MULTILINE | re.IGNORECASE)
+FEATURING = re.compile(r'([A-Z][a-zA-Z\s]+)\s+(?:feat\.|ft\.|vs\.?|x)\s+([A-Z][a-zA-Z\s]+)\s+-\s+([^\n]+)')
+COLLABORATION = re.compile(r'([A-Z][a-zA-Z\s&]+?)\s+(?:feat\.|ft\.|featuring|vs\.?|x|&)\s+([A-Z][a-zA-Z\s&]+?)\s+-\s+(.+?)(?:\n|$)')
+FALLBACK = re.compile(r'([A-Z][a-zA-Z\s&]+)\s+-\s+([^\n]+)')
+WHITESPACE = re.compile(r'\s+')
+BRACKETED = re.compile(r'\[.*?\]|\(.*?\)')
+TIMESTAMP_CONTEXT = re.compile(r'(?:\[)?(\d{1,2}:\d{2}(?::\d{2})?)(?:\])?(.{0,100})')
+HAS_TIMESTAMP = re.compile(r'\d{1,2}:\d{2}')
+HAS_NUMBERING = re.compile(r'^\s*\d+\.\s+', re.MULTILINE)
+BRACKETED_TIMESTAMP = re.compile(r'\[(\d{1,2}:\d{2})\]')
+TRACK_LINE = re.compile(r'[A-Z][a-zA-Z\s&]+ - [^\n]+')
+
+
+def content_hash(text: str, extract_timestamps: bool = True) -> str:
+    """Cache key for a text and its extraction options"""
+    return hashlib.sha256(f"{int(extract_timestamps)}:{text}".encode('utf-8')).hexdigest()
+
+
 class TracklistExtractor:
     """Enhanced tracklist extraction using spaCy NER + regex patterns"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = RESULT_CACHE_SIZE, pipe_batch_size: int = PIPE_BATCH_SIZE):
         # Load spaCy model
         try:
             self.nlp = spacy.load("en_core_web_sm")
@@ -19,6 +58,13 @@ class TracklistExtractor:
             logger.error(f"Failed to load spaCy model: {e}")
             self.nlp = None
 
+        self.pipe_batch_size = pipe_batch_size
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def extract_tracklist(
         self,
         text: str,
@@ -31,37 +77,85 @@ class TracklistExtractor:
         2. Regex patterns for structured formats
         3. Timestamp extraction
         """
-        tracks = []
+        return self.extract_tracklists([text], extract_timestamps)[0]
 
-        try:
+    def extract_tracklists(self, texts: Sequence[str], extract_timestamps: bool = True) -> List[List[Dict]]:
+        """
+        Extract tracklists from many texts at once
+
+        Texts seen before (same content hash) are answered from the cache and
+        identical texts in the batch are extracted once. Structured patterns
+        run per text; the texts that still need NER go through a single
+        `nlp.pipe` call.
+        """
+        results: List[Optional[List[Dict]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+
+        for i, text in enumerate(texts):
+            key = content_hash(text, extract_timestamps)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[i] = [dict(track) for track in cached]
+            else:
+                pending.setdefault(key, []).append(i)
+
+        extracted: Dict[str, List[Dict]] = {}
+        needs_ner: List[str] = []
+        for key, indexes in pending.items():
+            text = texts[indexes[0]]
             # Strategy 1: Structured patterns (most reliable)
-            structured_tracks = self._extract_structured_patterns(text, extract_timestamps)
-            if structured_tracks:
-                tracks.extend(structured_tracks)
-
-            # Strategy 2: spaCy NER (for unstructured text)
-            if not tracks and self.nlp:
-                ner_tracks = self._extract_with_spacy(text)
-                if ner_tracks:
-                    tracks.extend(ner_tracks)
-
-            # Strategy 3: Fallback regex patterns
-            if not tracks:
-                fallback_tracks = self._extract_fallback_patterns(text)
-                tracks.extend(fallback_tracks)
-
-            return self._deduplicate_tracks(tracks)
-        finally:
-            # Force garbage collection to release spaCy doc objects
-            gc.collect()
+            tracks = self._extract_structured_patterns(text, extract_timestamps)
+            if tracks:
+                extracted[key] = tracks
+            elif self.nlp:
+                needs_ner.append(key)
+            else:
+                # Strategy 3: Fallback regex patterns
+                extracted[key] = self._extract_fallback_patterns(text)
+
+        if needs_ner:
+            # Strategy 2: spaCy NER (for unstructured text), batched
+            ner_texts = [texts[pending[key][0]] for key in needs_ner]
+            docs = self.nlp.pipe(ner_texts, batch_size=self.pipe_batch_size)
+            for key, text, doc in zip(needs_ner, ner_texts, docs):
+                extracted[key] = self._extract_from_doc(doc) or self._extract_fallback_patterns(text)
+
+        for key, tracks in extracted.items():
+            tracks = self._deduplicate_tracks(tracks)
+            self._cache_put(key, tracks)
+            for i in pending[key]:
+                results[i] = [dict(track) for track in tracks]
+
+        return results
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {"size": len(self._cache), "hits": self.cache_hits, "misses": self.cache_misses}
+
+    def _cache_get(self, key: str) -> Optional[List[Dict]]:
+        with self._cache_lock:
+            tracks = self._cache.get(key)
+            if tracks is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return tracks
+
+    def _cache_put(self, key: str, tracks: List[Dict]):
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = tracks
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     def _extract_structured_patterns(self, text: str, extract_timestamps: bool) -> List[Dict]:
         """Extract from well-formatted tracklists using expanded pattern library"""
         tracks = []
 
         # Pattern 1: [00:00] Artist - Track
-        pattern1 = r'\[(\d{1,2}:\d{2}(?::\d{2})?)\]\s*([^-\n]+)\s*-\s*([^\n]+)'
-        for match in re.finditer(pattern1, text, re.MULTILINE):
+        for match in TIMESTAMP_BRACKETED.finditer(text):
             tracks.append({
                 'timestamp': match.group(1),
                 'artist': self._clean_text(match.group(2)),
@@ -71,8 +165,7 @@ class TracklistExtractor:
 
         # Pattern 2: 00:00 Artist - Track
         if not tracks:
-            pattern2 = r'(\d{1,2}:\d{2}(?::\d{2})?)\s+([^-\n]+)\s+-\s+([^\n]+)'
-            for match in re.finditer(pattern2, text, re.MULTILINE):
+            for match in TIMESTAMP_PLAIN.finditer(text):
                 tracks.append({
                     'timestamp': match.group(1),
                     'artist': self._clean_text(match.group(2)),
@@ -82,8 +175,7 @@ class TracklistExtractor:
 
         # Pattern 3: 1. Artist - Track (numbered with period)
         if not tracks:
-            pattern3 = r'^\s*\d+\.\s+([^-\n]+)\s+-\s+([^\n]+)'
-            for match in re.finditer(pattern3, text, re.MULTILINE):
+            for match in NUMBERED_PERIOD.finditer(text):
                 tracks.append({
                     'artist': self._clean_text(match.group(1)),
                     'title': self._clean_text(match.group(2)),
@@ -92,8 +184,7 @@ class TracklistExtractor:
 
         # Pattern 4: 01) Artist - Track (numbered with parenthesis)
         if not tracks:
-            pattern4_parens = r'^\s*\d+\)\s+([^-\n]+)\s+-\s+([^\n]+)'
-            for match in re.finditer(pattern4_parens, text, re.MULTILINE):
+            for match in NUMBERED_PARENS.finditer(text):
                 tracks.append({
                     'artist': self._clean_text(match.group(1)),
                     'title': self._clean_text(match.group(2)),
@@ -102,8 +193,7 @@ class TracklistExtractor:
 
         # Pattern 5: Artist / Track (DJ-style slash separator)
         if not tracks:
-            pattern5_slash = r'^\s*([A-Z][^/\n]{2,40})\s*/\s*([^\n]+)'
-            for match in re.finditer(pattern5_slash, text, re.MULTILINE):
+            for match in SLASH_SEPARATED.finditer(text):
                 tracks.append({
                     'artist': self._clean_text(match.group(1)),
                     'title': self._clean_text(match.group(2)),
@@ -112,11 +202,10 @@ class TracklistExtractor:
 
         # Pattern 6: [CAT123] Artist - Track (catalog number prefix)
         if not tracks:
-            pattern6_catalog = r'\[([^\]]+)\]\s+([^-\n]+)\s+-\s+([^\n]+)'
-            for match in re.finditer(pattern6_catalog, text, re.MULTILINE):
+            for match in CATALOG_PREFIX.finditer(text):
                 # Check if first group looks like catalog number
                 catalog = match.group(1)
-                if re.match(r'^[A-Z]{2,5}\d{2,6}$|^[A-Z]+\s*\d+$', catalog):
+                if CATALOG_NUMBER.match(catalog):
                     tracks.append({
                         'artist': self._clean_text(match.group(2)),
                         'title': self._clean_text(match.group(3)),
@@ -126,8 +215,7 @@ class TracklistExtractor:
 
         # Pattern 7: Track 01: Artist - Track
         if not tracks:
-            pattern7_track_prefix = r'Track\s+\d+:\s+([^-\n]+)\s+-\s+([^\n]+)'
-            for match in re.finditer(pattern7_track_prefix, text, re.MULTILINE | re.IGNORECASE):
+            for match in TRACK_PREFIX.finditer(text):
                 tracks.append({
                     'artist': self._clean_text(match.group(1)),
                     'title': self._clean_text(match.group(2)),
@@ -136,8 +224,7 @@ class TracklistExtractor:
 
         # Pattern 8: Artist – Track (em dash)
         if not tracks:
-            pattern8_emdash = r'^\s*([A-Z][^–\n]{2,40})\s*–\s*([^\n]+)'
-            for match in re.finditer(pattern8_emdash, text, re.MULTILINE):
+            for match in EM_DASH_SEPARATED.finditer(text):
                 tracks.append({
                     'artist': self._clean_text(match.group(1)),
                     'title': self._clean_text(match.group(2)),
@@ -146,11 +233,10 @@ class TracklistExtractor:
 
         # Pattern 9: [Label] Artist - Track
         if not tracks:
-            pattern9_label_prefix = r'\[([A-Za-z\s&]+)\]\s+([^-\n]+)\s+-\s+([^\n]+)'
-            for match in re.finditer(pattern9_label_prefix, text, re.MULTILINE):
+            for match in LABEL_PREFIX.finditer(text):
                 label = match.group(1).strip()
                 # Check if it looks like a label (not a catalog number or time)
-                if not re.match(r'^\d', label) and len(label) > 2:
+                if not STARTS_WITH_DIGIT.match(label) and len(label) > 2:
                     tracks.append({
                         'artist': self._clean_text(match.group(2)),
                         'title': self._clean_text(match.group(3)),
@@ -160,8 +246,7 @@ class TracklistExtractor:
 
         # Pattern 10: "Artist" - "Track" (quoted format)
         if not tracks:
-            pattern10_quoted = r'\"([^\"]+)\"\s*-\s*\"([^\"]+)\"'
-            for match in re.finditer(pattern10_quoted, text, re.MULTILINE):
+            for match in QUOTED.finditer(text):
                 tracks.append({
                     'artist': self._clean_text(match.group(1)),
                     'title': self._clean_text(match.group(2)),
@@ -170,8 +255,7 @@ class TracklistExtractor:
 
         # Pattern 11: Artist - Track (ID) [Label] (original Pattern 4 from before)
         if not tracks:
-            pattern11 = r'([A-Z][a-zA-Z\s&]+)\s+-\s+([^\[\(\n]+)(?:\s*\[([^\]]+)\])?(?:\s*\(([^\)]+)\))?'
-            for match in re.finditer(pattern11, text, re.MULTILINE):
+            for match in ARTIST_TITLE_LABEL.finditer(text):
                 track = {
                     'artist': self._clean_text(match.group(1)),
                     'title': self._clean_text(match.group(2)),
@@ -185,8 +269,7 @@ class TracklistExtractor:
 
         # Pattern 12: Detect "ID - ID" or "Unknown - Unknown" (mark explicitly)
         if not tracks:
-            pattern12_id = r'(?:ID|Unknown|TBD|TBA)\s*-\s*(?:ID|Unknown|TBD|TBA)'
-            for match in re.finditer(pattern12_id, text, re.MULTILINE | re.IGNORECASE):
+            for match in UNKNOWN_TRACK.finditer(text):
                 # Mark these explicitly as unknown so we don't waste enrichment API calls
                 tracks.append({
                     'artist': 'ID',
@@ -201,63 +284,57 @@ class TracklistExtractor:
         """Use spaCy NER to identify artists and tracks"""
         if not self.nlp:
             return []
+        return self._extract_from_doc(self.nlp(text))
 
+    def _extract_from_doc(self, doc) -> List[Dict]:
+        """Extract artist/track pairs from a parsed spaCy doc"""
         tracks = []
-        doc = None
-        try:
-            doc = self.nlp(text)
-            
-            # Look for PERSON entities (likely artists) followed by WORK_OF_ART (tracks)
-            entities = list(doc.ents)
-            for i, ent in enumerate(entities):
-                if ent.label_ == "PERSON":
-                    # Look for following entities that might be track names
-                    if i + 1 < len(entities):
-                        next_ent = entities[i + 1]
-                        if next_ent.label_ in ["WORK_OF_ART", "PRODUCT"]:
-                            tracks.append({
-                                'artist': self._clean_text(ent.text),
-                                'title': self._clean_text(next_ent.text),
-                                'confidence': 0.7
-                            })
-
-            # Alternative: Look for "feat.", "vs", "x" patterns
-            feat_pattern = r'([A-Z][a-zA-Z\s]+)\s+(?:feat\.|ft\.|vs\.?|x)\s+([A-Z][a-zA-Z\s]+)\s+-\s+([^\n]+)'
-            for match in re.finditer(feat_pattern, text):
-                tracks.append({
-                    'artist': self._clean_text(f"{match.group(1)} feat. {match.group(2)}"),
-                    'title': self._clean_text(match.group(3)),
-                    'confidence': 0.75
-                })
-
-            # Look for common collaboration patterns using spaCy
-            for sent in doc.sents:
-                sent_text = sent.text
-                # Check for artist collaboration indicators
-                if any(collab in sent_text.lower() for collab in ['feat.', 'ft.', 'featuring', 'vs', 'x', '&']):
-                    # Extract using pattern
-                    collab_pattern = r'([A-Z][a-zA-Z\s&]+?)\s+(?:feat\.|ft\.|featuring|vs\.?|x|&)\s+([A-Z][a-zA-Z\s&]+?)\s+-\s+(.+?)(?:\n|$)'
-                    match = re.search(collab_pattern, sent_text)
-                    if match:
+        text = doc.text
+
+        # Look for PERSON entities (likely artists) followed by WORK_OF_ART (tracks)
+        entities = list(doc.ents)
+        for i, ent in enumerate(entities):
+            if ent.label_ == "PERSON":
+                # Look for following entities that might be track names
+                if i + 1 < len(entities):
+                    next_ent = entities[i + 1]
+                    if next_ent.label_ in ["WORK_OF_ART", "PRODUCT"]:
                         tracks.append({
-                            'artist': self._clean_text(f"{match.group(1)} feat. {match.group(2)}"),
-                            'title': self._clean_text(match.group(3)),
-                            'confidence': 0.8
+                            'artist': self._clean_text(ent.text),
+                            'title': self._clean_text(next_ent.text),
+                            'confidence': 0.7
                         })
 
-            return tracks
-        finally:
-            # Explicitly release the spaCy doc to free memory
-            doc = None
-            gc.collect()
+        # Alternative: Look for "feat.", "vs", "x" patterns
+        for match in FEATURING.finditer(text):
+            tracks.append({
+                'artist': self._clean_text(f"{match.group(1)} feat. {match.group(2)}"),
+                'title': self._clean_text(match.group(3)),
+                'confidence': 0.75
+            })
+
+        # Look for common collaboration patterns using spaCy
+        for sent in doc.sents:
+            sent_text = sent.text
+            # Check for artist collaboration indicators
+            if any(collab in sent_text.lower() for collab in ['feat.', 'ft.', 'featuring', 'vs', 'x', '&']):
+                # Extract using pattern
+                match = COLLABORATION.search(sent_text)
+                if match:
+                    tracks.append({
+                        'artist': self._clean_text(f"{match.group(1)} feat. {match.group(2)}"),
+                        'title': self._clean_text(match.group(3)),
+                        'confidence': 0.8
+                    })
+
+        return tracks
 
     def _extract_fallback_patterns(self, text: str) -> List[Dict]:
         """Last resort: basic patterns"""
         tracks = []
 
         # Pattern: Any capitalized words followed by dash
-        pattern = r'([A-Z][a-zA-Z\s&]+)\s+-\s+([^\n]+)'
-        for match in re.finditer(pattern, text):
+        for match in FALLBACK.finditer(text):
             artist = self._clean_text(match.group(1))
             title = self._clean_text(match.group(2))
 
@@ -274,9 +351,9 @@ class TracklistExtractor:
     def _clean_text(self, text: str) -> str:
         """Clean extracted text"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE.sub(' ', text)
         # Remove common prefixes/suffixes
-        text = re.sub(r'\[.*?\]|\(.*?\)', '', text)
+        text = BRACKETED.sub('', text)
         # Remove leading/trailing whitespace and punctuation
         text = text.strip().strip('.,;:')
         return text
@@ -296,9 +373,7 @@ class TracklistExtractor:
         timestamps = []
 
         # Pattern: [00:00] or 00:00 format
-        pattern = r'(?:\[)?(\d{1,2}:\d{2}(?::\d{2})?)(?:\])?(.{0,100})'
-
-        for match in re.finditer(pattern, text):
+        for match in TIMESTAMP_CONTEXT.finditer(text):
             timestamp = match.group(1)
             context = self._clean_text(match.group(2))
 
@@ -320,38 +395,33 @@ class TracklistExtractor:
             'estimated_tracks': 0
         }
 
-        try:
-            # Check for timestamps
-            if re.search(r'\d{1,2}:\d{2}', text):
-                analysis['has_timestamps'] = True
-
-            # Check for numbering
-            if re.search(r'^\s*\d+\.\s+', text, re.MULTILINE):
-                analysis['has_numbering'] = True
-
-            # Check separator type
-            if ' - ' in text:
-                analysis['separator_type'] = 'dash'
-            elif ' – ' in text:  # En dash
-                analysis['separator_type'] = 'en_dash'
-
-            # Determine format type
-            if analysis['has_timestamps']:
-                if re.search(r'\[(\d{1,2}:\d{2})\]', text):
-                    analysis['format_type'] = 'bracketed_timestamps'
-                else:
-                    analysis['format_type'] = 'plain_timestamps'
-            elif analysis['has_numbering']:
-                analysis['format_type'] = 'numbered_list'
-            elif analysis['separator_type']:
-                analysis['format_type'] = 'simple_list'
-
-            # Estimate number of tracks
-            # Count lines with artist - track pattern
-            track_lines = re.findall(r'[A-Z][a-zA-Z\s&]+ - [^\n]+', text)
-            analysis['estimated_tracks'] = len(track_lines)
-
-            return analysis
-        finally:
-            # Ensure garbage collection
-            gc.collect()
+        # Check for timestamps
+        if HAS_TIMESTAMP.search(text):
+            analysis['has_timestamps'] = True
+
+        # Check for numbering
+        if HAS_NUMBERING.search(text):
+            analysis['has_numbering'] = True
+
+        # Check separator type
+        if ' - ' in text:
+            analysis['separator_type'] = 'dash'
+        elif ' – ' in text:  # En dash
+            analysis['separator_type'] = 'en_dash'
+
+        # Determine format type
+        if analysis['has_timestamps']:
+            if BRACKETED_TIMESTAMP.search(text):
+                analysis['format_type'] = 'bracketed_timestamps'
+            else:
+                analysis['format_type'] = 'plain_timestamps'
+        elif analysis['has_numbering']:
+            analysis['format_type'] = 'numbered_list'
+        elif analysis['separator_type']:
+            analysis['format_type'] = 'simple_list'
+
+        # Estimate number of tracks
+        # Count lines with artist - track pattern
+        analysis['estimated_tracks'] = len(TRACK_LINE.findall(text))
+
+        return analysis
@@ -9,7 +9,11 @@ import sys
 from datetime import datetime
 import asyncpg
 import json
+import asyncio
 from contextlib import asynccontextmanager
+
+from utils.search_index import search_documents, autocomplete, refresh_search_documents, order_by_ids
+from utils.tracklist_import import bulk_import_tracklists
 # Configure logging first
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -110,6 +114,23 @@ class TracklistImportResponse(BaseModel):
     failed: int = 0
     total: int = 0
     details: List[Dict[str, Any]] = Field(default_factory=list)
+    transitions_created: int = 0
+
+
+class BulkTracklistImportRequest(BaseModel):
+    """Request payload for importing many tracklists in one transaction"""
+    tracklists: List[TracklistImportRequest] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkTracklistImportResponse(BaseModel):
+    """Response payload for a bulk tracklist import"""
+    tracklists: List[TracklistImportResponse] = Field(default_factory=list)
+    total_tracks: int = 0
+    artists_upserted: int = 0
+    tracks_created: int = 0
+    tracks_matched: int = 0
+    transitions_written: int = 0
+    duration_ms: float = 0.0
 
 
 # Database connection - use secrets_manager if available
@@ -136,10 +157,26 @@ except NameError:
 
 db_pool = None
 
+# Search documents refresh cadence (0 disables the background refresh)
+SEARCH_REFRESH_INTERVAL_SECONDS = int(os.getenv("SEARCH_REFRESH_INTERVAL_SECONDS", "300"))
+
+async def search_refresh_loop():
+    """Keep the search_documents view close to the catalog"""
+    while True:
+        await asyncio.sleep(SEARCH_REFRESH_INTERVAL_SECONDS)
+        try:
+            if await refresh_search_documents(db_pool):
+                logger.info("Refreshed search_documents")
+        except asyncpg.UndefinedTableError:
+            logger.warning("search_documents view missing - apply migration 013 to enable indexed search")
+        except Exception as e:
+            logger.error(f"Failed to refresh search_documents: {str(e)}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage database connection pool lifecycle with 2025 best practices"""
     global db_pool
+    refresh_task = None
     try:
         # 2025 best practices: proper timeouts, connection validation, and limits
         db_pool = await asyncpg.create_pool(
@@ -156,8 +193,12 @@ async def lifespan(app: FastAPI):
         # Note: asyncpg does not support pool_recycle and pool_pre_ping directly
         # These are handled via max_queries and max_inactive_connection_lifetime above
         logger.info("Database connection pool created with enhanced 2025 configuration")
+        if SEARCH_REFRESH_INTERVAL_SECONDS > 0:
+            refresh_task = asyncio.create_task(search_refresh_loop())
         yield
     finally:
+        if refresh_task:
+            refresh_task.cancel()
         if db_pool:
             await db_pool.close()
             logger.info("Database connection pool closed")
@@ -824,8 +865,10 @@ async def search_artists(query: str, limit: int = 20):
     """
     Search artists by name with fuzzy matching.
 
-    Uses PostgreSQL ILIKE for pattern matching, returning results sorted by
-    match quality (exact matches first, then partial matches).
+    Ranked trigram search over the search_documents view: exact and prefix
+    matches first, then typo-tolerant word-similarity matches, with track
+    count breaking ties. Falls back to ILIKE matching if the view has not
+    been created yet.
 
     Args:
         query: Artist name search query
@@ -836,40 +879,34 @@ async def search_artists(query: str, limit: int = 20):
     """
     try:
         async with db_pool.acquire() as conn:
-            # Fuzzy search with ILIKE pattern matching
-            search_query = """
-            SELECT
-                a.artist_id::text as artist_id,
-                a.name,
-                a.spotify_id,
-                a.genres,
-                COUNT(DISTINCT ta.track_id) as track_count,
-                CASE
-                    WHEN LOWER(a.name) = LOWER($1) THEN 1.0
-                    WHEN LOWER(a.name) LIKE LOWER($1 || '%') THEN 0.9
-                    WHEN LOWER(a.name) LIKE LOWER('%' || $1 || '%') THEN 0.7
-                    ELSE 0.5
-                END as match_score
-            FROM artists a
-            LEFT JOIN track_artists ta ON a.artist_id = ta.artist_id
-            WHERE a.name ILIKE $2
-            GROUP BY a.artist_id, a.name, a.spotify_id, a.genres
-            ORDER BY match_score DESC, track_count DESC, a.name
-            LIMIT $3
-            """
+            try:
+                ranked = await search_documents(conn, "artist", query, limit)
+            except asyncpg.UndefinedTableError:
+                logger.warning("search_documents view missing - falling back to ILIKE artist search")
+                return await _search_artists_ilike(conn, query, limit)
 
-            search_pattern = f"%{query}%"
-            rows = await conn.fetch(search_query, query, search_pattern, limit)
+            artist_ids = [str(row['entity_id']) for row in ranked]
+            details = await conn.fetch(
+                """
+                SELECT artist_id::text as artist_id, spotify_id, genres
+                FROM artists
+                WHERE artist_id = ANY($1::uuid[])
+                """,
+                artist_ids
+            )
+            details_by_id = {row['artist_id']: row for row in details}
 
             results = []
-            for row in rows:
+            for row in ranked:
+                artist_id = str(row['entity_id'])
+                detail = details_by_id.get(artist_id)
                 results.append(ArtistSearchResult(
-                    artist_id=row['artist_id'],
-                    name=row['name'],
-                    match_score=float(row['match_score']),
-                    track_count=row['track_count'],
-                    spotify_id=row['spotify_id'],
-                    genres=row['genres'] if row['genres'] else None
+                    artist_id=artist_id,
+                    name=row['display_name'],
+                    match_score=round(float(row['score']), 4),
+                    track_count=row['popularity'],
+                    spotify_id=detail['spotify_id'] if detail else None,
+                    genres=detail['genres'] if detail and detail['genres'] else None
                 ))
 
             logger.info(f"Artist search for '{query}' returned {len(results)} results")
@@ -879,6 +916,44 @@ async def search_artists(query: str, limit: int = 20):
         logger.error(f"Failed to search artists: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _search_artists_ilike(conn, query: str, limit: int) -> List[ArtistSearchResult]:
+    """Unindexed artist search used until migration 013 is applied"""
+    search_query = """
+    SELECT
+        a.artist_id::text as artist_id,
+        a.name,
+        a.spotify_id,
+        a.genres,
+        COUNT(DISTINCT ta.track_id) as track_count,
+        CASE
+            WHEN LOWER(a.name) = LOWER($1) THEN 1.0
+            WHEN LOWER(a.name) LIKE LOWER($1 || '%') THEN 0.9
+            WHEN LOWER(a.name) LIKE LOWER('%' || $1 || '%') THEN 0.7
+            ELSE 0.5
+        END as match_score
+    FROM artists a
+    LEFT JOIN track_artists ta ON a.artist_id = ta.artist_id
+    WHERE a.name ILIKE $2
+    GROUP BY a.artist_id, a.name, a.spotify_id, a.genres
+    ORDER BY match_score DESC, track_count DESC, a.name
+    LIMIT $3
+    """
+
+    search_pattern = f"%{query}%"
+    rows = await conn.fetch(search_query, query, search_pattern, limit)
+
+    return [
+        ArtistSearchResult(
+            artist_id=row['artist_id'],
+            name=row['name'],
+            match_score=float(row['match_score']),
+            track_count=row['track_count'],
+            spotify_id=row['spotify_id'],
+            genres=row['genres'] if row['genres'] else None
+        )
+        for row in rows
+    ]
+
 @app.post("/api/v1/tracks/{track_id}/assign-artist")
 async def assign_artist_to_track(track_id: str, request: AssignArtistRequest):
     """
@@ -1226,161 +1301,82 @@ async def import_tracklist(request: TracklistImportRequest):
 
     Creates new tracks or updates existing ones based on artist + title matching.
     Automatically creates artist records and track-artist relationships.
+    Runs the set-based bulk import in a single transaction.
 
     Returns statistics on created, updated, and failed imports.
     """
-    import hashlib
+    try:
+        async with db_pool.acquire() as conn:
+            async with conn.transaction():
+                result = await bulk_import_tracklists(conn, [request.tracks])
+
+        stats = result.tracklists[0]
+        logger.info(
+            f"📊 Tracklist import complete: {stats['created']} created, {stats['updated']} updated, "
+            f"{stats['failed']} failed, {stats['transitions_created']} transitions ({result.duration_ms}ms)"
+        )
+        return TracklistImportResponse(**stats)
 
-    stats = {
-        "created": 0,
-        "updated": 0,
-        "failed": 0,
-        "total": len(request.tracks),
-        "details": [],
-        "transitions_created": 0
-    }
+    except Exception as e:
+        logger.error(f"Failed to import tracklist: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
-    # Track previous song_id for creating transitions
-    prev_song_id = None
-    imported_song_ids = []
 
+@app.post("/api/v1/tracks/import-tracklists", response_model=BulkTracklistImportResponse)
+async def import_tracklists(request: BulkTracklistImportRequest):
+    """
+    Import many tracklists at once.
+
+    Artists and tracks are deduplicated across the whole payload, resolved or
+    inserted with set-based statements, and transitions are written in one
+    batched upsert, all inside a single transaction.
+    """
     try:
         async with db_pool.acquire() as conn:
-            for track_data in request.tracks:
-                try:
-                    # Generate stable track_id from artist + title hash
-                    content = f"{track_data.artist.lower().strip()}:{track_data.title.lower().strip()}"
-                    track_id = hashlib.md5(content.encode()).hexdigest()[:16]
-
-                    # Normalize title for search
-                    normalized_title = track_data.title.lower().strip()
-
-                    # 1. Upsert artist
-                    artist_query = """
-                    INSERT INTO artists (name, normalized_name)
-                    VALUES ($1, $2)
-                    ON CONFLICT (normalized_name)
-                    DO UPDATE SET name = EXCLUDED.name
-                    RETURNING artist_id
-                    """
-                    artist_row = await conn.fetchrow(
-                        artist_query,
-                        track_data.artist.strip(),
-                        track_data.artist.lower().strip()
-                    )
-                    artist_id = artist_row['artist_id']
-
-                    # 2. Check if track exists (by matching normalized title + artist)
-                    existing_track_query = """
-                    SELECT t.id
-                    FROM tracks t
-                    JOIN track_artists ta ON ta.track_id = t.id
-                    WHERE t.normalized_title = $1 AND ta.artist_id = $2
-                    LIMIT 1
-                    """
-                    existing = await conn.fetchrow(
-                        existing_track_query,
-                        normalized_title,
-                        artist_id
-                    )
+            async with conn.transaction():
+                result = await bulk_import_tracklists(conn, [t.tracks for t in request.tracklists])
 
-                    if existing:
-                        # Track exists - update title if needed
-                        track_id_uuid = existing['id']
-                        update_query = """
-                        UPDATE tracks
-                        SET title = $1,
-                            updated_at = NOW()
-                        WHERE id = $2
-                        """
-                        await conn.execute(
-                            update_query,
-                            track_data.title.strip(),
-                            track_id_uuid
-                        )
-                        stats["updated"] += 1
-                        stats["details"].append({
-                            "artist": track_data.artist,
-                            "title": track_data.title,
-                            "status": "updated",
-                            "track_id": str(track_id_uuid)
-                        })
-                    else:
-                        # Track doesn't exist - create it
-                        insert_query = """
-                        INSERT INTO tracks (
-                            title, normalized_title
-                        ) VALUES ($1, $2)
-                        RETURNING id
-                        """
-                        new_track = await conn.fetchrow(
-                            insert_query,
-                            track_data.title.strip(),
-                            normalized_title
-                        )
-                        track_id_uuid = new_track['id']
-                        stats["created"] += 1
-                        stats["details"].append({
-                            "artist": track_data.artist,
-                            "title": track_data.title,
-                            "status": "created",
-                            "track_id": str(track_id_uuid)
-                        })
-
-                    # 3. Ensure track_artists relationship exists
-                    relationship_query = """
-                    INSERT INTO track_artists (track_id, artist_id, role)
-                    VALUES ($1, $2, 'primary')
-                    ON CONFLICT (track_id, artist_id, role) DO NOTHING
-                    """
-                    await conn.execute(relationship_query, track_id_uuid, artist_id)
-
-                    # 4. Create transition edge if this is not the first track
-                    if prev_song_id is not None:
-                        try:
-                            # Use song_adjacency (requires song_id_1 < song_id_2)
-                            # Sort the IDs to meet the constraint
-                            if prev_song_id < track_id_uuid:
-                                sid_1, sid_2 = prev_song_id, track_id_uuid
-                            else:
-                                sid_1, sid_2 = track_id_uuid, prev_song_id
-
-                            transition_query = """
-                            INSERT INTO song_adjacency (song_id_1, song_id_2, occurrence_count)
-                            VALUES ($1, $2, 1)
-                            ON CONFLICT (song_id_1, song_id_2)
-                            DO UPDATE SET occurrence_count = song_adjacency.occurrence_count + 1
-                            """
-                            await conn.execute(transition_query, sid_1, sid_2)
-                            stats["transitions_created"] += 1
-                            logger.info(f"🔗 Created transition: {prev_song_id} → {track_id_uuid}")
-                        except Exception as trans_error:
-                            logger.warning(f"⚠️  Failed to create transition: {trans_error}")
-
-                    # Track this track for next iteration
-                    imported_song_ids.append(track_id_uuid)
-                    prev_song_id = track_id_uuid
-
-                    logger.info(f"✅ Imported: {track_data.artist} - {track_data.title} (track_id: {track_id_uuid})")
-
-                except Exception as track_error:
-                    logger.error(f"❌ Failed to import {track_data.artist} - {track_data.title}: {track_error}")
-                    stats["failed"] += 1
-                    stats["details"].append({
-                        "artist": track_data.artist,
-                        "title": track_data.title,
-                        "status": "failed",
-                        "error": str(track_error)
-                    })
-
-        logger.info(f"📊 Tracklist import complete: {stats['created']} created, {stats['updated']} updated, {stats['failed']} failed")
-        return TracklistImportResponse(**stats)
+        total_tracks = sum(len(t.tracks) for t in request.tracklists)
+        logger.info(
+            f"📊 Bulk import of {len(request.tracklists)} tracklists ({total_tracks} tracks): "
+            f"{result.tracks_created} tracks created, {result.tracks_matched} matched, "
+            f"{result.transitions_written} transitions in {result.duration_ms}ms"
+        )
+        return BulkTracklistImportResponse(
+            tracklists=[TracklistImportResponse(**stats) for stats in result.tracklists],
+            total_tracks=total_tracks,
+            artists_upserted=result.artists_upserted,
+            tracks_created=result.tracks_created,
+            tracks_matched=result.tracks_matched,
+            transitions_written=result.transitions_written,
+            duration_ms=result.duration_ms
+        )
 
     except Exception as e:
-        logger.error(f"Failed to import tracklist: {str(e)}")
+        logger.error(f"Failed to import tracklists: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
 
+# Gold layer track columns returned by search (TrackResponse shape)
+TRACK_SEARCH_COLUMNS = """
+    t.id::text as song_id, t.id::text as track_id, t.title as track_name,
+    t.normalized_title, t.duration_ms,
+    t.isrc, t.spotify_id, t.apple_music_id, t.youtube_music_id as youtube_id,
+    t.soundcloud_id, t.musicbrainz_id,
+    t.bpm, t.key as musical_key, t.energy, t.danceability, t.valence,
+    t.acousticness, t.instrumentalness, t.liveness,
+    t.speechiness, t.loudness,
+    EXTRACT(YEAR FROM t.release_date)::int as release_date,
+    t.genre, NULL as subgenre, NULL as record_label,
+    false as is_remix, false as is_mashup, false as is_live, false as is_cover,
+    false as is_instrumental, false as is_explicit,
+    NULL as remix_type, NULL as original_artist, NULL as remixer, NULL as mashup_components,
+    NULL::integer as popularity_score, NULL::integer as play_count, NULL as track_type,
+    NULL as source_context, NULL::integer as position_in_source,
+    'gold' as data_source, t.created_at as scrape_timestamp,
+    ta.artist_id::text as primary_artist_id, t.created_at, t.updated_at
+"""
+
 @app.get("/api/search/tracks", response_model=List[TrackResponse])
 async def search_tracks(
     query: str,
@@ -1390,48 +1386,31 @@ async def search_tracks(
     """
     Search tracks by name or artist with fuzzy matching (Gold layer).
 
-    Uses PostgreSQL's ILIKE for pattern matching against Gold layer tracks
-    with proper artist attribution via track_artists junction table.
-    Results ordered by relevance (exact matches first).
+    Ranks matches from the search_documents view (title + primary artist,
+    trigram-indexed) so typos and partial words still match, then loads
+    the ranked page from tracks in one query. Falls back to ILIKE matching
+    if the view has not been created yet.
     """
     try:
         async with db_pool.acquire() as conn:
-            # Search Gold layer with artist joins
-            search_query = """
-            SELECT DISTINCT ON (t.id)
-                   t.id::text as song_id, t.id::text as track_id, t.title as track_name,
-                   t.normalized_title, t.duration_ms,
-                   t.isrc, t.spotify_id, t.apple_music_id, t.youtube_music_id as youtube_id,
-                   t.soundcloud_id, t.musicbrainz_id,
-                   t.bpm, t.key as musical_key, t.energy, t.danceability, t.valence,
-                   t.acousticness, t.instrumentalness, t.liveness,
-                   t.speechiness, t.loudness,
-                   EXTRACT(YEAR FROM t.release_date)::int as release_date,
-                   t.genre, NULL as subgenre, NULL as record_label,
-                   false as is_remix, false as is_mashup, false as is_live, false as is_cover,
-                   false as is_instrumental, false as is_explicit,
-                   NULL as remix_type, NULL as original_artist, NULL as remixer, NULL as mashup_components,
-                   NULL::integer as popularity_score, NULL::integer as play_count, NULL as track_type,
-                   NULL as source_context, NULL::integer as position_in_source,
-                   'gold' as data_source, t.created_at as scrape_timestamp,
-                   ta.artist_id::text as primary_artist_id, t.created_at, t.updated_at
-            FROM tracks t
-            LEFT JOIN track_artists ta ON t.id = ta.track_id AND ta.role = 'primary' AND ta.position = 0
-            LEFT JOIN artists a ON ta.artist_id = a.artist_id
-            WHERE t.title ILIKE $1 OR t.normalized_title ILIKE $1 OR a.name ILIKE $1
-            ORDER BY t.id,
-                CASE
-                    WHEN t.title ILIKE $2 THEN 1
-                    WHEN t.title ILIKE $1 THEN 2
-                    WHEN a.name ILIKE $1 THEN 3
-                    ELSE 4
-                END
-            LIMIT $3 OFFSET $4
-            """
-
-            search_pattern = f"%{query}%"
-            exact_pattern = query
-            rows = await conn.fetch(search_query, search_pattern, exact_pattern, limit, offset)
+            try:
+                ranked = await search_documents(conn, "track", query, limit, offset)
+            except asyncpg.UndefinedTableError:
+                logger.warning("search_documents view missing - falling back to ILIKE track search")
+                rows = await _search_tracks_ilike(conn, query, limit, offset)
+            else:
+                track_ids = [str(row['entity_id']) for row in ranked]
+                hydrated = await conn.fetch(
+                    f"""
+                    SELECT DISTINCT ON (t.id) {TRACK_SEARCH_COLUMNS}
+                    FROM tracks t
+                    LEFT JOIN track_artists ta ON t.id = ta.track_id AND ta.role = 'primary' AND ta.position = 0
+                    WHERE t.id = ANY($1::uuid[])
+                    ORDER BY t.id
+                    """,
+                    track_ids
+                )
+                rows = order_by_ids(hydrated, track_ids, 'track_id')
 
             tracks = []
             for row in rows:
@@ -1449,6 +1428,63 @@ async def search_tracks(
         logger.error(f"Failed to search tracks: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _search_tracks_ilike(conn, query: str, limit: int, offset: int):
+    """Unindexed track search used until migration 013 is applied"""
+    search_query = f"""
+    SELECT DISTINCT ON (t.id) {TRACK_SEARCH_COLUMNS}
+    FROM tracks t
+    LEFT JOIN track_artists ta ON t.id = ta.track_id AND ta.role = 'primary' AND ta.position = 0
+    LEFT JOIN artists a ON ta.artist_id = a.artist_id
+    WHERE t.title ILIKE $1 OR t.normalized_title ILIKE $1 OR a.name ILIKE $1
+    ORDER BY t.id,
+        CASE
+            WHEN t.title ILIKE $2 THEN 1
+            WHEN t.title ILIKE $1 THEN 2
+            WHEN a.name ILIKE $1 THEN 3
+            ELSE 4
+        END
+    LIMIT $3 OFFSET $4
+    """
+
+    search_pattern = f"%{query}%"
+    exact_pattern = query
+    return await conn.fetch(search_query, search_pattern, exact_pattern, limit, offset)
+
+@app.get("/api/v1/search/autocomplete")
+async def search_autocomplete(
+    q: str,
+    type: Optional[str] = Query(None, pattern="^(track|artist)$", description="Restrict to tracks or artists"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Prefix autocomplete for the search box.
+
+    Served from the prefix index on search_documents, so cost does not grow
+    with the catalog; suggestions are ordered by popularity.
+    """
+    doc_types = [type] if type else ["track", "artist"]
+    try:
+        async with db_pool.acquire() as conn:
+            suggestions = await autocomplete(conn, q, doc_types, limit)
+        return {"query": q, "suggestions": suggestions, "count": len(suggestions)}
+    except asyncpg.UndefinedTableError:
+        raise HTTPException(status_code=503, detail="Search index not available - apply migration 013")
+    except Exception as e:
+        logger.error(f"Autocomplete failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/search/refresh")
+async def refresh_search_index():
+    """Refresh the search documents view now (otherwise refreshed every SEARCH_REFRESH_INTERVAL_SECONDS)"""
+    try:
+        refreshed = await refresh_search_documents(db_pool)
+        return {"status": "refreshed" if refreshed else "refresh_in_progress"}
+    except asyncpg.UndefinedTableError:
+        raise HTTPException(status_code=503, detail="Search index not available - apply migration 013")
+    except Exception as e:
+        logger.error(f"Search index refresh failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/tracks/{track_id}", response_model=TrackResponse)
 async def get_track_by_id(track_id: str):
     """
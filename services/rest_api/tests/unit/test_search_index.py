@@ -0,0 +1,164 @@
+"""Unit tests for search_documents ranking, autocomplete and the ILIKE fallback"""
+import asyncpg
+import pytest
+from fastapi import HTTPException
+
+import main
+from utils.search_index import (
+    AUTOCOMPLETE_CANDIDATES,
+    autocomplete,
+    like_prefix,
+    normalize_query,
+    order_by_ids,
+    search_documents,
+)
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    """Routes fetch() to a handler by a fragment of the SQL it runs"""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.executed = []
+        self.fetched = []
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+    async def fetch(self, sql, *args):
+        self.fetched.append((sql, args))
+        for fragment, handler in self.handlers.items():
+            if fragment in sql:
+                return handler(*args)
+        return []
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+
+def missing_view(*args):
+    raise asyncpg.UndefinedTableError('relation "search_documents" does not exist')
+
+
+def test_query_normalisation_and_prefix_escaping():
+    assert normalize_query("  Eric   PRYDZ ") == "eric prydz"
+    assert like_prefix("100%_pure\\") == "100\\%\\_pure\\\\%"
+
+
+@pytest.mark.asyncio
+async def test_search_documents_sets_threshold_and_passes_normalised_query():
+    conn = FakeConnection({"FROM search_documents": lambda *args: ["row"]})
+
+    rows = await search_documents(conn, "track", "  Opus ", limit=5, offset=10, similarity_threshold=0.3)
+
+    assert rows == ["row"]
+    assert conn.executed[0][1] == ("0.3",)
+    assert conn.fetched[0][1] == ("track", "opus", "opus%", 5, 10)
+    assert await search_documents(conn, "track", "   ") == []
+    assert len(conn.fetched) == 1
+
+
+@pytest.mark.asyncio
+async def test_artist_search_keeps_ranked_order_and_scores(monkeypatch):
+    ranked = [
+        {"entity_id": "b", "display_name": "Eric Prydz", "popularity": 40, "score": 2.07},
+        {"entity_id": "a", "display_name": "Eric Prydz & Friends", "popularity": 90, "score": 1.5},
+    ]
+    conn = FakeConnection({
+        "FROM search_documents": lambda *args: ranked,
+        "FROM artists": lambda ids: [
+            {"artist_id": "a", "spotify_id": "sp-a", "genres": None},
+            {"artist_id": "b", "spotify_id": "sp-b", "genres": ["progressive house"]},
+        ],
+    })
+    monkeypatch.setattr(main, "db_pool", FakePool(conn))
+
+    results = await main.search_artists("eric prid", limit=2)
+
+    assert [r.artist_id for r in results] == ["b", "a"]
+    assert [r.match_score for r in results] == [2.07, 1.5]
+    assert results[0].genres == ["progressive house"]
+    assert results[1].track_count == 90
+
+
+def test_order_by_ids_follows_ranking_and_skips_missing_rows():
+    rows = [{"track_id": "2"}, {"track_id": "1"}]
+    assert order_by_ids(rows, ["1", "3", "2"], "track_id") == [{"track_id": "1"}, {"track_id": "2"}]
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_reads_prefix_candidates_then_ranks_by_popularity():
+    rows = [
+        {"doc_type": "artist", "entity_id": "a1", "display_name": "Deadmau5", "artist_name": "x", "popularity": 80},
+        {"doc_type": "track", "entity_id": "t1", "display_name": "Dead Space", "artist_name": "Fred", "popularity": 3},
+    ]
+    conn = FakeConnection({"prefix_key LIKE": lambda *args: rows})
+
+    suggestions = await autocomplete(conn, "DEAD", ("track", "artist"), limit=5)
+
+    assert conn.fetched[0][1] == (["track", "artist"], "dead%", 5, AUTOCOMPLETE_CANDIDATES)
+    assert suggestions[0] == {
+        "type": "artist", "id": "a1", "name": "Deadmau5", "artist_name": None, "popularity": 80,
+    }
+    assert suggestions[1]["artist_name"] == "Fred"
+    assert await autocomplete(conn, " ") == []
+
+
+@pytest.mark.asyncio
+async def test_artist_search_falls_back_to_ilike_without_the_view(monkeypatch):
+    conn = FakeConnection({
+        "FROM search_documents": missing_view,
+        "a.name ILIKE": lambda query, pattern, limit: [{
+            "artist_id": "a", "name": "Eric Prydz", "spotify_id": None, "genres": None,
+            "track_count": 12, "match_score": 1.0,
+        }],
+    })
+    monkeypatch.setattr(main, "db_pool", FakePool(conn))
+
+    results = await main.search_artists("Eric Prydz", limit=10)
+
+    assert [(r.name, r.track_count) for r in results] == [("Eric Prydz", 12)]
+    assert conn.fetched[-1][1] == ("Eric Prydz", "%Eric Prydz%", 10)
+
+
+@pytest.mark.asyncio
+async def test_track_search_falls_back_to_ilike_without_the_view(monkeypatch):
+    conn = FakeConnection({"FROM search_documents": missing_view, "t.title ILIKE": lambda *args: []})
+    monkeypatch.setattr(main, "db_pool", FakePool(conn))
+
+    assert await main.search_tracks("opus", limit=5, offset=0) == []
+    assert conn.fetched[-1][1] == ("%opus%", "opus", 5, 0)
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_without_the_view_is_unavailable(monkeypatch):
+    monkeypatch.setattr(main, "db_pool", FakePool(FakeConnection({"prefix_key LIKE": missing_view})))
+
+    with pytest.raises(HTTPException) as excinfo:
+        await main.search_autocomplete("dead", type=None, limit=10)
+    assert excinfo.value.status_code == 503
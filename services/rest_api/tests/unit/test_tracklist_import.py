@@ -0,0 +1,123 @@
+"""Unit tests for the set-based tracklist import"""
+import uuid
+
+import asyncpg
+import pytest
+
+from main import TracklistImportTrack
+from utils.tracklist_import import (
+    INSERT_TRACKS_SQL,
+    LINK_TRACK_ARTISTS_SQL,
+    MATCH_TRACKS_SQL,
+    UPDATE_TRACK_TITLES_SQL,
+    UPSERT_ARTISTS_SQL,
+    UPSERT_TRANSITIONS_SQL,
+    bulk_import_tracklists,
+)
+
+
+class FakeConnection:
+    """Answers the import's statements from in-memory artists and tracks"""
+
+    def __init__(self, existing_tracks=None, insert_error=None):
+        self.artist_ids = {}
+        # (normalized_title, normalized_artist) -> track id already in the catalog
+        self.existing_tracks = existing_tracks or {}
+        self.insert_error = insert_error
+        self.statements = []
+
+    async def fetch(self, sql, *args):
+        self.statements.append((sql, args))
+        if sql == UPSERT_ARTISTS_SQL:
+            names, normalized = args
+            return [
+                {"artist_id": self.artist_ids.setdefault(n, uuid.uuid4()), "normalized_name": n}
+                for n in normalized
+            ]
+        if sql == MATCH_TRACKS_SQL:
+            by_artist_id = {artist_id: name for name, artist_id in self.artist_ids.items()}
+            return [
+                {"idx": idx, "id": self.existing_tracks[(title, by_artist_id[artist_id])]}
+                for idx, title, artist_id in zip(*args)
+                if (title, by_artist_id[artist_id]) in self.existing_tracks
+            ]
+        raise AssertionError(f"unexpected fetch: {sql}")
+
+    async def execute(self, sql, *args):
+        self.statements.append((sql, args))
+        if sql == INSERT_TRACKS_SQL and self.insert_error:
+            raise self.insert_error
+
+    def args_for(self, sql):
+        return [args for statement, args in self.statements if statement == sql]
+
+
+def tracklist(*pairs):
+    return [TracklistImportTrack(artist=artist, title=title) for artist, title in pairs]
+
+
+@pytest.mark.asyncio
+async def test_import_dedupes_across_tracklists_in_a_fixed_number_of_statements():
+    existing_id = uuid.uuid4()
+    conn = FakeConnection(existing_tracks={("opus", "eric prydz"): existing_id})
+
+    result = await bulk_import_tracklists(conn, [
+        tracklist(("Eric Prydz", "Opus"), ("Deadmau5", "Strobe"), ("", "No Artist")),
+        tracklist(("eric prydz", "OPUS"), ("Deadmau5", "Strobe"), ("Deadmau5", "Ghosts n Stuff")),
+    ])
+
+    assert [sql for sql, _ in conn.statements] == [
+        UPSERT_ARTISTS_SQL, MATCH_TRACKS_SQL, UPDATE_TRACK_TITLES_SQL,
+        INSERT_TRACKS_SQL, LINK_TRACK_ARTISTS_SQL, UPSERT_TRANSITIONS_SQL,
+    ]
+    assert result.artists_upserted == 2
+    assert (result.tracks_matched, result.tracks_created) == (1, 2)
+
+    first, second = result.tracklists
+    assert (first["created"], first["updated"], first["failed"]) == (1, 1, 1)
+    assert first["details"][0]["track_id"] == str(existing_id)
+    assert first["details"][2]["status"] == "failed"
+    assert second["details"][0]["track_id"] == str(existing_id)
+    assert second["details"][1]["track_id"] == first["details"][1]["track_id"]
+
+    # Every linked track is either matched or inserted by this batch
+    [(inserted_ids, _, _)] = conn.args_for(INSERT_TRACKS_SQL)
+    [(linked_ids, _)] = conn.args_for(LINK_TRACK_ARTISTS_SQL)
+    assert set(linked_ids) == set(inserted_ids) | {existing_id}
+
+
+@pytest.mark.asyncio
+async def test_transitions_are_aggregated_per_unordered_pair():
+    conn = FakeConnection()
+
+    result = await bulk_import_tracklists(conn, [
+        tracklist(("A", "One"), ("B", "Two"), ("B", "Two"), ("C", "Three")),
+        tracklist(("B", "Two"), ("A", "One")),
+    ])
+
+    [(ids_1, ids_2, counts)] = conn.args_for(UPSERT_TRANSITIONS_SQL)
+    pairs = dict(zip(zip(ids_1, ids_2), counts))
+    assert all(a < b for a, b in pairs)
+    assert sorted(pairs.values()) == [1, 2]
+    assert result.transitions_written == 2
+    assert [t["transitions_created"] for t in result.tracklists] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_insert_conflict_aborts_the_batch():
+    conn = FakeConnection(insert_error=asyncpg.UniqueViolationError("duplicate key"))
+
+    with pytest.raises(asyncpg.UniqueViolationError):
+        await bulk_import_tracklists(conn, [tracklist(("A", "One"), ("B", "Two"))])
+
+    assert conn.args_for(LINK_TRACK_ARTISTS_SQL) == []
+
+
+@pytest.mark.asyncio
+async def test_empty_or_invalid_payload_touches_nothing():
+    conn = FakeConnection()
+
+    result = await bulk_import_tracklists(conn, [tracklist((" ", "Untitled"))])
+
+    assert conn.statements == []
+    assert result.tracklists[0]["failed"] == 1
@@ -0,0 +1,165 @@
+"""
+Search index helpers for track and artist search
+
+Searches run against the search_documents materialised view (migration 013)
+instead of ILIKE scans over tracks/artists joins:
+
+- Ranked search: pg_trgm word similarity (`<%`) on the GIN-indexed
+  search_text tolerates typos and partial words; exact and prefix matches on
+  prefix_key are boosted, and popularity breaks ties.
+- Autocomplete: a pure prefix range scan on the (doc_type, prefix_key
+  text_pattern_ops) B-tree, so it stays cheap for one- and two-letter prefixes
+  where trigrams can't help.
+
+The view is refreshed concurrently in the background; search results can be
+up to one refresh interval behind writes.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Minimum word similarity for a fuzzy match (pg_trgm.word_similarity_threshold)
+DEFAULT_SIMILARITY_THRESHOLD = 0.4
+
+# Prefix matches read in index order before re-ranking by popularity
+AUTOCOMPLETE_CANDIDATES = 200
+
+# Serialises refreshes across API replicas
+REFRESH_LOCK_KEY = 713013
+
+SEARCH_SQL = """
+    SELECT entity_id, display_name, artist_name, popularity,
+           word_similarity($2, search_text)
+             + CASE WHEN prefix_key = $2 THEN 1.0
+                    WHEN prefix_key LIKE $3 THEN 0.5
+                    ELSE 0 END
+             + 0.02 * ln(1 + popularity) AS score
+    FROM search_documents
+    WHERE doc_type = $1
+      AND ($2 <% search_text OR prefix_key LIKE $3)
+    ORDER BY score DESC, popularity DESC, display_name
+    LIMIT $4 OFFSET $5
+"""
+
+AUTOCOMPLETE_SQL = """
+    SELECT doc_type, entity_id, display_name, artist_name, popularity
+    FROM (
+        SELECT doc_type, entity_id, display_name, artist_name, popularity, prefix_key
+        FROM search_documents
+        WHERE doc_type = ANY($1::text[])
+          AND prefix_key LIKE $2
+        ORDER BY doc_type, prefix_key
+        LIMIT $4
+    ) candidates
+    ORDER BY popularity DESC, prefix_key
+    LIMIT $3
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case and collapse whitespace (mirrors prefix_key/search_text)"""
+    return _WHITESPACE.sub(" ", query).strip().lower()
+
+
+def like_prefix(normalized: str) -> str:
+    """LIKE pattern matching values that start with `normalized`"""
+    escaped = normalized.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+async def search_documents(
+    conn: asyncpg.Connection,
+    doc_type: str,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+) -> List[asyncpg.Record]:
+    """
+    Ranked, typo-tolerant search over one document type
+
+    Args:
+        conn: Database connection
+        doc_type: 'track' or 'artist'
+        query: Raw user query
+        limit: Page size
+        offset: Page offset
+        similarity_threshold: Minimum word similarity for fuzzy matches
+
+    Returns:
+        Rows with entity_id, display_name, artist_name, popularity, score;
+        best match first
+    """
+    normalized = normalize_query(query)
+    if not normalized:
+        return []
+
+    async with conn.transaction():
+        await conn.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', $1, true)",
+            str(similarity_threshold)
+        )
+        return await conn.fetch(
+            SEARCH_SQL, doc_type, normalized, like_prefix(normalized), limit, offset
+        )
+
+
+async def autocomplete(
+    conn: asyncpg.Connection,
+    prefix: str,
+    doc_types: Sequence[str] = ("track", "artist"),
+    limit: int = 10
+) -> List[Dict[str, Any]]:
+    """Prefix suggestions, most popular first"""
+    normalized = normalize_query(prefix)
+    if not normalized:
+        return []
+
+    rows = await conn.fetch(
+        AUTOCOMPLETE_SQL,
+        list(doc_types),
+        like_prefix(normalized),
+        limit,
+        max(limit, AUTOCOMPLETE_CANDIDATES)
+    )
+    return [
+        {
+            "type": row["doc_type"],
+            "id": str(row["entity_id"]),
+            "name": row["display_name"],
+            "artist_name": row["artist_name"] if row["doc_type"] == "track" else None,
+            "popularity": row["popularity"],
+        }
+        for row in rows
+    ]
+
+
+async def refresh_search_documents(pool: asyncpg.Pool) -> bool:
+    """
+    Refresh the search_documents view without blocking readers
+
+    Returns:
+        True if this process refreshed, False if another replica holds the lock
+    """
+    async with pool.acquire() as conn:
+        locked = await conn.fetchval("SELECT pg_try_advisory_lock($1)", REFRESH_LOCK_KEY)
+        if not locked:
+            return False
+        try:
+            await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY search_documents")
+            return True
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", REFRESH_LOCK_KEY)
+
+
+def order_by_ids(rows: Sequence[Any], ids: Sequence[str], key: str) -> List[Any]:
+    """Reorder hydrated rows to follow the ranked id list"""
+    by_id = {str(row[key]): row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
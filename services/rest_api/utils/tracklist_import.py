@@ -0,0 +1,226 @@
+"""
+Set-based tracklist import
+
+Imports any number of tracklists with a fixed number of statements,
+independent of how many tracks they contain:
+
+1. Artists in the payload are deduplicated by normalized name and upserted
+   with one INSERT ... SELECT FROM unnest(...)
+2. Distinct (normalized title, artist) pairs are matched against existing
+   tracks in one join; matches get their title refreshed in one UPDATE and
+   the rest are inserted in one INSERT with client-generated ids (tracks has
+   no unique title constraint, so any conflict there aborts the batch)
+3. Primary track_artists links are written in one INSERT
+4. Consecutive tracks become song_adjacency transitions, aggregated per pair
+   across all tracklists and written in one upsert
+
+Everything runs inside the caller's transaction, so a batch either lands
+completely or not at all.
+"""
+
+import logging
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+UPSERT_ARTISTS_SQL = """
+    INSERT INTO artists (name, normalized_name)
+    SELECT * FROM unnest($1::text[], $2::text[])
+    ON CONFLICT (normalized_name)
+    DO UPDATE SET name = EXCLUDED.name
+    RETURNING artist_id, normalized_name
+"""
+
+MATCH_TRACKS_SQL = """
+    SELECT DISTINCT ON (k.idx) k.idx, t.id
+    FROM unnest($1::int[], $2::text[], $3::uuid[]) AS k(idx, normalized_title, artist_id)
+    JOIN tracks t ON t.normalized_title = k.normalized_title
+    JOIN track_artists ta ON ta.track_id = t.id AND ta.artist_id = k.artist_id
+    ORDER BY k.idx, t.id
+"""
+
+UPDATE_TRACK_TITLES_SQL = """
+    UPDATE tracks t
+    SET title = u.title,
+        updated_at = NOW()
+    FROM unnest($1::uuid[], $2::text[]) AS u(id, title)
+    WHERE t.id = u.id
+"""
+
+INSERT_TRACKS_SQL = """
+    INSERT INTO tracks (id, title, normalized_title)
+    SELECT * FROM unnest($1::uuid[], $2::text[], $3::text[])
+"""
+
+LINK_TRACK_ARTISTS_SQL = """
+    INSERT INTO track_artists (track_id, artist_id, role)
+    SELECT track_id, artist_id, 'primary'
+    FROM unnest($1::uuid[], $2::uuid[]) AS l(track_id, artist_id)
+    ON CONFLICT (track_id, artist_id, role) DO NOTHING
+"""
+
+UPSERT_TRANSITIONS_SQL = """
+    INSERT INTO song_adjacency (song_id_1, song_id_2, occurrence_count)
+    SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::int[])
+    ON CONFLICT (song_id_1, song_id_2)
+    DO UPDATE SET occurrence_count = song_adjacency.occurrence_count + EXCLUDED.occurrence_count
+"""
+
+TrackKey = Tuple[str, uuid.UUID]  # (normalized_title, artist_id)
+
+
+@dataclass
+class BulkImportResult:
+    """Outcome of a bulk import; `tracklists` holds per-entry details for each input list"""
+    tracklists: List[Dict[str, Any]] = field(default_factory=list)
+    artists_upserted: int = 0
+    tracks_created: int = 0
+    tracks_matched: int = 0
+    transitions_written: int = 0
+    duration_ms: float = 0.0
+
+
+async def bulk_import_tracklists(
+    conn: asyncpg.Connection,
+    tracklists: Sequence[Sequence[Any]]
+) -> BulkImportResult:
+    """
+    Import tracklists in a fixed number of set-based statements
+
+    Args:
+        conn: Connection with an open transaction
+        tracklists: Lists of track entries with `.artist` and `.title`
+            attributes (TracklistImportTrack), each in play order
+
+    Returns:
+        BulkImportResult with per-tracklist created/updated/failed details
+    """
+    started = time.perf_counter()
+    result = BulkImportResult()
+
+    # Validate and normalize; invalid entries are reported, not sent to the DB
+    parsed: List[List[Optional[Tuple[str, str, str, str]]]] = []
+    artist_names: Dict[str, str] = {}
+    for tracks in tracklists:
+        entries = []
+        for track in tracks:
+            artist, title = (track.artist or "").strip(), (track.title or "").strip()
+            if not artist or not title:
+                entries.append(None)
+                continue
+            normalized_artist = artist.lower()
+            artist_names.setdefault(normalized_artist, artist)
+            entries.append((artist, normalized_artist, title, title.lower()))
+        parsed.append(entries)
+
+    artist_ids: Dict[str, uuid.UUID] = {}
+    if artist_names:
+        rows = await conn.fetch(
+            UPSERT_ARTISTS_SQL, list(artist_names.values()), list(artist_names.keys())
+        )
+        artist_ids = {row['normalized_name']: row['artist_id'] for row in rows}
+        result.artists_upserted = len(rows)
+
+    # Distinct tracks in the payload, first-seen title wins
+    track_titles: Dict[TrackKey, str] = {}
+    for entries in parsed:
+        for entry in entries:
+            if entry is not None:
+                _, normalized_artist, title, normalized_title = entry
+                track_titles.setdefault((normalized_title, artist_ids[normalized_artist]), title)
+
+    keys = list(track_titles)
+    track_ids: Dict[TrackKey, uuid.UUID] = {}
+    if keys:
+        rows = await conn.fetch(
+            MATCH_TRACKS_SQL,
+            list(range(len(keys))),
+            [k[0] for k in keys],
+            [k[1] for k in keys]
+        )
+        for row in rows:
+            track_ids[keys[row['idx']]] = row['id']
+
+    matched = list(track_ids)
+    new_keys = [k for k in keys if k not in track_ids]
+    for key in new_keys:
+        track_ids[key] = uuid.uuid4()
+
+    if matched:
+        await conn.execute(
+            UPDATE_TRACK_TITLES_SQL,
+            [track_ids[k] for k in matched],
+            [track_titles[k] for k in matched]
+        )
+    if new_keys:
+        # No ON CONFLICT: every id linked below must be a row this INSERT wrote
+        await conn.execute(
+            INSERT_TRACKS_SQL,
+            [track_ids[k] for k in new_keys],
+            [track_titles[k] for k in new_keys],
+            [k[0] for k in new_keys]
+        )
+    if keys:
+        await conn.execute(
+            LINK_TRACK_ARTISTS_SQL, [track_ids[k] for k in keys], [k[1] for k in keys]
+        )
+    result.tracks_matched = len(matched)
+    result.tracks_created = len(new_keys)
+
+    # Per-tracklist details and transitions between consecutive valid tracks
+    new_key_set = set(new_keys)
+    transitions: Counter = Counter()
+    for tracks, entries in zip(tracklists, parsed):
+        summary = {
+            "created": 0, "updated": 0, "failed": 0, "total": len(tracks),
+            "details": [], "transitions_created": 0
+        }
+        prev_id: Optional[uuid.UUID] = None
+        for track, entry in zip(tracks, entries):
+            if entry is None:
+                summary["failed"] += 1
+                summary["details"].append({
+                    "artist": track.artist,
+                    "title": track.title,
+                    "status": "failed",
+                    "error": "artist and title are required"
+                })
+                continue
+
+            _, normalized_artist, _, normalized_title = entry
+            key = (normalized_title, artist_ids[normalized_artist])
+            track_id = track_ids[key]
+            status = "created" if key in new_key_set else "updated"
+            summary[status] += 1
+            summary["details"].append({
+                "artist": track.artist,
+                "title": track.title,
+                "status": status,
+                "track_id": str(track_id)
+            })
+
+            # song_adjacency stores each pair once with song_id_1 < song_id_2
+            if prev_id is not None and prev_id != track_id:
+                transitions[(min(prev_id, track_id), max(prev_id, track_id))] += 1
+                summary["transitions_created"] += 1
+            prev_id = track_id
+        result.tracklists.append(summary)
+
+    if transitions:
+        pairs = list(transitions.items())
+        await conn.execute(
+            UPSERT_TRANSITIONS_SQL,
+            [p[0][0] for p in pairs],
+            [p[0][1] for p in pairs],
+            [count for _, count in pairs]
+        )
+    result.transitions_written = len(transitions)
+
+    result.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    return result
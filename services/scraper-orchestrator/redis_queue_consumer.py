@@ -7,9 +7,11 @@ import asyncio
 import json
 import logging
 import os
-import redis
+import time
+from collections import Counter
+import redis.asyncio as aioredis
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import structlog
 
@@ -30,20 +32,54 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
-class RedisQueueConsumer:
-    """Consumes tasks from Redis queue and dispatches to scraper APIs"""
+QUEUE_KEY = 'scraping_queue'
+FAILED_QUEUE_KEY = 'scraping_queue:failed'
+STATS_KEY = 'scraper:stats'
+
+# Concurrent scraper calls; sized to what the scraper service can absorb
+CONSUMER_CONCURRENCY = int(os.getenv("SCRAPER_CONSUMER_CONCURRENCY", "4"))
+# Seconds each blocking pop waits before re-checking for shutdown
+CONSUMER_POP_TIMEOUT = float(os.getenv("SCRAPER_CONSUMER_POP_TIMEOUT", "2"))
+# Seconds shutdown waits for in-flight tasks before requeueing them
+CONSUMER_DRAIN_TIMEOUT = float(os.getenv("SCRAPER_CONSUMER_DRAIN_TIMEOUT", "60"))
+STATS_FLUSH_INTERVAL = float(os.getenv("SCRAPER_STATS_FLUSH_INTERVAL", "5"))
+
 
-    def __init__(self):
-        # Redis connection (synchronous for blocking operations)
-        self.redis_client = redis.Redis(
+class RedisQueueConsumer:
+    """
+    Consumes tasks from Redis queue and dispatches to scraper APIs
+
+    `concurrency` workers each block on BRPOP and call the scraper service,
+    so the queue drains as fast as the scraper can take work. When the
+    scraper answers 429/503 the task goes back on the queue and all workers
+    pause for its Retry-After. Stats are counted locally and flushed to
+    Redis in one pipeline every STATS_FLUSH_INTERVAL seconds.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = CONSUMER_CONCURRENCY,
+        redis_client: Optional[aioredis.Redis] = None,
+        pop_timeout: float = CONSUMER_POP_TIMEOUT,
+        drain_timeout: float = CONSUMER_DRAIN_TIMEOUT
+    ):
+        # Async Redis connection; each worker's blocking pop only suspends that worker
+        self.redis_client = redis_client or aioredis.Redis(
             host=os.getenv("REDIS_HOST", "redis"),
             port=int(os.getenv("REDIS_PORT", 6379)),
             password=os.getenv("REDIS_PASSWORD"),
             decode_responses=True
         )
 
+        self.concurrency = max(1, concurrency)
+        self.pop_timeout = pop_timeout
+        self.drain_timeout = drain_timeout
+
         # HTTP client for calling scraper APIs
-        self.http_client = httpx.AsyncClient(timeout=60.0)
+        self.http_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        )
 
         # Scraper service mappings - All scrapers now unified in single service
         self.scraper_endpoints = {
@@ -53,40 +89,71 @@ class RedisQueueConsumer:
         self.running = True
         self.tasks_processed = 0
         self.tasks_failed = 0
+        self.in_flight = 0
+        self._workers: List[asyncio.Task] = []
+        self._pending_stats: Counter = Counter()
+        self._paused_until = 0.0
 
     async def consume_queue(self):
-        """Main consumer loop - pulls from Redis and calls scrapers"""
-        logger.info("Starting Redis queue consumer", queue="scraping_queue")
+        """Main consumer loop - runs the workers and stats flusher until shutdown"""
+        logger.info("Starting Redis queue consumer", queue=QUEUE_KEY, workers=self.concurrency)
 
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        flusher = asyncio.create_task(self._flush_stats_loop())
+        try:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        finally:
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+            await self.flush_stats()
+
+    async def _worker(self, worker_id: int):
         while self.running:
+            await self._wait_for_downstream()
             try:
-                # Blocking pop from Redis queue (timeout after 5 seconds)
-                result = self.redis_client.brpop('scraping_queue', timeout=5)
-
-                if result:
-                    _, task_json = result
-                    await self.process_task(task_json)
-                else:
-                    # No tasks available, wait a bit
-                    await asyncio.sleep(1)
-
-            except redis.ConnectionError as e:
-                logger.error("Redis connection error", error=str(e))
+                # Blocking pop from Redis queue; returns None after pop_timeout
+                result = await self.redis_client.brpop(QUEUE_KEY, timeout=self.pop_timeout)
+
+            except aioredis.ConnectionError as e:
+                logger.error("Redis connection error", error=str(e), worker=worker_id)
                 await asyncio.sleep(5)  # Wait before retry
+                continue
 
-            except redis.TimeoutError:
+            except aioredis.TimeoutError:
                 # Expected behavior when queue is empty - not an error
-                await asyncio.sleep(1)
+                continue
 
             except Exception as e:
                 # Only log truly unexpected errors
                 logger.error("Consumer unexpected error", error=str(e), error_type=type(e).__name__)
                 await asyncio.sleep(2)
+                continue
+
+            if not result:
+                continue
+
+            _, task_json = result
+            self.in_flight += 1
+            try:
+                # Another worker may have hit a saturated scraper while this one was popping
+                await self._wait_for_downstream()
+                await self.process_task(task_json)
+            except asyncio.CancelledError:
+                # Drain timed out before the task finished: put it back rather than lose it
+                await asyncio.shield(self.redis_client.rpush(QUEUE_KEY, task_json))
+                raise
+            finally:
+                self.in_flight -= 1
+
+    async def _wait_for_downstream(self):
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
     async def process_task(self, task_json: str):
         """Process a single task from the queue"""
+        task = None
         try:
-            await asyncio.sleep(5)
             task = json.loads(task_json)
 
             logger.info(
@@ -129,8 +196,19 @@ class RedisQueueConsumer:
                 )
                 self.tasks_processed += 1
 
-                # Store success metrics in Redis
-                self.redis_client.hincrby('scraper:stats', f'{scraper}:success', 1)
+                # Success metrics are flushed to Redis in batches
+                self._pending_stats[f'{scraper}:success'] += 1
+
+            elif response.status_code in (429, 503):
+                # Scraper is saturated: hand the task back untouched and let it catch up
+                retry_after = self._retry_after(response)
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                await self.redis_client.rpush(QUEUE_KEY, task_json)
+                logger.warning(
+                    "Scraper at capacity, pausing consumer",
+                    status=response.status_code,
+                    retry_after=retry_after
+                )
 
             else:
                 logger.error(
@@ -140,6 +218,7 @@ class RedisQueueConsumer:
                     response=response.text
                 )
                 self.tasks_failed += 1
+                self._pending_stats[f'{scraper}:failed'] += 1
 
                 # Re-queue failed task with backoff
                 await self.requeue_failed_task(task)
@@ -159,6 +238,13 @@ class RedisQueueConsumer:
             logger.error("Task processing error", error=str(e))
             self.tasks_failed += 1
 
+    @staticmethod
+    def _retry_after(response: httpx.Response, default: float = 5.0) -> float:
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', default)))
+        except ValueError:
+            return default
+
     async def requeue_failed_task(self, task: Dict[str, Any]):
         """Re-queue failed task with retry logic"""
         retry_count = task.get('retry_count', 0)
@@ -168,7 +254,7 @@ class RedisQueueConsumer:
             task['retry_at'] = datetime.now().isoformat()
 
             # Add back to queue (at the end)
-            self.redis_client.lpush('scraping_queue', json.dumps(task))
+            await self.redis_client.lpush(QUEUE_KEY, json.dumps(task))
 
             logger.info(
                 "Task re-queued for retry",
@@ -177,7 +263,7 @@ class RedisQueueConsumer:
             )
         else:
             # Move to dead letter queue after max retries
-            self.redis_client.lpush('scraping_queue:failed', json.dumps(task))
+            await self.redis_client.lpush(FAILED_QUEUE_KEY, json.dumps(task))
 
             logger.warning(
                 "Task moved to dead letter queue",
@@ -185,16 +271,40 @@ class RedisQueueConsumer:
                 retries=retry_count
             )
 
+    async def flush_stats(self):
+        """Write accumulated stats counters to Redis in one pipeline"""
+        if not self._pending_stats:
+            return
+        pending, self._pending_stats = self._pending_stats, Counter()
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for field, count in pending.items():
+                    pipe.hincrby(STATS_KEY, field, count)
+                await pipe.execute()
+        except Exception as e:
+            # Keep the counts for the next flush
+            self._pending_stats.update(pending)
+            logger.warning("Failed to flush scraper stats", error=str(e))
+
+    async def _flush_stats_loop(self):
+        while True:
+            await asyncio.sleep(STATS_FLUSH_INTERVAL)
+            await self.flush_stats()
+
     async def get_stats(self) -> Dict[str, Any]:
         """Get consumer statistics"""
-        queue_length = self.redis_client.llen('scraping_queue')
-        failed_queue_length = self.redis_client.llen('scraping_queue:failed')
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.llen(QUEUE_KEY)
+            pipe.llen(FAILED_QUEUE_KEY)
+            queue_length, failed_queue_length = await pipe.execute()
 
         return {
             'queue_length': queue_length,
             'failed_queue_length': failed_queue_length,
             'tasks_processed': self.tasks_processed,
             'tasks_failed': self.tasks_failed,
+            'tasks_in_flight': self.in_flight,
+            'workers': self.concurrency,
             'consumer_status': 'running' if self.running else 'stopped'
         }
 
@@ -202,7 +312,7 @@ class RedisQueueConsumer:
         """Check consumer health"""
         try:
             # Check Redis connection
-            self.redis_client.ping()
+            await self.redis_client.ping()
 
             # Check if scrapers are reachable
             for scraper, endpoint in self.scraper_endpoints.items():
@@ -223,11 +333,21 @@ class RedisQueueConsumer:
             return False
 
     async def shutdown(self):
-        """Graceful shutdown"""
-        logger.info("Shutting down Redis queue consumer")
+        """Graceful shutdown: stop taking tasks, let in-flight ones finish, then close"""
+        logger.info("Shutting down Redis queue consumer", tasks_in_flight=self.in_flight)
         self.running = False
+
+        # Idle workers return once their blocking pop times out
+        workers = [w for w in self._workers if not w.done()]
+        if workers:
+            _, still_running = await asyncio.wait(workers, timeout=self.drain_timeout + self.pop_timeout)
+            for worker in still_running:
+                worker.cancel()  # Requeues its task
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+        await self.flush_stats()
         await self.http_client.aclose()
-        self.redis_client.close()
+        await self.redis_client.aclose()
         logger.info(
             "Consumer shutdown complete",
             tasks_processed=self.tasks_processed,
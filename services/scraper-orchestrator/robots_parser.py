@@ -4,20 +4,33 @@ Handles robots.txt compliance and intelligent rate limiting for web scraping
 """
 
 import asyncio
+import heapq
 import re
 import time
-from typing import Dict, Optional, List, Tuple, Set
+from typing import Deque, Dict, Optional, List, Tuple, Set
 from urllib.parse import urlparse, urljoin
 from datetime import datetime, timedelta
 import logging
 import httpx
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
 import hashlib
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _compile_robots_pattern(pattern: str) -> Optional[re.Pattern]:
+    """Convert a robots.txt pattern to a compiled regex (None if invalid)"""
+    pattern = pattern.replace("*", ".*")
+    pattern = pattern.replace("?", ".")
+    try:
+        return re.compile(f"^{pattern}")
+    except re.error:
+        return None
+
+
 @dataclass
 class RobotRules:
     """Parsed rules from robots.txt for a specific user agent"""
@@ -42,14 +55,8 @@ class RobotRules:
 
     def _matches_pattern(self, pattern: str, path: str) -> bool:
         """Check if a path matches a robots.txt pattern"""
-        # Convert robots.txt pattern to regex
-        pattern = pattern.replace("*", ".*")
-        pattern = pattern.replace("?", ".")
-        pattern = f"^{pattern}"
-        try:
-            return bool(re.match(pattern, path))
-        except re.error:
-            return False
+        regex = _compile_robots_pattern(pattern)
+        return bool(regex and regex.match(path))
 
     def get_delay(self) -> float:
         """Get the appropriate crawl delay in seconds"""
@@ -130,17 +137,22 @@ class RobotsChecker:
 
     DEFAULT_USER_AGENT = "SongNodes-Bot/1.0 (+https://songnodes.com/bot)"
     CACHE_EXPIRY = 86400  # Cache robots.txt for 24 hours
+    NEGATIVE_CACHE_EXPIRY = 600  # Retry an unreachable robots.txt after 10 minutes
 
     def __init__(self, user_agent: Optional[str] = None):
         self.user_agent = user_agent or self.DEFAULT_USER_AGENT
-        self.robots_cache: Dict[str, RobotRules] = {}
+        # Rules per domain; None records a failed fetch until it expires
+        self.robots_cache: Dict[str, Optional[RobotRules]] = {}
+        self._cache_expires: Dict[str, float] = {}
+        self._fetches: Dict[str, asyncio.Future] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.domain_stats: Dict[str, DomainStats] = defaultdict(DomainStats)
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(10.0),
             follow_redirects=True,
             headers={"User-Agent": self.user_agent}
         )
-        self._lock = asyncio.Lock()
 
     async def fetch_robots_txt(self, domain: str) -> Optional[RobotRules]:
         """Fetch and parse robots.txt for a domain"""
@@ -264,20 +276,29 @@ class RobotsChecker:
         parsed = urlparse(url)
         domain = parsed.netloc
 
-        async with self._lock:
-            # Check cache
-            if domain in self.robots_cache:
-                rules = self.robots_cache[domain]
-                # Check if cache is still valid
-                if (datetime.now() - rules.last_fetched).total_seconds() < self.CACHE_EXPIRY:
-                    return rules
-
-            # Fetch fresh robots.txt
-            rules = await self.fetch_robots_txt(domain)
-            if rules:
-                self.robots_cache[domain] = rules
-
-            return rules
+        # Check cache
+        if domain in self.robots_cache and time.monotonic() < self._cache_expires[domain]:
+            self.cache_hits += 1
+            return self.robots_cache[domain]
+
+        # Fetch fresh robots.txt; concurrent callers for a domain share one fetch
+        fetch = self._fetches.get(domain)
+        if fetch is None:
+            self.cache_misses += 1
+            fetch = self._fetches[domain] = asyncio.ensure_future(self._refresh_rules(domain))
+            fetch.add_done_callback(lambda _: self._fetches.pop(domain, None))
+        return await asyncio.shield(fetch)
+
+    async def _refresh_rules(self, domain: str) -> Optional[RobotRules]:
+        rules = await self.fetch_robots_txt(domain)
+        ttl = self.CACHE_EXPIRY
+        if rules is None:
+            # Keep the last good rules, if any, but try again soon
+            rules = self.robots_cache.get(domain)
+            ttl = self.NEGATIVE_CACHE_EXPIRY
+        self.robots_cache[domain] = rules
+        self._cache_expires[domain] = time.monotonic() + ttl
+        return rules
 
     async def is_allowed(self, url: str) -> bool:
         """Check if a URL is allowed to be crawled"""
@@ -303,6 +324,14 @@ class RobotsChecker:
         stats = self.domain_stats[domain]
         return stats.get_adaptive_delay(base_delay)
 
+    def get_cached_crawl_delay(self, domain: str) -> Optional[float]:
+        """Adaptive crawl delay from cached rules without fetching; None if never fetched"""
+        if domain not in self.robots_cache:
+            return None
+        rules = self.robots_cache[domain]
+        base_delay = rules.get_delay() if rules else 10.0
+        return self.domain_stats[domain].get_adaptive_delay(base_delay)
+
     def update_domain_stats(self, url: str, response_time: float,
                            is_error: bool = False, is_rate_limit: bool = False):
         """Update statistics for a domain after a request"""
@@ -343,20 +372,87 @@ class RobotsChecker:
                           if stats.last_request_time > 0 else None
         }
 
+    def get_cache_stats(self) -> Dict:
+        """Get robots.txt cache statistics"""
+        return {
+            "cached_domains": len(self.robots_cache),
+            "unreachable_domains": sum(1 for rules in self.robots_cache.values() if rules is None),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
     async def close(self):
         """Close the HTTP client"""
         await self.client.aclose()
 
 
+@dataclass
+class TokenBucket:
+    """Request tokens for one domain, refilled at one token per crawl delay"""
+    delay: float
+    capacity: float = 1.0
+    tokens: float = 1.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) / self.delay)
+        self.updated_at = now
+
+    def set_delay(self, delay: float, now: float):
+        """Adopt a new adaptive delay; tokens earned so far are kept"""
+        self.refill(now)
+        self.delay = delay
+
+    def ready_at(self, now: float) -> float:
+        """Monotonic time at which a token is available"""
+        self.refill(now)
+        return now if self.tokens >= 1.0 else now + (1.0 - self.tokens) * self.delay
+
+    def take(self, now: float):
+        self.refill(now)
+        self.tokens -= 1.0
+
+
 class SmartScheduler:
-    """Intelligent scheduler that respects robots.txt and implements adaptive timing"""
+    """
+    Intelligent scheduler that respects robots.txt and implements adaptive timing
+
+    Domains with queued tasks sit in a heap keyed by the time their token
+    bucket next has a token, so getting the next task is O(log domains)
+    instead of a scan of every domain. Bucket rates follow
+    DomainStats.get_adaptive_delay, and a domain being processed is kept out
+    of the heap until its task is marked complete.
+    """
 
-    def __init__(self, robots_checker: RobotsChecker):
+    def __init__(self, robots_checker: RobotsChecker, burst: float = 1.0):
         self.robots_checker = robots_checker
-        self.domain_queues: Dict[str, List[Dict]] = defaultdict(list)
+        self.burst = burst
+        self.domain_queues: Dict[str, Deque[Dict]] = defaultdict(deque)
         self.processing_domains: Set[str] = set()
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.total_tasks = 0
+        # (ready_at, sequence, domain); entries whose sequence no longer
+        # matches _scheduled[domain] are stale and skipped when popped
+        self._heap: List[Tuple[float, int, str]] = []
+        self._scheduled: Dict[str, int] = {}
+        self._sequence = 0
         self._lock = asyncio.Lock()
 
+    def _schedule(self, domain: str, ready_at: float):
+        self._sequence += 1
+        self._scheduled[domain] = self._sequence
+        heapq.heappush(self._heap, (ready_at, self._sequence, domain))
+
+    def _ready_at(self, domain: str, now: float) -> float:
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            return now
+        # Pick up delay changes (errors, rate limits) since the last dispatch
+        delay = self.robots_checker.get_cached_crawl_delay(domain)
+        if delay is not None:
+            bucket.set_delay(delay, now)
+        return bucket.ready_at(now)
+
     def add_task(self, url: str, task_data: Dict):
         """Add a scraping task to the appropriate domain queue"""
         parsed = urlparse(url)
@@ -370,46 +466,71 @@ class SmartScheduler:
         }
 
         self.domain_queues[domain].append(task)
+        self.total_tasks += 1
+
+        if domain not in self.processing_domains and domain not in self._scheduled:
+            self._schedule(domain, self._ready_at(domain, time.monotonic()))
 
     async def get_next_task(self) -> Optional[Dict]:
         """Get the next task to process, respecting rate limits"""
         async with self._lock:
-            # Find domains that are ready to be scraped
-            available_domains = []
-            current_time = time.time()
+            while self._heap and self._heap[0][0] <= time.monotonic():
+                _, sequence, domain = heapq.heappop(self._heap)
+                if self._scheduled.get(domain) != sequence:
+                    continue
+                del self._scheduled[domain]
 
-            for domain, queue in self.domain_queues.items():
-                if not queue or domain in self.processing_domains:
+                queue = self.domain_queues.get(domain)
+                if not queue:
                     continue
 
-                # Check if enough time has passed since last request
-                stats = self.robots_checker.domain_stats[domain]
+                # May fetch robots.txt the first time a domain is seen
                 delay = await self.robots_checker.get_crawl_delay(queue[0]["url"])
+                now = time.monotonic()
+                bucket = self.buckets.get(domain)
+                if bucket is None:
+                    bucket = self.buckets[domain] = TokenBucket(
+                        delay=delay, capacity=self.burst, tokens=self.burst, updated_at=now
+                    )
+                else:
+                    bucket.set_delay(delay, now)
+
+                ready_at = bucket.ready_at(now)
+                if ready_at > now:
+                    # The adaptive delay grew while the domain waited in the heap
+                    self._schedule(domain, ready_at)
+                    continue
 
-                if current_time - stats.last_request_time >= delay:
-                    available_domains.append((domain, delay))
-
-            if not available_domains:
-                return None
-
-            # Sort by priority (shortest delay first, then by queue size)
-            available_domains.sort(key=lambda x: (x[1], -len(self.domain_queues[x[0]])))
+                bucket.take(now)
+                self.processing_domains.add(domain)
+                task = queue.popleft()
+                self.total_tasks -= 1
+                if not queue:
+                    del self.domain_queues[domain]
+                return task
 
-            # Get task from highest priority domain
-            domain = available_domains[0][0]
-            self.processing_domains.add(domain)
+            return None
 
-            return self.domain_queues[domain].pop(0)
+    def time_until_next_task(self) -> Optional[float]:
+        """Seconds until a queued domain may be ready, or None when nothing is scheduled"""
+        while self._heap and self._scheduled.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
 
     def mark_task_complete(self, domain: str):
         """Mark a domain as no longer processing"""
         self.processing_domains.discard(domain)
+        if self.domain_queues.get(domain) and domain not in self._scheduled:
+            self._schedule(domain, self._ready_at(domain, time.monotonic()))
 
     def get_queue_stats(self) -> Dict:
         """Get statistics about the task queues"""
         return {
-            "total_tasks": sum(len(q) for q in self.domain_queues.values()),
+            "total_tasks": self.total_tasks,
             "domains_queued": len(self.domain_queues),
             "domains_processing": len(self.processing_domains),
+            "domains_scheduled": len(self._scheduled),
             "queue_by_domain": {d: len(q) for d, q in self.domain_queues.items()}
-        }
\ No newline at end of file
+        }
@@ -5,6 +5,7 @@ Enhanced with circuit breakers, proper async patterns, and comprehensive observa
 
 import asyncio
 import logging
+import os
 import time
 import uuid
 from typing import List, Dict, Any, Optional, Callable
@@ -49,9 +50,23 @@ class CircuitBreakerConfig:
     recovery_timeout: float = 30.0
     expected_exception: tuple = (Exception,)
     fallback_function: Optional[Callable] = None
+    # Politeness towards the protected domain: minimum seconds between call
+    # starts and maximum calls in flight at once
+    min_interval: float = 0.0
+    max_concurrency: int = 1
+
+class CircuitBreakerOpenError(Exception):
+    """Raised when a call is blocked because the circuit is open."""
+    pass
 
 class AsyncCircuitBreaker:
-    def __init__(self, name: str, config: CircuitBreakerConfig):
+    def __init__(
+        self,
+        name: str,
+        config: CircuitBreakerConfig,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = asyncio.sleep
+    ):
         self.name = name
         self.config = config
         self.state = CircuitState.CLOSED
@@ -59,6 +74,28 @@ class AsyncCircuitBreaker:
         self.last_failure_time = 0
         self.success_count = 0
         self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(config.max_concurrency)
+        self._pacing = asyncio.Lock()
+        self._last_start: Optional[float] = None
+        self._clock = clock
+        self._sleep = sleep
+
+    def _blocked(self) -> bool:
+        """True while OPEN and still inside the recovery timeout."""
+        if self.state != CircuitState.OPEN:
+            return False
+        if time.time() - self.last_failure_time < self.config.recovery_timeout:
+            return True
+        self.state = CircuitState.HALF_OPEN
+        self.success_count = 0
+        logger.info("Circuit breaker transitioning to HALF_OPEN")
+        return False
+
+    async def _reject(self, *args, **kwargs) -> Any:
+        logger.warning("Circuit breaker OPEN, request blocked")
+        if self.config.fallback_function:
+            return await self.config.fallback_function(*args, **kwargs)
+        raise CircuitBreakerOpenError(f"Circuit breaker {self.name} is OPEN")
 
     async def call(self, func: Callable, *args, **kwargs) -> Any:
         correlation_id = str(uuid.uuid4())[:8]
@@ -70,16 +107,25 @@ class AsyncCircuitBreaker:
                 correlation_id=correlation_id
             )
 
-            if self.state == CircuitState.OPEN:
-                if time.time() - self.last_failure_time < self.config.recovery_timeout:
-                    logger.warning("Circuit breaker OPEN, request blocked")
-                    if self.config.fallback_function:
-                        return await self.config.fallback_function(*args, **kwargs)
-                    raise Exception(f"Circuit breaker {self.name} is OPEN")
-                else:
-                    self.state = CircuitState.HALF_OPEN
-                    self.success_count = 0
-                    logger.info("Circuit breaker transitioning to HALF_OPEN")
+            if self._blocked():
+                return await self._reject(*args, **kwargs)
+
+        async with self._slots:
+            # Space starts min_interval apart from the previous call's actual
+            # start, measured once a slot is held so calls queued behind a
+            # full domain do not burst out together when slots free up
+            async with self._pacing:
+                if self._last_start is not None:
+                    wait = self._last_start + self.config.min_interval - self._clock()
+                    if wait > 0:
+                        await self._sleep(wait)
+                # The circuit may have opened while this call was waiting
+                blocked = self._blocked()
+                if not blocked:
+                    self._last_start = self._clock()
+
+            if blocked:
+                return await self._reject(*args, **kwargs)
 
             try:
                 start_time = time.time()
@@ -91,7 +137,8 @@ class AsyncCircuitBreaker:
                     execution_time=f"{execution_time:.3f}s"
                 )
 
-                await self._on_success()
+                async with self._lock:
+                    await self._on_success()
                 return result
 
             except self.config.expected_exception as e:
@@ -101,7 +148,8 @@ class AsyncCircuitBreaker:
                     error=str(e),
                     execution_time=f"{execution_time:.3f}s"
                 )
-                await self._on_failure()
+                async with self._lock:
+                    await self._on_failure()
                 raise
 
     async def _on_success(self):
@@ -270,10 +318,14 @@ class TargetTrackSearcher2025:
     - Graceful error handling and fallbacks
     """
 
-    def __init__(self, session_factory=None):
+    def __init__(self, session_factory=None, concurrency: Optional[int] = None, track_timeout: float = 60.0):
         self.db_service = AsyncDatabaseService(session_factory) if session_factory else None
         self.timeout_manager = TimeoutManager(default_timeout=15.0)
 
+        # Target tracks searched in parallel; each platform still paces itself
+        self.concurrency = concurrency or int(os.getenv("TARGET_SEARCH_CONCURRENCY", "8"))
+        self.track_timeout = track_timeout
+
         # HTTP client with circuit breaker protection
         self.http_client = httpx.AsyncClient(
             timeout=httpx.Timeout(10.0, connect=5.0),
@@ -288,6 +340,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=2.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -296,6 +349,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -304,6 +358,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=0.5,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -313,6 +368,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -321,6 +377,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -329,6 +386,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -337,6 +395,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -345,6 +404,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -353,6 +413,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -361,6 +422,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=2,
                     recovery_timeout=30.0,
+                    min_interval=1.0,
                     expected_exception=(httpx.RequestError, httpx.HTTPStatusError, asyncio.TimeoutError)
                 )
             ),
@@ -370,6 +432,7 @@ class TargetTrackSearcher2025:
                 CircuitBreakerConfig(
                     failure_threshold=3,
                     recovery_timeout=60.0,
+                    max_concurrency=4,
                     expected_exception=(Exception,)
                 )
             )
@@ -398,13 +461,18 @@ class TargetTrackSearcher2025:
             }
         }
 
-    async def search_for_target_tracks(self, target_tracks: List[Dict]) -> Dict[str, List[str]]:
+    async def search_for_target_tracks(
+        self,
+        target_tracks: List[Dict],
+        checkpoint: Optional["SearchCheckpoint"] = None
+    ) -> Dict[str, List[str]]:
         """
         Main search function with 2025 best practices:
-        - Comprehensive error handling
-        - Circuit breaker protection
+        - Bounded concurrency across target tracks
+        - Per-domain politeness enforced by each platform's circuit breaker
         - Structured logging
         - Graceful degradation
+        - Resumable: tracks already recorded in `checkpoint` are not searched again
         """
         correlation_id = str(uuid.uuid4())[:8]
 
@@ -414,13 +482,23 @@ class TargetTrackSearcher2025:
             correlation_id=correlation_id
         )
 
-        logger.info("Starting target track search pipeline")
-        results = {}
+        results = checkpoint.load() if checkpoint else {}
+        pending = [
+            (i, track) for i, track in enumerate(target_tracks)
+            if f"{track['artist']} - {track['title']}" not in results
+        ]
+
+        logger.info(
+            "Starting target track search pipeline",
+            resumed_tracks=len(target_tracks) - len(pending),
+            concurrency=self.concurrency
+        )
 
-        async with self.timeout_manager.timeout(300.0, "complete_search_pipeline"):  # 5 minute total timeout
-            for i, track in enumerate(target_tracks):
-                track_key = f"{track['artist']} - {track['title']}"
+        semaphore = asyncio.Semaphore(self.concurrency)
 
+        async def search_one(i: int, track: Dict):
+            track_key = f"{track['artist']} - {track['title']}"
+            async with semaphore:
                 structlog.contextvars.bind_contextvars(
                     track_index=i + 1,
                     track_key=track_key,
@@ -430,10 +508,9 @@ class TargetTrackSearcher2025:
                 logger.info("Processing track")
 
                 try:
-                    # Search with timeout per track
-                    async with self.timeout_manager.timeout(30.0, f"search_track_{i}"):
+                    # Search with timeout per track; includes waiting for each domain's turn
+                    async with self.timeout_manager.timeout(self.track_timeout, f"search_track_{i}"):
                         playlist_urls = await self._search_track_across_platforms(track)
-                        results[track_key] = playlist_urls
 
                         # Update database with circuit breaker protection
                         if self.db_service:
@@ -452,11 +529,18 @@ class TargetTrackSearcher2025:
                         error=str(e),
                         track_key=track_key
                     )
-                    # Continue with next track instead of failing entire operation
+                    # Continue with other tracks instead of failing entire operation
                     results[track_key] = []
+                    return
 
-                # Rate limiting between tracks
-                await asyncio.sleep(1.0)
+                results[track_key] = playlist_urls
+                if checkpoint:
+                    checkpoint.save(track_key, playlist_urls)
+
+        async with self.timeout_manager.timeout(300.0, "complete_search_pipeline"):  # 5 minute total timeout
+            # Rate limiting happens per domain inside the circuit breakers, so
+            # wall-clock time follows the slowest domain rather than the track count
+            await asyncio.gather(*(search_one(i, track) for i, track in pending))
 
         logger.info(
             "Target track search pipeline completed",
@@ -1151,6 +1235,49 @@ class TargetTrackSearcher2025:
         logger.info("Graceful shutdown completed")
 
 
+# Resumable search runs
+class SearchCheckpoint:
+    """
+    Per-track search results of an unfinished pipeline run, kept in a Redis hash.
+
+    A run that is interrupted (timeout, restart) leaves its completed tracks
+    here; the next run reuses them instead of searching those tracks again,
+    and clears the checkpoint once their scraping tasks are queued.
+    """
+
+    def __init__(self, redis_client, key: str = "target_search:checkpoint", ttl: int = 86400):
+        self.redis = redis_client
+        self.key = key
+        self.ttl = ttl
+
+    def load(self) -> Dict[str, List[str]]:
+        try:
+            stored = self.redis.hgetall(self.key) or {}
+        except Exception as e:
+            logger.warning("Failed to load search checkpoint", error=str(e))
+            return {}
+        return {
+            (k.decode() if isinstance(k, bytes) else k): json.loads(v)
+            for k, v in stored.items()
+        }
+
+    def save(self, track_key: str, urls: List[str]):
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(self.key, track_key, json.dumps(urls))
+            pipe.expire(self.key, self.ttl)
+            pipe.execute()
+        except Exception as e:
+            # Losing a checkpoint entry only means the track is searched again
+            logger.warning("Failed to save search checkpoint", track_key=track_key, error=str(e))
+
+    def clear(self):
+        try:
+            self.redis.delete(self.key)
+        except Exception as e:
+            logger.warning("Failed to clear search checkpoint", error=str(e))
+
+
 # 2025 Best Practices: Enhanced Search Orchestrator
 class SearchOrchestrator2025:
     """
@@ -1167,6 +1294,7 @@ class SearchOrchestrator2025:
         self.queue = message_queue
         self.searcher = TargetTrackSearcher2025(session_factory)
         self.db_service = AsyncDatabaseService(session_factory)
+        self.checkpoint = SearchCheckpoint(redis_client) if redis_client else None
         self.timeout_manager = TimeoutManager(default_timeout=60.0)
 
     async def execute_search_pipeline(
@@ -1217,12 +1345,14 @@ class SearchOrchestrator2025:
                     limit=limit
                 )
 
-                if not target_tracks:
+                if not target_tracks and not (self.checkpoint and self.checkpoint.load()):
                     logger.info("No active target tracks found, pipeline complete")
                     return
 
-                # Step 2: Search for playlists
-                search_results = await self.searcher.search_for_target_tracks(target_tracks)
+                # Step 2: Search for playlists, resuming an interrupted run if any
+                search_results = await self.searcher.search_for_target_tracks(
+                    target_tracks, checkpoint=self.checkpoint
+                )
 
                 # Step 3: Create scraping tasks
                 scraping_tasks = await self.searcher.create_scraping_tasks(search_results)
@@ -1233,6 +1363,10 @@ class SearchOrchestrator2025:
                 # Step 5: Update statistics
                 await self.update_target_statistics(search_results)
 
+                # Everything found so far is queued; the next run starts fresh
+                if self.checkpoint:
+                    self.checkpoint.clear()
+
                 logger.info(
                     "Enhanced search pipeline completed successfully",
                     target_tracks_processed=len(target_tracks),
@@ -0,0 +1,175 @@
+"""Unit tests for the worker-pool Redis queue consumer"""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from redis_queue_consumer import FAILED_QUEUE_KEY, QUEUE_KEY, STATS_KEY, RedisQueueConsumer
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+        return queue
+
+    async def execute(self):
+        self.redis.pipelines += 1
+        return [await getattr(self.redis, name)(*args) for name, args in self.calls]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeAsyncRedis:
+    """In-memory lists and hashes with a BRPOP that honours its timeout"""
+
+    def __init__(self):
+        self.lists = {}
+        self.hashes = {}
+        self.pipelines = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def brpop(self, key, timeout=0):
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.lists.get(key):
+                return key, self.lists[key].pop()
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(0.005)
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+
+    async def aclose(self):
+        pass
+
+
+class FakeScraper:
+    """Scraper endpoint that takes `delay` seconds and records concurrency"""
+
+    def __init__(self, delay=0.05, responses=None):
+        self.delay = delay
+        self.responses = list(responses or [])
+        self.running = 0
+        self.max_running = 0
+        self.urls = []
+
+    async def __call__(self, request):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        self.urls.append(json.loads(request.content)["url"])
+        if self.responses:
+            return self.responses.pop(0)
+        return httpx.Response(200, json={"tracks_count": 12})
+
+
+def _consumer(redis, scraper, **kwargs):
+    consumer = RedisQueueConsumer(redis_client=redis, pop_timeout=0.2, **kwargs)
+    consumer.http_client = httpx.AsyncClient(transport=httpx.MockTransport(scraper))
+    return consumer
+
+
+def _enqueue(redis, count):
+    for n in range(count):
+        redis.lists.setdefault(QUEUE_KEY, []).insert(
+            0, json.dumps({"url": f"https://example.com/tracklist/{n}", "scraper": "unified-scraper"})
+        )
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_queue_concurrently_with_pipelined_stats():
+    redis, scraper = FakeAsyncRedis(), FakeScraper(delay=0.05)
+    _enqueue(redis, 20)
+    consumer = _consumer(redis, scraper, concurrency=4)
+
+    started = time.monotonic()
+    runner = asyncio.create_task(consumer.consume_queue())
+    await _wait_for(lambda: consumer.tasks_processed == 20)
+    elapsed = time.monotonic() - started
+    await consumer.shutdown()
+    await runner
+
+    # 20 tasks x 50ms over 4 workers, with no fixed per-task sleep
+    assert elapsed < 0.6
+    assert scraper.max_running == 4
+    assert scraper.urls[:4] == [f"https://example.com/tracklist/{n}" for n in range(4)]
+    assert redis.hashes[STATS_KEY] == {"unified-scraper:success": 20}
+    assert redis.pipelines == 1
+
+
+@pytest.mark.asyncio
+async def test_saturated_scraper_pauses_consumer_and_keeps_task():
+    redis = FakeAsyncRedis()
+    scraper = FakeScraper(delay=0.0, responses=[httpx.Response(429, headers={"Retry-After": "0.3"})])
+    _enqueue(redis, 1)
+    consumer = _consumer(redis, scraper, concurrency=2)
+
+    started = time.monotonic()
+    runner = asyncio.create_task(consumer.consume_queue())
+    await _wait_for(lambda: consumer.tasks_processed == 1)
+    elapsed = time.monotonic() - started
+    await consumer.shutdown()
+    await runner
+
+    assert elapsed >= 0.3
+    assert len(scraper.urls) == 2
+    assert consumer.tasks_failed == 0
+    assert not redis.lists.get(FAILED_QUEUE_KEY)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_finishes_in_flight_tasks_and_requeues_after_drain_timeout():
+    redis, scraper = FakeAsyncRedis(), FakeScraper(delay=0.2)
+    _enqueue(redis, 1)
+    consumer = _consumer(redis, scraper, concurrency=2)
+    runner = asyncio.create_task(consumer.consume_queue())
+    await _wait_for(lambda: scraper.running == 1)
+
+    await consumer.shutdown()
+    await runner
+    assert consumer.tasks_processed == 1 and not redis.lists[QUEUE_KEY]
+
+    slow = FakeScraper(delay=10.0)
+    _enqueue(redis, 1)
+    consumer = _consumer(redis, slow, concurrency=1, drain_timeout=0.1)
+    runner = asyncio.create_task(consumer.consume_queue())
+    await _wait_for(lambda: slow.running == 1)
+
+    await consumer.shutdown()
+    await runner
+    assert consumer.tasks_processed == 0
+    assert len(redis.lists[QUEUE_KEY]) == 1
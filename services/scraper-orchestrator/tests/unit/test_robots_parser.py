@@ -0,0 +1,87 @@
+"""Unit tests for robots.txt caching and the heap-based SmartScheduler"""
+import asyncio
+
+import pytest
+
+from robots_parser import RobotRules, RobotsChecker, SmartScheduler
+
+
+class FakeRobotsChecker(RobotsChecker):
+    """Counts robots.txt fetches; domains in `unreachable` fail"""
+
+    def __init__(self, crawl_delay=2.0, unreachable=()):
+        super().__init__()
+        self.crawl_delay = crawl_delay
+        self.unreachable = set(unreachable)
+        self.fetches = []
+
+    async def fetch_robots_txt(self, domain):
+        self.fetches.append(domain)
+        await asyncio.sleep(0.01)
+        if domain in self.unreachable:
+            return None
+        return RobotRules(crawl_delay=self.crawl_delay, disallowed_paths={"/private"})
+
+
+@pytest.fixture
+async def checker():
+    checker = FakeRobotsChecker()
+    yield checker
+    await checker.close()
+
+
+@pytest.mark.asyncio
+async def test_robots_rules_are_fetched_once_per_ttl(checker):
+    checker.unreachable.add("down.example")
+
+    allowed = await asyncio.gather(*(checker.is_allowed("https://a.example/tracklist/1") for _ in range(5)))
+    assert allowed == [True] * 5
+    assert not await checker.is_allowed("https://a.example/private/x")
+    assert not await checker.is_allowed("https://down.example/x")
+    assert not await checker.is_allowed("https://down.example/y")
+
+    # Concurrent lookups share one fetch; failures are cached briefly too
+    assert checker.fetches == ["a.example", "down.example"]
+
+    checker._cache_expires["a.example"] = 0
+    await checker.get_rules("https://a.example/")
+    assert checker.fetches.count("a.example") == 2
+    assert checker.get_cache_stats()["unreachable_domains"] == 1
+
+
+@pytest.mark.asyncio
+async def test_next_task_waits_for_each_domain_token(checker):
+    scheduler = SmartScheduler(checker)
+    for n in range(3):
+        scheduler.add_task(f"https://a.example/tracklist/{n}", {"n": n})
+    scheduler.add_task("https://b.example/tracklist/0", {"n": 0})
+
+    first = await scheduler.get_next_task()
+    second = await scheduler.get_next_task()
+    assert {first["domain"], second["domain"]} == {"a.example", "b.example"}
+
+    # a.example is still processing, b.example has nothing queued
+    assert await scheduler.get_next_task() is None
+
+    scheduler.mark_task_complete("a.example")
+    assert await scheduler.get_next_task() is None
+    assert scheduler.time_until_next_task() == pytest.approx(2.0, abs=0.1)
+    assert scheduler.get_queue_stats()["total_tasks"] == 2
+    assert scheduler.get_queue_stats()["queue_by_domain"] == {"a.example": 2}
+
+
+@pytest.mark.asyncio
+async def test_burst_and_adaptive_delay(checker):
+    scheduler = SmartScheduler(checker, burst=2.0)
+    for n in range(3):
+        scheduler.add_task(f"https://a.example/tracklist/{n}", {"n": n})
+
+    assert (await scheduler.get_next_task())["data"] == {"n": 0}
+    scheduler.mark_task_complete("a.example")
+    assert (await scheduler.get_next_task())["data"] == {"n": 1}
+
+    # A rate-limit hit raises the adaptive delay for the next token
+    checker.update_domain_stats("https://a.example/", 1.0, is_error=True, is_rate_limit=True)
+    scheduler.mark_task_complete("a.example")
+    assert await scheduler.get_next_task() is None
+    assert scheduler.time_until_next_task() > 5.0
@@ -0,0 +1,154 @@
+"""Unit tests for concurrent, per-domain-throttled target track search"""
+import asyncio
+
+import pytest
+
+from target_track_searcher import (
+    AsyncCircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerOpenError,
+    SearchCheckpoint,
+    TargetTrackSearcher2025,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def hset(self, key, field, value):
+        self.ops.append((key, field, value))
+
+    def expire(self, key, ttl):
+        pass
+
+    def execute(self):
+        for key, field, value in self.ops:
+            self.redis.hashes.setdefault(key, {})[field.encode()] = value.encode()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+def _targets(n):
+    return [{"artist": "Eric Prydz", "title": f"Track {i}"} for i in range(n)]
+
+
+class FakeClock:
+    """Virtual monotonic clock; sleeping advances it instead of waiting"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def _breaker(name, clock, **config):
+    return AsyncCircuitBreaker(name, CircuitBreakerConfig(**config), clock=clock, sleep=clock.sleep)
+
+
+@pytest.fixture
+async def searcher():
+    searcher = TargetTrackSearcher2025(concurrency=16)
+    clocks = {"slow": FakeClock(), "fast": FakeClock()}
+    calls = {"slow": [], "fast": []}
+
+    async def search(domain, track):
+        calls[domain].append((clocks[domain](), track["title"]))
+        await asyncio.sleep(0)
+        return [f"https://{domain}.example/tracklist/{track['title']}"]
+
+    searcher._search_slow = lambda track: search("slow", track)
+    searcher._search_fast = lambda track: search("fast", track)
+    searcher.circuit_breakers = {
+        "slow": _breaker("slow", clocks["slow"], min_interval=0.05),
+        "fast": _breaker("fast", clocks["fast"], min_interval=0.01),
+    }
+    searcher.calls = calls
+    searcher.clocks = clocks
+    yield searcher
+    await searcher.close()
+
+
+@pytest.mark.asyncio
+async def test_wall_clock_follows_slowest_domain_rate(searcher):
+    results = await searcher.search_for_target_tracks(_targets(10))
+
+    # 10 targets at one call per 50ms on the slow domain, not 10 x (search + 1s)
+    assert searcher.clocks["slow"]() == pytest.approx(0.45)
+    assert all(len(urls) == 2 for urls in results.values())
+
+    for domain, interval in (("slow", 0.05), ("fast", 0.01)):
+        starts = [t for t, _ in searcher.calls[domain]]
+        assert [b - a for a, b in zip(starts, starts[1:])] == pytest.approx([interval] * 9)
+
+
+@pytest.mark.asyncio
+async def test_calls_queued_for_a_slot_keep_their_spacing():
+    clock = FakeClock()
+    breaker = _breaker("busy", clock, min_interval=0.05, max_concurrency=1)
+    release = asyncio.Event()
+    starts = []
+
+    async def fetch():
+        starts.append(clock())
+        await release.wait()
+
+    calls = [asyncio.create_task(breaker.call(fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    # The first call holds the only slot for a long time
+    clock.now += 1.0
+    release.set()
+    await asyncio.gather(*calls)
+
+    assert starts == pytest.approx([0.0, 1.0, 1.05])
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_checkpoint(searcher):
+    redis = FakeRedis()
+    checkpoint = SearchCheckpoint(redis)
+    for track in _targets(3):
+        checkpoint.save(f"{track['artist']} - {track['title']}", ["https://example/tracklist/earlier"])
+
+    results = await searcher.search_for_target_tracks(_targets(5), checkpoint=checkpoint)
+
+    assert sorted(title for _, title in searcher.calls["slow"]) == ["Track 3", "Track 4"]
+    assert results["Eric Prydz - Track 0"] == ["https://example/tracklist/earlier"]
+    assert len(checkpoint.load()) == 5
+
+    checkpoint.clear()
+    assert checkpoint.load() == {}
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_rejects_without_waiting_for_a_slot():
+    clock = FakeClock()
+    breaker = _breaker("flaky", clock, failure_threshold=1, min_interval=10.0)
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await breaker.call(fail)
+
+    with pytest.raises(CircuitBreakerOpenError):
+        await breaker.call(fail)
+    assert clock() == 0.0
@@ -7,6 +7,8 @@ Usage:
     python batch_import.py --music-dir /path/to/music --limit 100
     python batch_import.py --music-dir /path/to/music --dry-run
     python batch_import.py --serato-dir ~/Music/_Serato_
+    python batch_import.py --music-dir /path/to/music --workers 8 --chunk-size 1000
+    python batch_import.py --music-dir /path/to/music --rescan
 
 Features:
 - Scans directory recursively for audio files with Serato tags
@@ -15,19 +17,27 @@ Features:
 - Matches files to existing tracks by artist/title or creates new tracks
 - Provides progress tracking and error reporting
 - Supports dry-run mode for testing
+- Persistent scan index (path, size, mtime) so unchanged files are skipped
+- Parses tags in a process pool; each file is parsed exactly once
+- Matches and writes tracks in chunks instead of one round trip chain per file
 """
 
 import asyncio
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import structlog
 from tqdm import tqdm
 
 import asyncpg
 from serato_parser import SeratoFileParser, SeratoTrackMetadata
+from scan_index import ScanIndex
+from track_matcher import SeratoTrackMatcher
 
 # Configure logging
 structlog.configure(
@@ -50,16 +60,140 @@ logger = structlog.get_logger(__name__)
 # Supported audio file extensions
 AUDIO_EXTENSIONS = {'.mp3', '.flac', '.aac', '.m4a', '.wav', '.aiff', '.ogg', '.wma'}
 
+# Files handed to a parser worker per task (amortises process pool IPC)
+PARSE_BATCH_SIZE = 64
+
+# Files matched and written to the database per chunk
+DEFAULT_CHUNK_SIZE = 500
+
+DEFAULT_INDEX_PATH = os.getenv('SERATO_SCAN_INDEX', 'serato_scan_index.db')
+
+UPDATE_TRACK_SQL = """
+    UPDATE tracks
+    SET
+        serato_bpm = $2,
+        serato_key = $3,
+        serato_key_text = $4,
+        serato_auto_gain = $5,
+        serato_beatgrid = $6,
+        serato_cues = $7,
+        serato_loops = $8,
+        serato_analyzed_at = $9,
+        file_path = $10,
+        duration_ms = COALESCE(duration_ms, $11)
+    WHERE track_id = $1
+"""
+
+INSERT_TRACK_SQL = """
+    INSERT INTO tracks (
+        artist_name,
+        track_name,
+        file_path,
+        duration_ms,
+        serato_bpm,
+        serato_key,
+        serato_key_text,
+        serato_auto_gain,
+        serato_beatgrid,
+        serato_cues,
+        serato_loops,
+        serato_analyzed_at,
+        created_at
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, CURRENT_TIMESTAMP
+    )
+    RETURNING track_id
+"""
+
+
+@dataclass
+class ScannedFile:
+    """Audio file found during a scan, with its file state and parsed metadata"""
+    path: str
+    size: int
+    mtime_ns: int
+    metadata: Optional[SeratoTrackMetadata] = None
+
+
+def _update_args(track_id: str, metadata: SeratoTrackMetadata) -> tuple:
+    return (
+        track_id,
+        metadata.bpm,
+        metadata.key,
+        metadata.key_text,
+        metadata.auto_gain,
+        metadata.beatgrid,
+        metadata.cue_points,
+        metadata.loops,
+        metadata.analyzed_at,
+        metadata.file_path,
+        metadata.duration_ms
+    )
+
+
+def _insert_args(metadata: SeratoTrackMetadata) -> tuple:
+    return (
+        metadata.artist_name,
+        metadata.track_name,
+        metadata.file_path,
+        metadata.duration_ms,
+        metadata.bpm,
+        metadata.key,
+        metadata.key_text,
+        metadata.auto_gain,
+        metadata.beatgrid,
+        metadata.cue_points,
+        metadata.loops,
+        metadata.analyzed_at
+    )
+
+
+# One parser per worker process, created on first use
+_worker_parser: Optional[SeratoFileParser] = None
+
+
+def _parse_files(paths: List[str]) -> List[Tuple[str, Optional[SeratoTrackMetadata], Optional[str]]]:
+    """
+    Parse a batch of audio files inside a process pool worker
+
+    Returns:
+        (path, metadata, error) tuples; metadata is None when the file has no Serato data
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = SeratoFileParser()
+
+    results = []
+    for path in paths:
+        try:
+            results.append((path, _worker_parser.extract_metadata(Path(path)), None))
+        except Exception as e:
+            results.append((path, None, str(e)))
+    return results
+
 
 class SeratoBatchImporter:
     """Batch importer for Serato metadata from audio files"""
 
-    def __init__(self, db_pool: asyncpg.Pool, dry_run: bool = False):
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        dry_run: bool = False,
+        scan_index: Optional[ScanIndex] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rescan: bool = False
+    ):
         self.db_pool = db_pool
         self.dry_run = dry_run
-        self.parser = SeratoFileParser()
+        self.scan_index = scan_index
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.rescan = rescan
+        self.matcher = SeratoTrackMatcher(db_pool)
         self.stats = {
             'files_scanned': 0,
+            'files_unchanged': 0,
             'files_with_serato': 0,
             'tracks_updated': 0,
             'tracks_created': 0,
@@ -67,280 +201,226 @@ class SeratoBatchImporter:
             'skipped': 0
         }
 
-    async def scan_directory(self, music_dir: Path, limit: Optional[int] = None) -> List[Path]:
+    def discover_audio_files(self, music_dir: Path) -> List[ScannedFile]:
+        """
+        Walk the music directory once and stat every audio file
+
+        Args:
+            music_dir: Root directory to scan
+
+        Returns:
+            ScannedFile entries (without metadata) for every audio file
+        """
+        found = []
+        stack = [str(music_dir)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS:
+                            st = entry.stat()
+                            found.append(ScannedFile(entry.path, st.st_size, st.st_mtime_ns))
+            except OSError as e:
+                logger.warning("Failed to read directory", path=current, error=str(e))
+                self.stats['errors'] += 1
+        return found
+
+    def _record_in_index(self, files: List[ScannedFile], track_ids: Optional[Dict[str, str]] = None):
+        """Remember files as imported so unchanged files are skipped next run"""
+        if self.dry_run or self.scan_index is None or not files:
+            return
+        track_ids = track_ids or {}
+        self.scan_index.record_many(
+            (f.path, f.size, f.mtime_ns, f.metadata is not None, track_ids.get(f.path))
+            for f in files
+        )
+
+    async def scan_directory(self, music_dir: Path, limit: Optional[int] = None) -> List[ScannedFile]:
         """
         Recursively scan directory for audio files with Serato data
 
+        Files whose size and mtime match the scan index are skipped without
+        being opened. The rest are parsed in a process pool, once; the parsed
+        metadata is carried through to the import step. Files without Serato
+        data and files that fail to parse are indexed straight away.
+
         Args:
             music_dir: Root directory to scan
             limit: Maximum number of files to process (None = unlimited)
 
         Returns:
-            List of audio file paths that have Serato metadata
+            ScannedFile entries that have Serato metadata
         """
         logger.info(f"Scanning directory for audio files", path=str(music_dir))
 
-        audio_files = []
-        for ext in AUDIO_EXTENSIONS:
-            audio_files.extend(music_dir.rglob(f"*{ext}"))
-
+        audio_files = self.discover_audio_files(music_dir)
         logger.info(f"Found {len(audio_files)} audio files", total=len(audio_files))
 
-        # Quick scan to find files with Serato data
-        serato_files = []
-        for file_path in tqdm(audio_files, desc="Scanning for Serato data", unit="files"):
-            if limit and len(serato_files) >= limit:
-                break
+        if self.scan_index is not None and not self.rescan:
+            changed = [
+                f for f in audio_files
+                if not self.scan_index.is_unchanged(f.path, f.size, f.mtime_ns)
+            ]
+            self.stats['files_unchanged'] = len(audio_files) - len(changed)
+            logger.info(
+                "Skipping unchanged files from scan index",
+                unchanged=self.stats['files_unchanged'],
+                changed=len(changed)
+            )
+        else:
+            changed = audio_files
 
-            self.stats['files_scanned'] += 1
+        if not changed:
+            return []
 
-            try:
-                metadata = self.parser.extract_metadata(file_path)
-                if metadata and metadata.has_serato_data:
-                    serato_files.append(file_path)
-                    self.stats['files_with_serato'] += 1
-            except Exception as e:
-                logger.warning(f"Failed to scan file", file=str(file_path), error=str(e))
-                self.stats['errors'] += 1
+        by_path = {f.path: f for f in changed}
+        batches = [
+            [f.path for f in changed[i:i + PARSE_BATCH_SIZE]]
+            for i in range(0, len(changed), PARSE_BATCH_SIZE)
+        ]
+
+        serato_files: List[ScannedFile] = []
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [loop.run_in_executor(executor, _parse_files, batch) for batch in batches]
+
+        try:
+            with tqdm(total=len(changed), desc="Scanning for Serato data", unit="files") as progress:
+                for future in asyncio.as_completed(futures):
+                    results = await future
+                    not_imported = []
+
+                    for path, metadata, error in results:
+                        self.stats['files_scanned'] += 1
+                        scanned = by_path[path]
+                        if error:
+                            logger.warning(f"Failed to scan file", file=path, error=error)
+                            self.stats['errors'] += 1
+                            # Retried once the file changes, or with --rescan
+                            not_imported.append(scanned)
+                        elif metadata and metadata.has_serato_data:
+                            scanned.metadata = metadata
+                            serato_files.append(scanned)
+                            self.stats['files_with_serato'] += 1
+                        else:
+                            not_imported.append(scanned)
+
+                    self._record_in_index(not_imported)
+                    progress.update(len(results))
+
+                    if limit and len(serato_files) >= limit:
+                        break
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if limit:
+            serato_files = serato_files[:limit]
 
         logger.info(
             f"Found {len(serato_files)} files with Serato metadata",
             total=len(serato_files),
-            coverage_pct=round((len(serato_files) / len(audio_files) * 100), 2) if audio_files else 0
+            coverage_pct=round((len(serato_files) / self.stats['files_scanned'] * 100), 2) if self.stats['files_scanned'] else 0
         )
 
         return serato_files
 
-    async def find_matching_track(self, metadata: SeratoTrackMetadata) -> Optional[str]:
+    async def match_chunk(self, metadata_list: List[SeratoTrackMetadata]) -> List[Optional[str]]:
         """
-        Find matching track in database by artist/title
+        Find matching tracks for a chunk of Serato metadata
 
-        Args:
-            metadata: Serato track metadata
+        One exact-match join for the whole chunk, then one trigram query for
+        the leftovers (see SeratoTrackMatcher).
 
         Returns:
-            track_id if found, None otherwise
+            track_id (or None) for each metadata entry, in order
         """
-        if not metadata.artist_name or not metadata.track_name:
-            return None
-
-        async with self.db_pool.acquire() as conn:
-            # Try exact match first
-            result = await conn.fetchrow(
-                """
-                SELECT track_id
-                FROM tracks
-                WHERE LOWER(artist_name) = LOWER($1)
-                AND LOWER(track_name) = LOWER($2)
-                LIMIT 1
-                """,
-                metadata.artist_name,
-                metadata.track_name
-            )
-
-            if result:
-                return str(result['track_id'])
-
-            # Try fuzzy match using similarity (requires pg_trgm extension)
-            result = await conn.fetchrow(
-                """
-                SELECT track_id
-                FROM tracks
-                WHERE similarity(artist_name, $1) > 0.8
-                AND similarity(track_name, $2) > 0.8
-                ORDER BY
-                    similarity(artist_name, $1) + similarity(track_name, $2) DESC
-                LIMIT 1
-                """,
-                metadata.artist_name,
-                metadata.track_name
-            )
-
-            return str(result['track_id']) if result else None
+        return await self.matcher.match(metadata_list)
 
-    async def update_track_metadata(self, track_id: str, metadata: SeratoTrackMetadata) -> bool:
+    async def process_chunk(self, files: List[ScannedFile]) -> int:
         """
-        Update track with Serato metadata
+        Match and write a chunk of parsed files to the database
+
+        Matched tracks are updated and unmatched tracks are created with one
+        pipelined batch each, inside a single transaction. Every file of the
+        chunk ends up in the scan index: duplicates of a created track point
+        at it, and files without artist/title are indexed without a track.
 
         Args:
-            track_id: Track UUID
-            metadata: Serato track metadata
+            files: Scanned files with Serato metadata
 
         Returns:
-            True if successful, False otherwise
+            Number of files imported
         """
-        if self.dry_run:
-            logger.info(
-                "DRY RUN: Would update track",
-                track_id=track_id,
-                artist=metadata.artist_name,
-                title=metadata.track_name,
-                bpm=metadata.bpm,
-                key=metadata.key_text
-            )
-            return True
-
-        try:
-            async with self.db_pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    UPDATE tracks
-                    SET
-                        serato_bpm = $2,
-                        serato_key = $3,
-                        serato_key_text = $4,
-                        serato_auto_gain = $5,
-                        serato_beatgrid = $6,
-                        serato_cues = $7,
-                        serato_loops = $8,
-                        serato_analyzed_at = $9,
-                        file_path = $10,
-                        duration_ms = COALESCE(duration_ms, $11)
-                    WHERE track_id = $1
-                    """,
-                    track_id,
-                    metadata.bpm,
-                    metadata.key,
-                    metadata.key_text,
-                    metadata.auto_gain,
-                    metadata.beatgrid,
-                    metadata.cue_points,
-                    metadata.loops,
-                    metadata.analyzed_at,
-                    metadata.file_path,
-                    metadata.duration_ms
-                )
+        if not files:
+            return 0
 
-            logger.info(
-                "Updated track with Serato metadata",
-                track_id=track_id,
-                bpm=metadata.bpm,
-                key=metadata.key_text
-            )
-            self.stats['tracks_updated'] += 1
-            return True
-
-        except Exception as e:
-            logger.error(f"Failed to update track", track_id=track_id, error=str(e))
-            self.stats['errors'] += 1
-            return False
+        track_ids = await self.match_chunk([f.metadata for f in files])
 
-    async def create_track_from_metadata(self, metadata: SeratoTrackMetadata) -> Optional[str]:
-        """
-        Create new track from Serato metadata
+        updates: List[Tuple[ScannedFile, str]] = []
+        creates: Dict[Tuple[str, str], List[ScannedFile]] = {}
+        skipped: List[ScannedFile] = []
+        for scanned, track_id in zip(files, track_ids):
+            metadata = scanned.metadata
+            if track_id:
+                updates.append((scanned, track_id))
+            elif not metadata.artist_name or not metadata.track_name:
+                logger.warning("Cannot create track without artist/title", file=metadata.file_path)
+                self.stats['skipped'] += 1
+                skipped.append(scanned)
+            else:
+                # Several files of the same track in one chunk create it once
+                key = (metadata.artist_name.lower(), metadata.track_name.lower())
+                creates.setdefault(key, []).append(scanned)
 
-        Args:
-            metadata: Serato track metadata
+        # Unchanged files without artist/title would be skipped again next run
+        self._record_in_index(skipped)
 
-        Returns:
-            track_id if created, None otherwise
-        """
         if self.dry_run:
             logger.info(
-                "DRY RUN: Would create track",
-                artist=metadata.artist_name,
-                title=metadata.track_name,
-                bpm=metadata.bpm,
-                key=metadata.key_text
+                "DRY RUN: Would write chunk",
+                updates=len(updates),
+                creates=len(creates)
             )
-            return "dry-run-uuid"
-
-        if not metadata.artist_name or not metadata.track_name:
-            logger.warning("Cannot create track without artist/title", file=metadata.file_path)
-            self.stats['skipped'] += 1
-            return None
+            return len(updates) + len(creates)
 
+        groups = list(creates.values())
         try:
             async with self.db_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    """
-                    INSERT INTO tracks (
-                        artist_name,
-                        track_name,
-                        file_path,
-                        duration_ms,
-                        serato_bpm,
-                        serato_key,
-                        serato_key_text,
-                        serato_auto_gain,
-                        serato_beatgrid,
-                        serato_cues,
-                        serato_loops,
-                        serato_analyzed_at,
-                        created_at
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, CURRENT_TIMESTAMP
-                    )
-                    RETURNING track_id
-                    """,
-                    metadata.artist_name,
-                    metadata.track_name,
-                    metadata.file_path,
-                    metadata.duration_ms,
-                    metadata.bpm,
-                    metadata.key,
-                    metadata.key_text,
-                    metadata.auto_gain,
-                    metadata.beatgrid,
-                    metadata.cue_points,
-                    metadata.loops,
-                    metadata.analyzed_at
-                )
-
-            track_id = str(result['track_id'])
-            logger.info(
-                "Created new track from Serato metadata",
-                track_id=track_id,
-                artist=metadata.artist_name,
-                title=metadata.track_name
-            )
-            self.stats['tracks_created'] += 1
-            return track_id
-
+                async with conn.transaction():
+                    if updates:
+                        await conn.executemany(
+                            UPDATE_TRACK_SQL,
+                            [_update_args(track_id, f.metadata) for f, track_id in updates]
+                        )
+                    created = []
+                    if groups:
+                        # The last file of a group wins, as the last tag write would
+                        created = await conn.fetchmany(
+                            INSERT_TRACK_SQL,
+                            [_insert_args(group[-1].metadata) for group in groups]
+                        )
         except Exception as e:
-            logger.error(
-                f"Failed to create track",
-                artist=metadata.artist_name,
-                title=metadata.track_name,
-                error=str(e)
-            )
-            self.stats['errors'] += 1
-            return None
-
-    async def process_file(self, file_path: Path) -> bool:
-        """
-        Process a single audio file: extract Serato metadata and update database
-
-        Args:
-            file_path: Path to audio file
-
-        Returns:
-            True if processed successfully, False otherwise
-        """
-        try:
-            # Extract Serato metadata
-            metadata = self.parser.extract_metadata(file_path)
-
-            if not metadata or not metadata.has_serato_data:
-                logger.debug(f"No Serato data in file", file=str(file_path))
-                self.stats['skipped'] += 1
-                return False
-
-            # Try to find matching track
-            track_id = await self.find_matching_track(metadata)
-
-            if track_id:
-                # Update existing track
-                return await self.update_track_metadata(track_id, metadata)
-            else:
-                # Create new track
-                track_id = await self.create_track_from_metadata(metadata)
-                return track_id is not None
-
-        except Exception as e:
-            logger.error(f"Failed to process file", file=str(file_path), error=str(e))
-            self.stats['errors'] += 1
-            return False
+            logger.error(f"Failed to write chunk", files=len(files), error=str(e))
+            self.stats['errors'] += len(updates) + len(creates)
+            return 0
+
+        self.stats['tracks_updated'] += len(updates)
+        self.stats['tracks_created'] += len(creates)
+
+        imported = {f.path: track_id for f, track_id in updates}
+        for group, row in zip(groups, created):
+            for f in group:
+                imported[f.path] = str(row['track_id'])
+        self._record_in_index(
+            [f for f, _ in updates] + [f for group in groups for f in group],
+            imported
+        )
+        return len(updates) + len(creates)
 
     async def run(self, music_dir: Path, limit: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -358,25 +438,32 @@ class SeratoBatchImporter:
             "Starting Serato batch import",
             music_dir=str(music_dir),
             limit=limit,
-            dry_run=self.dry_run
+            dry_run=self.dry_run,
+            chunk_size=self.chunk_size,
+            index_entries=len(self.scan_index) if self.scan_index is not None else None
         )
 
-        # Scan for audio files with Serato data
+        # Scan (and parse, once) audio files with Serato data
         serato_files = await self.scan_directory(music_dir, limit)
 
         if not serato_files:
-            logger.warning("No files with Serato metadata found")
-            return self.stats
-
-        # Process each file
-        logger.info(f"Processing {len(serato_files)} files with Serato metadata")
-        for file_path in tqdm(serato_files, desc="Importing Serato metadata", unit="files"):
-            await self.process_file(file_path)
+            logger.warning("No new or changed files with Serato metadata found")
+        else:
+            # Process in chunks
+            logger.info(f"Processing {len(serato_files)} files with Serato metadata")
+            with tqdm(total=len(serato_files), desc="Importing Serato metadata", unit="files") as progress:
+                for i in range(0, len(serato_files), self.chunk_size):
+                    chunk = serato_files[i:i + self.chunk_size]
+                    await self.process_chunk(chunk)
+                    progress.update(len(chunk))
 
         # Calculate elapsed time
         elapsed = (datetime.now() - start_time).total_seconds()
         self.stats['elapsed_seconds'] = round(elapsed, 2)
-        self.stats['files_per_second'] = round(self.stats['files_scanned'] / elapsed, 2)
+        self.stats['files_per_second'] = round(
+            (self.stats['files_scanned'] + self.stats['files_unchanged']) / elapsed, 2
+        ) if elapsed > 0 else 0
+        self.stats.update(self.matcher.report.to_dict())
 
         # Log final statistics
         logger.info(
@@ -413,6 +500,33 @@ async def main():
         action='store_true',
         help='Scan files but do not update database'
     )
+    parser.add_argument(
+        '--index-path',
+        type=Path,
+        default=Path(DEFAULT_INDEX_PATH),
+        help=f'Persistent scan index location (default: {DEFAULT_INDEX_PATH})'
+    )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Do not read or write the scan index'
+    )
+    parser.add_argument(
+        '--rescan',
+        action='store_true',
+        help='Parse every file even if unchanged in the scan index (index is still updated)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Tag parsing worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Files matched and written per database chunk (default: {DEFAULT_CHUNK_SIZE})'
+    )
     parser.add_argument(
         '--db-host',
         default='localhost',
@@ -468,9 +582,18 @@ async def main():
         logger.error(f"Failed to connect to database: {e}")
         sys.exit(1)
 
+    scan_index = None if args.no_index else ScanIndex(args.index_path)
+
     try:
         # Create importer and run
-        importer = SeratoBatchImporter(db_pool, dry_run=args.dry_run)
+        importer = SeratoBatchImporter(
+            db_pool,
+            dry_run=args.dry_run,
+            scan_index=scan_index,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            rescan=args.rescan
+        )
         stats = await importer.run(args.music_dir, limit=args.limit)
 
         # Print summary
@@ -478,7 +601,11 @@ async def main():
         print("SERATO BATCH IMPORT SUMMARY")
         print("=" * 80)
         print(f"Files scanned:        {stats['files_scanned']}")
+        print(f"Files unchanged:      {stats['files_unchanged']}")
         print(f"Files with Serato:    {stats['files_with_serato']}")
+        print(f"Match rate:           {stats.get('match_rate_pct', 0)}% "
+              f"({stats.get('match_exact', 0)} exact in {stats.get('match_exact_seconds', 0)}s, "
+              f"{stats.get('match_fuzzy', 0)} fuzzy in {stats.get('match_fuzzy_seconds', 0)}s)")
         print(f"Tracks updated:       {stats['tracks_updated']}")
         print(f"Tracks created:       {stats['tracks_created']}")
         print(f"Errors:               {stats['errors']}")
@@ -491,6 +618,8 @@ async def main():
             print("\n⚠️  DRY RUN MODE - No database changes were made")
 
     finally:
+        if scan_index is not None:
+            scan_index.close()
         await db_pool.close()
 
 
@@ -0,0 +1,100 @@
+"""
+Serato Scan Index
+Persistent file-state index used by batch_import.py to skip unchanged files
+
+Each audio file is keyed by its path and remembered with the size and mtime it
+had when it was last imported. On the next run a file whose size and mtime are
+unchanged is skipped without opening it, so re-importing an unchanged library
+only costs one directory walk.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class ScanIndex:
+    """SQLite-backed path → (size, mtime) index of imported audio files"""
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.index_path))
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scanned_files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                has_serato INTEGER NOT NULL,
+                track_id TEXT,
+                indexed_at TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        # Whole index is held in memory: lookups happen once per file per scan
+        self._entries: Dict[str, Tuple[int, int]] = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self._conn.execute(
+                "SELECT path, size, mtime_ns FROM scanned_files"
+            )
+        }
+        logger.info("Loaded Serato scan index", path=str(self.index_path), entries=len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_unchanged(self, file_path: str, size: int, mtime_ns: int) -> bool:
+        """Return True if the file was indexed with the same size and mtime"""
+        return self._entries.get(file_path) == (size, mtime_ns)
+
+    def record_many(
+        self,
+        entries: Iterable[Tuple[str, int, int, bool, Optional[str]]]
+    ) -> int:
+        """
+        Record imported files
+
+        Args:
+            entries: (path, size, mtime_ns, has_serato, track_id) tuples
+
+        Returns:
+            Number of entries written
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (path, size, mtime_ns, int(has_serato), track_id, now)
+            for path, size, mtime_ns, has_serato, track_id in entries
+        ]
+        if not rows:
+            return 0
+
+        self._conn.executemany(
+            """
+            INSERT INTO scanned_files (path, size, mtime_ns, has_serato, track_id, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                size = excluded.size,
+                mtime_ns = excluded.mtime_ns,
+                has_serato = excluded.has_serato,
+                track_id = COALESCE(excluded.track_id, scanned_files.track_id),
+                indexed_at = excluded.indexed_at
+            """,
+            rows
+        )
+        self._conn.commit()
+
+        for path, size, mtime_ns, _, _, _ in rows:
+            self._entries[path] = (size, mtime_ns)
+        return len(rows)
+
+    def close(self):
+        """Close the underlying SQLite connection"""
+        self._conn.close()
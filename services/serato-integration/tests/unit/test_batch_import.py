@@ -0,0 +1,134 @@
+"""Unit tests for chunked matching and writing in SeratoBatchImporter"""
+from contextlib import asynccontextmanager
+
+import pytest
+
+from batch_import import INSERT_TRACK_SQL, UPDATE_TRACK_SQL, ScannedFile, SeratoBatchImporter
+from scan_index import ScanIndex
+from serato_parser import SeratoTrackMetadata
+
+
+class FakeConnection:
+    """Records executemany/fetchmany calls; inserts return sequential track ids"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def executemany(self, query, args):
+        self.calls.append((query, list(args)))
+
+    async def fetchmany(self, query, args):
+        if self.fail:
+            raise RuntimeError('insert failed')
+        args = list(args)
+        self.calls.append((query, args))
+        return [{'track_id': f'new-{n}'} for n in range(len(args))]
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def scanned(name, artist='Eric Prydz', title=None, size=1000):
+    path = f'/music/{name}.mp3'
+    metadata = SeratoTrackMetadata(
+        file_path=path, bpm=126.0, has_serato_data=True, artist_name=artist, track_name=title or name
+    )
+    return ScannedFile(path, size, 111, metadata)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ScanIndex(tmp_path / 'index.db')
+    yield index
+    index.close()
+
+
+def make_importer(index, matches, conn=None, dry_run=False):
+    importer = SeratoBatchImporter(FakePool(conn or FakeConnection()), dry_run=dry_run, scan_index=index)
+
+    async def match_chunk(metadata_list):
+        return [matches.get(m.track_name) for m in metadata_list]
+
+    importer.match_chunk = match_chunk
+    return importer
+
+
+def indexed_track_ids(index):
+    return dict(index._conn.execute("SELECT path, track_id FROM scanned_files"))
+
+
+@pytest.mark.asyncio
+async def test_matched_files_are_updated_and_the_rest_created(index):
+    conn = FakeConnection()
+    importer = make_importer(index, {'Opus': 't-opus'}, conn)
+
+    imported = await importer.process_chunk([scanned('Opus'), scanned('Pjanoo')])
+
+    assert imported == 2
+    [(update_sql, update_args), (insert_sql, insert_args)] = conn.calls
+    assert (update_sql, insert_sql) == (UPDATE_TRACK_SQL, INSERT_TRACK_SQL)
+    assert [args[0] for args in update_args] == ['t-opus']
+    assert [args[1] for args in insert_args] == ['Pjanoo']
+    assert indexed_track_ids(index) == {'/music/Opus.mp3': 't-opus', '/music/Pjanoo.mp3': 'new-0'}
+    assert (importer.stats['tracks_updated'], importer.stats['tracks_created']) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_files_without_artist_or_title_are_indexed_without_a_track(index):
+    importer = make_importer(index, {})
+
+    imported = await importer.process_chunk([scanned('Untitled', artist=None)])
+
+    assert imported == 0
+    assert importer.stats['skipped'] == 1
+    assert index.is_unchanged('/music/Untitled.mp3', 1000, 111)
+    assert indexed_track_ids(index) == {'/music/Untitled.mp3': None}
+
+
+@pytest.mark.asyncio
+async def test_duplicates_create_one_track_and_all_point_at_it(index):
+    conn = FakeConnection()
+    importer = make_importer(index, {}, conn)
+    files = [scanned('a', title='Opus'), scanned('b', title='OPUS', size=2000), scanned('c', title='Pjanoo')]
+
+    await importer.process_chunk(files)
+
+    [(_, insert_args)] = conn.calls
+    # The last file of a duplicate group is the one written
+    assert [args[2] for args in insert_args] == ['/music/b.mp3', '/music/c.mp3']
+    assert indexed_track_ids(index) == {
+        '/music/a.mp3': 'new-0',
+        '/music/b.mp3': 'new-0',
+        '/music/c.mp3': 'new-1',
+    }
+    assert importer.stats['tracks_created'] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_not_indexed(index):
+    importer = make_importer(index, {'Opus': 't-opus'}, FakeConnection(fail=True))
+
+    assert await importer.process_chunk([scanned('Opus'), scanned('Pjanoo')]) == 0
+    assert importer.stats['errors'] == 2
+    assert len(index) == 0
+
+
+@pytest.mark.asyncio
+async def test_dry_run_writes_nothing(index):
+    conn = FakeConnection()
+    importer = make_importer(index, {}, conn, dry_run=True)
+
+    assert await importer.process_chunk([scanned('Opus'), scanned('Untitled', artist=None)]) == 1
+    assert conn.calls == []
+    assert len(index) == 0
@@ -0,0 +1,30 @@
+"""Unit tests for the persistent path → (size, mtime) scan index"""
+from scan_index import ScanIndex
+
+
+def test_unchanged_file_is_a_hit_and_any_change_is_a_miss(tmp_path):
+    index = ScanIndex(tmp_path / 'index.db')
+    index.record_many([('/music/a.mp3', 1000, 111, True, 't1')])
+
+    assert index.is_unchanged('/music/a.mp3', 1000, 111)
+    assert not index.is_unchanged('/music/a.mp3', 1001, 111)
+    assert not index.is_unchanged('/music/a.mp3', 1000, 112)
+    assert not index.is_unchanged('/music/b.mp3', 1000, 111)
+    index.close()
+
+
+def test_entries_persist_and_keep_their_track_id(tmp_path):
+    index = ScanIndex(tmp_path / 'index.db')
+    index.record_many([('/music/a.mp3', 1000, 111, True, 't1'), ('/music/b.mp3', 2000, 222, False, None)])
+    # Re-recording a changed file without a track keeps the known track
+    index.record_many([('/music/a.mp3', 1500, 333, True, None)])
+    index.close()
+
+    reopened = ScanIndex(tmp_path / 'index.db')
+    assert len(reopened) == 2
+    assert reopened.is_unchanged('/music/a.mp3', 1500, 333)
+    assert reopened.is_unchanged('/music/b.mp3', 2000, 222)
+    assert reopened._conn.execute(
+        "SELECT track_id FROM scanned_files WHERE path = '/music/a.mp3'"
+    ).fetchone() == ('t1',)
+    reopened.close()
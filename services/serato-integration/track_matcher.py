@@ -0,0 +1,166 @@
+"""
+Serato Track Matcher
+Set-based matching of Serato file metadata against the tracks catalog
+
+A chunk of metadata is matched in two stages:
+1. Exact: one join of the whole chunk against the normalised
+   (LOWER(TRIM(artist_name)), LOWER(TRIM(track_name))) key
+2. Fuzzy: one pg_trgm query for the leftovers only, using the trigram
+   operator so candidates come from the GIN index instead of a scan
+
+See sql/migrations/012_serato_match_indexes_up.sql for the supporting indexes.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import asyncpg
+import structlog
+
+from serato_parser import SeratoTrackMetadata
+
+logger = structlog.get_logger(__name__)
+
+EXACT_MATCH_SQL = """
+    SELECT k.idx, m.track_id
+    FROM unnest($1::int[], $2::text[], $3::text[]) AS k(idx, artist_key, title_key)
+    JOIN LATERAL (
+        SELECT track_id
+        FROM tracks
+        WHERE LOWER(TRIM(artist_name)) = k.artist_key
+        AND LOWER(TRIM(track_name)) = k.title_key
+        LIMIT 1
+    ) m ON TRUE
+"""
+
+FUZZY_MATCH_SQL = """
+    SELECT k.idx, m.track_id, m.score
+    FROM unnest($1::int[], $2::text[], $3::text[]) AS k(idx, artist_name, track_name)
+    JOIN LATERAL (
+        SELECT
+            track_id,
+            similarity(artist_name, k.artist_name) + similarity(track_name, k.track_name) AS score
+        FROM tracks
+        WHERE track_name % k.track_name
+        AND similarity(artist_name, k.artist_name) > $4
+        AND similarity(track_name, k.track_name) > $4
+        ORDER BY score DESC
+        LIMIT 1
+    ) m ON TRUE
+"""
+
+
+def normalize_key(value: str) -> str:
+    """Normalise an artist or title for exact matching (mirrors LOWER(TRIM(...)))"""
+    return value.strip().lower()
+
+
+@dataclass
+class MatchReport:
+    """Match counts and per-stage timings for one or more chunks"""
+    total: int = 0
+    exact: int = 0
+    fuzzy: int = 0
+    unmatched: int = 0
+    exact_seconds: float = 0.0
+    fuzzy_seconds: float = 0.0
+
+    @property
+    def match_rate(self) -> float:
+        return (self.exact + self.fuzzy) / self.total if self.total else 0.0
+
+    def add(self, other: 'MatchReport'):
+        self.total += other.total
+        self.exact += other.exact
+        self.fuzzy += other.fuzzy
+        self.unmatched += other.unmatched
+        self.exact_seconds += other.exact_seconds
+        self.fuzzy_seconds += other.fuzzy_seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'match_total': self.total,
+            'match_exact': self.exact,
+            'match_fuzzy': self.fuzzy,
+            'match_unmatched': self.unmatched,
+            'match_rate_pct': round(self.match_rate * 100, 2),
+            'match_exact_seconds': round(self.exact_seconds, 3),
+            'match_fuzzy_seconds': round(self.fuzzy_seconds, 3)
+        }
+
+
+class SeratoTrackMatcher:
+    """Batch matcher for Serato metadata against the tracks table"""
+
+    def __init__(self, db_pool: asyncpg.Pool, fuzzy_threshold: float = 0.8):
+        self.db_pool = db_pool
+        self.fuzzy_threshold = fuzzy_threshold
+        self.report = MatchReport()
+
+    async def match(self, metadata_list: List[SeratoTrackMetadata]) -> List[Optional[str]]:
+        """
+        Match a chunk of Serato metadata to existing tracks
+
+        Args:
+            metadata_list: Serato track metadata
+
+        Returns:
+            track_id (or None) for each metadata entry, in order
+        """
+        results: List[Optional[str]] = [None] * len(metadata_list)
+        chunk_report = MatchReport(total=len(metadata_list))
+
+        candidates: List[Tuple[int, SeratoTrackMetadata]] = [
+            (i, m) for i, m in enumerate(metadata_list)
+            if m.artist_name and m.track_name
+        ]
+
+        if candidates:
+            async with self.db_pool.acquire() as conn:
+                started = time.perf_counter()
+                rows = await conn.fetch(
+                    EXACT_MATCH_SQL,
+                    [i for i, _ in candidates],
+                    [normalize_key(m.artist_name) for _, m in candidates],
+                    [normalize_key(m.track_name) for _, m in candidates]
+                )
+                for row in rows:
+                    results[row['idx']] = str(row['track_id'])
+                chunk_report.exact = len(rows)
+                chunk_report.exact_seconds = time.perf_counter() - started
+
+                leftovers = [(i, m) for i, m in candidates if results[i] is None]
+                if leftovers:
+                    started = time.perf_counter()
+                    async with conn.transaction():
+                        # Trigram operator threshold = candidate block for the GIN index
+                        await conn.execute(
+                            "SELECT set_config('pg_trgm.similarity_threshold', $1, true)",
+                            str(self.fuzzy_threshold)
+                        )
+                        rows = await conn.fetch(
+                            FUZZY_MATCH_SQL,
+                            [i for i, _ in leftovers],
+                            [m.artist_name for _, m in leftovers],
+                            [m.track_name for _, m in leftovers],
+                            self.fuzzy_threshold
+                        )
+                    for row in rows:
+                        results[row['idx']] = str(row['track_id'])
+                    chunk_report.fuzzy = len(rows)
+                    chunk_report.fuzzy_seconds = time.perf_counter() - started
+
+        chunk_report.unmatched = chunk_report.total - chunk_report.exact - chunk_report.fuzzy
+        self.report.add(chunk_report)
+
+        logger.debug(
+            "Matched Serato chunk",
+            total=chunk_report.total,
+            exact=chunk_report.exact,
+            fuzzy=chunk_report.fuzzy,
+            unmatched=chunk_report.unmatched,
+            exact_ms=round(chunk_report.exact_seconds * 1000, 1),
+            fuzzy_ms=round(chunk_report.fuzzy_seconds * 1000, 1)
+        )
+        return results
@@ -6,6 +6,7 @@ Provides unified access to multiple music streaming platforms
 from .unified_streaming_client import (
     TrackMetadata,
     SearchResult,
+    PlatformSearchOutcome,
     StreamingPlatformClient,
     UnifiedStreamingClient,
     TidalClient,
@@ -22,6 +23,7 @@ from .unified_streaming_client import (
 __all__ = [
     "TrackMetadata",
     "SearchResult",
+    "PlatformSearchOutcome",
     "StreamingPlatformClient",
     "UnifiedStreamingClient",
     "TidalClient",
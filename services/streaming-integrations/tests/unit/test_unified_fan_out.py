@@ -0,0 +1,164 @@
+"""Unit tests for the cross-platform search fan-out and platform ID resolution cache"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+import unified_streaming_client
+from unified_streaming_client import (
+    SearchResult,
+    StreamingPlatformClient,
+    TrackMetadata,
+    UnifiedStreamingClient,
+)
+
+
+class FakePlatform(StreamingPlatformClient):
+    """Answers every search after `delay` seconds with one result"""
+
+    def __init__(self, name, delay, confidence=0.9, fail=False):
+        super().__init__(name, enabled=True)
+        self.delay = delay
+        self.confidence = confidence
+        self.fail = fail
+        self.searches = 0
+        self.cancelled = False
+
+    async def initialize(self):
+        pass
+
+    async def search_track(self, title, artist, isrc=None, **kwargs):
+        self.searches += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError("platform down")
+        if self.confidence is None:
+            return []
+        low = SearchResult(TrackMetadata(title, artist, "", platform_id=f"{self.platform_name}-low"),
+                           confidence=0.3, search_query=title)
+        best = SearchResult(TrackMetadata(title, artist, "", platform_id=f"{self.platform_name}-1"),
+                            confidence=self.confidence, search_query=title)
+        return [low, best]
+
+    async def get_track_by_id(self, track_id):
+        return None
+
+
+class FakeConnection:
+    def __init__(self, table):
+        self.table = table
+        self.updates = []
+
+    async def fetch(self, query, track_id):
+        return [{"platform": p, "platform_id": pid} for (t, p), pid in self.table.items() if t == track_id]
+
+    async def executemany(self, query, rows):
+        for track_id, platform, platform_id in rows:
+            self.table[(track_id, platform)] = platform_id
+
+    async def execute(self, query, *values):
+        self.updates.append(values)
+
+
+class FakePool:
+    """Stands in for the asyncpg pool; rows outlive any one client"""
+
+    def __init__(self):
+        self.table = {}
+        self.conn = FakeConnection(self.table)
+
+    async def acquire(self):
+        return self.conn
+
+    async def release(self, conn):
+        pass
+
+
+def _client(platforms, pool=None):
+    client = UnifiedStreamingClient()
+    client.clients = {p.platform_name: p for p in platforms}
+    client.db_pool = pool
+    client._initialized = True
+    return client
+
+
+@pytest.mark.asyncio
+async def test_one_overall_deadline_and_best_match_first():
+    fast = FakePlatform("spotify", 0.01, confidence=0.8)
+    broken = FakePlatform("tidal", 0.01, fail=True)
+    slow = FakePlatform("beatport", 5.0)
+    client = _client([fast, broken, slow])
+
+    started = time.monotonic()
+    outcomes = await client.fan_out_search("Opus", "Eric Prydz", timeout=0.2)
+
+    assert time.monotonic() - started < 0.5
+    assert {name: o.status for name, o in outcomes.items()} == {
+        "spotify": "success", "tidal": "error", "beatport": "timeout"
+    }
+    assert outcomes["spotify"].confidence == 0.8
+    assert outcomes["spotify"].results[0].track.platform_id == "spotify-1"
+    assert slow.cancelled
+
+
+@pytest.mark.asyncio
+async def test_early_exit_cancels_remaining_searches():
+    platforms = [
+        FakePlatform("spotify", 0.01),
+        FakePlatform("tidal", 0.02),
+        FakePlatform("deezer", 0.01, confidence=0.4),
+        FakePlatform("beatport", 5.0),
+    ]
+    client = _client(platforms)
+
+    started = time.monotonic()
+    results = await client.search_track_across_platforms(
+        "Opus", "Eric Prydz", min_confident_matches=2, confidence_threshold=0.7
+    )
+
+    assert time.monotonic() - started < 0.5
+    assert [r[0].confidence if r else None for r in results.values()] == [0.9, 0.9, 0.4, None]
+    assert platforms[3].cancelled
+
+
+@pytest.mark.asyncio
+async def test_tracks_are_resolved_once_per_platform():
+    pool = FakePool()
+    spotify = FakePlatform("spotify", 0.01)
+    nothing = FakePlatform("deezer", 0.01, confidence=None)
+    broken = FakePlatform("tidal", 0.01, fail=True)
+
+    client = _client([spotify, nothing, broken], pool)
+    assert await client.enrich_track_with_platform_ids("t1", "Opus", "Eric Prydz") == {"spotify_id": "spotify-1"}
+    assert await client.enrich_track_with_platform_ids("t1", "Opus", "Eric Prydz") == {"spotify_id": "spotify-1"}
+
+    # A fresh client (e.g. after a restart) reads the persisted outcomes
+    restarted = _client([spotify, nothing, broken], pool)
+    assert await restarted.enrich_track_with_platform_ids("t1", "Opus", "Eric Prydz") == {"spotify_id": "spotify-1"}
+
+    # Matches and "no match" are final; failures are retried
+    assert (spotify.searches, nothing.searches, broken.searches) == (1, 1, 3)
+    assert pool.table == {("t1", "spotify"): "spotify-1", ("t1", "deezer"): None}
+    assert len(pool.conn.updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_resolution_cache_is_bounded_and_falls_back_to_the_table(monkeypatch):
+    monkeypatch.setattr(unified_streaming_client, "PLATFORM_ID_CACHE_SIZE", 2)
+    pool = FakePool()
+    spotify = FakePlatform("spotify", 0.01)
+    client = _client([spotify], pool)
+
+    for track_id in ("t1", "t2", "t3"):
+        await client.enrich_track_with_platform_ids(track_id, "Opus", "Eric Prydz")
+    assert list(client._platform_id_cache) == ["t2", "t3"]
+
+    # The evicted track is read back from track_platform_resolutions, not searched again
+    assert await client.enrich_track_with_platform_ids("t1", "Opus", "Eric Prydz") == {"spotify_id": "spotify-1"}
+    assert spotify.searches == 3
+    assert list(client._platform_id_cache) == ["t3", "t1"]
@@ -9,6 +9,7 @@ import logging
 import os
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
@@ -19,6 +20,10 @@ from contextlib import asynccontextmanager
 
 import asyncpg
 
+# Tracks whose platform resolutions are kept in memory; older ones are re-read
+# from track_platform_resolutions when needed
+PLATFORM_ID_CACHE_SIZE = int(os.getenv("PLATFORM_ID_CACHE_SIZE", "10000"))
+
 
 @dataclass
 class TrackMetadata:
@@ -126,6 +131,16 @@ class SearchResult:
     exact_match: bool = False
 
 
+@dataclass
+class PlatformSearchOutcome:
+    """Outcome of one platform's search within a cross-platform fan-out."""
+    platform: str
+    status: str  # success, error, timeout or cancelled (early exit)
+    results: List[SearchResult] = field(default_factory=list)
+    confidence: float = 0.0  # Best match confidence, 0.0 when nothing matched
+    elapsed: float = 0.0  # Seconds from fan-out start until the outcome was known
+
+
 class StreamingPlatformClient(ABC):
     """Abstract base class for streaming platform clients."""
 
@@ -672,6 +687,14 @@ class UnifiedStreamingClient:
             "youtube_music": YouTubeMusicClient(),
         }
 
+        # Resolution outcome per track and platform, backed by track_platform_resolutions
+        self._platform_id_cache: "OrderedDict[str, Dict[str, Optional[Union[str, int]]]]" = OrderedDict()
+
+        # Optional Prometheus metrics, assigned by the hosting service
+        self.search_counter = None
+        self.search_duration = None
+        self.memory_usage = None
+
         self._initialized = False
 
     def _get_default_db_config(self) -> Dict[str, Any]:
@@ -723,16 +746,24 @@ class UnifiedStreamingClient:
         self._initialized = True
         self.logger.info(f"UnifiedStreamingClient initialized with {initialized_count} platforms")
 
-    async def search_track_across_platforms(
+    async def fan_out_search(
         self,
         title: str,
         artist: str,
         isrc: Optional[str] = None,
         platforms: Optional[List[str]] = None,
-        max_results_per_platform: int = 3
-    ) -> Dict[str, List[SearchResult]]:
+        max_results_per_platform: int = 3,
+        timeout: float = 30.0,
+        min_confident_matches: Optional[int] = None,
+        confidence_threshold: float = 0.7
+    ) -> Dict[str, PlatformSearchOutcome]:
         """
-        Search for a track across multiple streaming platforms.
+        Search platforms concurrently under one overall deadline.
+
+        Results are consumed as they complete. Once `min_confident_matches`
+        platforms have returned a match at or above `confidence_threshold`
+        the remaining searches are cancelled; whatever is still running at
+        the deadline is cancelled too.
 
         Args:
             title: Track title
@@ -740,9 +771,12 @@ class UnifiedStreamingClient:
             isrc: ISRC code (optional)
             platforms: List of platform names to search (None = all enabled)
             max_results_per_platform: Maximum results per platform
+            timeout: Overall deadline in seconds for the whole fan-out
+            min_confident_matches: Stop after this many confident platforms (None = wait for all)
+            confidence_threshold: Confidence a platform's best match needs to count
 
         Returns:
-            Dictionary mapping platform names to search results
+            Dictionary mapping platform names to their search outcome
         """
         if not self._initialized:
             await self.initialize()
@@ -750,8 +784,10 @@ class UnifiedStreamingClient:
         if platforms is None:
             platforms = [name for name, client in self.clients.items() if client.enabled]
 
-        results = {}
-        search_tasks = []
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        outcomes: Dict[str, PlatformSearchOutcome] = {}
+        tasks: Dict[asyncio.Task, str] = {}
 
         for platform_name in platforms:
             if platform_name in self.clients and self.clients[platform_name].enabled:
@@ -760,48 +796,114 @@ class UnifiedStreamingClient:
                     client.search_track(title, artist, isrc),
                     name=f"search_{platform_name}"
                 )
-                search_tasks.append((platform_name, task))
-
-        # Wait for all searches to complete with timeout
-        for platform_name, task in search_tasks:
-            start_time = time.time()
-            try:
-                platform_results = await asyncio.wait_for(task, timeout=30.0)
-                # Limit results per platform
-                results[platform_name] = platform_results[:max_results_per_platform]
-                self.logger.debug(f"{platform_name}: found {len(platform_results)} results")
+                tasks[task] = platform_name
+                outcomes[platform_name] = PlatformSearchOutcome(platform=platform_name, status="pending")
 
-                # Update metrics
-                if self.search_counter:
-                    self.search_counter.labels(platform=platform_name, status='success').inc()
-                if self.search_duration:
-                    self.search_duration.labels(platform=platform_name).observe(time.time() - start_time)
-
-            except asyncio.TimeoutError:
-                self.logger.warning(f"Search timeout on {platform_name}")
-                results[platform_name] = []
+        pending = set(tasks)
+        confident = 0
+        early_exit = False
+        try:
+            while pending:
+                remaining = started + timeout - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    outcome = outcomes[tasks[task]]
+                    outcome.elapsed = loop.time() - started
+                    try:
+                        platform_results = task.result()
+                    except Exception as e:
+                        self.logger.warning(f"Search failed on {outcome.platform}: {e}")
+                        outcome.status = "error"
+                    else:
+                        # Best match first, whatever order the platform returned
+                        ranked = sorted(platform_results, key=lambda r: r.confidence, reverse=True)
+                        outcome.status = "success"
+                        outcome.results = ranked[:max_results_per_platform]
+                        outcome.confidence = ranked[0].confidence if ranked else 0.0
+                        self.logger.debug(f"{outcome.platform}: found {len(platform_results)} results")
+                        if outcome.confidence >= confidence_threshold:
+                            confident += 1
+
+                    self._record_search_metrics(outcome)
+
+                if min_confident_matches and confident >= min_confident_matches:
+                    early_exit = True
+                    break
+        finally:
+            for task in pending:
                 task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in pending:
+            outcome = outcomes[tasks[task]]
+            outcome.elapsed = loop.time() - started
+            if early_exit:
+                outcome.status = "cancelled"
+            else:
+                outcome.status = "timeout"
+                self.logger.warning(f"Search timeout on {outcome.platform}")
+            self._record_search_metrics(outcome)
+
+        return outcomes
+
+    def _record_search_metrics(self, outcome: PlatformSearchOutcome) -> None:
+        if self.search_counter:
+            self.search_counter.labels(platform=outcome.platform, status=outcome.status).inc()
+        if self.search_duration and outcome.status == "success":
+            self.search_duration.labels(platform=outcome.platform).observe(outcome.elapsed)
 
-                # Update metrics
-                if self.search_counter:
-                    self.search_counter.labels(platform=platform_name, status='timeout').inc()
+    async def search_track_across_platforms(
+        self,
+        title: str,
+        artist: str,
+        isrc: Optional[str] = None,
+        platforms: Optional[List[str]] = None,
+        max_results_per_platform: int = 3,
+        timeout: float = 30.0,
+        min_confident_matches: Optional[int] = None,
+        confidence_threshold: float = 0.7
+    ) -> Dict[str, List[SearchResult]]:
+        """
+        Search for a track across multiple streaming platforms.
 
-            except Exception as e:
-                self.logger.warning(f"Search failed on {platform_name}: {e}")
-                results[platform_name] = []
+        See `fan_out_search` for deadline and early-exit behaviour; platforms
+        that failed, timed out or were cancelled map to an empty list.
 
-                # Update metrics
-                if self.search_counter:
-                    self.search_counter.labels(platform=platform_name, status='error').inc()
+        Args:
+            title: Track title
+            artist: Artist name
+            isrc: ISRC code (optional)
+            platforms: List of platform names to search (None = all enabled)
+            max_results_per_platform: Maximum results per platform
+            timeout: Overall deadline in seconds for the whole fan-out
+            min_confident_matches: Stop after this many confident platforms (None = wait for all)
+            confidence_threshold: Confidence a platform's best match needs to count
 
-        return results
+        Returns:
+            Dictionary mapping platform names to search results, best match first
+        """
+        outcomes = await self.fan_out_search(
+            title, artist, isrc,
+            platforms=platforms,
+            max_results_per_platform=max_results_per_platform,
+            timeout=timeout,
+            min_confident_matches=min_confident_matches,
+            confidence_threshold=confidence_threshold
+        )
+        return {name: outcome.results for name, outcome in outcomes.items()}
 
     async def get_best_match(
         self,
         title: str,
         artist: str,
         isrc: Optional[str] = None,
-        min_confidence: float = 0.7
+        min_confidence: float = 0.7,
+        min_confident_matches: Optional[int] = None
     ) -> Optional[SearchResult]:
         """
         Get the best matching track across all platforms.
@@ -811,11 +913,17 @@ class UnifiedStreamingClient:
             artist: Artist name
             isrc: ISRC code (optional)
             min_confidence: Minimum confidence threshold
+            min_confident_matches: Stop searching once this many platforms
+                have a match above `min_confidence` (None = search all)
 
         Returns:
             Best matching SearchResult or None
         """
-        all_results = await self.search_track_across_platforms(title, artist, isrc)
+        all_results = await self.search_track_across_platforms(
+            title, artist, isrc,
+            min_confident_matches=min_confident_matches,
+            confidence_threshold=min_confidence
+        )
 
         best_result = None
         best_confidence = 0.0
@@ -833,38 +941,122 @@ class UnifiedStreamingClient:
         track_id: str,
         title: str,
         artist: str,
-        isrc: Optional[str] = None
+        isrc: Optional[str] = None,
+        min_confidence: float = 0.7
     ) -> Dict[str, Union[str, int]]:
         """
         Enrich a track with platform IDs and store in database.
 
+        Each (track, platform) pair is resolved at most once: outcomes,
+        including "no match", are kept in track_platform_resolutions and
+        only platforms without a recorded outcome are searched. Platforms
+        that failed or timed out are retried on the next call.
+
         Args:
             track_id: SongNodes internal track UUID
             title: Track title
             artist: Artist name
             isrc: ISRC code (optional)
+            min_confidence: Minimum confidence for a match to be stored
 
         Returns:
             Dictionary of platform IDs found
         """
-        if not self.db_pool:
+        if not self._initialized:
             await self.initialize()
 
-        search_results = await self.search_track_across_platforms(title, artist, isrc)
-        platform_ids = {}
-
-        # Extract platform IDs from search results
-        for platform_name, results in search_results.items():
-            if results and results[0].confidence >= 0.7:  # Use best result if confidence is high
-                best_result = results[0]
-                platform_ids[f"{platform_name}_id"] = best_result.track.platform_id
+        resolved = await self._get_platform_resolutions(track_id)
+        unresolved = [
+            name for name, client in self.clients.items()
+            if client.enabled and name not in resolved
+        ]
+
+        new_resolutions: Dict[str, Optional[Union[str, int]]] = {}
+        if unresolved:
+            outcomes = await self.fan_out_search(title, artist, isrc, platforms=unresolved)
+            for platform_name, outcome in outcomes.items():
+                if outcome.status != "success":
+                    continue
+                if outcome.results and outcome.confidence >= min_confidence:
+                    new_resolutions[platform_name] = outcome.results[0].track.platform_id
+                else:
+                    new_resolutions[platform_name] = None
+
+        platform_ids = {
+            f"{name}_id": platform_id
+            for name, platform_id in {**resolved, **new_resolutions}.items()
+            if platform_id is not None
+        }
 
         # Store platform IDs in database
-        if platform_ids:
-            await self._update_track_platform_ids(track_id, platform_ids)
+        new_ids = {f"{name}_id": pid for name, pid in new_resolutions.items() if pid is not None}
+        if new_ids:
+            await self._update_track_platform_ids(track_id, new_ids)
+        if new_resolutions:
+            await self._store_platform_resolutions(track_id, new_resolutions)
 
         return platform_ids
 
+    async def _get_platform_resolutions(self, track_id: str) -> Dict[str, Optional[Union[str, int]]]:
+        """Recorded resolution per platform for a track (None = no match)."""
+        if track_id in self._platform_id_cache:
+            self._platform_id_cache.move_to_end(track_id)
+            return dict(self._platform_id_cache[track_id])
+
+        resolutions: Dict[str, Optional[Union[str, int]]] = {}
+        if self.db_pool:
+            try:
+                async with self.get_db_connection() as conn:
+                    rows = await conn.fetch(
+                        "SELECT platform, platform_id FROM track_platform_resolutions WHERE track_id = $1",
+                        str(track_id)
+                    )
+                resolutions = {row["platform"]: row["platform_id"] for row in rows}
+            except asyncpg.UndefinedTableError:
+                self.logger.warning("track_platform_resolutions table missing; platform IDs cached in memory only")
+
+        self._cache_platform_resolutions(track_id, resolutions)
+        return resolutions
+
+    def _cache_platform_resolutions(
+        self,
+        track_id: str,
+        resolutions: Dict[str, Optional[Union[str, int]]]
+    ) -> None:
+        """Merge resolutions into the LRU cache, evicting the least recently used tracks."""
+        self._platform_id_cache.setdefault(track_id, {}).update(resolutions)
+        self._platform_id_cache.move_to_end(track_id)
+        while len(self._platform_id_cache) > PLATFORM_ID_CACHE_SIZE:
+            self._platform_id_cache.popitem(last=False)
+
+    async def _store_platform_resolutions(
+        self,
+        track_id: str,
+        resolutions: Dict[str, Optional[Union[str, int]]]
+    ) -> None:
+        """Record resolution outcomes so the platforms are not searched again."""
+        self._cache_platform_resolutions(track_id, resolutions)
+        if not self.db_pool:
+            return
+
+        rows = [
+            (str(track_id), platform, None if platform_id is None else str(platform_id))
+            for platform, platform_id in resolutions.items()
+        ]
+        try:
+            async with self.get_db_connection() as conn:
+                await conn.executemany(
+                    """
+                    INSERT INTO track_platform_resolutions (track_id, platform, platform_id, resolved_at)
+                    VALUES ($1, $2, $3, CURRENT_TIMESTAMP)
+                    ON CONFLICT (track_id, platform) DO UPDATE
+                    SET platform_id = EXCLUDED.platform_id, resolved_at = EXCLUDED.resolved_at
+                    """,
+                    rows
+                )
+        except asyncpg.UndefinedTableError:
+            self.logger.warning("track_platform_resolutions table missing; platform IDs cached in memory only")
+
     async def _update_track_platform_ids(
         self,
         track_id: str,
@@ -1071,6 +1263,7 @@ async def test_unified_client() -> bool:
 __all__ = [
     'TrackMetadata',
     'SearchResult',
+    'PlatformSearchOutcome',
     'StreamingPlatformClient',
     'TidalClient',
     'SpotifyClient',
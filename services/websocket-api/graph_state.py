@@ -0,0 +1,181 @@
+"""
+Versioned in-memory graph state for the WebSocket API
+
+Node and edge changes posted to the service are applied here immediately and
+also collected into a pending delta. Once per tick the pending delta is
+stamped with the next version and broadcast, so a burst of updates to the
+same node goes out as one entry. Recent deltas are kept in a bounded history:
+a reconnecting client that reports its last version receives only the deltas
+it missed, and falls back to a full snapshot when that version is too old or
+from a previous process (different epoch).
+"""
+
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+
+class GraphState:
+    """Nodes and edges keyed by id, plus a version-stamped delta history"""
+
+    def __init__(self, history_size: int = 1000):
+        self.epoch = uuid.uuid4().hex
+        self.version = 0
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: Dict[str, Dict[str, Any]] = {}
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        # Coalesced changes since the last flush; None marks a removal.
+        # Values alias the live node/edge dicts and are copied on flush.
+        self._pending_nodes: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._pending_edges: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _edge_id(edge: Dict[str, Any]) -> Optional[str]:
+        edge_id = edge.get("id")
+        if edge_id is None and edge.get("source") is not None and edge.get("target") is not None:
+            edge_id = f"{edge['source']}__{edge['target']}"
+        return str(edge_id) if edge_id is not None else None
+
+    def add_nodes(self, nodes: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace nodes; returns the number applied"""
+        applied = 0
+        for node in nodes:
+            if not isinstance(node, dict) or node.get("id") is None:
+                continue
+            node_id = str(node["id"])
+            self.nodes[node_id] = dict(node)
+            self._pending_nodes[node_id] = self.nodes[node_id]
+            applied += 1
+        return applied
+
+    def update_nodes(self, updates: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge partial updates into existing nodes
+
+        Each update is {"id": ..., <fields>} or {"id": ..., "updates": {...}}.
+        Updates for unknown nodes create them.
+        """
+        applied = 0
+        for update in updates:
+            if not isinstance(update, dict) or update.get("id") is None:
+                continue
+            node_id = str(update["id"])
+            fields = update.get("updates", update)
+            node = self.nodes.setdefault(node_id, {"id": update["id"]})
+            node.update({k: v for k, v in fields.items() if k != "id"})
+            self._pending_nodes[node_id] = node
+            applied += 1
+        return applied
+
+    def remove_nodes(self, node_ids: Iterable[Any]) -> int:
+        """Remove nodes and any edges touching them"""
+        removed = set()
+        for node_id in node_ids:
+            node_id = str(node_id)
+            self.nodes.pop(node_id, None)
+            self._pending_nodes[node_id] = None
+            removed.add(node_id)
+
+        if removed:
+            dangling = [
+                edge_id for edge_id, edge in self.edges.items()
+                if str(edge.get("source")) in removed or str(edge.get("target")) in removed
+            ]
+            self.remove_edges(dangling)
+        return len(removed)
+
+    def add_edges(self, edges: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace edges"""
+        applied = 0
+        for edge in edges:
+            if not isinstance(edge, dict):
+                continue
+            edge_id = self._edge_id(edge)
+            if edge_id is None:
+                continue
+            self.edges[edge_id] = {**edge, "id": edge_id}
+            self._pending_edges[edge_id] = self.edges[edge_id]
+            applied += 1
+        return applied
+
+    def remove_edges(self, edge_ids: Iterable[Any]) -> int:
+        count = 0
+        for edge_id in edge_ids:
+            edge_id = str(edge_id)
+            self.edges.pop(edge_id, None)
+            self._pending_edges[edge_id] = None
+            count += 1
+        return count
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending_nodes or self._pending_edges)
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Stamp pending changes with the next version
+
+        Returns:
+            The delta, or None when nothing changed since the last flush
+        """
+        if not self.has_pending:
+            return None
+
+        self.version += 1
+        delta = {
+            "epoch": self.epoch,
+            "version": self.version,
+            "base_version": self.version - 1,
+            "nodes_upserted": [dict(n) for n in self._pending_nodes.values() if n is not None],
+            "nodes_removed": [k for k, n in self._pending_nodes.items() if n is None],
+            "edges_upserted": [dict(e) for e in self._pending_edges.values() if e is not None],
+            "edges_removed": [k for k, e in self._pending_edges.items() if e is None],
+            "timestamp": time.time()
+        }
+        self._pending_nodes = {}
+        self._pending_edges = {}
+        self.history.append(delta)
+        return delta
+
+    def deltas_since(self, version: int, epoch: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Deltas a client at `version` needs to catch up
+
+        Returns:
+            Deltas in version order, or None if the client must reload a snapshot
+        """
+        if epoch is not None and epoch != self.epoch:
+            return None
+        if version > self.version or version < 0:
+            return None
+        if version == self.version:
+            return []
+        if not self.history or self.history[0]["base_version"] > version:
+            return None
+        return [d for d in self.history if d["version"] > version]
+
+    def snapshot(self, node_ids: Optional[Iterable[Any]] = None) -> Dict[str, Any]:
+        """
+        Current nodes and edges at the last flushed version
+
+        Changes applied since the last flush are included; replaying the next
+        delta on top is idempotent.
+        """
+        if node_ids:
+            wanted = {str(n) for n in node_ids}
+            nodes = [self.nodes[n] for n in wanted if n in self.nodes]
+            edges = [
+                e for e in self.edges.values()
+                if str(e.get("source")) in wanted or str(e.get("target")) in wanted
+            ]
+        else:
+            nodes = list(self.nodes.values())
+            edges = list(self.edges.values())
+
+        return {
+            "epoch": self.epoch,
+            "version": self.version,
+            "nodes": nodes,
+            "edges": edges,
+        }
@@ -4,7 +4,7 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, Set, Any, Optional, Annotated
+from typing import Dict, Set, Any, Optional, Annotated, Tuple
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
@@ -19,6 +19,8 @@ import aio_pika
 from aio_pika import Connection, Channel, Exchange
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 
+from graph_state import GraphState
+
 # Import UnifiedWorkflow authentication dependencies
 try:
     import sys
@@ -68,6 +70,21 @@ WS_CONNECTIONS = Gauge('websocket_connections', 'Active WebSocket connections')
 WS_MESSAGES = Counter('websocket_messages_total', 'Total WebSocket messages', ['type', 'direction'])
 WS_ERRORS = Counter('websocket_errors_total', 'WebSocket errors', ['error_type'])
 REDIS_OPERATIONS = Counter('redis_operations_total', 'Redis operations', ['operation', 'status'])
+WS_DROPPED = Counter('websocket_messages_dropped_total', 'Outbound messages dropped for slow clients')
+
+# Per-connection send queue limits
+SEND_QUEUE_SIZE = int(os.getenv('WS_SEND_QUEUE_SIZE', '256'))
+SEND_TIMEOUT_SECONDS = float(os.getenv('WS_SEND_TIMEOUT_SECONDS', '5'))
+SLOW_CLIENT_MAX_DROPS = int(os.getenv('WS_SLOW_CLIENT_MAX_DROPS', '64'))
+
+# Graph delta streaming
+GRAPH_ROOM = "graph_updates"
+GRAPH_DELTA_TICK_SECONDS = float(os.getenv('GRAPH_DELTA_TICK_SECONDS', '0.25'))
+GRAPH_DELTA_HISTORY_SIZE = int(os.getenv('GRAPH_DELTA_HISTORY_SIZE', '1000'))
+GRAPH_VERSION = Gauge('websocket_graph_version', 'Current graph state version')
+
+# Subscription channel -> room whose broadcasts the subscriber joins
+SUBSCRIPTION_ROOMS = {"graph_updates": GRAPH_ROOM, "live_data": "data_updates"}
 
 # Data Models
 class WebSocketMessage(BaseModel):
@@ -77,107 +94,223 @@ class WebSocketMessage(BaseModel):
     user_id: Optional[str] = None
 
 class ConnectionManager:
-    """Manages WebSocket connections and message broadcasting"""
-    
-    def __init__(self):
+    """
+    Manages WebSocket connections and message broadcasting
+
+    Connections are indexed by room and by user, so a broadcast only touches
+    the members of its room. Each connection has a bounded send queue drained
+    by its own sender task: a broadcast serialises the payload once and
+    enqueues it for every member without awaiting any socket, so one slow
+    client cannot stall the room. A client whose queue is full has messages
+    dropped; after SLOW_CLIENT_MAX_DROPS consecutive drops it is disconnected.
+
+    A connection belongs to the room it connected to and can also join
+    further rooms (e.g. graph_updates on subscribe) until it leaves them or
+    disconnects. room_users/user_rooms track connect-time rooms only.
+    """
+
+    def __init__(
+        self,
+        send_queue_size: int = SEND_QUEUE_SIZE,
+        send_timeout: float = SEND_TIMEOUT_SECONDS,
+        max_drops: int = SLOW_CLIENT_MAX_DROPS
+    ):
         self.active_connections: Dict[str, WebSocket] = {}
         self.user_rooms: Dict[str, Set[str]] = {}  # user_id -> set of room_ids
         self.room_users: Dict[str, Set[str]] = {}  # room_id -> set of user_ids
-        
+        self.room_connections: Dict[str, Set[str]] = {}  # room_id -> set of connection_ids
+        self.user_connections: Dict[str, Set[str]] = {}  # user_id -> set of connection_ids
+        self.connection_info: Dict[str, Tuple[str, str]] = {}  # connection_id -> (user_id, room_id)
+        self.joined_rooms: Dict[str, Set[str]] = {}  # connection_id -> rooms joined after connect
+        self.send_queues: Dict[str, asyncio.Queue] = {}
+        self.sender_tasks: Dict[str, asyncio.Task] = {}
+        self.dropped_counts: Dict[str, int] = {}  # consecutive drops per connection
+        self.send_queue_size = send_queue_size
+        self.send_timeout = send_timeout
+        self.max_drops = max_drops
+
     async def connect(self, websocket: WebSocket, user_id: str, room_id: str = "general"):
         """Connect a user to a room"""
         await websocket.accept()
-        
+
         connection_id = f"{user_id}_{room_id}_{id(websocket)}"
         self.active_connections[connection_id] = websocket
-        
+        self.connection_info[connection_id] = (user_id, room_id)
+        self.room_connections.setdefault(room_id, set()).add(connection_id)
+        self.user_connections.setdefault(user_id, set()).add(connection_id)
+
         # Add user to room
-        if user_id not in self.user_rooms:
-            self.user_rooms[user_id] = set()
-        self.user_rooms[user_id].add(room_id)
-        
-        if room_id not in self.room_users:
-            self.room_users[room_id] = set()
-        self.room_users[room_id].add(user_id)
-        
+        self.user_rooms.setdefault(user_id, set()).add(room_id)
+        self.room_users.setdefault(room_id, set()).add(user_id)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.send_queue_size)
+        self.send_queues[connection_id] = queue
+        self.dropped_counts[connection_id] = 0
+        self.sender_tasks[connection_id] = asyncio.create_task(
+            self._sender(connection_id, websocket, queue)
+        )
+
         logger.info(f"User {user_id} connected to room {room_id}")
-        
+
         # Notify room about new connection
         await self.broadcast_to_room(room_id, {
             "type": "user_joined",
             "data": {"user_id": user_id, "room_id": room_id},
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
-        
+
         return connection_id
-    
+
     async def disconnect(self, connection_id: str):
         """Disconnect a user"""
-        if connection_id in self.active_connections:
-            del self.active_connections[connection_id]
-            
-            # Extract user and room from connection_id
-            parts = connection_id.split('_')
-            if len(parts) >= 2:
-                user_id, room_id = parts[0], parts[1]
-                
-                # Remove user from room
-                if room_id in self.room_users and user_id in self.room_users[room_id]:
-                    self.room_users[room_id].remove(user_id)
-                    if not self.room_users[room_id]:
-                        del self.room_users[room_id]
-                
-                if user_id in self.user_rooms and room_id in self.user_rooms[user_id]:
-                    self.user_rooms[user_id].remove(room_id)
-                    if not self.user_rooms[user_id]:
-                        del self.user_rooms[user_id]
-                
-                logger.info(f"User {user_id} disconnected from room {room_id}")
-                
-                # Notify room about disconnection
-                await self.broadcast_to_room(room_id, {
-                    "type": "user_left",
-                    "data": {"user_id": user_id, "room_id": room_id},
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
+        websocket = self.active_connections.pop(connection_id, None)
+        if websocket is None:
+            return
+
+        for joined in list(self.joined_rooms.get(connection_id, ())):
+            self.leave_room(connection_id, joined)
+        user_id, room_id = self.connection_info.pop(connection_id)
+        queue = self.send_queues.pop(connection_id, None)
+        self.dropped_counts.pop(connection_id, None)
+        sender = self.sender_tasks.pop(connection_id, None)
+        if sender and sender is not asyncio.current_task():
+            sender.cancel()
+            if queue is not None and not queue.full():
+                queue.put_nowait(None)
+
+        room_connections = self.room_connections.get(room_id, set())
+        room_connections.discard(connection_id)
+        user_connections = self.user_connections.get(user_id, set())
+        user_connections.discard(connection_id)
+
+        # Only drop room membership once the user's last connection to it is gone
+        if not any(self.connection_info[cid][1] == room_id for cid in user_connections):
+            if room_id in self.room_users:
+                self.room_users[room_id].discard(user_id)
+                if not self.room_users[room_id]:
+                    del self.room_users[room_id]
+            if user_id in self.user_rooms:
+                self.user_rooms[user_id].discard(room_id)
+                if not self.user_rooms[user_id]:
+                    del self.user_rooms[user_id]
+
+        if not room_connections:
+            self.room_connections.pop(room_id, None)
+        if not user_connections:
+            self.user_connections.pop(user_id, None)
+
+        logger.info(f"User {user_id} disconnected from room {room_id}")
+
+        # Notify room about disconnection
+        await self.broadcast_to_room(room_id, {
+            "type": "user_left",
+            "data": {"user_id": user_id, "room_id": room_id},
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+
+    def join_room(self, connection_id: str, room_id: str) -> bool:
+        """Add a connection to another room's broadcasts"""
+        if connection_id not in self.connection_info:
+            return False
+        self.room_connections.setdefault(room_id, set()).add(connection_id)
+        if self.connection_info[connection_id][1] != room_id:
+            self.joined_rooms.setdefault(connection_id, set()).add(room_id)
+        return True
+
+    def leave_room(self, connection_id: str, room_id: str) -> bool:
+        """Remove a connection from a room it joined; its connect-time room is kept"""
+        joined = self.joined_rooms.get(connection_id)
+        if not joined or room_id not in joined:
+            return False
+        joined.discard(room_id)
+        if not joined:
+            del self.joined_rooms[connection_id]
+        room_connections = self.room_connections.get(room_id)
+        if room_connections is not None:
+            room_connections.discard(connection_id)
+            if not room_connections:
+                del self.room_connections[room_id]
+        return True
+
+    async def _sender(self, connection_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain one connection's send queue onto its socket"""
+        try:
+            while True:
+                text = await queue.get()
+                # disconnect() also wakes the sender with None, in case its cancel
+                # was swallowed by wait_for completing at the same moment
+                if text is None or connection_id not in self.active_connections:
+                    return
+                await asyncio.wait_for(websocket.send_text(text), timeout=self.send_timeout)
+                WS_MESSAGES.labels(type="broadcast", direction="outbound").inc()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Dropping connection {connection_id} after send failure: {e}")
+            WS_ERRORS.labels(error_type="send_failed").inc()
+            await self.disconnect(connection_id)
+
+    def _enqueue(self, connection_id: str, text: str) -> bool:
+        """Queue serialised text for a connection without blocking"""
+        queue = self.send_queues.get(connection_id)
+        if queue is None:
+            return False
+
+        try:
+            queue.put_nowait(text)
+        except asyncio.QueueFull:
+            WS_DROPPED.inc()
+            self.dropped_counts[connection_id] += 1
+            if self.dropped_counts[connection_id] == self.max_drops:
+                logger.warning(
+                    f"Disconnecting slow client {connection_id} "
+                    f"after {self.dropped_counts[connection_id]} dropped messages"
+                )
+                WS_ERRORS.labels(error_type="slow_client").inc()
+                asyncio.create_task(self._close_slow_client(connection_id))
+            return False
+
+        self.dropped_counts[connection_id] = 0
+        return True
+
+    async def _close_slow_client(self, connection_id: str):
+        websocket = self.active_connections.get(connection_id)
+        await self.disconnect(connection_id)
+        if websocket is not None:
+            try:
+                await websocket.close(code=1013, reason="Client too slow")
+            except Exception:
+                pass
+
+    async def send_to_connection(self, message: Dict[str, Any], connection_id: str):
+        """Send message to a single connection"""
+        self._enqueue(connection_id, json.dumps(message))
+
     async def send_personal_message(self, message: Dict[str, Any], user_id: str):
         """Send message to a specific user"""
-        connections_to_send = []
-        for connection_id, websocket in self.active_connections.items():
-            if connection_id.startswith(f"{user_id}_"):
-                connections_to_send.append(websocket)
-        
-        for websocket in connections_to_send:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error sending personal message to {user_id}: {e}")
-    
+        connection_ids = self.user_connections.get(user_id)
+        if not connection_ids:
+            return
+
+        text = json.dumps(message)
+        for connection_id in list(connection_ids):
+            self._enqueue(connection_id, text)
+
     async def broadcast_to_room(self, room_id: str, message: Dict[str, Any]):
         """Broadcast message to all users in a room"""
-        if room_id not in self.room_users:
+        connection_ids = self.room_connections.get(room_id)
+        if not connection_ids:
             return
-        
-        connections_to_send = []
-        for user_id in self.room_users[room_id]:
-            for connection_id, websocket in self.active_connections.items():
-                if connection_id.startswith(f"{user_id}_{room_id}"):
-                    connections_to_send.append(websocket)
-        
-        for websocket in connections_to_send:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to room {room_id}: {e}")
-    
+
+        text = json.dumps(message)
+        for connection_id in list(connection_ids):
+            self._enqueue(connection_id, text)
+
     async def broadcast_to_all(self, message: Dict[str, Any]):
         """Broadcast message to all connected users"""
-        for websocket in self.active_connections.values():
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to all: {e}")
+        text = json.dumps(message)
+        for connection_id in list(self.active_connections):
+            self._enqueue(connection_id, text)
 
 class WebSocketService:
     """Main WebSocket service class"""
@@ -188,10 +321,13 @@ class WebSocketService:
         self.rabbitmq_channel: Optional[Channel] = None
         self.exchange: Optional[Exchange] = None
         self.manager = ConnectionManager()
+        self.graph_state = GraphState(history_size=GRAPH_DELTA_HISTORY_SIZE)
+        self.graph_delta_task: Optional[asyncio.Task] = None
         
     async def startup(self):
         """Initialize connections"""
         logger.info("🚀 Starting WebSocket service initialization...")
+        self.graph_delta_task = asyncio.create_task(self.graph_delta_loop())
         # Redis connection - use secrets_manager if available
         try:
             redis_config = get_redis_config()
@@ -258,11 +394,35 @@ class WebSocketService:
     
     async def shutdown(self):
         """Cleanup connections"""
+        if self.graph_delta_task:
+            self.graph_delta_task.cancel()
         if self.redis_client:
             await self.redis_client.close()
         if self.rabbitmq_connection:
             await self.rabbitmq_connection.close()
     
+    async def graph_delta_loop(self):
+        """Once per tick, stamp coalesced graph changes and broadcast them"""
+        while True:
+            await asyncio.sleep(GRAPH_DELTA_TICK_SECONDS)
+            try:
+                await self.flush_graph_delta()
+            except Exception as e:
+                logger.error(f"Failed to flush graph delta: {e}")
+
+    async def flush_graph_delta(self) -> Optional[Dict[str, Any]]:
+        delta = self.graph_state.flush()
+        if delta is None:
+            return None
+
+        GRAPH_VERSION.set(delta["version"])
+        await self.manager.broadcast_to_room(GRAPH_ROOM, {
+            "type": "graph_delta",
+            "data": delta,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+        return delta
+
     async def consume_messages(self):
         """Consume messages from RabbitMQ and broadcast to WebSocket clients"""
         if not self.rabbitmq_channel or not self.exchange:
@@ -523,7 +683,7 @@ async def public_websocket_endpoint(websocket: WebSocket):
             },
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
-        await websocket.send_text(json.dumps(welcome_message))
+        await websocket_service.manager.send_to_connection(welcome_message, connection_id)
         
         # Listen for messages
         while True:
@@ -543,13 +703,18 @@ async def public_websocket_endpoint(websocket: WebSocket):
                     "data": {"error": "Invalid message format", "details": str(e)},
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
-                await websocket.send_text(json.dumps(error_message))
+                await websocket_service.manager.send_to_connection(error_message, connection_id)
             except Exception as e:
                 logger.error(f"Error handling message: {e}")
                 
     except WebSocketDisconnect:
-        await websocket_service.manager.disconnect(connection_id)
         logger.info(f"Public WebSocket disconnected: {connection_id}")
+    except Exception as e:
+        logger.error(f"Public WebSocket {connection_id} failed: {e}")
+        WS_ERRORS.labels(error_type="connection_failed").inc()
+    finally:
+        # Release room/user index entries and the sender task however the loop ended
+        await websocket_service.manager.disconnect(connection_id)
 
 @app.websocket("/ws/{user_id}")
 async def websocket_endpoint(
@@ -601,7 +766,7 @@ async def websocket_endpoint(
             },
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
-        await websocket.send_text(json.dumps(welcome_message))
+        await websocket_service.manager.send_to_connection(welcome_message, connection_id)
         
         # Listen for messages
         while True:
@@ -612,7 +777,7 @@ async def websocket_endpoint(
                 message.user_id = authenticated_user_id
                 message.timestamp = datetime.now(timezone.utc)
                 
-                await handle_websocket_message(message, room_id)
+                await handle_websocket_message(message, room_id, connection_id)
                 
             except ValidationError as e:
                 error_message = {
@@ -620,19 +785,25 @@ async def websocket_endpoint(
                     "data": {"message": "Invalid message format", "details": str(e)},
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
-                await websocket.send_text(json.dumps(error_message))
+                await websocket_service.manager.send_to_connection(error_message, connection_id)
             except json.JSONDecodeError:
                 error_message = {
                     "type": "error",
                     "data": {"message": "Invalid JSON"},
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
-                await websocket.send_text(json.dumps(error_message))
+                await websocket_service.manager.send_to_connection(error_message, connection_id)
                 
     except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"WebSocket {connection_id} failed: {e}")
+        WS_ERRORS.labels(error_type="connection_failed").inc()
+    finally:
+        # Release room/user index entries and the sender task however the loop ended
         await websocket_service.manager.disconnect(connection_id)
 
-async def handle_websocket_message(message: WebSocketMessage, room_id: str):
+async def handle_websocket_message(message: WebSocketMessage, room_id: str, connection_id: Optional[str] = None):
     """Handle incoming WebSocket messages"""
     if message.type == "chat":
         # Broadcast chat message to room
@@ -664,7 +835,13 @@ async def handle_websocket_message(message: WebSocketMessage, room_id: str):
     elif message.type == "subscribe":
         # Handle subscription requests
         channel = message.data.get("channel", "general")
-        await handle_subscription_request(message, room_id, channel)
+        await handle_subscription_request(message, room_id, channel, connection_id)
+
+    elif message.type == "unsubscribe":
+        channel = message.data.get("channel", "general")
+        room = SUBSCRIPTION_ROOMS.get(channel)
+        if room and connection_id:
+            websocket_service.manager.leave_room(connection_id, room)
 
     elif message.type == "graph_node_update":
         # Handle node position/property updates
@@ -726,13 +903,33 @@ async def handle_websocket_message(message: WebSocketMessage, room_id: str):
         except Exception as e:
             logger.error(f"Failed to store message in Redis: {e}")
 
-async def handle_subscription_request(message: WebSocketMessage, room_id: str, channel: str):
+async def handle_subscription_request(
+    message: WebSocketMessage,
+    room_id: str,
+    channel: str,
+    connection_id: Optional[str] = None
+):
     """Handle subscription requests for real-time data"""
     user_id = message.user_id
 
     if channel == "graph_updates":
-        # Subscribe user to graph updates room
-        await websocket_service.manager.broadcast_to_room("graph_updates", {
+        # Reconnecting clients report their last version and only get what they missed
+        last_version = message.data.get("lastVersion")
+        if last_version is not None:
+            try:
+                last_version = int(last_version)
+            except (TypeError, ValueError):
+                await send_to_subscriber({
+                    "type": "error",
+                    "data": {"message": "Invalid lastVersion", "channel": "graph_updates"},
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }, user_id, connection_id)
+                return
+
+        # Join before the snapshot is taken so no delta flushed after it is missed
+        if connection_id:
+            websocket_service.manager.join_room(connection_id, GRAPH_ROOM)
+        await websocket_service.manager.broadcast_to_room(GRAPH_ROOM, {
             "type": "subscription_confirmed",
             "data": {
                 "channel": "graph_updates",
@@ -742,13 +939,29 @@ async def handle_subscription_request(message: WebSocketMessage, room_id: str, c
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
 
-        # Send initial graph data if requested
-        node_ids = message.data.get("nodeIds", [])
-        if node_ids:
-            await send_graph_snapshot(user_id, node_ids)
+        if last_version is not None:
+            deltas = websocket_service.graph_state.deltas_since(
+                last_version, message.data.get("epoch")
+            )
+            if deltas is not None:
+                await send_to_subscriber({
+                    "type": "graph_deltas",
+                    "data": {
+                        "epoch": websocket_service.graph_state.epoch,
+                        "from_version": last_version,
+                        "version": websocket_service.graph_state.version,
+                        "deltas": deltas
+                    },
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }, user_id, connection_id)
+                return
+
+        await send_graph_snapshot(user_id, message.data.get("nodeIds", []), connection_id)
 
     elif channel == "live_data":
         # Subscribe to live scraper data
+        if connection_id:
+            websocket_service.manager.join_room(connection_id, SUBSCRIPTION_ROOMS[channel])
         await websocket_service.manager.broadcast_to_room("data_updates", {
             "type": "subscription_confirmed",
             "data": {
@@ -759,26 +972,34 @@ async def handle_subscription_request(message: WebSocketMessage, room_id: str, c
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
 
-async def send_graph_snapshot(user_id: str, node_ids: list = None):
+async def send_to_subscriber(message: Dict[str, Any], user_id: str, connection_id: Optional[str] = None):
+    """Reply on the requesting connection when known, otherwise to all of the user's connections"""
+    if connection_id:
+        await websocket_service.manager.send_to_connection(message, connection_id)
+    else:
+        await websocket_service.manager.send_personal_message(message, user_id)
+
+async def send_graph_snapshot(user_id: str, node_ids: list = None, connection_id: Optional[str] = None):
     """Send current graph state to a specific user"""
     try:
-        # This would typically fetch from your graph database
-        # For now, send a simulated response
+        state = websocket_service.graph_state.snapshot(node_ids)
         snapshot = {
             "type": "graph_snapshot",
             "data": {
-                "nodes": [],  # Fetch from database
-                "edges": [],  # Fetch from database
+                "nodes": state["nodes"],
+                "edges": state["edges"],
                 "metadata": {
+                    "epoch": state["epoch"],
+                    "version": state["version"],
                     "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "node_count": 0,
-                    "edge_count": 0
+                    "node_count": len(state["nodes"]),
+                    "edge_count": len(state["edges"])
                 }
             },
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
-        await websocket_service.manager.send_personal_message(snapshot, user_id)
+        await send_to_subscriber(snapshot, user_id, connection_id)
     except Exception as e:
         logger.error(f"Failed to send graph snapshot to {user_id}: {e}")
 
@@ -801,42 +1022,38 @@ async def broadcast_graph_update(
 
 @app.post("/api/v1/graph/nodes/added")
 async def broadcast_nodes_added(nodes: list):
-    """Broadcast new nodes to WebSocket clients"""
-    await websocket_service.manager.broadcast_to_room("graph_updates", {
-        "type": "nodes_added",
-        "data": {
-            "nodes": nodes,
-            "count": len(nodes)
-        },
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
-    return {"status": "broadcasted", "nodes_added": len(nodes)}
+    """Add nodes to the graph state; clients receive them in the next delta"""
+    applied = websocket_service.graph_state.add_nodes(nodes)
+    return {"status": "queued", "nodes_added": applied, "version": websocket_service.graph_state.version}
 
 @app.post("/api/v1/graph/nodes/updated")
 async def broadcast_nodes_updated(updates: list):
-    """Broadcast node updates to WebSocket clients"""
-    await websocket_service.manager.broadcast_to_room("graph_updates", {
-        "type": "nodes_updated",
-        "data": {
-            "updates": updates,
-            "count": len(updates)
-        },
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
-    return {"status": "broadcasted", "nodes_updated": len(updates)}
+    """Merge node updates into the graph state; repeated updates within a tick coalesce"""
+    applied = websocket_service.graph_state.update_nodes(updates)
+    return {"status": "queued", "nodes_updated": applied, "version": websocket_service.graph_state.version}
 
 @app.post("/api/v1/graph/nodes/removed")
 async def broadcast_nodes_removed(node_ids: list):
-    """Broadcast node removals to WebSocket clients"""
-    await websocket_service.manager.broadcast_to_room("graph_updates", {
-        "type": "nodes_removed",
-        "data": {
-            "node_ids": node_ids,
-            "count": len(node_ids)
-        },
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
-    return {"status": "broadcasted", "nodes_removed": len(node_ids)}
+    """Remove nodes (and their edges) from the graph state"""
+    removed = websocket_service.graph_state.remove_nodes(node_ids)
+    return {"status": "queued", "nodes_removed": removed, "version": websocket_service.graph_state.version}
+
+@app.post("/api/v1/graph/edges/added")
+async def broadcast_edges_added(edges: list):
+    """Add edges ({"source", "target", ...}) to the graph state"""
+    applied = websocket_service.graph_state.add_edges(edges)
+    return {"status": "queued", "edges_added": applied, "version": websocket_service.graph_state.version}
+
+@app.post("/api/v1/graph/edges/removed")
+async def broadcast_edges_removed(edge_ids: list):
+    """Remove edges from the graph state"""
+    removed = websocket_service.graph_state.remove_edges(edge_ids)
+    return {"status": "queued", "edges_removed": removed, "version": websocket_service.graph_state.version}
+
+@app.get("/api/v1/graph/snapshot")
+async def get_graph_snapshot():
+    """Full graph state with its version, for clients that need to reload"""
+    return websocket_service.graph_state.snapshot()
 
 @app.post("/api/v1/broadcast/{room_id}")
 async def broadcast_message(
@@ -862,8 +1079,32 @@ async def broadcast_message(
     return {"status": "broadcasted", "room_id": room_id, "message_type": message.type}
 
 @app.get("/api/v1/rooms/{room_id}/history")
-async def get_room_history(room_id: str, limit: int = 50):
-    """Get message history for a room"""
+async def get_room_history(
+    room_id: str,
+    limit: int = 50,
+    since_version: Optional[int] = None,
+    epoch: Optional[str] = None
+):
+    """
+    Get message history for a room
+
+    With since_version on the graph room, returns the graph deltas after that
+    version instead; resync_required is set when the version is no longer
+    covered by the delta history and the client must reload a snapshot.
+    """
+    if since_version is not None and room_id == GRAPH_ROOM:
+        graph_state = websocket_service.graph_state
+        deltas = graph_state.deltas_since(since_version, epoch)
+        return {
+            "room_id": room_id,
+            "epoch": graph_state.epoch,
+            "version": graph_state.version,
+            "since_version": since_version,
+            "resync_required": deltas is None,
+            "deltas": deltas or [],
+            "count": len(deltas or [])
+        }
+
     if not websocket_service.redis_client:
         raise HTTPException(status_code=503, detail="Redis not available")
     
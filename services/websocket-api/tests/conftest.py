@@ -4,6 +4,7 @@ import asyncio
 from typing import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock, patch
 from httpx import AsyncClient
+from fastapi import WebSocketDisconnect
 from fastapi.testclient import TestClient
 
 
@@ -119,3 +120,46 @@ def sample_subscribe_message():
             "channel": "graph_updates"
         }
     }
+
+
+class FakeWebSocket:
+    """Minimal WebSocket: replays `incoming` frames, then raises `end`"""
+
+    def __init__(self, incoming=(), end=WebSocketDisconnect()):
+        self.incoming = list(incoming)
+        self.end = end
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self):
+        await asyncio.sleep(0)
+        if self.incoming:
+            return self.incoming.pop(0)
+        raise self.end
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def close(self, code=1000, reason=None):
+        self.closed = code
+
+
+@pytest.fixture
+def fake_websocket():
+    """FakeWebSocket class, for tests that drive ConnectionManager directly"""
+    return FakeWebSocket
+
+
+@pytest.fixture
+async def manager(monkeypatch):
+    """Fresh ConnectionManager installed on the global websocket_service"""
+    from main import ConnectionManager, websocket_service
+
+    manager = ConnectionManager()
+    monkeypatch.setattr(websocket_service, "manager", manager)
+    yield manager
+    # Let cancelled sender tasks finish before the loop moves on
+    await asyncio.sleep(0.01)
@@ -0,0 +1,37 @@
+"""Unit tests for ConnectionManager bookkeeping"""
+import pytest
+from fastapi import WebSocketDisconnect
+
+from main import websocket_endpoint
+
+
+def assert_released(manager):
+    assert manager.active_connections == {}
+    assert manager.room_connections == {}
+    assert manager.user_connections == {}
+    assert manager.room_users == {}
+    assert manager.user_rooms == {}
+    assert manager.sender_tasks == {}
+    assert manager.joined_rooms == {}
+
+
+@pytest.mark.asyncio
+async def test_disconnect_releases_room_and_user_indexes(manager, fake_websocket):
+    first = await manager.connect(fake_websocket(), "alice", "general")
+    second = await manager.connect(fake_websocket(), "alice", "general")
+
+    await manager.disconnect(first)
+    assert manager.room_users == {"general": {"alice"}}
+
+    await manager.disconnect(second)
+    assert_released(manager)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("end", [WebSocketDisconnect(), RuntimeError("receive failed")])
+async def test_endpoint_cleans_up_however_the_loop_ends(manager, fake_websocket, end):
+    websocket = fake_websocket(incoming=['{"type": "chat", "data": {"message": "hi"}}'], end=end)
+
+    await websocket_endpoint(websocket, "anonymous", room_id="general", token=None)
+
+    assert_released(manager)
@@ -0,0 +1,108 @@
+"""Unit tests for graph_updates subscriptions: snapshot, deltas and resync"""
+import asyncio
+import json
+
+import pytest
+
+from graph_state import GraphState
+from main import (
+    GRAPH_ROOM,
+    WebSocketMessage,
+    handle_websocket_message,
+    websocket_service,
+)
+
+
+@pytest.fixture
+def graph_state(monkeypatch):
+    state = GraphState(history_size=2)
+    monkeypatch.setattr(websocket_service, "graph_state", state)
+    return state
+
+
+async def received(websocket, message_type):
+    # Sender tasks drain the per-connection queues asynchronously
+    await asyncio.sleep(0.01)
+    frames = [json.loads(text) for text in websocket.sent]
+    return [frame for frame in frames if frame["type"] == message_type]
+
+
+async def send(connection_id, message_type, **data):
+    message = WebSocketMessage(type=message_type, data=data, user_id="alice")
+    await handle_websocket_message(message, "general", connection_id)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_sends_snapshot_then_deltas_from_its_version(manager, fake_websocket, graph_state):
+    graph_state.add_nodes([{"id": "a"}])
+    await websocket_service.flush_graph_delta()
+
+    websocket = fake_websocket()
+    connection_id = await manager.connect(websocket, "alice", "general")
+    await send(connection_id, "subscribe", channel="graph_updates")
+
+    [snapshot] = await received(websocket, "graph_snapshot")
+    assert snapshot["data"]["metadata"]["version"] == 1
+    assert [n["id"] for n in snapshot["data"]["nodes"]] == ["a"]
+
+    graph_state.add_nodes([{"id": "b"}])
+    await websocket_service.flush_graph_delta()
+
+    [delta] = await received(websocket, "graph_delta")
+    assert delta["data"]["base_version"] == 1
+    assert [n["id"] for n in delta["data"]["nodes_upserted"]] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_reconnect_gets_missed_deltas_or_snapshot_on_version_gap(manager, fake_websocket, graph_state):
+    for node_id in ("a", "b", "c"):
+        graph_state.add_nodes([{"id": node_id}])
+        await websocket_service.flush_graph_delta()
+
+    caught_up = fake_websocket()
+    connection_id = await manager.connect(caught_up, "alice", "general")
+    await send(connection_id, "subscribe", channel="graph_updates", lastVersion=1, epoch=graph_state.epoch)
+
+    [deltas] = await received(caught_up, "graph_deltas")
+    assert [d["version"] for d in deltas["data"]["deltas"]] == [2, 3]
+    assert await received(caught_up, "graph_snapshot") == []
+
+    # Version 0 has aged out of the two-entry history: full snapshot instead
+    too_old = fake_websocket()
+    connection_id = await manager.connect(too_old, "alice", "general")
+    await send(connection_id, "subscribe", channel="graph_updates", lastVersion=0, epoch=graph_state.epoch)
+
+    [snapshot] = await received(too_old, "graph_snapshot")
+    assert snapshot["data"]["metadata"]["version"] == 3
+    assert await received(too_old, "graph_deltas") == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_last_version_gets_error_and_no_subscription(manager, fake_websocket, graph_state):
+    websocket = fake_websocket()
+    connection_id = await manager.connect(websocket, "alice", "general")
+
+    await send(connection_id, "subscribe", channel="graph_updates", lastVersion="latest")
+
+    [error] = await received(websocket, "error")
+    assert error["data"]["message"] == "Invalid lastVersion"
+    assert connection_id not in manager.room_connections.get(GRAPH_ROOM, set())
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_and_disconnect_leave_graph_room(manager, fake_websocket, graph_state):
+    websocket = fake_websocket()
+    connection_id = await manager.connect(websocket, "alice", "general")
+    await send(connection_id, "subscribe", channel="graph_updates")
+    assert connection_id in manager.room_connections[GRAPH_ROOM]
+
+    await send(connection_id, "unsubscribe", channel="graph_updates")
+    graph_state.add_nodes([{"id": "a"}])
+    await websocket_service.flush_graph_delta()
+    assert await received(websocket, "graph_delta") == []
+    assert GRAPH_ROOM not in manager.room_connections
+
+    await send(connection_id, "subscribe", channel="graph_updates")
+    await manager.disconnect(connection_id)
+    assert GRAPH_ROOM not in manager.room_connections
+    assert manager.joined_rooms == {}
@@ -0,0 +1,6 @@
+-- ===================================================================
+-- Migration 012 ROLLBACK: Drop Serato track matching indexes
+-- ===================================================================
+
+DROP INDEX IF EXISTS idx_tracks_serato_match_key;
+DROP INDEX IF EXISTS idx_tracks_track_name_trgm;
@@ -0,0 +1,34 @@
+-- ===================================================================
+-- Migration 012: Indexes for batched Serato track matching
+-- ===================================================================
+-- Purpose: Let services/serato-integration/track_matcher.py resolve a chunk
+--          of Serato files with index lookups instead of sequential scans
+--   - Exact stage joins on (LOWER(TRIM(artist_name)), LOWER(TRIM(track_name)))
+--   - Fuzzy stage uses the pg_trgm % operator on track_name
+-- Note: Only applied when tracks is a physical table with artist_name/track_name
+-- ===================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns c
+        JOIN information_schema.tables t
+          ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+        WHERE c.table_name = 'tracks'
+          AND c.column_name = 'artist_name'
+          AND t.table_type = 'BASE TABLE'
+    ) AND EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'tracks' AND column_name = 'track_name'
+    ) THEN
+        CREATE INDEX IF NOT EXISTS idx_tracks_serato_match_key
+            ON tracks (LOWER(TRIM(artist_name)), LOWER(TRIM(track_name)));
+        CREATE INDEX IF NOT EXISTS idx_tracks_track_name_trgm
+            ON tracks USING gin (track_name gin_trgm_ops);
+        RAISE NOTICE 'Migration 012: Serato match indexes created';
+    ELSE
+        RAISE NOTICE 'Migration 012: tracks has no artist_name/track_name columns, skipping';
+    END IF;
+END $$;
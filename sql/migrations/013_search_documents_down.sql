@@ -0,0 +1,5 @@
+-- ===================================================================
+-- Migration 013 ROLLBACK: Drop search documents view
+-- ===================================================================
+
+DROP MATERIALIZED VIEW IF EXISTS search_documents;
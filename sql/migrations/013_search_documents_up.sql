@@ -0,0 +1,71 @@
+-- ===================================================================
+-- Migration 013: Search documents for track/artist search
+-- ===================================================================
+-- Purpose: Serve /api/search/tracks, /api/v1/artists/search and
+--          /api/v1/search/autocomplete from one pre-joined, indexed
+--          materialised view instead of ILIKE scans over tracks, artists
+--          and track_artists (see services/rest_api/utils/search_index.py)
+--   - search_text: lower-cased title + primary artist, trigram GIN index
+--     for ranked, typo-tolerant word-similarity search
+--   - prefix_key: lower-cased title/name, text_pattern_ops B-tree for
+--     prefix autocomplete
+--   - popularity: transition count (tracks) / track count (artists),
+--     precomputed so ranking needs no GROUP BY at query time
+-- Refresh: REFRESH MATERIALIZED VIEW CONCURRENTLY search_documents
+--          (run periodically by the REST API)
+-- ===================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS search_documents AS
+SELECT
+    'track'::text AS doc_type,
+    t.id AS entity_id,
+    t.title AS display_name,
+    pa.name AS artist_name,
+    LOWER(TRIM(t.title)) AS prefix_key,
+    LOWER(TRIM(t.title) || ' ' || COALESCE(pa.name, '')) AS search_text,
+    COALESCE(adj.transitions, 0)::bigint AS popularity
+FROM tracks t
+LEFT JOIN LATERAL (
+    SELECT a.name
+    FROM track_artists ta
+    JOIN artists a ON a.artist_id = ta.artist_id
+    WHERE ta.track_id = t.id AND ta.role = 'primary'
+    ORDER BY ta.position
+    LIMIT 1
+) pa ON TRUE
+LEFT JOIN (
+    SELECT song_id, SUM(occurrence_count) AS transitions
+    FROM (
+        SELECT song_id_1 AS song_id, occurrence_count FROM song_adjacency
+        UNION ALL
+        SELECT song_id_2 AS song_id, occurrence_count FROM song_adjacency
+    ) edges
+    GROUP BY song_id
+) adj ON adj.song_id = t.id
+UNION ALL
+SELECT
+    'artist'::text AS doc_type,
+    a.artist_id AS entity_id,
+    a.name AS display_name,
+    a.name AS artist_name,
+    LOWER(TRIM(a.name)) AS prefix_key,
+    LOWER(TRIM(a.name)) AS search_text,
+    COALESCE(tc.track_count, 0)::bigint AS popularity
+FROM artists a
+LEFT JOIN (
+    SELECT artist_id, COUNT(DISTINCT track_id) AS track_count
+    FROM track_artists
+    GROUP BY artist_id
+) tc ON tc.artist_id = a.artist_id;
+
+-- Required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_search_documents_key
+    ON search_documents (doc_type, entity_id);
+CREATE INDEX IF NOT EXISTS idx_search_documents_text_trgm
+    ON search_documents USING gin (search_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_search_documents_prefix
+    ON search_documents (doc_type, prefix_key text_pattern_ops);
+
+COMMENT ON MATERIALIZED VIEW search_documents IS 'Pre-joined track/artist search documents with trigram and prefix indexes. Refreshed concurrently by the REST API.';
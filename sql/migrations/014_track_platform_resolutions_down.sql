@@ -0,0 +1,5 @@
+-- ===================================================================
+-- Migration 014 ROLLBACK: Drop platform ID resolution cache
+-- ===================================================================
+
+DROP TABLE IF EXISTS track_platform_resolutions;
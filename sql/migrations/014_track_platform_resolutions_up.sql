@@ -0,0 +1,19 @@
+-- ===================================================================
+-- Migration 014: Platform ID resolution cache
+-- ===================================================================
+-- Purpose: Let UnifiedStreamingClient.enrich_track_with_platform_ids
+--          (services/streaming-integrations) resolve each track on each
+--          streaming platform at most once
+--   - One row per (track, platform) that returned a definitive answer
+--   - platform_id IS NULL records "searched, no confident match", which
+--     the platform ID columns on tracks cannot express
+--   - Failed or timed-out searches are not recorded and are retried
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS track_platform_resolutions (
+    track_id    TEXT         NOT NULL,
+    platform    VARCHAR(32)  NOT NULL,
+    platform_id VARCHAR(100),
+    resolved_at TIMESTAMPTZ  NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (track_id, platform)
+);